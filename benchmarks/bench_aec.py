@@ -0,0 +1,81 @@
+"""Measure echo canceller CPU cost and echo suppression per sample rate.
+
+Usage: python -m benchmarks.bench_aec [seconds]
+
+A speech-like far-end signal is fed as the reference in 40 ms downlink
+frames, and its echo (250 ms later, through a decaying room response)
+forms the uplink in 20 ms frames. The table shows how many times faster
+than real time one session is processed, the cost per filter block, the
+echo suppression over the final second, and the memory a session holds.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.aec import EchoCanceller
+
+SAMPLE_RATES = (16000, 24000, 48000)
+ECHO_DELAY = 0.25
+SEED = 7
+
+
+def signals(rate: int, seconds: float) -> tuple[np.ndarray, np.ndarray]:
+    """Return a far-end signal and its echo at ``rate``."""
+    rng = np.random.default_rng(SEED)
+    samples = int(rate * seconds)
+    syllable = rate // 10
+    envelope = np.repeat(np.abs(rng.normal(0, 1, samples // syllable + 1)), syllable)
+    far = rng.normal(0, 0.2, samples) * envelope[:samples]
+    taps = int(rate * 0.03)
+    path = rng.normal(0, 0.1, taps) * np.exp(-np.arange(taps) / (rate * 0.006))
+    delay = int(rate * ECHO_DELAY)
+    echo = np.concatenate((np.zeros(delay), np.convolve(far, path)[: samples - delay]))
+    return far, echo.astype(np.float32)
+
+
+def run(rate: int, seconds: float) -> tuple[float, float, float, int]:
+    """Return (realtime factor, µs per block, suppression dB, state bytes)."""
+    far, echo = signals(rate, seconds)
+    reference = np.clip(far * 32767, -32768, 32767).astype("<i2")
+    canceller = EchoCanceller(rate)
+    uplink_frame = rate // 50
+    out = []
+    start = time.perf_counter()
+    for offset in range(0, echo.size, uplink_frame):
+        if offset % (2 * uplink_frame) == 0:
+            frame = reference[offset : offset + 2 * uplink_frame]
+            canceller.add_reference(frame.tobytes(), rate)
+        out.append(canceller.process(echo[offset : offset + uplink_frame]))
+    elapsed = time.perf_counter() - start
+
+    cancelled = np.concatenate(out)[-rate:]
+    before = echo[-rate - canceller.block : -canceller.block]
+    suppression = 10 * np.log10(
+        np.mean(np.square(before)) / np.mean(np.square(cancelled))
+    )
+    state = sum(
+        value.nbytes
+        for value in vars(canceller).values()
+        if isinstance(value, np.ndarray)
+    )
+    blocks = echo.size // canceller.block
+    return seconds / elapsed, elapsed / blocks * 1e6, suppression, state
+
+
+def main() -> None:
+    """Run the benchmark for each sample rate."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    for rate in SAMPLE_RATES:
+        realtime, per_block, suppression, state = run(rate, seconds)
+        print(
+            f"{rate:5d} Hz: {realtime:6.1f}x realtime, {per_block:6.0f} µs/block, "
+            f"suppression {suppression:5.1f} dB, state {state / 1024:6.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
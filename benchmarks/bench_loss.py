@@ -0,0 +1,168 @@
+"""Measure Opus loss-resilience modes under simulated packet loss.
+
+Usage: python -m benchmarks.bench_loss [seconds] [loss_percent ...]
+
+A synthetic voice signal is encoded with the encoder settings of each
+loss-resilience mode. Random datagrams are dropped, with redundant copies
+dropped independently. The result is then decoded with libopus, using
+in-band FEC from the next packet where the mode provides it. The table
+shows the bitrate of each mode and the segmental SNR of the lossy decode
+against a loss-free decode of the same stream. The SNR gain over ``off`` is
+the intelligibility recovered at that loss rate.
+
+Decoding needs libopus's FEC entry point, which PyAV does not expose, so the
+libopus bundled with PyAV (or a system copy) is loaded through ctypes.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import glob
+import os
+import random
+import sys
+
+import av
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.const import LOSS_RESILIENCE_MODES
+from custom_components.unifiprotect_2way_audio.const import (
+    RESILIENCE_OFF as OFF,
+)
+from custom_components.unifiprotect_2way_audio.const import (
+    RESILIENCE_REDUNDANCY as REDUNDANCY,
+)
+from custom_components.unifiprotect_2way_audio.ratecontrol import resilience_settings
+from custom_components.unifiprotect_2way_audio.rtp import RTP_HEADER, RtpOpusStream
+
+SAMPLE_RATE = 24000
+BIT_RATE = 24000
+FRAME = SAMPLE_RATE // 50  # 20 ms
+MAX_FRAME = SAMPLE_RATE * 120 // 1000
+SEED = 7
+
+
+def load_libopus() -> ctypes.CDLL:
+    """Load libopus from the PyAV wheel or the system."""
+    bundled = glob.glob(
+        os.path.join(os.path.dirname(av.__file__), os.pardir, "av.libs", "libopus*")
+    )
+    path = bundled[0] if bundled else ctypes.util.find_library("opus")
+    if path is None:
+        sys.exit("libopus not found")
+    lib = ctypes.CDLL(path)
+    lib.opus_decoder_create.restype = ctypes.c_void_p
+    lib.opus_decoder_create.argtypes = [
+        ctypes.c_int32,
+        ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int),
+    ]
+    lib.opus_decoder_destroy.argtypes = [ctypes.c_void_p]
+    lib.opus_decode.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_char_p,
+        ctypes.c_int32,
+        ctypes.POINTER(ctypes.c_int16),
+        ctypes.c_int,
+        ctypes.c_int,
+    ]
+    return lib
+
+
+def voice_signal(seconds: float) -> np.ndarray:
+    """Return a harmonic, syllable-modulated test signal with some noise."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 3.5 * t), 0, None) ** 0.5
+    noise = np.random.default_rng(SEED).normal(0, 0.05, t.size)
+    return ((voiced * envelope + noise) * 5000).astype(np.int16)
+
+
+def encode(signal: np.ndarray, mode: str, expected_loss: int) -> list[bytes]:
+    """Encode ``signal`` into Opus packets with the settings of ``mode``."""
+    stream = RtpOpusStream(
+        SAMPLE_RATE, resilience_settings(BIT_RATE, mode, expected_loss)
+    )
+    packets: list[bytes] = []
+    for start in range(0, signal.size - FRAME + 1, FRAME):
+        frame = av.AudioFrame.from_ndarray(
+            signal[start : start + FRAME].reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = SAMPLE_RATE
+        frame.pts = start
+        packets.extend(bytes(packet) for packet in stream.encode(frame))
+    return packets
+
+
+def received(count: int, mode: str, loss: float, rng: random.Random) -> list[bool]:
+    """Return which packets arrive, counting a redundant copy as a second try."""
+    copies = 2 if mode == REDUNDANCY else 1
+    return [any(rng.random() >= loss for _ in range(copies)) for _ in range(count)]
+
+
+def decode(lib: ctypes.CDLL, packets: list[bytes], arrived: list[bool], fec: bool):
+    """Decode packets, concealing losses with FEC or libopus PLC."""
+    error = ctypes.c_int()
+    decoder = lib.opus_decoder_create(SAMPLE_RATE, 1, ctypes.byref(error))
+    pcm = (ctypes.c_int16 * MAX_FRAME)()
+    out: list[np.ndarray] = []
+    try:
+        for index, packet in enumerate(packets):
+            if arrived[index]:
+                samples = lib.opus_decode(
+                    decoder, packet, len(packet), pcm, MAX_FRAME, 0
+                )
+            elif fec and index + 1 < len(packets) and arrived[index + 1]:
+                following = packets[index + 1]
+                samples = lib.opus_decode(
+                    decoder, following, len(following), pcm, FRAME, 1
+                )
+            else:
+                samples = lib.opus_decode(decoder, None, 0, pcm, FRAME, 0)
+            out.append(np.ctypeslib.as_array(pcm)[: max(samples, 0)].copy())
+    finally:
+        lib.opus_decoder_destroy(decoder)
+    return np.concatenate(out).astype(np.float64)
+
+
+def segmental_snr(reference: np.ndarray, degraded: np.ndarray) -> float:
+    """Return the mean per-frame SNR (dB), clamped to [-10, 35] per frame."""
+    length = min(reference.size, degraded.size) // FRAME * FRAME
+    ref = reference[:length].reshape(-1, FRAME)
+    err = ref - degraded[:length].reshape(-1, FRAME)
+    snr = 10 * np.log10(((ref**2).sum(axis=1) + 1) / ((err**2).sum(axis=1) + 1))
+    return float(np.clip(snr, -10, 35).mean())
+
+
+def main() -> None:
+    """Print bitrate and quality for each mode and loss rate."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    losses = [int(arg) for arg in sys.argv[2:]] or [5, 10, 20]
+    lib = load_libopus()
+    signal = voice_signal(seconds)
+
+    print(f"{'mode':<11} {'loss':>5} {'kbit/s':>7} {'segSNR':>7} {'gain':>6}")
+    for loss in losses:
+        baseline = None
+        for mode in LOSS_RESILIENCE_MODES:
+            packets = encode(signal, mode, loss)
+            copies = 2 if mode == REDUNDANCY else 1
+            octets = sum(len(packet) + RTP_HEADER.size for packet in packets)
+            kbps = octets * copies * 8 / seconds / 1000
+            reference = decode(lib, packets, [True] * len(packets), fec=False)
+            arrived = received(len(packets), mode, loss / 100, random.Random(SEED))
+            snr = segmental_snr(
+                reference, decode(lib, packets, arrived, fec=mode != OFF)
+            )
+            baseline = snr if baseline is None else baseline
+            print(
+                f"{mode:<11} {loss:>4}% {kbps:>7.1f} {snr:>6.1f}dB "
+                f"{snr - baseline:>+5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
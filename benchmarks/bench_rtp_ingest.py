@@ -0,0 +1,95 @@
+"""Measure the RTP ingest listener's delay with a local gateway stand-in.
+
+Usage: python -m benchmarks.bench_rtp_ingest [seconds] [loss %] [reorder %]
+
+A sender paces 20 ms Opus and G.711 RTP packets to the listener over
+loopback, dropping and swapping packets at the given rates. The table
+shows the delay from send to hand-off in milliseconds: the jitter buffer
+adds nothing to in-order packets and at most JITTER_DELAY to those that
+wait behind a gap, so the ingest stays well inside a 100 ms SIP-to-doorbell
+budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import socket
+import sys
+import time
+
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.rtp import RTP_HEADER
+from custom_components.unifiprotect_2way_audio.rtp_ingest import (
+    PAYLOAD_PCMU,
+    RtpIngest,
+)
+
+PACKET_INTERVAL = 0.02
+OPUS_PAYLOAD_TYPE = 111
+# A 20 ms CELT-only Opus frame and 160 mu-law samples
+PAYLOADS = {
+    OPUS_PAYLOAD_TYPE: (bytes([0xF8]) + bytes(60), 960),
+    PAYLOAD_PCMU: (bytes(160), 160),
+}
+
+
+async def run(payload_type: int, seconds: float, loss: float, reorder: float):
+    """Return per-packet delays in ms and the listener's loss count."""
+    payload, step = PAYLOADS[payload_type]
+    sent_at: dict[int, float] = {}
+    delays: list[float] = []
+    sequence = 0
+    next_sequence = 0
+
+    def on_audio(chunk: bytes, audio_format: str, rate: int | None) -> None:
+        # Packets come out in sequence order; dropped ones were never sent
+        nonlocal next_sequence
+        while next_sequence not in sent_at:
+            next_sequence += 1
+        delays.append((time.perf_counter() - sent_at[next_sequence]) * 1000)
+        next_sequence += 1
+
+    ingest = RtpIngest(on_audio)
+    await ingest.async_start(0, "127.0.0.1")
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    address = ("127.0.0.1", ingest.port)
+    held: bytes | None = None
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        datagram = RTP_HEADER.pack(0x80, payload_type, sequence, sequence * step, 1)
+        datagram += payload
+        if random.random() >= loss:
+            sent_at[sequence] = time.perf_counter()
+            if held is None and random.random() < reorder:
+                held = datagram
+            else:
+                sender.sendto(datagram, address)
+                if held is not None:
+                    sender.sendto(held, address)
+                    held = None
+        sequence += 1
+        await asyncio.sleep(PACKET_INTERVAL)
+    await asyncio.sleep(0.2)
+    sender.close()
+    ingest.close()
+    return np.array(delays), ingest.lost_packets
+
+
+def main() -> None:
+    """Print ingest delay percentiles for Opus and G.711 streams."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    loss = float(sys.argv[2]) / 100 if len(sys.argv) > 2 else 0.02
+    reorder = float(sys.argv[3]) / 100 if len(sys.argv) > 3 else 0.02
+    for name, payload_type in (("opus", OPUS_PAYLOAD_TYPE), ("pcmu", PAYLOAD_PCMU)):
+        delays, lost = asyncio.run(run(payload_type, seconds, loss, reorder))
+        p50, p99 = np.percentile(delays, [50, 99])
+        print(
+            f"{name}: {len(delays)} packets, {lost} skipped, "
+            f"delay p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {delays.max():.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
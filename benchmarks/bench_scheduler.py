@@ -0,0 +1,125 @@
+"""Compare playout underruns of paced sessions next to a flooding one.
+
+Usage: python -m benchmarks.bench_scheduler [seconds] [sessions] [encode ms]
+
+Each session is a talkback stream whose 20 ms chunks cost ``encode ms`` of
+CPU on the event loop. The paced sessions receive a chunk every 20 ms and
+keep 60 ms of audio queued on the camera; the flooding session gets two
+seconds of audio at once every two seconds. Without the scheduler each session
+drains its queue without yielding, as the switch used to, and the burst
+holds up everyone's encodes. With it, the table shows the paced sessions
+keeping their cadence while the flooder absorbs the delay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.scheduler import EncodeScheduler
+
+CHUNK = 0.02
+LEAD = 0.06
+# Seconds of audio the flooding session receives at once
+BURST = 2.0
+
+
+class Stream:
+    """Queued chunks and playout state of one simulated session."""
+
+    def __init__(self) -> None:
+        self.pending = 0
+        self.ready = asyncio.Event()
+        self.media_end: float | None = None
+        self.underruns = 0
+        self.lateness: list[float] = []
+
+    def played(self) -> None:
+        """Account one chunk encoded now against the camera's playout."""
+        now = time.monotonic()
+        if self.media_end is None:
+            self.media_end = now + LEAD
+        elif now > self.media_end:
+            self.underruns += 1
+            self.lateness.append((now - self.media_end) * 1000)
+            self.media_end = now
+        self.media_end += CHUNK
+
+
+def encode(cost: float) -> None:
+    """Burn ``cost`` seconds of CPU like an Opus encode."""
+    end = time.perf_counter() + cost
+    while time.perf_counter() < end:
+        pass
+
+
+async def consume(stream: Stream, cost: float, scheduler: EncodeScheduler | None):
+    """Encode the stream's chunks as they arrive."""
+    session = scheduler.open_session() if scheduler else None
+    while True:
+        if not stream.pending:
+            stream.ready.clear()
+            await stream.ready.wait()
+            continue
+        if session is None:
+            stream.pending -= 1
+            encode(cost)
+            stream.played()
+            continue
+        async with session.slot(stream.media_end):
+            stream.pending -= 1
+            encode(cost)
+            stream.played()
+
+
+async def produce(stream: Stream, seconds: float, burst: int) -> None:
+    """Queue ``burst`` chunks at a time, as soon as they are recorded."""
+    start = time.monotonic()
+    sent = 0
+    while (elapsed := time.monotonic() - start) < seconds:
+        # Chunks held up while the loop was blocked arrive together
+        while (sent + burst) * CHUNK <= elapsed:
+            stream.pending += burst
+            stream.ready.set()
+            sent += burst
+        await asyncio.sleep(CHUNK / 4)
+
+
+async def run(seconds: float, sessions: int, cost: float, scheduled: bool):
+    """Return the paced sessions' and the flooder's streams."""
+    scheduler = EncodeScheduler() if scheduled else None
+    streams = [Stream() for _ in range(sessions)]
+    consumers = [
+        asyncio.create_task(consume(stream, cost, scheduler)) for stream in streams
+    ]
+    await asyncio.gather(
+        produce(streams[0], seconds, int(BURST / CHUNK)),
+        *(produce(stream, seconds, 1) for stream in streams[1:]),
+    )
+    for task in consumers:
+        task.cancel()
+    return streams[1:], streams[0]
+
+
+def main() -> None:
+    """Print underruns of paced sessions with and without the scheduler."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    cost = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 1.5
+    for name, scheduled in (("inline", False), ("scheduled", True)):
+        paced, flooder = asyncio.run(run(seconds, sessions, cost, scheduled))
+        lateness = [value for stream in paced for value in stream.lateness]
+        worst = max(lateness, default=0.0)
+        p99 = np.percentile(lateness, 99) if lateness else 0.0
+        print(
+            f"{name}: paced underruns {sum(s.underruns for s in paced)}, "
+            f"late p99 {p99:.1f} ms, max {worst:.1f} ms; "
+            f"flooder underruns {flooder.underruns}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure process-pool transcoding throughput as workers are added.
+
+Usage: python -m benchmarks.bench_transcoder [max_workers] [seconds]
+
+Each worker gets one camera session that encodes 20 ms PCM chunks to Opus
+and sends RTP to a local UDP sink. Throughput should grow close to
+linearly until the number of workers reaches the number of free cores.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.audio_format import PCM_FORMAT
+from custom_components.unifiprotect_2way_audio.transcoder import TranscoderPool
+
+SAMPLE_RATE = 48000
+CHUNK = (np.sin(np.arange(SAMPLE_RATE // 50) / 8) * 8000).astype("<i2").tobytes()
+
+
+async def run(workers: int, seconds: float) -> float:
+    """Return chunks transcoded per second with ``workers`` processes."""
+    loop = asyncio.get_running_loop()
+    sink, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, local_addr=("127.0.0.1", 0)
+    )
+    url = f"rtp://127.0.0.1:{sink.get_extra_info('sockname')[1]}"
+    pool = TranscoderPool(workers)
+    done = [0]
+
+    def on_stats(chunks: int, *_: int) -> None:
+        done[0] += chunks
+
+    sessions = [
+        await pool.async_open_session(
+            f"camera_{i}", url, "opus", SAMPLE_RATE, 24000, on_stats, print
+        )
+        for i in range(workers)
+    ]
+    await asyncio.sleep(2)  # let workers import and open their outputs
+    done[0] = 0
+    start = time.monotonic()
+    while time.monotonic() - start < seconds:
+        if not any(pool.submit(s, CHUNK, PCM_FORMAT, SAMPLE_RATE) for s in sessions):
+            await asyncio.sleep(0.001)
+        else:
+            await asyncio.sleep(0)
+    for index, session in enumerate(sessions):
+        pool.close_session(f"camera_{index}", session)
+    await asyncio.sleep(1.5)  # collect final statistics
+    await pool.async_shutdown()
+    sink.close()
+    return done[0] / seconds
+
+
+async def main() -> None:
+    """Run the benchmark for 1..max_workers workers."""
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        rate = await run(workers, seconds)
+        baseline = baseline or rate
+        print(
+            f"{workers} worker(s): {rate:8.0f} chunks/s "
+            f"({rate * 0.02:6.1f}x realtime, speedup {rate / baseline:4.2f})"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+/**
+ * Measure the card's microphone capture worklet against the previous
+ * array-based implementation.
+ *
+ * Usage: node benchmarks/bench_worklet.mjs [seconds]
+ *
+ * The processors are driven with 128-sample render quanta of a 48 kHz
+ * signal, the way an AudioContext calls them, and every posted buffer is
+ * returned as the card does. The worklet runs both at the context rate and
+ * downsampling to a 16 kHz camera. The table shows the mean, 99th percentile and
+ * worst time per quantum; the audio thread has 2.7 ms per quantum at 48 kHz,
+ * and garbage collection pauses caused by per-chunk allocation show up in
+ * the tail.
+ */
+
+import { readFileSync } from 'node:fs';
+import { performance } from 'node:perf_hooks';
+
+const SAMPLE_RATE = 48000;
+const QUANTUM = 128;
+const WORKLET_PATH = new URL(
+  '../custom_components/unifiprotect_2way_audio/www/up2wa-recorder-worklet.js',
+  import.meta.url,
+);
+
+class FakePort {
+  constructor() {
+    this.onmessage = null;
+    this.posted = 0;
+  }
+
+  postMessage(buffer) {
+    this.posted++;
+    // The card sends each chunk, then hands the buffer back
+    if (this.onmessage) {
+      this.onmessage({ data: buffer });
+    }
+  }
+}
+
+class FakeAudioWorkletProcessor {
+  constructor() {
+    this.port = new FakePort();
+  }
+}
+
+// The implementation the card embedded before the ring buffer rewrite
+class LegacyRecorderWorklet extends FakeAudioWorkletProcessor {
+  constructor() {
+    super();
+    this._buffer = [];
+    this._chunkSize = 2048;
+  }
+
+  process(inputs) {
+    const input = inputs[0];
+    if (!input || !input[0]) {
+      return true;
+    }
+
+    const channelData = input[0];
+    for (let i = 0; i < channelData.length; i++) {
+      const sample = Math.max(-1, Math.min(1, channelData[i]));
+      this._buffer.push(sample < 0 ? sample * 0x8000 : sample * 0x7fff);
+    }
+
+    while (this._buffer.length >= this._chunkSize) {
+      const chunk = this._buffer.splice(0, this._chunkSize);
+      const int16 = new Int16Array(chunk.length);
+      for (let i = 0; i < chunk.length; i++) {
+        int16[i] = chunk[i];
+      }
+      this.port.postMessage({ buffer: int16.buffer }, [int16.buffer]);
+    }
+
+    return true;
+  }
+}
+
+function loadWorklet() {
+  // The worklet is a classic script run in the AudioWorkletGlobalScope, so
+  // evaluate it globally with that scope's names provided
+  const processors = {};
+  globalThis.sampleRate = SAMPLE_RATE;
+  globalThis.AudioWorkletProcessor = FakeAudioWorkletProcessor;
+  globalThis.registerProcessor = (name, processor) => {
+    processors[name] = processor;
+  };
+  (0, eval)(readFileSync(WORKLET_PATH, 'utf8'));
+  return processors['up2wa-recorder-worklet'];
+}
+
+function quanta(count) {
+  const signal = [];
+  for (let index = 0; index < count; index++) {
+    const samples = new Float32Array(QUANTUM);
+    for (let i = 0; i < QUANTUM; i++) {
+      const t = (index * QUANTUM + i) / SAMPLE_RATE;
+      samples[i] = 1.2 * Math.sin(2 * Math.PI * 440 * t);
+    }
+    signal.push([[samples]]);
+  }
+  return signal;
+}
+
+function run(processor, signal) {
+  // Warm up the JIT before timing
+  for (let i = 0; i < 2000; i++) {
+    processor.process(signal[i % signal.length]);
+  }
+  const times = new Float64Array(signal.length);
+  for (let index = 0; index < signal.length; index++) {
+    const start = performance.now();
+    processor.process(signal[index]);
+    times[index] = performance.now() - start;
+  }
+  const mean = times.reduce((total, time) => total + time, 0) / times.length;
+  times.sort();
+  return {
+    mean: mean * 1e6,
+    p99: times[Math.floor(times.length * 0.99)] * 1e6,
+    worst: times[times.length - 1] * 1e6,
+  };
+}
+
+function main() {
+  const seconds = Number(process.argv[2] || 60);
+  const signal = quanta(Math.floor((seconds * SAMPLE_RATE) / QUANTUM));
+  const Worklet = loadWorklet();
+  const implementations = [
+    ['legacy', new LegacyRecorderWorklet()],
+    ['ring', new Worklet({ processorOptions: { chunkSize: 2048 } })],
+    ['16 kHz', new Worklet({ processorOptions: { chunkSize: 683, targetRate: 16000 } })],
+  ];
+  for (const [name, processor] of implementations) {
+    const { mean, p99, worst } = run(processor, signal);
+    console.log(
+      `${name.padEnd(6)}: ${mean.toFixed(0).padStart(6)} ns/quantum mean, ` +
+        `${p99.toFixed(0).padStart(6)} ns p99, ` +
+        `${worst.toFixed(0).padStart(8)} ns worst, ` +
+        `${processor.port.posted} chunks`,
+    );
+  }
+}
+
+main();
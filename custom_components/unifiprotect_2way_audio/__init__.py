@@ -8,11 +8,15 @@ from pathlib import Path
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
 from .frontend import init_resource, register_static_path
 from .manager import StreamConfigManager
+from .media_source import RecordingView
+from .recorder import RETENTION_CHECK_INTERVAL
+from .upload import AudioUploadView
 from .websocket_api import async_register_websocket_handlers
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,6 +34,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     # Register websocket API handlers for audio streaming
     async_register_websocket_handlers(hass)
 
+    # Serve session recordings to the media browser
+    if hass.http is not None:
+        hass.http.register_view(RecordingView(hass))
+        # Chunked HTTP uploads from non-browser producers (ffmpeg, gateways)
+        hass.http.register_view(AudioUploadView(hass))
+
     # Register static path for the Lovelace card
     try:
         path = Path(__file__).parent / "www"
@@ -38,6 +48,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             "/unifiprotect_2way_audio/unifi-2way-audio.js",
             str(path / "unifi-2way-audio.js"),
         )
+        # The card loads this by a fixed URL, so it is never cached long-term
+        await register_static_path(
+            hass,
+            "/unifiprotect_2way_audio/up2wa-recorder-worklet.js",
+            str(path / "up2wa-recorder-worklet.js"),
+            cache_headers=False,
+        )
 
         # Get version from integration metadata
         version = getattr(
@@ -64,9 +81,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Create and store the stream config manager
     hass.data.setdefault(DOMAIN, {})
-    manager = StreamConfigManager(hass)
+    manager = StreamConfigManager(hass, entry.options)
     hass.data[DOMAIN][entry.entry_id] = {"manager": manager}
 
+    # Reload so session limits and idle policy pick up option changes
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    # Enforce the recording retention now and periodically
+    entry.async_create_background_task(
+        hass, manager.async_remove_expired_recordings(), f"{DOMAIN} retention"
+    )
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, manager.async_remove_expired_recordings, RETENTION_CHECK_INTERVAL
+        )
+    )
+
     # Build entities - this will be called by each platform setup
     manager.build_entities(hass)
 
@@ -76,6 +106,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading UniFi Protect 2-Way Audio entry: %s", entry.entry_id)
@@ -84,6 +119,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["manager"].async_shutdown()
 
     return unload_ok
@@ -0,0 +1,266 @@
+"""Acoustic echo cancellation of the camera's audio in the talkback uplink."""
+
+from __future__ import annotations
+
+import math
+
+import av
+import numpy as np
+
+# Seconds of audio per filter block; the canceller adds one block of latency
+BLOCK_DURATION = 0.008
+
+# Seconds of echo the adaptive filter models after the bulk delay, covering
+# room reverberation and the jitter left after delay alignment
+TAIL_DURATION = 0.096
+
+# Longest round trip (seconds) from the downlink to the uplink that the
+# delay estimator searches: network both ways plus browser playout buffers
+MAX_ECHO_DELAY = 1.0
+
+# Bulk delay (seconds) assumed until the first estimate
+INITIAL_ECHO_DELAY = 0.25
+
+# Seconds of audio correlated per delay estimate, and how often to estimate
+ESTIMATE_WINDOW = 0.5
+ESTIMATE_INTERVAL = 0.5
+
+# The estimator works on audio averaged down to about this rate
+ESTIMATE_RATE = 8000
+
+# A correlation peak this many times the mean magnitude is a delay estimate
+ESTIMATE_CONFIDENCE = 8.0
+
+# Blocks of reference read ahead of the estimated echo, so jitter does not
+# push the echo outside the causal filter
+ALIGNMENT_LEAD = 2
+
+# Normalized step size of the filter update
+STEP_SIZE = 0.5
+
+# Adaptation pauses while the uplink peaks above this ratio of the recent
+# reference peak (Geigel double-talk detection), so near-end speech does not
+# disturb the filter
+DOUBLE_TALK_RATIO = 1.0
+
+# Reference peaks below this (full scale 1.0) do not excite the echo path
+REFERENCE_SILENCE = 1e-3
+
+# Smoothing of the reported echo return loss enhancement per block
+ERLE_SMOOTHING = 0.98
+
+
+def frame_to_mono(frame: av.AudioFrame) -> np.ndarray:
+    """Return a frame's samples as mono float32 in [-1, 1]."""
+    samples = frame.to_ndarray()
+    if np.issubdtype(samples.dtype, np.integer):
+        samples = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max)
+    channels = len(frame.layout.channels)
+    if frame.format.is_planar:
+        return samples.mean(axis=0, dtype=np.float32)
+    return samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+
+
+def mono_to_frame(samples: np.ndarray, sample_rate: int) -> av.AudioFrame:
+    """Return a mono S16 frame for float32 samples in [-1, 1]."""
+    pcm = np.clip(samples * 32767.0, -32768, 32767).astype(np.int16)
+    frame = av.AudioFrame.from_ndarray(pcm.reshape(1, -1), format="s16", layout="mono")
+    frame.sample_rate = sample_rate
+    return frame
+
+
+class EchoCanceller:
+    """Remove the echo of a reference signal from the uplink.
+
+    The reference (the camera audio played to the client) is kept in a ring
+    covering the longest echo delay. A GCC-PHAT estimator finds the bulk
+    delay between the reference and the uplink, and a partitioned-block
+    frequency-domain NLMS filter models the remaining echo path. Every block
+    is processed with vectorized FFTs over all partitions at once, and all
+    state is allocated up front, so memory per session is fixed.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        tail: float = TAIL_DURATION,
+        max_delay: float = MAX_ECHO_DELAY,
+    ) -> None:
+        """Initialize the canceller for uplink audio at ``sample_rate``."""
+        self.sample_rate = sample_rate
+        self.block = max(1, round(sample_rate * BLOCK_DURATION))
+        self.partitions = max(1, math.ceil(tail / BLOCK_DURATION))
+        self._max_delay = round(sample_rate * max_delay)
+        self._estimate_window = round(sample_rate * ESTIMATE_WINDOW)
+        self._estimate_interval = round(sample_rate * ESTIMATE_INTERVAL)
+        self._decimation = max(1, sample_rate // ESTIMATE_RATE)
+        self._lead = ALIGNMENT_LEAD * self.block
+
+        bins = self.block + 1
+        self._weights: np.ndarray = np.zeros(
+            (self.partitions, bins), dtype=np.complex64
+        )
+        # Reference block spectra, stored twice so that the latest partitions
+        # are always one contiguous view, newest first
+        self._history: np.ndarray = np.zeros(
+            (2 * self.partitions, bins), dtype=np.complex64
+        )
+        self._head = 0
+        self._spectra = self._history[: self.partitions]
+        self._peaks: np.ndarray = np.zeros(self.partitions, dtype=np.float32)
+        self._previous: np.ndarray = np.zeros(self.block, dtype=np.float32)
+        self._zeros: np.ndarray = np.zeros(self.block, dtype=np.float32)
+
+        capacity = (
+            self._max_delay
+            + self._estimate_window
+            + (self.partitions + 2) * self.block
+            + self._lead
+        )
+        self._reference: np.ndarray = np.zeros(capacity, dtype=np.float32)
+        self._written = 0  # Reference samples received in total
+        self._read: int | None = None  # Reference index of the next block
+        self._resampler: av.AudioResampler | None = None
+        self._resampler_rate: int | None = None
+
+        self._near: np.ndarray = np.zeros(self._estimate_window, dtype=np.float32)
+        self._near_written = 0
+        self._pending: np.ndarray = np.zeros(0, dtype=np.float32)
+        self._until_estimate = self._estimate_interval
+
+        self.delay: float | None = None  # Estimated echo delay in seconds
+        self.erle = 0.0  # Echo return loss enhancement in dB
+        self.adapted_blocks = 0
+
+    def add_reference(self, pcm: bytes, sample_rate: int) -> None:
+        """Append mono S16LE reference audio as it is played to the client."""
+        samples = np.frombuffer(pcm, dtype="<i2")
+        if sample_rate != self.sample_rate:
+            if self._resampler is None or self._resampler_rate != sample_rate:
+                self._resampler = av.AudioResampler(
+                    format="s16", layout="mono", rate=self.sample_rate
+                )
+                self._resampler_rate = sample_rate
+            frame = av.AudioFrame.from_ndarray(
+                samples.reshape(1, -1), format="s16", layout="mono"
+            )
+            frame.sample_rate = sample_rate
+            frames = self._resampler.resample(frame)
+            if not frames:
+                return
+            samples = np.concatenate([f.to_ndarray().reshape(-1) for f in frames])
+
+        samples = samples[-self._reference.size :].astype(np.float32) / 32768.0
+        indices = np.arange(self._written, self._written + samples.size)
+        self._reference[indices % self._reference.size] = samples
+        self._written += samples.size
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Return uplink samples with the echo removed, one block behind."""
+        pending = np.concatenate((self._pending, samples.astype(np.float32)))
+        count = pending.size // self.block
+        out: np.ndarray = np.empty(count * self.block, dtype=np.float32)
+        for index in range(count):
+            start = index * self.block
+            out[start : start + self.block] = self._process_block(
+                pending[start : start + self.block]
+            )
+        self._pending = pending[count * self.block :]
+        return out
+
+    def _process_block(self, near: np.ndarray) -> np.ndarray:
+        """Cancel the echo in one block and adapt the filter."""
+        if self._read is None:
+            self._read = self._written - round(self.sample_rate * INITIAL_ECHO_DELAY)
+        self._store_near(near)
+        reference = self._reference_slice(self._read, self.block)
+        self._read += self.block
+
+        # Overlap-save: each spectrum covers the previous and current block
+        self._head = (self._head - 1) % self.partitions
+        spectrum = np.fft.rfft(np.concatenate((self._previous, reference)))
+        self._history[self._head] = self._history[self._head + self.partitions] = (
+            spectrum
+        )
+        self._spectra = self._history[self._head : self._head + self.partitions]
+        self._previous = reference
+        self._peaks[self._head] = np.abs(reference).max()
+
+        echo = np.fft.irfft((self._weights * self._spectra).sum(axis=0))[self.block :]
+        error = near - echo
+        near_energy = float(np.dot(near, near))
+        error_energy = float(np.dot(error, error))
+
+        reference_peak = float(self._peaks.max())
+        if reference_peak > REFERENCE_SILENCE:
+            if np.abs(near).max() < DOUBLE_TALK_RATIO * reference_peak:
+                self._adapt(error)
+            erle = 10 * math.log10((near_energy + 1e-10) / (error_energy + 1e-10))
+            self.erle = ERLE_SMOOTHING * self.erle + (1 - ERLE_SMOOTHING) * erle
+
+        self._until_estimate -= self.block
+        if self._until_estimate <= 0:
+            self._until_estimate = self._estimate_interval
+            self._estimate_delay()
+
+        # A diverged filter adds echo; pass the uplink through until it recovers
+        return near if error_energy > near_energy else error
+
+    def _adapt(self, error: np.ndarray) -> None:
+        """Apply one constrained, power-normalized NLMS update."""
+        error_spectrum = np.fft.rfft(np.concatenate((self._zeros, error)))
+        power = np.square(np.abs(self._spectra)).sum(axis=0)
+        regularization = self.block * 1e-4
+        gradient = np.conj(self._spectra) * (error_spectrum / (power + regularization))
+        # Keep each partition's impulse response one block long
+        impulse = np.fft.irfft(gradient, axis=1)
+        impulse[:, self.block :] = 0
+        self._weights += STEP_SIZE * np.fft.rfft(impulse, axis=1).astype(np.complex64)
+        self.adapted_blocks += 1
+
+    def _reference_slice(self, start: int, count: int) -> np.ndarray:
+        """Return reference samples by index, zero where none are held."""
+        indices = np.arange(start, start + count)
+        held = (indices >= self._written - self._reference.size) & (
+            indices < self._written
+        )
+        return np.where(held, self._reference[indices % self._reference.size], 0)
+
+    def _store_near(self, near: np.ndarray) -> None:
+        """Keep the latest uplink samples for delay estimation."""
+        indices = np.arange(self._near_written, self._near_written + near.size)
+        self._near[indices % self._near.size] = near
+        self._near_written += near.size
+
+    def _estimate_delay(self) -> None:
+        """Align the reference to the uplink by GCC-PHAT over recent audio."""
+        if self._near_written < self._near.size:
+            return
+        window = self._near.size
+        span = window + self._max_delay
+        near = np.roll(self._near, -(self._near_written % window))
+        reference = self._reference_slice(self._written - span, span)
+        if np.abs(reference).max() <= REFERENCE_SILENCE:
+            return
+
+        # Averaging adjacent samples is a cheap low-pass before decimation
+        step = self._decimation
+        near = near[window % step :].reshape(-1, step).mean(axis=1)
+        reference = reference[span % step :].reshape(-1, step).mean(axis=1)
+        size = 1 << (reference.size + near.size - 1).bit_length()
+        cross = np.fft.rfft(reference, size) * np.conj(np.fft.rfft(near, size))
+        correlation = np.abs(np.fft.irfft(cross / (np.abs(cross) + 1e-12), size))
+        lags = correlation[: reference.size - near.size + 1]
+        best = int(lags.argmax())
+        if lags[best] < ESTIMATE_CONFIDENCE * lags.mean():
+            return
+
+        # The newest uplink sample echoes reference this many samples old
+        delay = (lags.size - 1 - best) * step
+        self.delay = delay / self.sample_rate
+        read = self._written - delay + self._lead
+        if abs(read - self._read) > self.block:
+            self._read = read
+            self._weights[:] = 0
+            self._history[:] = 0
+            self._peaks[:] = 0
@@ -0,0 +1,141 @@
+"""Arbitration between concurrent audio producers on one talkback session."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+_LOGGER = logging.getLogger(__name__)
+
+# Arbitration policies
+ARBITRATION_EXCLUSIVE = "exclusive"
+ARBITRATION_PRIORITY = "priority"
+ARBITRATION_MIX = "mix"
+ARBITRATION_POLICIES = [ARBITRATION_EXCLUSIVE, ARBITRATION_PRIORITY, ARBITRATION_MIX]
+
+# Producer priorities (higher wins under the priority policy)
+PRIORITY_USER = 0
+PRIORITY_ANNOUNCEMENT = 10
+
+# Producers without an explicit claim (service calls, per-chunk websocket
+# messages) hold their place only while they keep sending audio
+IMPLICIT_PRODUCER_TTL = 2.0
+
+
+@dataclass
+class AudioProducer:
+    """A source feeding audio into a talkback session."""
+
+    owner: Hashable
+    priority: int
+    on_stop: Callable[[], None] | None = None
+    expires_at: float | None = None
+
+
+class SessionArbiter:
+    """Decide which producers may feed a talkback session.
+
+    - ``exclusive``: the first producer owns the session, others are refused.
+    - ``priority``: only the highest-priority producer is heard, and a higher
+      priority producer preempts lower ones until it leaves.
+    - ``mix``: every producer is accepted and their audio is mixed.
+    """
+
+    def __init__(
+        self,
+        policy: str = ARBITRATION_EXCLUSIVE,
+        on_expire: Callable[[Hashable], None] | None = None,
+    ) -> None:
+        """Initialize the arbiter.
+
+        ``on_expire`` is called with each implicit producer that is dropped
+        after going quiet, so per-producer state can be freed with it.
+        """
+        self.policy = policy
+        self._on_expire = on_expire
+        self._producers: dict[Hashable, AudioProducer] = {}
+        self.rejected_chunks = 0
+
+    @property
+    def producers(self) -> list[AudioProducer]:
+        """Return the producers currently registered."""
+        return list(self._producers.values())
+
+    def claim(
+        self,
+        owner: Hashable,
+        priority: int = PRIORITY_USER,
+        on_stop: Callable[[], None] | None = None,
+    ) -> bool:
+        """Register an explicit producer. Returns False if it is refused."""
+        self._expire()
+        existing = self._producers.get(owner)
+        if existing is None and not self._admits(priority):
+            return False
+        self._producers[owner] = AudioProducer(owner, priority, on_stop)
+        return True
+
+    def release(self, owner: Hashable) -> bool:
+        """Remove a producer. Returns True if it was registered."""
+        return self._producers.pop(owner, None) is not None
+
+    def accepts(self, owner: Hashable, priority: int = PRIORITY_USER) -> bool:
+        """Return True if a chunk from ``owner`` should reach the encoder.
+
+        Unknown owners are registered as implicit producers that expire once
+        they stop sending audio. Expired producers are dropped first, so a
+        quiet higher-priority producer does not keep preempting the others.
+        """
+        self._expire()
+        producer = self._producers.get(owner)
+        if producer is None:
+            if not self._admits(priority):
+                self.rejected_chunks += 1
+                return False
+            producer = AudioProducer(owner, priority)
+            self._producers[owner] = producer
+        if producer.on_stop is None:
+            producer.expires_at = time.monotonic() + IMPLICIT_PRODUCER_TTL
+
+        if self.policy == ARBITRATION_PRIORITY and producer.priority < max(
+            p.priority for p in self._producers.values()
+        ):
+            # Preempted by a higher priority producer
+            self.rejected_chunks += 1
+            return False
+        return True
+
+    def has_claims(self) -> bool:
+        """Return True if any explicit producer is still registered."""
+        return any(p.on_stop is not None for p in self._producers.values())
+
+    def stop_all(self) -> None:
+        """Drop every producer, notifying explicit ones that the session ended."""
+        producers = list(self._producers.values())
+        self._producers.clear()
+        for producer in producers:
+            if producer.on_stop is not None:
+                producer.on_stop()
+
+    def _admits(self, priority: int) -> bool:
+        """Return True if a new producer at ``priority`` may join."""
+        if not self._producers or self.policy == ARBITRATION_MIX:
+            return True
+        if self.policy == ARBITRATION_PRIORITY:
+            return priority > max(p.priority for p in self._producers.values())
+        return False
+
+    def _expire(self) -> None:
+        """Forget implicit producers that stopped sending audio."""
+        now = time.monotonic()
+        for owner in [
+            owner
+            for owner, producer in self._producers.items()
+            if producer.expires_at is not None and producer.expires_at < now
+        ]:
+            _LOGGER.debug("Audio producer %s expired", owner)
+            del self._producers[owner]
+            if self._on_expire is not None:
+                self._on_expire(owner)
@@ -0,0 +1,232 @@
+"""Input audio format detection and parsing shared by the in-process and worker paths."""
+
+from __future__ import annotations
+
+import struct
+
+# WebM container structure: EBML Header (typically 40-50 bytes) + Segment
+# Header (~20-30 bytes)
+# Setting minimum to 50 bytes ensures we have at least the EBML header before
+# attempting to parse
+# This prevents PyAV from failing on partial/incomplete MediaRecorder chunks
+MIN_WEBM_SIZE = 50  # Minimum bytes for valid WebM container with EBML header
+WEBM_EBML_HEADER = b"\x1a\x45\xdf\xa3"
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+WEBM_EBML_HEADER_TRUNC = b"\x45\xdf\xa3"
+WEBM_CLUSTER_ID_TRUNC = b"\x43\xb6\x75"
+OGG_CAPTURE_PATTERN = b"OggS"
+PCM_FORMAT = "pcm_s16le"
+OPUS_PACKETS_FORMAT = "opus_packets"
+
+# Formats as stored in the one-byte code of ring buffer records
+AUDIO_FORMAT_CODES: tuple[str | None, ...] = (
+    None,
+    PCM_FORMAT,
+    "webm",
+    "ogg",
+    OPUS_PACKETS_FORMAT,
+)
+
+# An opus_packets chunk is a run of records, each a big-endian 32-bit
+# timestamp on the 48 kHz Opus clock and 16-bit length, then one Opus packet
+OPUS_PACKET_HEADER = struct.Struct(">IH")
+
+# A producer's timestamps may jump ahead by up to this many 48 kHz samples
+# for audio it did not send; larger jumps either way start a new timeline
+MAX_OPUS_TIMESTAMP_GAP = 48000
+
+# Opus frame duration in 48 kHz samples per TOC configuration (RFC 6716 3.1):
+# SILK, hybrid and CELT modes
+OPUS_FRAME_SAMPLES = (
+    (480, 960, 1920, 2880) * 3 + (480, 960) * 2 + (120, 240, 480, 960) * 4
+)
+
+# RFC 6716 caps a packet at 120 ms
+MAX_OPUS_PACKET_SAMPLES = 5760
+
+# Ogg page header (RFC 3533): capture pattern, version, header type, granule
+# position, stream serial, page sequence, CRC and segment count
+OGG_PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+OGG_BEGINNING_OF_STREAM = 0x02
+
+
+def detect_audio_format(chunk: bytes) -> str | None:
+    """Detect input container from magic bytes."""
+    if chunk.startswith(WEBM_EBML_HEADER):
+        return "webm"
+    if chunk.startswith(WEBM_EBML_HEADER_TRUNC):
+        return "webm"
+    if chunk.startswith(OGG_CAPTURE_PATTERN):
+        return "ogg"
+    return None
+
+
+def repair_prefix(chunk_head: bytes, declared_format: str | None) -> bytes:
+    """Return the bytes missing from the start of a malformed WebM chunk.
+
+    Some frontend transports drop the first byte of EBML header or cluster
+    IDs; ``chunk_head`` only needs the first few bytes of the chunk.
+    """
+    if declared_format not in (None, "webm"):
+        return b""
+
+    if chunk_head.startswith(WEBM_EBML_HEADER_TRUNC):
+        return b"\x1a"
+    if chunk_head.startswith(WEBM_CLUSTER_ID_TRUNC):
+        return b"\x1f"
+    return b""
+
+
+def normalize_audio_chunk(chunk: bytes, declared_format: str | None) -> bytes:
+    """Repair known malformed chunk prefixes from frontend transport quirks."""
+    prefix = repair_prefix(chunk[:4], declared_format)
+    return prefix + chunk if prefix else chunk
+
+
+def opus_packet_samples(packet: bytes | memoryview) -> int:
+    """Return the duration of an Opus packet in 48 kHz samples.
+
+    Raises ValueError for a packet whose TOC byte is not valid.
+    """
+    if not packet:
+        raise ValueError("Empty Opus packet")
+    toc = packet[0]
+    code = toc & 0x03
+    if code == 0:
+        frames = 1
+    elif code in (1, 2):
+        frames = 2
+    elif len(packet) < 2:
+        raise ValueError("Opus packet is missing its frame count")
+    else:
+        frames = packet[1] & 0x3F
+    samples = frames * OPUS_FRAME_SAMPLES[toc >> 3]
+    if not 0 < samples <= MAX_OPUS_PACKET_SAMPLES:
+        raise ValueError(f"Opus packet of {samples} samples")
+    return samples
+
+
+def parse_opus_packets(
+    chunk: bytes | bytearray | memoryview,
+) -> list[tuple[int, memoryview, int]]:
+    """Split an opus_packets chunk into (timestamp, packet, samples) records.
+
+    The packets are views into ``chunk``. Raises ValueError if a record is
+    truncated or a packet is not valid, so no part of a bad chunk is used.
+    """
+    view = memoryview(chunk)
+    packets = []
+    offset = 0
+    while offset < len(view):
+        if len(view) - offset < OPUS_PACKET_HEADER.size:
+            raise ValueError("Truncated Opus packet header")
+        timestamp, length = OPUS_PACKET_HEADER.unpack_from(view, offset)
+        offset += OPUS_PACKET_HEADER.size
+        if offset + length > len(view):
+            raise ValueError("Truncated Opus packet")
+        packet = view[offset : offset + length]
+        packets.append((timestamp, packet, opus_packet_samples(packet)))
+        offset += length
+    return packets
+
+
+def opus_timestamp_gap(expected: int | None, timestamp: int) -> int | None:
+    """Return the 48 kHz samples a producer skipped before ``timestamp``.
+
+    ``expected`` is where the producer's previous packet ended. Returns None
+    for a packet that repeats or precedes audio already sent, and 0 for a
+    contiguous packet or one that starts a new timeline.
+    """
+    if expected is None:
+        return 0
+    # Timestamps wrap at 32 bits; compare them as a signed difference
+    difference = ((timestamp - expected + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+    if abs(difference) > MAX_OPUS_TIMESTAMP_GAP:
+        return 0
+    if difference < 0:
+        return None
+    return difference
+
+
+class OggOpusReader:
+    """Incremental reader of the Opus packets in an Ogg byte stream.
+
+    Bytes may be fed in pieces of any size. Each call returns the audio
+    packets completed so far as (timestamp, packet, samples) records, with
+    timestamps counted on the 48 kHz Opus clock from the start of the stream.
+    The OpusHead and OpusTags header packets of each logical stream are
+    consumed here. Raises ValueError for data that is not Ogg/Opus.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a reader waiting for the first page."""
+        self._buffer = bytearray()
+        self._packet = bytearray()
+        self._headers_pending = 0
+        self._serial: int | None = None
+        self._timestamp = 0
+
+    def feed(self, data: bytes | memoryview) -> list[tuple[int, bytes, int]]:
+        """Consume ``data`` and return the audio packets it completed."""
+        self._buffer += data
+        packets: list[tuple[int, bytes, int]] = []
+        offset = 0
+        while len(self._buffer) - offset >= OGG_PAGE_HEADER.size:
+            (
+                capture,
+                _version,
+                header_type,
+                _granule,
+                serial,
+                _page,
+                _crc,
+                segment_count,
+            ) = OGG_PAGE_HEADER.unpack_from(self._buffer, offset)
+            if capture != OGG_CAPTURE_PATTERN:
+                raise ValueError("Lost Ogg page sync")
+            table_start = offset + OGG_PAGE_HEADER.size
+            body_start = table_start + segment_count
+            if len(self._buffer) < body_start:
+                break
+            lacing = self._buffer[table_start:body_start]
+            body_end = body_start + sum(lacing)
+            if len(self._buffer) < body_end:
+                break
+
+            if self._serial is None and not header_type & OGG_BEGINNING_OF_STREAM:
+                raise ValueError("Ogg stream starts without a header page")
+            if header_type & OGG_BEGINNING_OF_STREAM:
+                # A new (possibly chained) logical stream restarts its headers
+                self._serial = serial
+                self._headers_pending = 2
+                self._packet.clear()
+            if serial == self._serial:
+                self._read_page(self._buffer, body_start, lacing, packets)
+            offset = body_end
+        del self._buffer[:offset]
+        return packets
+
+    def _read_page(
+        self,
+        page: bytearray,
+        position: int,
+        lacing: bytearray,
+        packets: list[tuple[int, bytes, int]],
+    ) -> None:
+        """Reassemble the packets of one page's body from its lacing values."""
+        for size in lacing:
+            self._packet += page[position : position + size]
+            position += size
+            if size == 255:
+                # The packet continues in the next segment, maybe on the next page
+                continue
+            packet = bytes(self._packet)
+            self._packet.clear()
+            if self._headers_pending:
+                if self._headers_pending == 2 and not packet.startswith(b"OpusHead"):
+                    raise ValueError("Ogg stream does not carry Opus")
+                self._headers_pending -= 1
+                continue
+            samples = opus_packet_samples(packet)
+            packets.append((self._timestamp, packet, samples))
+            self._timestamp = (self._timestamp + samples) & 0xFFFFFFFF
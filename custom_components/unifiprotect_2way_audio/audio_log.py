@@ -0,0 +1,117 @@
+"""Rate-limited logging for the per-chunk audio pipeline."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Mapping
+
+# Emit one sampled debug line per this many events of the same kind
+DEBUG_SAMPLE_EVERY = 50
+
+# Seconds between aggregated pipeline summaries while a session is active
+SUMMARY_INTERVAL = 60.0
+
+# Seconds a warning of one kind is suppressed after it was logged
+WARNING_INTERVAL = 10.0
+
+
+class AudioPipelineLogger:
+    """Sampled, aggregated logging for one talkback session.
+
+    Per-chunk code guards its debug lines with ``sample()`` so neither the
+    message nor its arguments are built unless the line will be emitted.
+    Repeated warnings are collapsed into one line per ``WARNING_INTERVAL``
+    with a count of what was suppressed, and ``maybe_summarize()`` replaces
+    per-chunk statistics with one INFO line per ``SUMMARY_INTERVAL``.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        label: str,
+        sample_every: int = DEBUG_SAMPLE_EVERY,
+        summary_interval: float = SUMMARY_INTERVAL,
+        warning_interval: float = WARNING_INTERVAL,
+    ) -> None:
+        """Initialize the pipeline logger."""
+        self._logger = logger
+        self._label = label
+        self._sample_every = sample_every
+        self._summary_interval = summary_interval
+        self._warning_interval = warning_interval
+        self._samples: dict[str, int] = {}
+        # Warning kind -> [suppressed until (monotonic), suppressed count]
+        self._warnings: dict[str, list] = {}
+        self._next_summary = time.monotonic() + summary_interval
+        self._last_stats: Mapping[str, int] = {}
+
+    def reset(self) -> None:
+        """Forget sampling, suppression and summary state for a new session."""
+        self._samples.clear()
+        self._warnings.clear()
+        self._next_summary = time.monotonic() + self._summary_interval
+        self._last_stats = {}
+
+    def sample(self, kind: str) -> bool:
+        """Return True if this ``kind`` of debug event should be logged.
+
+        The first event and then every ``sample_every``-th event pass. When
+        DEBUG is disabled this is a single cached level check.
+        """
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return False
+        count = self._samples.get(kind, 0)
+        self._samples[kind] = count + 1
+        return count % self._sample_every == 0
+
+    def warning(self, kind: str, msg: str, *args: object) -> None:
+        """Log a warning unless one of the same kind was logged recently."""
+        now = time.monotonic()
+        state = self._warnings.get(kind)
+        if state is not None and now < state[0]:
+            state[1] += 1
+            return
+
+        suppressed = state[1] if state is not None else 0
+        self._warnings[kind] = [now + self._warning_interval, 0]
+        if suppressed:
+            msg += " (%d similar warnings suppressed)"
+            args = (*args, suppressed)
+        self._logger.warning(msg, *args)
+
+    def maybe_summarize(self, stats: Callable[[], Mapping[str, int]]) -> None:
+        """Log a summary of counter changes once per summary interval."""
+        now = time.monotonic()
+        if now < self._next_summary:
+            return
+        self._next_summary = now + self._summary_interval
+        if self._logger.isEnabledFor(logging.INFO):
+            self._log_summary(stats(), "Audio pipeline stats")
+
+    def flush(self, stats: Mapping[str, int]) -> None:
+        """Log the final summary and any warnings still being suppressed."""
+        for kind, (_, suppressed) in self._warnings.items():
+            if suppressed:
+                self._logger.warning(
+                    "%d %s warnings suppressed for %s",
+                    suppressed,
+                    kind,
+                    self._label,
+                )
+        if self._logger.isEnabledFor(logging.INFO) and any(stats.values()):
+            self._log_summary(stats, "Audio session totals")
+        self.reset()
+
+    def _log_summary(self, stats: Mapping[str, int], title: str) -> None:
+        """Log counters and their change since the previous summary."""
+        self._logger.info(
+            "%s for %s - %s",
+            title,
+            self._label,
+            ", ".join(
+                f"{key}: {value} (+{value - self._last_stats.get(key, 0)})"
+                for key, value in stats.items()
+            ),
+        )
+        self._last_stats = dict(stats)
@@ -0,0 +1,145 @@
+"""Sample-accurate presentation timestamps for encoded talkback audio."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from fractions import Fraction
+
+import av
+
+from .drift import DriftCompensator
+
+# Arrival gaps up to this many seconds are network or producer jitter and
+# leave the timestamps contiguous
+JITTER_TOLERANCE = 0.06
+
+# Gaps up to this many seconds are filled with silence so the decoder stays
+# continuous; longer gaps are pauses and only advance the timestamps
+MAX_SILENCE_FILL = 0.5
+
+
+class SessionClock:
+    """Monotonic PTS counter in output samples for one talkback session.
+
+    Every frame handed to the encoder is stamped from the number of samples
+    already emitted, so timestamps do not depend on how the input was
+    chunked, decoded or resampled. The counter also follows the wall clock:
+    when audio arrives later than the audio stamped so far could have
+    played out, the gap is reported so the caller inserts silence, or the
+    counter skips ahead, keeping playback on the camera in real time.
+    Audio that runs ahead is left to ``drift``, which reports how many
+    samples the caller should remove to hold the lead constant.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        jitter_tolerance: float = JITTER_TOLERANCE,
+        max_silence_fill: float = MAX_SILENCE_FILL,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the clock at PTS zero."""
+        self.sample_rate = sample_rate
+        self.time_base = Fraction(1, sample_rate)
+        self.pts = 0
+        self.gaps_filled = 0
+        self.gaps_skipped = 0
+        self._jitter_tolerance = jitter_tolerance
+        self._max_silence_fill = max_silence_fill
+        self._time = time_func
+        # Wall-clock time at which the audio stamped so far finishes playing
+        self._media_end: float | None = None
+        self.drift = DriftCompensator()
+
+    @property
+    def deadline(self) -> float | None:
+        """Return the monotonic time at which the stamped audio runs out."""
+        return self._media_end
+
+    def catch_up(self) -> int:
+        """Account for wall-clock time since the last frame.
+
+        Returns the number of silence samples to encode before the next
+        frame; gaps too long to fill advance the PTS directly.
+        """
+        now = self._time()
+        if self._media_end is None:
+            self._media_end = now
+            return 0
+
+        gap = now - self._media_end
+        if gap <= self._jitter_tolerance:
+            return 0
+
+        self._media_end = now
+        self.drift.rebase()
+        gap_samples = round(gap * self.sample_rate)
+        if gap <= self._max_silence_fill:
+            self.gaps_filled += 1
+            return gap_samples
+
+        self.gaps_skipped += 1
+        self.pts += gap_samples
+        return 0
+
+    def stamp(self, frame: av.AudioFrame) -> av.AudioFrame:
+        """Assign the next PTS to a frame at the output rate and advance."""
+        frame.pts = self.pts
+        frame.time_base = self.time_base
+        self.pts += frame.samples
+        now = self._time()
+        if self._media_end is None:
+            self._media_end = now
+        self._media_end += frame.samples / self.sample_rate
+        self.drift.observe(self._media_end - now, now)
+        return frame
+
+    def stamp_packet(self, packet: av.Packet, samples: int, gap: int = 0) -> av.Packet:
+        """Assign the next PTS to a packet of ``samples`` already encoded samples.
+
+        ``gap`` samples the producer did not send precede the packet. Encoded
+        audio cannot be padded with silence, so an arrival gap past the
+        jitter tolerance also only advances the PTS; the longer gap is used.
+        """
+        now = self._time()
+        if self._media_end is None:
+            self._media_end = now
+        elif now - self._media_end > self._jitter_tolerance:
+            self.gaps_skipped += 1
+            gap = max(gap, round((now - self._media_end) * self.sample_rate))
+            self.drift.rebase()
+        self.pts += gap
+        self._media_end += gap / self.sample_rate
+        packet.pts = packet.dts = self.pts
+        packet.duration = samples
+        packet.time_base = self.time_base
+        self.pts += samples
+        self._media_end += samples / self.sample_rate
+        self.drift.observe(self._media_end - now, now)
+        return packet
+
+    def skip(self, samples: int) -> None:
+        """Advance over ``samples`` of audio that is not encoded.
+
+        Used for gated silence: the timestamps stay in step with the input
+        and the receiver sees a jump instead of encoded silence.
+        """
+        now = self._time()
+        if self._media_end is None:
+            self._media_end = now
+        elif now - self._media_end > self._jitter_tolerance:
+            self.pts += round((now - self._media_end) * self.sample_rate)
+            self._media_end = now
+            self.drift.rebase()
+        self.pts += samples
+        self._media_end += samples / self.sample_rate
+        self.drift.observe(self._media_end - now, now)
+
+    def silence(self, samples: int, audio_format: str, layout: str) -> av.AudioFrame:
+        """Return a stamped frame of ``samples`` silent samples."""
+        frame = av.AudioFrame(format=audio_format, layout=layout, samples=samples)
+        frame.sample_rate = self.sample_rate
+        for plane in frame.planes:
+            plane.update(bytes(plane.buffer_size))
+        return self.stamp(frame)
@@ -10,7 +10,40 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN
+from .arbitration import ARBITRATION_POLICIES
+from .const import (
+    CONF_ARBITRATION_POLICY,
+    CONF_ECHO_CANCELLATION,
+    CONF_EXPECTED_PACKET_LOSS,
+    CONF_IDLE_TIMEOUT,
+    CONF_LOSS_RESILIENCE,
+    CONF_MAX_ACTIVE_SESSIONS,
+    CONF_MAX_BIT_RATE,
+    CONF_MAX_QUEUED_CHUNKS,
+    CONF_MIN_BIT_RATE,
+    CONF_RECORD_SESSIONS,
+    CONF_RECORDING_RETENTION,
+    CONF_RTP_TRANSPORT,
+    CONF_TRANSCODE_WORKERS,
+    CONF_VOICE_GATE,
+    DEFAULT_ARBITRATION_POLICY,
+    DEFAULT_ECHO_CANCELLATION,
+    DEFAULT_EXPECTED_PACKET_LOSS,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_LOSS_RESILIENCE,
+    DEFAULT_MAX_ACTIVE_SESSIONS,
+    DEFAULT_MAX_BIT_RATE,
+    DEFAULT_MAX_QUEUED_CHUNKS,
+    DEFAULT_MIN_BIT_RATE,
+    DEFAULT_RECORD_SESSIONS,
+    DEFAULT_RECORDING_RETENTION,
+    DEFAULT_RTP_TRANSPORT,
+    DEFAULT_TRANSCODE_WORKERS,
+    DEFAULT_VOICE_GATE,
+    DOMAIN,
+    LOSS_RESILIENCE_MODES,
+    RTP_TRANSPORTS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,7 +98,85 @@ class UniFiProtect2WayAudioOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema({}),
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_MAX_ACTIVE_SESSIONS,
+                        default=options.get(
+                            CONF_MAX_ACTIVE_SESSIONS, DEFAULT_MAX_ACTIVE_SESSIONS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+                    vol.Optional(
+                        CONF_MAX_QUEUED_CHUNKS,
+                        default=options.get(
+                            CONF_MAX_QUEUED_CHUNKS, DEFAULT_MAX_QUEUED_CHUNKS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+                    vol.Optional(
+                        CONF_ARBITRATION_POLICY,
+                        default=options.get(
+                            CONF_ARBITRATION_POLICY, DEFAULT_ARBITRATION_POLICY
+                        ),
+                    ): vol.In(ARBITRATION_POLICIES),
+                    vol.Optional(
+                        CONF_RTP_TRANSPORT,
+                        default=options.get(CONF_RTP_TRANSPORT, DEFAULT_RTP_TRANSPORT),
+                    ): vol.In(RTP_TRANSPORTS),
+                    vol.Optional(
+                        CONF_TRANSCODE_WORKERS,
+                        default=options.get(
+                            CONF_TRANSCODE_WORKERS, DEFAULT_TRANSCODE_WORKERS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=32)),
+                    vol.Optional(
+                        CONF_MIN_BIT_RATE,
+                        default=options.get(CONF_MIN_BIT_RATE, DEFAULT_MIN_BIT_RATE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=6, max=128)),
+                    vol.Optional(
+                        CONF_MAX_BIT_RATE,
+                        default=options.get(CONF_MAX_BIT_RATE, DEFAULT_MAX_BIT_RATE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=6, max=128)),
+                    vol.Optional(
+                        CONF_LOSS_RESILIENCE,
+                        default=options.get(
+                            CONF_LOSS_RESILIENCE, DEFAULT_LOSS_RESILIENCE
+                        ),
+                    ): vol.In(LOSS_RESILIENCE_MODES),
+                    vol.Optional(
+                        CONF_EXPECTED_PACKET_LOSS,
+                        default=options.get(
+                            CONF_EXPECTED_PACKET_LOSS, DEFAULT_EXPECTED_PACKET_LOSS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_VOICE_GATE,
+                        default=options.get(CONF_VOICE_GATE, DEFAULT_VOICE_GATE),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ECHO_CANCELLATION,
+                        default=options.get(
+                            CONF_ECHO_CANCELLATION, DEFAULT_ECHO_CANCELLATION
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_RECORD_SESSIONS,
+                        default=options.get(
+                            CONF_RECORD_SESSIONS, DEFAULT_RECORD_SESSIONS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_RECORDING_RETENTION,
+                        default=options.get(
+                            CONF_RECORDING_RETENTION, DEFAULT_RECORDING_RETENTION
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3650)),
+                }
+            ),
         )
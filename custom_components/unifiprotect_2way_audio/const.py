@@ -11,12 +11,54 @@ SERVICE_TOGGLE_MUTE = "toggle_mute"
 # Attributes
 ATTR_CAMERA_ID = "camera_id"
 ATTR_AUDIO_DATA = "audio_data"
+ATTR_CODEC = "codec"
 ATTR_SAMPLE_RATE = "sample_rate"
 ATTR_CHANNELS = "channels"
 
+# Options
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_MAX_ACTIVE_SESSIONS = "max_active_sessions"
+CONF_MAX_QUEUED_CHUNKS = "max_queued_chunks"
+CONF_ARBITRATION_POLICY = "arbitration_policy"
+CONF_RTP_TRANSPORT = "rtp_transport"
+CONF_TRANSCODE_WORKERS = "transcode_workers"
+CONF_MIN_BIT_RATE = "min_bit_rate"
+CONF_MAX_BIT_RATE = "max_bit_rate"
+CONF_LOSS_RESILIENCE = "loss_resilience"
+CONF_EXPECTED_PACKET_LOSS = "expected_packet_loss"
+CONF_VOICE_GATE = "voice_gate"
+CONF_ECHO_CANCELLATION = "echo_cancellation"
+CONF_RECORD_SESSIONS = "record_sessions"
+CONF_RECORDING_RETENTION = "recording_retention"
+
+# RTP transports: libavformat's RTP muxer or the native paced sender
+TRANSPORT_PYAV = "pyav"
+TRANSPORT_NATIVE = "native"
+RTP_TRANSPORTS = [TRANSPORT_PYAV, TRANSPORT_NATIVE]
+
+# Opus loss resilience: none, in-band FEC, or FEC plus duplicated packets
+RESILIENCE_OFF = "off"
+RESILIENCE_FEC = "fec"
+RESILIENCE_REDUNDANCY = "redundancy"
+LOSS_RESILIENCE_MODES = [RESILIENCE_OFF, RESILIENCE_FEC, RESILIENCE_REDUNDANCY]
+
 # Default values
 DEFAULT_SAMPLE_RATE = 16000
 DEFAULT_CHANNELS = 1
+DEFAULT_IDLE_TIMEOUT = 30  # Seconds without audio before auto-stop (0 disables)
+DEFAULT_MAX_ACTIVE_SESSIONS = 4  # Concurrent backchannels across all cameras
+DEFAULT_MAX_QUEUED_CHUNKS = 50  # Pending audio chunks buffered per camera
+DEFAULT_ARBITRATION_POLICY = "exclusive"  # exclusive, priority or mix
+DEFAULT_RTP_TRANSPORT = TRANSPORT_PYAV
+DEFAULT_TRANSCODE_WORKERS = 0  # Worker processes for transcoding (0 = in-process)
+DEFAULT_MIN_BIT_RATE = 12  # kbit/s floor for adaptive Opus bitrate
+DEFAULT_MAX_BIT_RATE = 32  # kbit/s ceiling for adaptive Opus bitrate
+DEFAULT_LOSS_RESILIENCE = RESILIENCE_FEC
+DEFAULT_EXPECTED_PACKET_LOSS = 0  # Percent; RTCP reports raise it when native
+DEFAULT_VOICE_GATE = True  # Skip encoding and sending audio without voice
+DEFAULT_ECHO_CANCELLATION = False  # Cancel listened camera audio in the uplink
+DEFAULT_RECORD_SESSIONS = False  # Keep an Ogg/Opus recording of each session
+DEFAULT_RECORDING_RETENTION = 30  # Days recordings are kept (0 keeps them)
 
 # Integration name
 NAME = "UniFi Protect 2-Way Audio"
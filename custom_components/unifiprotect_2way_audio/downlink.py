@@ -0,0 +1,205 @@
+"""Audio-only camera downlink shared by every listening client."""
+
+from __future__ import annotations
+
+import base64
+import logging
+import threading
+from collections.abc import Callable
+
+import av
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_bytes
+
+_LOGGER = logging.getLogger(__name__)
+
+DOWNLINK_SAMPLE_RATE = 16000
+DOWNLINK_FORMAT = "pcm_s16le"
+DOWNLINK_FRAME_DURATION = 0.04  # Seconds of audio per event
+
+# libavformat options: set up only the RTSP audio track, over TCP, and probe
+# it briefly. fflags=nobuffer is avoided: it discards the probed packets.
+RTSP_OPTIONS = {
+    "rtsp_transport": "tcp",
+    "allowed_media_types": "audio",
+    "analyzeduration": "500000",
+    "flags": "low_delay",
+}
+OPEN_TIMEOUT = 10.0  # Seconds to connect and read the stream description
+READ_TIMEOUT = 5.0  # Seconds without packets before the pull is restarted
+RECONNECT_DELAY = 5.0  # Seconds between attempts after the upstream fails
+
+AudioListener = Callable[[bytes], None]
+PcmListener = Callable[[bytes], None]
+
+
+class CameraAudioDownlink:
+    """Pull a camera's audio once and fan it out to every listener.
+
+    A thread demuxes only the audio track, resamples it to mono PCM and
+    re-packetizes it into short frames. Each frame is serialized once as a
+    JSON event body that every listener forwards unchanged, so the cost of
+    a listener is one websocket write. The pull stops with the last
+    listener; a stopped downlink is not restarted.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        camera_entity_id: str,
+        source: str,
+        reconnect_delay: float = RECONNECT_DELAY,
+        taps: set[PcmListener] | None = None,
+    ) -> None:
+        """Initialize the downlink for a camera's stream ``source``.
+
+        ``taps`` receive each frame's raw PCM while anyone listens, without
+        keeping the pull alive themselves.
+        """
+        self._hass = hass
+        self.camera_entity_id = camera_entity_id
+        self._source = source
+        self._reconnect_delay = reconnect_delay
+        self._listeners: set[AudioListener] = set()
+        self._taps = taps if taps is not None else set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.sequence = 0
+
+    @property
+    def stopped(self) -> bool:
+        """Return True once the last listener has left."""
+        return self._stop.is_set()
+
+    @callback
+    def subscribe(self, listener: AudioListener) -> Callable[[], None]:
+        """Add a listener, starting the upstream pull for the first one."""
+        self._listeners.add(listener)
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"unifiprotect_2way_audio downlink {self.camera_entity_id}",
+                daemon=True,
+            )
+            self._thread.start()
+
+        @callback
+        def _unsubscribe() -> None:
+            self._listeners.discard(listener)
+            if not self._listeners:
+                self.stop()
+
+        return _unsubscribe
+
+    def stop(self) -> None:
+        """Stop the upstream pull; the thread exits at its next packet."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        """Pull the camera's audio until stopped, reconnecting on failures."""
+        while not self._stop.is_set():
+            try:
+                self._pull()
+            except (av.error.FFmpegError, OSError, IndexError) as err:
+                _LOGGER.debug(
+                    "Audio downlink for %s failed: %s", self.camera_entity_id, err
+                )
+            self._stop.wait(self._reconnect_delay)
+        _LOGGER.debug("Audio downlink for %s stopped", self.camera_entity_id)
+
+    def _pull(self) -> None:
+        """Demux, decode and re-packetize one upstream connection."""
+        with av.open(
+            self._source, options=RTSP_OPTIONS, timeout=(OPEN_TIMEOUT, READ_TIMEOUT)
+        ) as container:
+            stream = container.streams.audio[0]
+            resampler = av.AudioResampler(
+                format="s16",
+                layout="mono",
+                rate=DOWNLINK_SAMPLE_RATE,
+                frame_size=round(DOWNLINK_SAMPLE_RATE * DOWNLINK_FRAME_DURATION),
+            )
+            _LOGGER.debug(
+                "Audio downlink for %s connected - codec: %s, sample_rate: %d",
+                self.camera_entity_id,
+                stream.codec_context.name,
+                stream.codec_context.sample_rate,
+            )
+            for packet in container.demux(stream):
+                if self._stop.is_set():
+                    return
+                for frame in packet.decode():
+                    for out_frame in resampler.resample(frame):
+                        pcm = bytes(out_frame.planes[0])[: out_frame.samples * 2]
+                        self._hass.loop.call_soon_threadsafe(self._publish, pcm)
+
+    @callback
+    def _publish(self, pcm: bytes) -> None:
+        """Serialize one frame and hand it to every listener."""
+        if not self._listeners:
+            return
+        self.sequence += 1
+        event = json_bytes(
+            {
+                "type": "audio",
+                "seq": self.sequence,
+                "data": base64.b64encode(pcm).decode(),
+            }
+        )
+        for listener in list(self._listeners):
+            listener(event)
+        for tap in list(self._taps):
+            tap(pcm)
+
+
+class AudioDownlinkHub:
+    """Hand out one shared downlink per camera."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub without any downlinks."""
+        self._hass = hass
+        self._downlinks: dict[str, CameraAudioDownlink] = {}
+        self._taps: dict[str, set[PcmListener]] = {}
+
+    @callback
+    def tap(self, camera_entity_id: str, listener: PcmListener) -> Callable[[], None]:
+        """Receive the PCM a camera's listeners hear, without starting a pull."""
+        taps = self._taps.setdefault(camera_entity_id, set())
+        taps.add(listener)
+
+        @callback
+        def _untap() -> None:
+            taps.discard(listener)
+
+        return _untap
+
+    async def async_subscribe(
+        self, camera_entity_id: str, listener: AudioListener
+    ) -> Callable[[], None]:
+        """Subscribe to a camera's audio, starting its downlink if needed."""
+        downlink = self._downlinks.get(camera_entity_id)
+        if downlink is None or downlink.stopped:
+            # Only the camera integration knows where the stream lives
+            from homeassistant.components.camera import async_get_stream_source
+
+            source = await async_get_stream_source(self._hass, camera_entity_id)
+            if not source:
+                raise HomeAssistantError(f"{camera_entity_id} has no stream source")
+            downlink = self._downlinks.get(camera_entity_id)
+            if downlink is None or downlink.stopped:
+                downlink = CameraAudioDownlink(
+                    self._hass,
+                    camera_entity_id,
+                    source,
+                    taps=self._taps.setdefault(camera_entity_id, set()),
+                )
+                self._downlinks[camera_entity_id] = downlink
+        return downlink.subscribe(listener)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop every downlink."""
+        for downlink in self._downlinks.values():
+            downlink.stop()
+        self._downlinks.clear()
@@ -0,0 +1,131 @@
+"""Clock-drift compensation between a producer's audio and wall time."""
+
+from __future__ import annotations
+
+import math
+
+import av
+import numpy as np
+
+# Seconds of observations whose lowest lead forms one measurement
+DRIFT_WINDOW = 2.0
+
+# Time constant of the correction loop in seconds; the loop is critically
+# damped, so a step in drift settles within a few of these
+DRIFT_TIME_CONSTANT = 20.0
+
+# Largest correction as a fraction of samples: 0.2% is far below an audible
+# pitch change and many times the drift of real sound cards
+MAX_DRIFT_CORRECTION = 0.002
+
+# A lead this far from the target is a burst or a pause, not drift
+DRIFT_MAX_ERROR = 0.25
+
+
+class DriftCompensator:
+    """Hold the audio stamped ahead of wall time at a constant lead.
+
+    A producer's nominal 48 kHz is never exactly 48 kHz, so over an open
+    session its audio slowly runs ahead of wall time, growing the camera's
+    buffer, or falls behind and underruns in periodic gaps. The session
+    clock reports its lead after every frame. The lowest lead of each
+    ``DRIFT_WINDOW`` is the arrival of the latest chunk, which jitter does
+    not move over time, and is compared with that of the first window. A PI
+    controller, as in JACK's ``alsa_in``, turns the difference into
+    ``ratio``: the fraction of samples to remove (negative to insert).
+    Its integral term settles on the producer's drift.
+    """
+
+    def __init__(
+        self,
+        window: float = DRIFT_WINDOW,
+        time_constant: float = DRIFT_TIME_CONSTANT,
+        max_correction: float = MAX_DRIFT_CORRECTION,
+    ) -> None:
+        """Initialize without a target lead or drift estimate."""
+        self.ratio = 0.0
+        # Net samples removed so far; negative when more were inserted
+        self.adjusted = 0
+        self._window = window
+        self._gain = 1 / time_constant
+        self._integral_gain = 1 / (4 * time_constant**2)
+        self._max_correction = max_correction
+        self._integral = 0.0
+        self._target: float | None = None
+        self._window_start: float | None = None
+        self._window_low = math.inf
+        self._debt = 0.0
+
+    @property
+    def drift_ppm(self) -> float:
+        """Return the estimated drift of the producer in parts per million."""
+        return self._integral * 1e6
+
+    def observe(self, lead: float, now: float) -> None:
+        """Record how far the stamped audio runs ahead of wall time."""
+        if self._window_start is None:
+            self._window_start = now
+        self._window_low = min(self._window_low, lead)
+        elapsed = now - self._window_start
+        if elapsed < self._window:
+            return
+
+        low = self._window_low
+        self._window_start = now
+        self._window_low = math.inf
+        if self._target is None or abs(low - self._target) > DRIFT_MAX_ERROR:
+            self._target = low
+            return
+        error = low - self._target
+        self._integral = self._clamp(
+            self._integral + self._integral_gain * error * elapsed
+        )
+        self.ratio = self._clamp(self._gain * error + self._integral)
+
+    def rebase(self) -> None:
+        """Measure a new target lead after a gap, keeping the drift estimate."""
+        self._target = None
+        self._window_start = None
+        self._window_low = math.inf
+        self.ratio = self._integral
+
+    def adjust(self, samples: int, step: int = 1) -> int:
+        """Return how many of ``samples`` to remove, in whole ``step``s.
+
+        A negative result is the number to insert. Fractions carry over to
+        later calls, so the corrections add up to the ratio exactly.
+        """
+        self._debt += samples * self.ratio
+        removed = int(self._debt / step) * step
+        self._debt -= removed
+        self.adjusted += removed
+        return removed
+
+    def _clamp(self, value: float) -> float:
+        return max(-self._max_correction, min(self._max_correction, value))
+
+
+def stretch_frame(frame: av.AudioFrame, samples: int) -> av.AudioFrame:
+    """Return ``frame`` resampled to ``samples`` samples by interpolation.
+
+    Used for corrections of a few samples per frame, where the pitch change
+    is a fraction of a percent and linear interpolation is inaudible.
+    """
+    data = frame.to_ndarray()
+    channels = len(frame.layout.channels)
+    if not frame.format.is_planar:
+        data = data.reshape(-1, channels).T
+    positions = np.linspace(0, frame.samples - 1, samples)
+    indices = np.arange(frame.samples)
+    stretched = np.stack([np.interp(positions, indices, plane) for plane in data])
+    if np.issubdtype(data.dtype, np.integer):
+        stretched = np.rint(stretched)
+    stretched = stretched.astype(data.dtype)
+    if not frame.format.is_planar:
+        stretched = stretched.T.reshape(1, -1)
+
+    out = av.AudioFrame.from_ndarray(
+        stretched, format=frame.format.name, layout=frame.layout.name
+    )
+    out.sample_rate = frame.sample_rate
+    return out
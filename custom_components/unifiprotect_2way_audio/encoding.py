@@ -0,0 +1,134 @@
+"""Decode and encode stages shared by the in-process and worker pipelines."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import av
+
+from .audio_format import WEBM_CLUSTER_ID, WEBM_EBML_HEADER
+from .clock import SessionClock
+from .drift import stretch_frame
+from .ringbuffer import SegmentReader
+from .rtp import OPUS_RTP_CLOCK_RATE
+from .vad import VoiceActivityDetector
+
+
+def pcm_frame(data: bytes | bytearray | memoryview, sample_rate: int) -> av.AudioFrame:
+    """Wrap S16LE mono samples in a frame, ignoring a trailing odd byte."""
+    num_samples = len(data) // 2
+    if num_samples == 0:
+        raise av.error.InvalidDataError(-1, "PCM chunk has no complete samples")
+    frame = av.AudioFrame(format="s16", layout="mono", samples=num_samples)
+    frame.sample_rate = sample_rate
+    frame.planes[0].update(memoryview(data)[: num_samples * 2])
+    return frame
+
+
+def webm_init_segment(chunk: bytes) -> bytes | None:
+    """Return the headers of a chunk that starts a WebM stream.
+
+    MediaRecorder sends them once, before the first cluster; later chunks
+    only decode with these headers prepended.
+    """
+    if (
+        chunk.startswith(WEBM_EBML_HEADER)
+        and (cluster_pos := chunk.find(WEBM_CLUSTER_ID)) > 0
+    ):
+        return chunk[:cluster_pos]
+    return None
+
+
+def decode_frames(
+    segments: tuple[bytes | memoryview, ...], input_format: str | None
+) -> list[av.AudioFrame]:
+    """Demux and decode a container chunk read from back-to-back buffers."""
+    open_kwargs: dict[str, Any] = {"mode": "r"}
+    if input_format in ("webm", "ogg"):
+        open_kwargs["format"] = input_format
+    with av.open(SegmentReader(*segments), **open_kwargs) as input_container:
+        return [
+            frame
+            for packet in input_container.demux()
+            for frame in packet.decode()
+            if isinstance(frame, av.AudioFrame)
+        ]
+
+
+class OutputResampler:
+    """Convert frames to an encoder's format at the output rate.
+
+    One resampler is kept until the input rate changes.
+    """
+
+    def __init__(self, codec_context: Any, sample_rate: int) -> None:
+        """Initialize for the encoder's codec context."""
+        self.codec_context = codec_context
+        self.sample_rate = sample_rate
+        self._resampler: av.AudioResampler | None = None
+        self._input_rate: int | None = None
+
+    def resample(self, frame: av.AudioFrame) -> list[av.AudioFrame]:
+        """Return the frame at the output rate; frames at that rate pass as is."""
+        if frame.sample_rate == self.sample_rate:
+            return [frame]
+        if self._resampler is None or self._input_rate != frame.sample_rate:
+            self._resampler = av.AudioResampler(
+                format=self.codec_context.format,
+                layout=self.codec_context.layout,
+                rate=self.sample_rate,
+            )
+            self._input_rate = frame.sample_rate
+        return self._resampler.resample(frame)
+
+
+def clocked_frames(
+    clock: SessionClock,
+    frame: av.AudioFrame,
+    resampler: OutputResampler,
+    vad: VoiceActivityDetector | None = None,
+) -> list[av.AudioFrame]:
+    """Return the stamped frames to encode for one decoded frame.
+
+    Frames the voice gate closes on only advance the clock, so silence costs
+    neither resampling nor encoding and sends nothing. Others are stretched
+    or squeezed by the few samples the clock's drift compensation asks for,
+    preceded by silence when they arrive after a short gap, resampled and
+    stamped.
+    """
+    if vad is not None and not vad.is_voice(frame):
+        samples = frame.samples * clock.sample_rate // frame.sample_rate
+        clock.skip(samples - clock.drift.adjust(samples))
+        return []
+    if removed := clock.drift.adjust(frame.samples):
+        frame = stretch_frame(frame, frame.samples - removed)
+
+    out_frames: list[av.AudioFrame] = []
+    if silence := clock.catch_up():
+        codec_context = resampler.codec_context
+        out_frames.append(
+            clock.silence(silence, codec_context.format.name, codec_context.layout.name)
+        )
+    out_frames.extend(clock.stamp(out_frame) for out_frame in resampler.resample(frame))
+    return out_frames
+
+
+def stamp_opus_packet(
+    clock: SessionClock, data: bytes | memoryview, samples: int, gap: int
+) -> av.Packet | None:
+    """Return a client-encoded Opus packet stamped by ``clock``, or None to drop it.
+
+    ``samples`` and ``gap`` are counted on the 48 kHz Opus clock. Encoded
+    audio cannot be stretched: drift is made up by dropping a whole packet,
+    or by a packet-long gap the camera conceals.
+    """
+    rate = clock.sample_rate
+    out_samples = samples * rate // OPUS_RTP_CLOCK_RATE
+    removed = clock.drift.adjust(out_samples, out_samples)
+    if removed > 0:
+        return None
+    return clock.stamp_packet(
+        av.Packet(bytes(data)),
+        out_samples,
+        gap * rate // OPUS_RTP_CLOCK_RATE - removed,
+    )
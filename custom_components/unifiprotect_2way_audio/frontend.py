@@ -10,15 +10,17 @@ from homeassistant.core import HomeAssistant
 _LOGGER = logging.getLogger(__name__)
 
 
-async def register_static_path(hass: HomeAssistant, url_path: str, path: str):
+async def register_static_path(
+    hass: HomeAssistant, url_path: str, path: str, cache_headers: bool = True
+):
     """Register a static path for serving files."""
     # Home Assistant 2024.7 introduced StaticPathConfig for async path registration
     if (MAJOR_VERSION, MINOR_VERSION) >= (2024, 7):
         from homeassistant.components.http import StaticPathConfig
 
-        # Third parameter (True) enables cache headers for better performance
+        # Cache headers suit files whose URL carries the version
         await hass.http.async_register_static_paths(
-            [StaticPathConfig(url_path, path, True)]
+            [StaticPathConfig(url_path, path, cache_headers)]
         )
     else:
         # Fallback for older versions - synchronous registration without cache headers
@@ -3,15 +3,56 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from collections.abc import Mapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
 
+from .const import (
+    CONF_ARBITRATION_POLICY,
+    CONF_ECHO_CANCELLATION,
+    CONF_EXPECTED_PACKET_LOSS,
+    CONF_IDLE_TIMEOUT,
+    CONF_LOSS_RESILIENCE,
+    CONF_MAX_ACTIVE_SESSIONS,
+    CONF_MAX_BIT_RATE,
+    CONF_MAX_QUEUED_CHUNKS,
+    CONF_MIN_BIT_RATE,
+    CONF_RECORD_SESSIONS,
+    CONF_RECORDING_RETENTION,
+    CONF_RTP_TRANSPORT,
+    CONF_TRANSCODE_WORKERS,
+    CONF_VOICE_GATE,
+    DEFAULT_ARBITRATION_POLICY,
+    DEFAULT_ECHO_CANCELLATION,
+    DEFAULT_EXPECTED_PACKET_LOSS,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_LOSS_RESILIENCE,
+    DEFAULT_MAX_ACTIVE_SESSIONS,
+    DEFAULT_MAX_BIT_RATE,
+    DEFAULT_MAX_QUEUED_CHUNKS,
+    DEFAULT_MIN_BIT_RATE,
+    DEFAULT_RECORD_SESSIONS,
+    DEFAULT_RECORDING_RETENTION,
+    DEFAULT_RTP_TRANSPORT,
+    DEFAULT_TRANSCODE_WORKERS,
+    DEFAULT_VOICE_GATE,
+)
+from .downlink import AudioDownlinkHub
+from .recorder import (
+    RecordingWriter,
+    recordings_directory,
+    remove_expired_recordings,
+)
+from .scheduler import EncodeScheduler
+
 if TYPE_CHECKING:
     from .switch import TalkbackSwitch
+    from .transcoder import TranscoderPool
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,10 +76,171 @@ class Unifi2WayAudioDevice:
 class StreamConfigManager:
     """Manages camera stream configuration across entities."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self, hass: HomeAssistant, options: Mapping[str, Any] | None = None
+    ) -> None:
         """Initialize the manager."""
         self._devices: dict[str, Unifi2WayAudioDevice] = {}
         self._hass = hass
+        self._options: Mapping[str, Any] = options or {}
+        self._active_sessions: set[str] = set()
+        self._transcoder: TranscoderPool | None = None
+        self._downlink: AudioDownlinkHub | None = None
+        self._recorder: RecordingWriter | None = None
+        # Orders in-process encoding across all cameras' sessions
+        self.scheduler = EncodeScheduler()
+
+    @property
+    def idle_timeout(self) -> int:
+        """Seconds without audio before an active session is stopped."""
+        return int(self._options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT))
+
+    @property
+    def max_active_sessions(self) -> int:
+        """Maximum number of concurrent backchannel sessions."""
+        return int(
+            self._options.get(CONF_MAX_ACTIVE_SESSIONS, DEFAULT_MAX_ACTIVE_SESSIONS)
+        )
+
+    @property
+    def max_queued_chunks(self) -> int:
+        """Maximum number of pending audio chunks buffered per camera."""
+        return int(self._options.get(CONF_MAX_QUEUED_CHUNKS, DEFAULT_MAX_QUEUED_CHUNKS))
+
+    @property
+    def rtp_transport(self) -> str:
+        """Transport used to send encoded audio to the camera."""
+        return str(self._options.get(CONF_RTP_TRANSPORT, DEFAULT_RTP_TRANSPORT))
+
+    @property
+    def arbitration_policy(self) -> str:
+        """Policy used when several producers talk to the same camera."""
+        return str(
+            self._options.get(CONF_ARBITRATION_POLICY, DEFAULT_ARBITRATION_POLICY)
+        )
+
+    @property
+    def transcode_workers(self) -> int:
+        """Number of worker processes used for transcoding (0 = in-process)."""
+        return int(self._options.get(CONF_TRANSCODE_WORKERS, DEFAULT_TRANSCODE_WORKERS))
+
+    @property
+    def bit_rate_range(self) -> tuple[int, int]:
+        """Bounds (bit/s) for the adaptive Opus bitrate."""
+        min_rate = int(self._options.get(CONF_MIN_BIT_RATE, DEFAULT_MIN_BIT_RATE))
+        max_rate = int(self._options.get(CONF_MAX_BIT_RATE, DEFAULT_MAX_BIT_RATE))
+        return min_rate * 1000, max(min_rate, max_rate) * 1000
+
+    @property
+    def loss_resilience(self) -> tuple[str, int]:
+        """Default Opus loss-resilience mode and expected loss percentage."""
+        return (
+            str(self._options.get(CONF_LOSS_RESILIENCE, DEFAULT_LOSS_RESILIENCE)),
+            int(
+                self._options.get(
+                    CONF_EXPECTED_PACKET_LOSS, DEFAULT_EXPECTED_PACKET_LOSS
+                )
+            ),
+        )
+
+    @property
+    def voice_gate(self) -> bool:
+        """Whether audio without voice is skipped instead of encoded."""
+        return bool(self._options.get(CONF_VOICE_GATE, DEFAULT_VOICE_GATE))
+
+    @property
+    def echo_cancellation(self) -> bool:
+        """Whether camera audio played to listeners is cancelled in the uplink."""
+        return bool(
+            self._options.get(CONF_ECHO_CANCELLATION, DEFAULT_ECHO_CANCELLATION)
+        )
+
+    @property
+    def record_sessions(self) -> bool:
+        """Whether each talkback session is recorded for auditing."""
+        return bool(self._options.get(CONF_RECORD_SESSIONS, DEFAULT_RECORD_SESSIONS))
+
+    @property
+    def recording_retention(self) -> int:
+        """Days recordings are kept before they are deleted (0 keeps them)."""
+        return int(
+            self._options.get(CONF_RECORDING_RETENTION, DEFAULT_RECORDING_RETENTION)
+        )
+
+    @property
+    def recorder(self) -> RecordingWriter:
+        """Return the writer shared by every session recording.
+
+        Its thread is only started when the first recording opens.
+        """
+        if self._recorder is None:
+            self._recorder = RecordingWriter(recordings_directory(self._hass))
+        return self._recorder
+
+    async def async_remove_expired_recordings(
+        self, now: datetime | None = None
+    ) -> None:
+        """Delete recordings past the retention period."""
+        removed = await self._hass.async_add_executor_job(
+            remove_expired_recordings,
+            recordings_directory(self._hass),
+            self.recording_retention,
+        )
+        if removed:
+            _LOGGER.info("Removed %d expired talkback recordings", removed)
+
+    @property
+    def transcoder(self) -> TranscoderPool | None:
+        """Return the shared transcoder pool, or None when transcoding in-process.
+
+        Worker processes are only spawned when the first session opens.
+        """
+        if self._transcoder is None and self.transcode_workers > 0:
+            from .transcoder import TranscoderPool
+
+            self._transcoder = TranscoderPool(self.transcode_workers)
+        return self._transcoder
+
+    @property
+    def downlink(self) -> AudioDownlinkHub:
+        """Return the hub sharing one audio downlink per camera."""
+        if self._downlink is None:
+            self._downlink = AudioDownlinkHub(self._hass)
+        return self._downlink
+
+    async def async_shutdown(self) -> None:
+        """Stop transcoder worker processes, audio downlinks and the recorder."""
+        if self._downlink is not None:
+            self._downlink.async_shutdown()
+            self._downlink = None
+        if self._recorder is not None:
+            await self._hass.async_add_executor_job(self._recorder.stop)
+            self._recorder = None
+        if self._transcoder is not None:
+            await self._transcoder.async_shutdown()
+            self._transcoder = None
+
+    def try_acquire_session(self, camera_id: str) -> bool:
+        """Reserve a backchannel slot for a camera.
+
+        Returns False when the global cap on concurrent sessions is reached.
+        """
+        if camera_id in self._active_sessions:
+            return True
+        if len(self._active_sessions) >= self.max_active_sessions:
+            _LOGGER.warning(
+                "Refusing talkback for %s - %d of %d sessions already active",
+                camera_id,
+                len(self._active_sessions),
+                self.max_active_sessions,
+            )
+            return False
+        self._active_sessions.add(camera_id)
+        return True
+
+    def release_session(self, camera_id: str) -> None:
+        """Release the backchannel slot held by a camera."""
+        self._active_sessions.discard(camera_id)
 
     def build_entities(self, hass: HomeAssistant) -> None:
         """Build switch entities from unifiprotect integration."""
@@ -89,6 +291,7 @@ class StreamConfigManager:
                     if not media_player_entities
                     else media_player_entities[0].entity_id
                 ),
+                manager=self,
             )
             _LOGGER.debug(
                 "Created switch entity for camera: %s",
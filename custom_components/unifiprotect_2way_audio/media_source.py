@@ -0,0 +1,159 @@
+"""Browse and play talkback session recordings through the media source."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.media_player import BrowseError, MediaClass
+from homeassistant.components.media_source.error import Unresolvable
+from homeassistant.components.media_source.models import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.util import raise_if_invalid_filename
+
+from .const import DOMAIN, NAME
+from .recorder import RECORDING_EXTENSION, recordings_directory
+
+RECORDINGS_URL = f"/api/{DOMAIN}/recordings"
+RECORDING_MIME_TYPE = "audio/ogg"
+
+
+async def async_get_media_source(hass: HomeAssistant) -> RecordingMediaSource:
+    """Set up the talkback recordings media source."""
+    return RecordingMediaSource(hass)
+
+
+def _recording_parts(identifier: str) -> list[str]:
+    """Split an identifier into a camera folder and optional file name.
+
+    Raises ValueError for anything that could leave the recordings directory.
+    """
+    parts = identifier.split("/") if identifier else []
+    if len(parts) > 2:
+        raise ValueError(f"Invalid recording identifier {identifier}")
+    for part in parts:
+        if part in ("", "."):
+            raise ValueError(f"Invalid recording identifier {identifier}")
+        raise_if_invalid_filename(part)
+    return parts
+
+
+class RecordingMediaSource(MediaSource):
+    """Offer one folder of recordings per camera, newest first."""
+
+    name = f"{NAME} recordings"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the recordings media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Return the authenticated URL of a recording."""
+        try:
+            parts = _recording_parts(item.identifier)
+        except ValueError as err:
+            raise Unresolvable(str(err)) from err
+        if len(parts) != 2 or not parts[1].endswith(RECORDING_EXTENSION):
+            raise Unresolvable(f"Not a recording: {item.identifier}")
+        return PlayMedia(f"{RECORDINGS_URL}/{item.identifier}", RECORDING_MIME_TYPE)
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Return the cameras with recordings, or one camera's recordings."""
+        try:
+            parts = _recording_parts(item.identifier)
+        except ValueError as err:
+            raise BrowseError(str(err)) from err
+        if len(parts) == 2:
+            raise BrowseError(f"Not a folder: {item.identifier}")
+        return await self.hass.async_add_executor_job(
+            self._browse, recordings_directory(self.hass), parts
+        )
+
+    def _browse(self, directory: Path, parts: list[str]) -> BrowseMediaSource:
+        """List a folder of the recordings directory."""
+        if not parts:
+            folders = sorted(path.name for path in directory.glob("*") if path.is_dir())
+            return self._folder(
+                "",
+                self.name,
+                [self._folder(camera, camera, None) for camera in folders],
+            )
+
+        folder = directory / parts[0]
+        if not folder.is_dir():
+            raise BrowseError(f"No recordings for {parts[0]}")
+        files = sorted(
+            folder.glob(f"*{RECORDING_EXTENSION}"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        return self._folder(
+            parts[0],
+            parts[0],
+            [
+                BrowseMediaSource(
+                    domain=DOMAIN,
+                    identifier=f"{parts[0]}/{path.name}",
+                    media_class=MediaClass.MUSIC,
+                    media_content_type=RECORDING_MIME_TYPE,
+                    title=path.stem,
+                    can_play=True,
+                    can_expand=False,
+                )
+                for path in files
+            ],
+        )
+
+    def _folder(
+        self,
+        identifier: str,
+        title: str,
+        children: list[BrowseMediaSource] | None,
+    ) -> BrowseMediaSource:
+        """Return a browsable folder."""
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=identifier,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=title,
+            can_play=False,
+            can_expand=True,
+            children=children,
+            children_media_class=(
+                MediaClass.MUSIC if identifier else MediaClass.DIRECTORY
+            ),
+        )
+
+
+class RecordingView(HomeAssistantView):
+    """Serve recordings to authenticated clients."""
+
+    url = RECORDINGS_URL + "/{camera}/{filename}"
+    name = f"api:{DOMAIN}:recordings"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the recordings view."""
+        self.hass = hass
+
+    async def get(
+        self, request: web.Request, camera: str, filename: str
+    ) -> web.FileResponse:
+        """Return a recording file."""
+        try:
+            _recording_parts(f"{camera}/{filename}")
+        except ValueError as err:
+            raise web.HTTPBadRequest from err
+        path = recordings_directory(self.hass) / camera / filename
+        if path.suffix != RECORDING_EXTENSION:
+            raise web.HTTPNotFound
+        if not await self.hass.async_add_executor_job(path.is_file):
+            raise web.HTTPNotFound
+        return web.FileResponse(path, headers={"Content-Type": RECORDING_MIME_TYPE})
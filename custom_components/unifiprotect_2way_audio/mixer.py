@@ -0,0 +1,59 @@
+"""Real-time PCM mixer for several producers feeding one talkback session."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+
+import numpy as np
+
+# How many frames a lagging producer may hold back the mix before it is
+# treated as silent for the current frame
+MAX_LAG_FRAMES = 3
+
+
+class PcmMixer:
+    """Sum aligned mono S16 frames from several producers.
+
+    Each producer appends samples at the session's output rate. Mixed frames
+    of ``frame_samples`` samples are emitted once every producer has a full
+    frame buffered, or once the furthest-ahead producer is ``MAX_LAG_FRAMES``
+    ahead, so a stalled producer cannot block the others.
+    """
+
+    def __init__(self, frame_samples: int) -> None:
+        """Initialize the mixer."""
+        self.frame_samples = frame_samples
+        self._buffers: dict[Hashable, np.ndarray] = {}
+
+    def add(self, producer: Hashable, samples: np.ndarray) -> None:
+        """Append mono int16 samples from a producer."""
+        buffered = self._buffers.get(producer)
+        if buffered is None or not len(buffered):
+            self._buffers[producer] = samples.astype(np.int16, copy=False)
+        else:
+            self._buffers[producer] = np.concatenate((buffered, samples))
+
+    def remove(self, producer: Hashable) -> None:
+        """Drop a producer and any audio it still has buffered."""
+        self._buffers.pop(producer, None)
+
+    def pull(self) -> list[np.ndarray]:
+        """Return every mixed frame that is ready."""
+        frames: list[np.ndarray] = []
+        size = self.frame_samples
+        while self._buffers:
+            lengths = [len(buf) for buf in self._buffers.values()]
+            longest = max(lengths)
+            if longest < size or (
+                min(lengths) < size and longest < size * MAX_LAG_FRAMES
+            ):
+                break
+
+            stacked: np.ndarray = np.zeros((len(self._buffers), size), dtype=np.int32)
+            for row, (producer, buf) in enumerate(list(self._buffers.items())):
+                take = min(size, len(buf))
+                stacked[row, :take] = buf[:take]
+                self._buffers[producer] = buf[take:]
+
+            frames.append(np.clip(stacked.sum(axis=0), -32768, 32767).astype(np.int16))
+        return frames
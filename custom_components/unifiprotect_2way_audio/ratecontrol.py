@@ -0,0 +1,122 @@
+"""Opus encoder settings driven by RTCP receiver reports."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+from .const import RESILIENCE_FEC, RESILIENCE_OFF
+
+# Fraction of packets lost above which FEC is enabled and the bitrate held
+LOSS_THRESHOLD = 0.02
+
+# Fraction lost above which the bitrate is cut and frames are lengthened
+HIGH_LOSS = 0.10
+
+# Interarrival jitter (seconds) above which frames are lengthened
+HIGH_JITTER = 0.03
+
+# Multiplicative decrease on heavy loss, additive increase (bit/s) on recovery
+DECREASE_FACTOR = 0.75
+INCREASE_STEP = 4000
+
+# Consecutive clean reports needed before raising the bitrate or dropping FEC
+RECOVERY_REPORTS = 2
+
+FRAME_DURATION = 20  # Milliseconds per Opus frame on a clean link
+LOSSY_FRAME_DURATION = 40  # Fewer, larger packets on a lossy or jittery link
+
+
+@dataclass(frozen=True)
+class OpusSettings:
+    """Encoder parameters that can change during a session."""
+
+    bit_rate: int
+    frame_duration: int = FRAME_DURATION
+    fec: bool = False
+    packet_loss: int = 0  # Expected loss percentage passed to libopus
+
+    def codec_options(self) -> dict[str, str]:
+        """Return the libopus private options for these settings."""
+        return {
+            "frame_duration": str(self.frame_duration),
+            "fec": "1" if self.fec else "0",
+            "packet_loss": str(self.packet_loss),
+        }
+
+
+def resilience_settings(
+    bit_rate: int, mode: str, expected_loss: int, reported_loss: int = 0
+) -> OpusSettings:
+    """Return encoder settings for a loss-resilience mode.
+
+    FEC is used unless the mode is off, once loss is expected or reported;
+    the loss hint given to libopus is the larger of the two.
+    """
+    packet_loss = max(expected_loss, reported_loss)
+    fec = mode != RESILIENCE_OFF and packet_loss > 0
+    return OpusSettings(bit_rate, fec=fec, packet_loss=packet_loss if fec else 0)
+
+
+class OpusRateController:
+    """AIMD bitrate control with in-band FEC for one talkback session.
+
+    Heavy loss cuts the bitrate and switches to longer frames; moderate loss
+    holds the bitrate and turns on Opus in-band FEC sized to the reported
+    loss; a run of clean reports raises the bitrate step by step again.
+    The loss-resilience mode can disable FEC or set a minimum loss hint.
+    """
+
+    def __init__(
+        self,
+        min_bit_rate: int,
+        max_bit_rate: int,
+        bit_rate: int,
+        mode: str = RESILIENCE_FEC,
+        expected_loss: int = 0,
+    ) -> None:
+        """Initialize the controller at ``bit_rate`` clamped to the bounds."""
+        self.min_bit_rate = min_bit_rate
+        self.max_bit_rate = max(min_bit_rate, max_bit_rate)
+        self.mode = mode
+        self.expected_loss = expected_loss
+        self.settings = resilience_settings(self._clamp(bit_rate), mode, expected_loss)
+        self._clean_reports = 0
+        self._reported_loss = 0  # Loss percentage FEC is currently sized for
+
+    def set_resilience(self, mode: str, expected_loss: int) -> bool:
+        """Change the loss-resilience mode; return True if the settings changed."""
+        self.mode = mode
+        self.expected_loss = expected_loss
+        return self._apply(self.settings.bit_rate, self.settings.frame_duration)
+
+    def update(self, fraction_lost: float, jitter: float) -> bool:
+        """Fold in one receiver report; return True if the settings changed."""
+        bit_rate = self.settings.bit_rate
+        if fraction_lost >= LOSS_THRESHOLD:
+            self._clean_reports = 0
+            self._reported_loss = min(100, round(fraction_lost * 100))
+            if fraction_lost >= HIGH_LOSS:
+                bit_rate = self._clamp(int(bit_rate * DECREASE_FACTOR))
+        else:
+            self._clean_reports += 1
+            if self._clean_reports >= RECOVERY_REPORTS:
+                bit_rate = self._clamp(bit_rate + INCREASE_STEP)
+                self._reported_loss = 0
+
+        lossy = fraction_lost >= HIGH_LOSS or jitter >= HIGH_JITTER
+        return self._apply(bit_rate, LOSSY_FRAME_DURATION if lossy else FRAME_DURATION)
+
+    def _apply(self, bit_rate: int, frame_duration: int) -> bool:
+        """Recompute the settings; return True if they changed."""
+        settings = self.settings
+        self.settings = replace(
+            resilience_settings(
+                bit_rate, self.mode, self.expected_loss, self._reported_loss
+            ),
+            frame_duration=frame_duration,
+        )
+        return self.settings != settings
+
+    def _clamp(self, bit_rate: int) -> int:
+        """Keep a bitrate within the configured bounds."""
+        return max(self.min_bit_rate, min(self.max_bit_rate, bit_rate))
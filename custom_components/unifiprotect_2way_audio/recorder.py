@@ -0,0 +1,393 @@
+"""Audit recording of talkback sessions as Ogg/Opus files."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from fractions import Fraction
+from pathlib import Path
+from typing import BinaryIO
+
+import av
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDINGS_DIR = "recordings"
+RECORDING_EXTENSION = ".ogg"
+
+# Seconds of packets handed to the writer at once; each batch becomes one
+# Ogg page, so this is also the most audio lost if Home Assistant crashes
+RECORDING_BATCH_DURATION = 1.0
+
+# A recording is continued in a new file past either limit
+MAX_RECORDING_BYTES = 16 * 1024 * 1024
+MAX_RECORDING_DURATION = 900  # Seconds of wall-clock time
+
+# How often recordings past the retention period are deleted
+RETENTION_CHECK_INTERVAL = timedelta(hours=1)
+
+# Encoded audio queued for the writer; past this the live path drops
+# batches rather than wait for a slow disk
+MAX_PENDING_BYTES = 1024 * 1024
+
+# Samples per second of Ogg/Opus granule positions and the pre-skip that
+# libopus encoders report (their lookahead at 48 kHz)
+OPUS_GRANULE_RATE = 48000
+OPUS_PRE_SKIP = 312
+
+OGG_PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+OGG_FLAG_BOS = 0x02
+OGG_FLAG_EOS = 0x04
+OGG_MAX_SEGMENTS = 255
+
+
+def _crc_table() -> list[int]:
+    """Return the CRC-32 table of Ogg pages (polynomial 0x04C11DB7, no reflection)."""
+    table = []
+    for byte in range(256):
+        crc = byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7 if crc & 0x80000000 else crc << 1) & (
+                0xFFFFFFFF
+            )
+        table.append(crc)
+    return table
+
+
+OGG_CRC_TABLE = _crc_table()
+
+
+def ogg_crc(data: bytes | bytearray) -> int:
+    """Return the Ogg checksum of a page."""
+    crc = 0
+    table = OGG_CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ table[(crc >> 24) ^ byte]
+    return crc
+
+
+def ogg_page(
+    packets: list[bytes], granule: int, serial: int, sequence: int, flags: int = 0
+) -> bytes:
+    """Return one Ogg page holding whole ``packets``."""
+    lacing = bytearray()
+    for packet in packets:
+        lacing += b"\xff" * (len(packet) // 255) + bytes((len(packet) % 255,))
+    header = OGG_PAGE_HEADER.pack(
+        b"OggS", 0, flags, granule, serial, sequence, 0, len(lacing)
+    )
+    page = bytearray(header + lacing + b"".join(packets))
+    struct.pack_into("<I", page, 22, ogg_crc(page))
+    return bytes(page)
+
+
+def opus_head(channels: int, sample_rate: int) -> bytes:
+    """Return an OpusHead identification header (RFC 7845)."""
+    return struct.pack(
+        "<8sBBHIhB", b"OpusHead", 1, channels, OPUS_PRE_SKIP, sample_rate, 0, 0
+    )
+
+
+def opus_tags(comments: list[str]) -> bytes:
+    """Return an OpusTags comment header."""
+    vendor = DOMAIN.encode()
+    tags = bytearray(b"OpusTags" + struct.pack("<I", len(vendor)) + vendor)
+    tags += struct.pack("<I", len(comments))
+    for comment in comments:
+        encoded = comment.encode()
+        tags += struct.pack("<I", len(encoded)) + encoded
+    return bytes(tags)
+
+
+def recordings_directory(hass: HomeAssistant) -> Path:
+    """Return the directory holding one folder of recordings per camera."""
+    return Path(hass.config.path(DOMAIN, RECORDINGS_DIR))
+
+
+def remove_expired_recordings(directory: Path, retention_days: int) -> int:
+    """Delete recordings older than ``retention_days``; return how many."""
+    if retention_days <= 0 or not directory.is_dir():
+        return 0
+    cutoff = time.time() - retention_days * 86400
+    removed = 0
+    for path in directory.glob(f"*/*{RECORDING_EXTENSION}"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError as err:
+            _LOGGER.warning("Failed to remove expired recording %s: %s", path, err)
+    return removed
+
+
+class SessionRecording:
+    """Collect one session's encoded packets and hand them to the writer.
+
+    Called on the event loop; it only copies packet payloads and queues a
+    batch about once a second, so the live path never waits on the disk.
+    """
+
+    def __init__(
+        self,
+        writer: RecordingWriter,
+        camera_entity_id: str,
+        sample_rate: int,
+        channels: int,
+    ) -> None:
+        """Initialize the recording of a session."""
+        self._writer = writer
+        self.camera_entity_id = camera_entity_id
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._batch: list[tuple[bytes, int]] = []
+        self._batch_samples = 0
+        self._batch_limit = int(RECORDING_BATCH_DURATION * OPUS_GRANULE_RATE)
+        self.path: Path | None = None  # Current file, set by the writer
+        self.packets = 0
+        self.dropped_packets = 0
+
+    def add(self, packet: av.Packet) -> None:
+        """Queue an encoded packet for the recording."""
+        time_base = packet.time_base or Fraction(1, self.sample_rate)
+        samples = int((packet.duration or 0) * time_base * OPUS_GRANULE_RATE)
+        self._batch.append((bytes(packet), samples))
+        self._batch_samples += samples
+        if self._batch_samples >= self._batch_limit:
+            self._submit(close=False)
+
+    def close(self) -> None:
+        """Flush the last packets and finish the current file."""
+        self._submit(close=True)
+
+    def _submit(self, close: bool) -> None:
+        """Hand the current batch to the writer."""
+        batch, self._batch, self._batch_samples = self._batch, [], 0
+        if self._writer.submit(self, batch, close):
+            self.packets += len(batch)
+        else:
+            self.dropped_packets += len(batch)
+
+
+@dataclass
+class _OggFile:
+    """Writer-side state of the file a recording currently writes."""
+
+    handle: BinaryIO
+    path: Path
+    serial: int
+    opened: float
+    sequence: int = 0
+    granule: int = 0
+    size: int = 0
+    # The newest page's packets, held back so the last page can carry EOS
+    held: list[tuple[bytes, int]] = field(default_factory=list)
+
+
+class RecordingWriter:
+    """Write every session's recording from one background thread.
+
+    Batches of packets arrive through a queue and are written as Ogg pages.
+    Files are rotated by size and by wall-clock duration.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = MAX_RECORDING_BYTES,
+        max_duration: float = MAX_RECORDING_DURATION,
+        max_pending_bytes: int = MAX_PENDING_BYTES,
+    ) -> None:
+        """Initialize the writer; its thread starts with the first recording."""
+        self.directory = directory
+        self._max_bytes = max_bytes
+        self._max_duration = max_duration
+        self._max_pending_bytes = max_pending_bytes
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+        self._files: dict[SessionRecording, _OggFile] = {}
+        self._thread: threading.Thread | None = None
+
+    def open_session(
+        self, camera_entity_id: str, sample_rate: int, channels: int
+    ) -> SessionRecording:
+        """Start recording a session."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"{DOMAIN} recorder", daemon=True
+            )
+            self._thread.start()
+        return SessionRecording(self, camera_entity_id, sample_rate, channels)
+
+    def submit(
+        self,
+        recording: SessionRecording,
+        batch: list[tuple[bytes, int]],
+        close: bool,
+    ) -> bool:
+        """Queue a batch without blocking; False if it had to be dropped."""
+        size = sum(len(payload) for payload, _ in batch)
+        with self._lock:
+            if batch and self._pending_bytes + size > self._max_pending_bytes:
+                batch, size = [], 0
+                dropped = True
+            else:
+                dropped = False
+            self._pending_bytes += size
+        if batch or close:
+            self._queue.put((recording, batch, size, close))
+        return not dropped
+
+    def stop(self) -> None:
+        """Finish every open file and wait for the thread to exit."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Write queued batches until stopped."""
+        while (item := self._queue.get()) is not None:
+            recording, batch, size, close = item
+            try:
+                self._write(recording, batch, close)
+            except OSError as err:
+                _LOGGER.error(
+                    "Failed to write recording for %s: %s",
+                    recording.camera_entity_id,
+                    err,
+                )
+                self._discard(recording)
+            with self._lock:
+                self._pending_bytes -= size
+        for recording in list(self._files):
+            try:
+                self._finish(recording)
+            except OSError as err:
+                _LOGGER.error("Failed to finish recording %s: %s", recording.path, err)
+
+    def _write(
+        self,
+        recording: SessionRecording,
+        batch: list[tuple[bytes, int]],
+        close: bool,
+    ) -> None:
+        """Write the held page of a recording and hold the new batch."""
+        ogg = self._files.get(recording)
+        if ogg is not None and batch and self._should_rotate(ogg):
+            self._finish(recording)
+            ogg = None
+        if ogg is None and batch:
+            ogg = self._open(recording)
+        if ogg is None:
+            return
+        if batch:
+            if ogg.held:
+                self._write_pages(ogg, ogg.held, last=False)
+                ogg.handle.flush()
+            ogg.held = batch
+        if close:
+            self._finish(recording)
+
+    def _should_rotate(self, ogg: _OggFile) -> bool:
+        """Return True once a file reaches its size or duration limit."""
+        return (
+            ogg.size >= self._max_bytes
+            or time.monotonic() - ogg.opened >= self._max_duration
+        )
+
+    def _open(self, recording: SessionRecording) -> _OggFile:
+        """Create the next file of a recording and write its headers."""
+        start = dt_util.now()
+        folder = self.directory / recording.camera_entity_id.split(".")[-1]
+        folder.mkdir(parents=True, exist_ok=True)
+        stem = start.strftime("%Y%m%d-%H%M%S")
+        path = folder / f"{stem}{RECORDING_EXTENSION}"
+        suffix = 1
+        while path.exists():
+            path = folder / f"{stem}-{suffix}{RECORDING_EXTENSION}"
+            suffix += 1
+
+        ogg = _OggFile(
+            handle=path.open("wb"),
+            path=path,
+            serial=int.from_bytes(os.urandom(4), "little"),
+            opened=time.monotonic(),
+        )
+        self._files[recording] = ogg
+        recording.path = path
+        comments = [
+            f"CAMERA={recording.camera_entity_id}",
+            f"DATE={start.isoformat(timespec='seconds')}",
+        ]
+        self._append(ogg, [opus_head(recording.channels, recording.sample_rate)], 0)
+        self._append(ogg, [opus_tags(comments)], 0, first=False)
+        _LOGGER.debug("Recording %s to %s", recording.camera_entity_id, path)
+        return ogg
+
+    def _write_pages(
+        self, ogg: _OggFile, batch: list[tuple[bytes, int]], last: bool
+    ) -> None:
+        """Write packets as pages of at most 255 segments."""
+        pages: list[list[tuple[bytes, int]]] = [[]]
+        segments = 0
+        for packet in batch:
+            needed = len(packet[0]) // 255 + 1
+            if segments + needed > OGG_MAX_SEGMENTS:
+                pages.append([])
+                segments = 0
+            pages[-1].append(packet)
+            segments += needed
+        for index, page in enumerate(pages):
+            ogg.granule += sum(samples for _, samples in page)
+            self._append(
+                ogg,
+                [payload for payload, _ in page],
+                ogg.granule,
+                first=False,
+                last=last and index == len(pages) - 1,
+            )
+
+    def _append(
+        self,
+        ogg: _OggFile,
+        packets: list[bytes],
+        granule: int,
+        first: bool = True,
+        last: bool = False,
+    ) -> None:
+        """Write one page to a file."""
+        flags = (OGG_FLAG_BOS if first else 0) | (OGG_FLAG_EOS if last else 0)
+        page = ogg_page(packets, granule, ogg.serial, ogg.sequence, flags)
+        ogg.handle.write(page)
+        ogg.sequence += 1
+        ogg.size += len(page)
+
+    def _finish(self, recording: SessionRecording) -> None:
+        """Write the held page with the end-of-stream flag and close the file."""
+        ogg = self._files.pop(recording, None)
+        if ogg is None:
+            return
+        try:
+            self._write_pages(ogg, ogg.held, last=True)
+        finally:
+            ogg.handle.close()
+
+    def _discard(self, recording: SessionRecording) -> None:
+        """Close a file that failed to write; the recording continues in a new one."""
+        ogg = self._files.pop(recording, None)
+        if ogg is not None:
+            with contextlib.suppress(OSError):
+                ogg.handle.close()
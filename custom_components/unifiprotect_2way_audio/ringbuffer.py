@@ -0,0 +1,204 @@
+"""Preallocated byte ring used to hand audio chunks to the encoding stage."""
+
+from __future__ import annotations
+
+import io
+import struct
+
+from .audio_format import AUDIO_FORMAT_CODES
+
+# Per-record header: payload length, sample rate, producer slot, format code
+RECORD_HEADER = struct.Struct("=IIHB")
+# Marks the unused tail of the buffer when a record wraps to the start
+WRAP_MARKER = 0xFFFFFFFF
+
+
+class ByteRing:
+    """Ring of length-prefixed audio records in one preallocated buffer.
+
+    Writes copy the payload into the buffer once; reads return a
+    ``memoryview`` into it, so nothing is copied or allocated per chunk.
+    Records are stored contiguously (the tail is skipped when a record
+    would straddle the end), and the oldest records are dropped when a new
+    one does not fit.
+
+    The buffer is allocated on the first write and freed by ``clear()``.
+    A view returned by ``read()`` is only valid until the next ``write()``;
+    the consumer must finish with it before yielding to the event loop.
+    """
+
+    def __init__(self, capacity: int, max_records: int) -> None:
+        """Initialize an empty ring of ``capacity`` bytes."""
+        self.capacity = capacity
+        self.max_records = max_records
+        self.dropped = 0
+        self._buf: bytearray | None = None
+        self._view: memoryview | None = None
+        self._start = 0  # Offset of the oldest record
+        self._end = 0  # Offset where the next record is written
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of queued records."""
+        return self._count
+
+    def write(
+        self,
+        payload: bytes | memoryview,
+        sample_rate: int | None,
+        producer: int,
+        audio_format: str | None,
+    ) -> bool:
+        """Append a record, dropping the oldest ones if needed.
+
+        Returns False if the payload can never fit in the ring.
+        """
+        size = RECORD_HEADER.size + len(payload)
+        if size > self.capacity:
+            return False
+        if self._view is None:
+            self._buf = bytearray(self.capacity)
+            self._view = memoryview(self._buf)
+
+        while True:
+            if self._count < self.max_records and (offset := self._reserve(size)) >= 0:
+                break
+            self._drop_oldest()
+
+        RECORD_HEADER.pack_into(
+            self._view,
+            offset,
+            len(payload),
+            sample_rate or 0,
+            producer,
+            AUDIO_FORMAT_CODES.index(audio_format)
+            if audio_format in AUDIO_FORMAT_CODES
+            else 0,
+        )
+        self._view[offset + RECORD_HEADER.size : offset + size] = payload
+        self._end = offset + size
+        self._count += 1
+        return True
+
+    def read(self) -> tuple[memoryview, int | None, int, str | None] | None:
+        """Pop the oldest record as (payload view, sample rate, producer, format)."""
+        if not self._count or self._view is None:
+            return None
+        offset = self._skip_wrap()
+        length, rate, producer, fmt = RECORD_HEADER.unpack_from(self._view, offset)
+        payload_start = offset + RECORD_HEADER.size
+        self._advance(payload_start + length)
+        return (
+            self._view[payload_start : payload_start + length],
+            rate or None,
+            producer,
+            AUDIO_FORMAT_CODES[fmt],
+        )
+
+    def clear(self) -> None:
+        """Drop every record and free the buffer."""
+        if self._view is not None:
+            self._view.release()
+        self._buf = None
+        self._view = None
+        self._start = self._end = self._count = 0
+
+    @property
+    def _buffer(self) -> memoryview:
+        """Return the buffer, which is allocated while records are queued."""
+        assert self._view is not None
+        return self._view
+
+    def _reserve(self, size: int) -> int:
+        """Return the offset for a ``size``-byte record, or -1 if it won't fit."""
+        if not self._count:
+            self._start = self._end = 0
+            return 0
+        if self._end > self._start:
+            if self.capacity - self._end >= size:
+                return self._end
+            if self._start >= size:
+                # Skip the tail and wrap to the start of the buffer
+                if self.capacity - self._end >= RECORD_HEADER.size:
+                    struct.pack_into("=I", self._buffer, self._end, WRAP_MARKER)
+                return 0
+            return -1
+        if self._start - self._end >= size:
+            return self._end
+        return -1
+
+    def _drop_oldest(self) -> None:
+        """Discard the oldest record to make room."""
+        offset = self._skip_wrap()
+        (length,) = struct.unpack_from("=I", self._buffer, offset)
+        self._advance(offset + RECORD_HEADER.size + length)
+        self.dropped += 1
+
+    def _skip_wrap(self) -> int:
+        """Return the offset of the oldest record, skipping a wrapped tail."""
+        if (
+            self.capacity - self._start < RECORD_HEADER.size
+            or struct.unpack_from("=I", self._buffer, self._start)[0] == WRAP_MARKER
+        ):
+            self._start = 0
+        return self._start
+
+    def _advance(self, new_start: int) -> None:
+        """Release the oldest record, which ends at ``new_start``."""
+        self._start = new_start
+        self._count -= 1
+        if not self._count:
+            self._start = self._end = 0
+
+
+class SegmentReader(io.RawIOBase):
+    """Seekable read-only file over one or more buffers, without joining them.
+
+    Lets PyAV demux a cached WebM init segment followed by a chunk view, or a
+    repaired prefix byte followed by the chunk, with no concatenation copy.
+    """
+
+    def __init__(self, *segments: bytes | memoryview) -> None:
+        """Initialize the reader over ``segments`` in order."""
+        self._segments = [memoryview(segment).cast("B") for segment in segments]
+        self._size = sum(len(segment) for segment in self._segments)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        """Read into ``buffer`` from the current position."""
+        written = 0
+        pos = self._pos
+        want = len(buffer)
+        for segment in self._segments:
+            if written == want:
+                break
+            if pos >= len(segment):
+                pos -= len(segment)
+                continue
+            take = min(len(segment) - pos, want - written)
+            buffer[written : written + take] = segment[pos : pos + take]
+            written += take
+            pos = 0
+        self._pos += written
+        return written
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move the read position."""
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, min(offset, self._size))
+        return self._pos
+
+    def tell(self) -> int:
+        """Return the read position."""
+        return self._pos
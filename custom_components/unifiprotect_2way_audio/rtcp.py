@@ -0,0 +1,210 @@
+"""RTCP sender and receiver reports for the native RTP transport (RFC 3550)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .rtp import RtpSender, parse_rtp_url
+
+_LOGGER = logging.getLogger(__name__)
+
+RTCP_SR = 200
+RTCP_RR = 201
+RTCP_HEADER = struct.Struct("!BBH")
+SSRC = struct.Struct("!I")
+# NTP timestamp (seconds, fraction), RTP timestamp, packet and octet counts
+SENDER_INFO = struct.Struct("!IIIII")
+REPORT_BLOCK = struct.Struct("!IIIIII")
+
+# Seconds between sender reports; RFC 3550's minimum interval
+RTCP_INTERVAL = 5.0
+
+# Sender reports remembered for matching the LSR field of receiver reports
+MAX_PENDING_SR = 4
+
+# Seconds between the NTP epoch (1900) and the Unix epoch
+NTP_EPOCH_OFFSET = 2208988800
+
+
+@dataclass(frozen=True)
+class ReceptionReport:
+    """One report block from a receiver or sender report."""
+
+    ssrc: int
+    fraction_lost: float
+    packets_lost: int
+    highest_sequence: int
+    jitter: int  # Interarrival jitter in RTP timestamp units
+    last_sr: int
+    delay_since_last_sr: int
+
+
+def _ntp_time(now: float) -> tuple[int, int]:
+    """Return a Unix time as NTP seconds and fraction."""
+    seconds = now + NTP_EPOCH_OFFSET
+    return int(seconds) & 0xFFFFFFFF, int((seconds % 1) * (1 << 32))
+
+
+def parse_rtcp(data: bytes) -> list[ReceptionReport]:
+    """Return the report blocks of a (compound) RTCP packet."""
+    reports: list[ReceptionReport] = []
+    offset = 0
+    while offset + RTCP_HEADER.size <= len(data):
+        first, packet_type, length = RTCP_HEADER.unpack_from(data, offset)
+        end = offset + (length + 1) * 4
+        if first >> 6 != 2 or end > len(data):
+            break
+
+        if packet_type in (RTCP_SR, RTCP_RR):
+            block = offset + RTCP_HEADER.size + SSRC.size
+            if packet_type == RTCP_SR:
+                block += SENDER_INFO.size
+            for _ in range(first & 0x1F):
+                if block + REPORT_BLOCK.size > end:
+                    break
+                ssrc, lost, highest, jitter, lsr, dlsr = REPORT_BLOCK.unpack_from(
+                    data, block
+                )
+                cumulative = lost & 0xFFFFFF
+                if cumulative & 0x800000:
+                    cumulative -= 1 << 24
+                reports.append(
+                    ReceptionReport(
+                        ssrc, (lost >> 24) / 256, cumulative, highest, jitter, lsr, dlsr
+                    )
+                )
+                block += REPORT_BLOCK.size
+        offset = end
+    return reports
+
+
+def build_sender_report(
+    ssrc: int, now: float, rtp_timestamp: int, packets: int, octets: int
+) -> bytes:
+    """Return an RTCP sender report without report blocks."""
+    ntp_seconds, ntp_fraction = _ntp_time(now)
+    return (
+        RTCP_HEADER.pack(2 << 6, RTCP_SR, 6)
+        + SSRC.pack(ssrc)
+        + SENDER_INFO.pack(
+            ntp_seconds,
+            ntp_fraction,
+            rtp_timestamp,
+            packets & 0xFFFFFFFF,
+            octets & 0xFFFFFFFF,
+        )
+    )
+
+
+class _RtcpProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol feeding received RTCP to its session."""
+
+    def __init__(self, session: RtcpSession) -> None:
+        self._session = session
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self._session.datagram_received(data)
+
+    def error_received(self, exc: Exception) -> None:
+        _LOGGER.debug("RTCP error: %s", exc)
+
+
+class RtcpSession:
+    """RTCP companion of an ``RtpSender`` on the port above its RTP port.
+
+    Sends periodic sender reports so the camera can compute round-trip time,
+    and hands each receiver report block about our SSRC to ``on_report``.
+    """
+
+    def __init__(
+        self, sender: RtpSender, on_report: Callable[[ReceptionReport], None]
+    ) -> None:
+        """Initialize the session for ``sender``."""
+        self._sender = sender
+        self._on_report = on_report
+        self._transport: asyncio.DatagramTransport | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        # Compact NTP time of recent sender reports -> monotonic send time
+        self._sr_sent: dict[int, float] = {}
+        self.last_report: ReceptionReport | None = None
+        self.round_trip: float | None = None
+
+    async def async_start(self, rtp_url: str) -> None:
+        """Open the RTCP socket next to the sender's RTP socket."""
+        (host, port), _ = parse_rtp_url(rtp_url)
+        local_port = self._sender.local_port
+        loop = asyncio.get_running_loop()
+        try:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _RtcpProtocol(self),
+                remote_addr=(host, port + 1),
+                local_addr=("0.0.0.0", local_port + 1) if local_port else None,
+            )
+        except OSError as err:
+            # Receivers usually answer on RTP port + 1, but any port can
+            # still carry our sender reports
+            _LOGGER.debug(
+                "RTCP port %s unavailable: %s", local_port and local_port + 1, err
+            )
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _RtcpProtocol(self), remote_addr=(host, port + 1)
+            )
+        self._send_report()
+
+    def datagram_received(self, data: bytes) -> None:
+        """Handle an RTCP packet from the camera."""
+        try:
+            reports = parse_rtcp(data)
+        except struct.error:
+            _LOGGER.debug("Ignoring malformed RTCP packet")
+            return
+
+        for report in reports:
+            if report.ssrc != self._sender.ssrc:
+                continue
+            sent_at = self._sr_sent.get(report.last_sr)
+            if sent_at is not None:
+                self.round_trip = max(
+                    0.0,
+                    time.monotonic() - sent_at - report.delay_since_last_sr / 65536,
+                )
+            self.last_report = report
+            self._on_report(report)
+
+    def _send_report(self) -> None:
+        """Send a sender report and schedule the next one."""
+        if self._transport is None:
+            return
+        now = time.time()
+        ntp_seconds, ntp_fraction = _ntp_time(now)
+        # Receivers echo the middle 32 bits of the NTP time as LSR
+        compact = ((ntp_seconds & 0xFFFF) << 16) | (ntp_fraction >> 16)
+        self._sr_sent[compact] = time.monotonic()
+        if len(self._sr_sent) > MAX_PENDING_SR:
+            del self._sr_sent[next(iter(self._sr_sent))]
+        self._transport.sendto(
+            build_sender_report(
+                self._sender.ssrc,
+                now,
+                self._sender.timestamp,
+                self._sender.packets_sent,
+                self._sender.octets_sent,
+            )
+        )
+        self._timer = asyncio.get_running_loop().call_later(
+            RTCP_INTERVAL, self._send_report
+        )
+
+    def close(self) -> None:
+        """Stop sending reports and close the socket."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
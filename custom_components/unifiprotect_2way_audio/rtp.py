@@ -0,0 +1,267 @@
+"""Native RTP sender for Opus talkback audio (RFC 3550 / RFC 7587)."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import random
+import struct
+from fractions import Fraction
+from urllib.parse import parse_qs, urlsplit
+
+import av
+
+from .ratecontrol import OpusSettings
+
+_LOGGER = logging.getLogger(__name__)
+
+# RFC 7587: the Opus RTP clock always runs at 48 kHz, whatever the encoder rate
+OPUS_RTP_CLOCK_RATE = 48000
+RTP_VERSION = 2
+RTP_HEADER = struct.Struct("!BBHII")
+DEFAULT_PAYLOAD_TYPE = 96
+
+# Packets due within this many seconds are sent together in one wakeup
+PACING_SLACK = 0.005
+
+# If the producer falls this far behind wall-clock time, the next packet
+# starts a new talkspurt instead of being sent in a catch-up burst
+MAX_PACING_LAG = 0.2
+
+# Seconds a redundant copy of each packet trails the original, so a short
+# loss burst rarely takes out both
+REDUNDANCY_DELAY = 0.03
+
+
+def parse_rtp_url(rtp_url: str) -> tuple[tuple[str, int], tuple[str, int] | None]:
+    """Return the remote address and optional local bind address of an RTP URL.
+
+    Accepts the ``rtp://host:port?localrtpport=N`` form libavformat understands.
+    """
+    parts = urlsplit(rtp_url)
+    if parts.scheme != "rtp" or not parts.hostname or not parts.port:
+        raise ValueError(f"Unsupported RTP URL: {rtp_url}")
+
+    query = parse_qs(parts.query)
+    local_port = (query.get("localrtpport") or query.get("localport") or [""])[0]
+    local_addr = ("0.0.0.0", int(local_port)) if local_port else None
+    return (parts.hostname, parts.port), local_addr
+
+
+class RtpOpusStream:
+    """Standalone Opus encoder shaped like the PyAV stream the pipeline expects.
+
+    Exposes ``codec_context`` and ``encode()`` so the resample/encode path is
+    shared with the libavformat muxer transport. libopus cannot change its
+    bitrate once open, so ``configure()`` replaces the encoder at the next
+    frame boundary after flushing the old one.
+    """
+
+    def __init__(self, sample_rate: int, settings: OpusSettings) -> None:
+        """Open an Opus encoder for mono S16 audio at ``sample_rate``."""
+        self.sample_rate = sample_rate
+        self.settings = settings
+        self.codec_context = self._create_codec_context()
+        self._reconfigure = False
+
+    def configure(self, settings: OpusSettings) -> None:
+        """Apply new encoder settings from the next encoded frame."""
+        if settings != self.settings:
+            self.settings = settings
+            self._reconfigure = True
+
+    def encode(self, frame: av.AudioFrame | None = None) -> list[av.Packet]:
+        """Encode a frame into Opus packets."""
+        if not self._reconfigure:
+            return self.codec_context.encode(frame)
+
+        packets = self.codec_context.encode(None)
+        self.codec_context = self._create_codec_context()
+        self._reconfigure = False
+        return packets + self.codec_context.encode(frame)
+
+    def _create_codec_context(self) -> av.CodecContext:
+        """Create an encoder with the current settings."""
+        codec_context = av.CodecContext.create("opus", "w")
+        codec_context.sample_rate = self.sample_rate
+        codec_context.format = "s16"
+        codec_context.layout = "mono"
+        codec_context.bit_rate = self.settings.bit_rate
+        codec_context.time_base = Fraction(1, self.sample_rate)
+        codec_context.options = self.settings.codec_options()
+        return codec_context
+
+
+class _RtpProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that reports transport errors back to the sender."""
+
+    def __init__(self, sender: RtpSender) -> None:
+        self._sender = sender
+
+    def error_received(self, exc: Exception) -> None:
+        self._sender.send_errors += 1
+        _LOGGER.debug("RTP send error: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._sender.transport_lost()
+
+
+class RtpSender:
+    """Packetize encoded Opus packets into RTP and pace them to wall-clock time.
+
+    One sender lives as long as its talkback switch, so the SSRC, sequence
+    number and timestamp stay continuous across session renewals: after a
+    reconnect or a pause the timestamp advances by the wall-clock gap and
+    the first packet carries the marker bit. Within a session, jumps in the
+    encoder's packet PTS (a pause skipped by the session clock) advance the
+    timestamp and the pacing schedule by the same amount.
+
+    With ``redundancy`` set, every datagram is sent a second time
+    ``REDUNDANCY_DELAY`` later; receivers discard the copy by sequence
+    number unless the original was lost.
+
+    ``mux()`` and ``close()`` mirror ``av.container.OutputContainer`` so the
+    sender drops into the existing encode path.
+    """
+
+    def __init__(self, payload_type: int = DEFAULT_PAYLOAD_TYPE) -> None:
+        """Initialize the sender with random SSRC, sequence and timestamp."""
+        self.payload_type = payload_type
+        self.ssrc = random.getrandbits(32)
+        self.sequence = random.getrandbits(16)
+        self.timestamp = random.getrandbits(32)
+        self.packets_sent = 0
+        self.octets_sent = 0
+        self.send_errors = 0
+        self.redundancy = False
+        self._transport: asyncio.DatagramTransport | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending: list[tuple[float, bytes]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # Wall-clock (loop) time at which the audio queued so far ends
+        self._media_end: float | None = None
+        # Encoder PTS expected for the next packet of the current session
+        self._next_pts: int | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True while a UDP transport is open."""
+        return self._transport is not None
+
+    @property
+    def local_port(self) -> int | None:
+        """Return the local UDP port while connected."""
+        if self._transport is None:
+            return None
+        return self._transport.get_extra_info("sockname")[1]
+
+    async def async_connect(self, rtp_url: str) -> None:
+        """Open a UDP transport towards the camera's talkback port."""
+        remote_addr, local_addr = parse_rtp_url(rtp_url)
+        self._loop = asyncio.get_running_loop()
+        self._transport, _ = await self._loop.create_datagram_endpoint(
+            lambda: _RtpProtocol(self),
+            remote_addr=remote_addr,
+            local_addr=local_addr,
+        )
+        _LOGGER.debug(
+            "RTP sender connected to %s:%d (ssrc=%08x, seq=%d)",
+            *remote_addr,
+            self.ssrc,
+            self.sequence,
+        )
+
+    def mux(self, packet: av.Packet) -> None:
+        """Queue one encoded Opus packet for paced transmission."""
+        rate = packet.time_base.denominator if packet.time_base else None
+        duration = packet.duration or 0
+        skipped = 0
+        if packet.pts is not None:
+            if self._next_pts is not None and packet.pts > self._next_pts:
+                skipped = packet.pts - self._next_pts
+            self._next_pts = packet.pts + duration
+        if rate and rate != OPUS_RTP_CLOCK_RATE:
+            duration = duration * OPUS_RTP_CLOCK_RATE // rate
+            skipped = skipped * OPUS_RTP_CLOCK_RATE // rate
+        self.send(bytes(packet), duration, skipped)
+
+    def send(self, payload: bytes, samples: int, skipped: int = 0) -> None:
+        """Queue an Opus payload covering ``samples`` ticks of the 48 kHz clock.
+
+        ``skipped`` ticks of silence that were not encoded precede the payload.
+        """
+        if self._transport is None or self._loop is None:
+            return
+
+        now = self._loop.time()
+        marker = 0
+        if skipped and self._media_end is not None:
+            # Keep the pause in both the timestamps and the pacing schedule
+            self.timestamp = (self.timestamp + skipped) & 0xFFFFFFFF
+            self._media_end += skipped / OPUS_RTP_CLOCK_RATE
+            marker = 0x80
+        if self._media_end is None or now - self._media_end > MAX_PACING_LAG:
+            # New talkspurt: send immediately and keep the timestamp in step
+            # with the wall clock across the gap
+            if self._media_end is not None:
+                gap = int((now - self._media_end) * OPUS_RTP_CLOCK_RATE)
+                self.timestamp = (self.timestamp + gap) & 0xFFFFFFFF
+            self._media_end = now
+            marker = 0x80
+
+        header = RTP_HEADER.pack(
+            RTP_VERSION << 6,
+            marker | self.payload_type,
+            self.sequence,
+            self.timestamp,
+            self.ssrc,
+        )
+        datagram = header + payload
+        # Keep the queue ordered by due time; redundant copies interleave
+        bisect.insort(self._pending, (self._media_end, datagram))
+        if self.redundancy:
+            bisect.insort(self._pending, (self._media_end + REDUNDANCY_DELAY, datagram))
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        self.timestamp = (self.timestamp + samples) & 0xFFFFFFFF
+        self._media_end += samples / OPUS_RTP_CLOCK_RATE
+
+        if self._flush_handle is None:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Send every packet that is due, then sleep until the next one."""
+        self._flush_handle = None
+        if self._transport is None or self._loop is None:
+            self._pending.clear()
+            return
+
+        deadline = self._loop.time() + PACING_SLACK
+        due = 0
+        for due_at, datagram in self._pending:
+            if due_at > deadline:
+                break
+            self._transport.sendto(datagram)
+            self.packets_sent += 1
+            self.octets_sent += len(datagram)
+            due += 1
+        del self._pending[:due]
+
+        if self._pending:
+            self._flush_handle = self._loop.call_at(self._pending[0][0], self._flush)
+
+    def transport_lost(self) -> None:
+        """Forget the transport after the socket closes."""
+        self._transport = None
+
+    def close(self) -> None:
+        """Close the transport and drop unsent packets, keeping RTP state."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+        # The next session starts a new encoder with its own PTS origin
+        self._next_pts = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
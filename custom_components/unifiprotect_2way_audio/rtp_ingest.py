@@ -0,0 +1,229 @@
+"""UDP RTP ingest of G.711 and Opus audio from SIP/VoIP gateways."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+import numpy as np
+
+from .audio_format import OPUS_PACKET_HEADER, OPUS_PACKETS_FORMAT, PCM_FORMAT
+from .rtp import RTP_HEADER, RTP_VERSION
+from .sequencer import ChunkSequencer
+
+_LOGGER = logging.getLogger(__name__)
+
+# Static payload types (RFC 3551); Opus always has a dynamic one (96-127)
+PAYLOAD_PCMU = 0
+PAYLOAD_PCMA = 8
+FIRST_DYNAMIC_PAYLOAD = 96
+G711_SAMPLE_RATE = 8000
+
+RTP_SEQUENCE_MODULO = 1 << 16
+
+# Jitter buffer: packets held behind a missing one before it is skipped, and
+# the longest a held packet waits for it
+JITTER_DEPTH = 3
+JITTER_DELAY = 0.04
+
+# A packet this far behind the stream means the sender restarted it
+# (RFC 3550 A.1 MAX_MISORDER)
+MAX_MISORDER = 100
+
+# (audio chunk, format, sample rate) handed to the talkback switch
+IngestCallback = Callable[[bytes, str, int | None], None]
+
+
+def _ulaw_table() -> np.ndarray:
+    """Return the G.711 mu-law to linear 16-bit decoding table."""
+    code = ~np.arange(256) & 0xFF
+    exponent = (code >> 4) & 0x07
+    magnitude = ((((code & 0x0F) << 3) + 0x84) << exponent) - 0x84
+    return np.where(code & 0x80, -magnitude, magnitude).astype("<i2")
+
+
+def _alaw_table() -> np.ndarray:
+    """Return the G.711 A-law to linear 16-bit decoding table."""
+    code = np.arange(256) ^ 0x55
+    exponent = (code >> 4) & 0x07
+    mantissa = (code & 0x0F) << 4
+    magnitude = np.where(
+        exponent == 0,
+        mantissa + 8,
+        (mantissa + 0x108) << np.maximum(exponent - 1, 0),
+    )
+    return np.where(code & 0x80, magnitude, -magnitude).astype("<i2")
+
+
+G711_TABLES = {PAYLOAD_PCMU: _ulaw_table(), PAYLOAD_PCMA: _alaw_table()}
+
+
+def parse_rtp(datagram: bytes) -> tuple[int, int, int, int, memoryview]:
+    """Return (payload type, sequence, timestamp, SSRC, payload) of a packet.
+
+    Raises ValueError for anything that is not an RTP version 2 packet.
+    """
+    if len(datagram) < RTP_HEADER.size:
+        raise ValueError("Truncated RTP header")
+    first, second, sequence, timestamp, ssrc = RTP_HEADER.unpack_from(datagram)
+    if first >> 6 != RTP_VERSION:
+        raise ValueError("Not an RTP version 2 packet")
+    view = memoryview(datagram)
+    start = RTP_HEADER.size + 4 * (first & 0x0F)
+    if first & 0x10:
+        # Header extension: 16-bit profile, 16-bit length in 32-bit words
+        if len(view) < start + 4:
+            raise ValueError("Truncated RTP header extension")
+        start += 4 + 4 * int.from_bytes(view[start + 2 : start + 4], "big")
+    end = len(view)
+    if first & 0x20 and end:
+        end -= view[end - 1]
+    if start >= end:
+        raise ValueError("RTP packet without payload")
+    return second & 0x7F, sequence, timestamp, ssrc, view[start:end]
+
+
+class _IngestProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol feeding received RTP to its ingest."""
+
+    def __init__(self, ingest: RtpIngest) -> None:
+        self._ingest = ingest
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        self._ingest.datagram_received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        _LOGGER.debug("RTP ingest error: %s", exc)
+
+
+class RtpIngest:
+    """Receive RTP audio from a gateway and hand it on in order.
+
+    Packets pass a small jitter buffer keyed by sequence number: reordered
+    packets are put back in order, and a missing one is skipped once
+    ``JITTER_DEPTH`` packets wait behind it or the oldest has waited
+    ``JITTER_DELAY``. Opus payloads are passed on as ``opus_packets`` chunks
+    stamped with their RTP timestamp, so an Opus camera receives them
+    without transcoding; G.711 is expanded to 8 kHz PCM.
+
+    Opus is expected on ``opus_payload_type``; without one, the first dynamic
+    payload type of each stream is taken as Opus, so telephone-event (DTMF)
+    packets sent alongside it are ignored. Only packets from ``source`` are
+    accepted when it is set. A new SSRC or a sequence far behind the stream
+    restarts the buffer.
+    """
+
+    def __init__(
+        self,
+        on_audio: IngestCallback,
+        source: str | None = None,
+        opus_payload_type: int | None = None,
+    ) -> None:
+        """Initialize an ingest that reports audio to ``on_audio``."""
+        self.source = source
+        self.opus_payload_type = opus_payload_type
+        self.packets_received = 0
+        self.rejected_packets = 0
+        self._on_audio = on_audio
+        self._transport: asyncio.DatagramTransport | None = None
+        self._ssrc: int | None = None
+        self._stream_opus_type = opus_payload_type
+        self._sequencer = ChunkSequencer(JITTER_DEPTH, RTP_SEQUENCE_MODULO)
+        self._lost = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def port(self) -> int | None:
+        """Return the local UDP port while listening."""
+        if self._transport is None:
+            return None
+        return self._transport.get_extra_info("sockname")[1]
+
+    @property
+    def lost_packets(self) -> int:
+        """Return packets skipped as lost, across stream restarts."""
+        return self._lost + self._sequencer.lost
+
+    async def async_start(self, port: int, host: str = "0.0.0.0") -> None:
+        """Listen for RTP on ``port``."""
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _IngestProtocol(self), local_addr=(host, port)
+        )
+        _LOGGER.debug("RTP ingest listening on %s:%d", host, self.port)
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Queue one RTP packet and deliver whatever is now in order."""
+        if self.source and addr[0] != self.source:
+            self.rejected_packets += 1
+            return
+        try:
+            _payload_type, sequence, _timestamp, ssrc, _payload = parse_rtp(data)
+        except ValueError:
+            self.rejected_packets += 1
+            return
+
+        self.packets_received += 1
+        distance = self._sequencer.distance(sequence)
+        if ssrc != self._ssrc or (distance is not None and distance < -MAX_MISORDER):
+            self._restart(ssrc)
+        for packet in self._sequencer.push(sequence, data):
+            self._deliver(packet)
+
+        if not self._sequencer.held:
+            self._cancel_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                JITTER_DELAY, self._flush
+            )
+
+    def _restart(self, ssrc: int) -> None:
+        """Start a new stream, delivering what the old one still held."""
+        self._cancel_flush()
+        while self._sequencer.held:
+            for packet in self._sequencer.skip_gap():
+                self._deliver(packet)
+        self._lost += self._sequencer.lost
+        self._sequencer = ChunkSequencer(JITTER_DEPTH, RTP_SEQUENCE_MODULO)
+        self._ssrc = ssrc
+        self._stream_opus_type = self.opus_payload_type
+
+    def _flush(self) -> None:
+        """Give up on a missing packet that held the buffer too long."""
+        self._flush_handle = None
+        for packet in self._sequencer.skip_gap():
+            self._deliver(packet)
+        if self._sequencer.held:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                JITTER_DELAY, self._flush
+            )
+
+    def _cancel_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _deliver(self, datagram: bytes) -> None:
+        """Convert one in-order packet for the switch."""
+        payload_type, _sequence, timestamp, _ssrc, payload = parse_rtp(datagram)
+        table = G711_TABLES.get(payload_type)
+        if table is not None:
+            pcm = table[np.frombuffer(payload, dtype=np.uint8)]
+            self._on_audio(pcm.tobytes(), PCM_FORMAT, G711_SAMPLE_RATE)
+            return
+        if self._stream_opus_type is None and payload_type >= FIRST_DYNAMIC_PAYLOAD:
+            self._stream_opus_type = payload_type
+        if payload_type == self._stream_opus_type:
+            # RFC 7587 timestamps run on the 48 kHz clock opus_packets expects
+            header = OPUS_PACKET_HEADER.pack(timestamp, len(payload))
+            self._on_audio(header + payload, OPUS_PACKETS_FORMAT, None)
+        else:
+            self.rejected_packets += 1
+
+    def close(self) -> None:
+        """Stop listening and drop buffered packets."""
+        self._cancel_flush()
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
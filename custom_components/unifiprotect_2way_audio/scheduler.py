@@ -0,0 +1,136 @@
+"""Earliest-deadline-first scheduling of encode work across talkback sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+# Seconds of past encode time counted against a session's quota
+QUOTA_WINDOW = 1.0
+
+
+class EncodeScheduler:
+    """Share the event loop's encode time between talkback sessions.
+
+    Every session decodes, resamples and encodes its audio on the event
+    loop. Left alone, a session whose ring holds a burst of chunks encodes
+    them back to back without yielding, and other cameras' audio waits
+    behind it until their playout runs dry. Instead each session awaits a
+    slot before encoding a chunk. Slots are granted one at a time, each in
+    a new loop iteration, to the waiting chunk whose audio is due to play
+    first. A session that used more than its quota of the last
+    ``QUOTA_WINDOW`` (an equal share among open sessions) waits behind every
+    session within its quota, so a flooding producer cannot crowd out the
+    rest even when its own deadlines are early.
+    """
+
+    def __init__(
+        self,
+        window: float = QUOTA_WINDOW,
+        time_func: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an idle scheduler."""
+        self.deadline_misses = 0
+        self._window = window
+        self._time = time_func
+        self._sessions: set[ScheduledSession] = set()
+        # (over quota, deadline, sequence, future) of chunks waiting for a slot
+        self._waiting: list[tuple[bool, float, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._busy = False
+
+    @property
+    def quota(self) -> float:
+        """Return the encode seconds per window each open session is due."""
+        return self._window / max(1, len(self._sessions))
+
+    def open_session(self) -> ScheduledSession:
+        """Return a handle through which one talkback session is scheduled."""
+        session = ScheduledSession(self)
+        self._sessions.add(session)
+        return session
+
+    async def _acquire(self, session: ScheduledSession, deadline: float) -> None:
+        """Wait until the slot is granted to ``session``."""
+        future = asyncio.get_running_loop().create_future()
+        over_quota = session.encode_time() > self.quota
+        heapq.heappush(
+            self._waiting, (over_quota, deadline, next(self._sequence), future)
+        )
+        try:
+            # A free slot is granted at once, and awaiting a done future does
+            # not yield: give other sessions a turn to queue their chunks
+            await asyncio.sleep(0)
+            self._grant()
+            await future
+        except asyncio.CancelledError:
+            # Cancelled after the grant but before resuming: pass it on
+            if future.done() and not future.cancelled():
+                self._release()
+            future.cancel()
+            raise
+
+    def _release(self) -> None:
+        """Free the slot for the next waiting chunk."""
+        self._busy = False
+        self._grant()
+
+    def _grant(self) -> None:
+        """Hand a free slot to the waiting chunk with the earliest deadline."""
+        while not self._busy and self._waiting:
+            future = heapq.heappop(self._waiting)[-1]
+            if not future.done():
+                self._busy = True
+                future.set_result(None)
+
+
+class ScheduledSession:
+    """One talkback session's share of an ``EncodeScheduler``."""
+
+    def __init__(self, scheduler: EncodeScheduler) -> None:
+        """Initialize with no encode time used."""
+        self.deadline_misses = 0
+        self._scheduler = scheduler
+        # (end, duration) of the slots held within the quota window
+        self._runs: deque[tuple[float, float]] = deque()
+        self._used = 0.0
+
+    def encode_time(self) -> float:
+        """Return the seconds spent encoding within the quota window."""
+        horizon = self._scheduler._time() - self._scheduler._window
+        while self._runs and self._runs[0][0] < horizon:
+            self._used -= self._runs.popleft()[1]
+        return self._used
+
+    @asynccontextmanager
+    async def slot(self, deadline: float | None = None) -> AsyncIterator[None]:
+        """Wait for this session's turn, then encode within the block.
+
+        ``deadline`` is the monotonic time by which the chunk must be
+        encoded for playout to continue without a gap; None means as soon
+        as possible. Finishing past a deadline that had not yet passed when
+        the slot was requested counts as a miss.
+        """
+        scheduler = self._scheduler
+        requested = scheduler._time()
+        await scheduler._acquire(self, requested if deadline is None else deadline)
+        start = scheduler._time()
+        try:
+            yield
+        finally:
+            end = scheduler._time()
+            self._runs.append((end, end - start))
+            self._used += end - start
+            if deadline is not None and requested < deadline < end:
+                self.deadline_misses += 1
+                scheduler.deadline_misses += 1
+            scheduler._release()
+
+    def close(self) -> None:
+        """Stop counting this session in the other sessions' quotas."""
+        self._scheduler._sessions.discard(self)
@@ -0,0 +1,100 @@
+"""In-order delivery of sequence-numbered audio chunks from a client."""
+
+from __future__ import annotations
+
+import struct
+
+# Sequenced binary frames carry a big-endian 32-bit chunk number before the audio
+SEQUENCE_HEADER = struct.Struct(">I")
+
+SEQUENCE_MODULO = 1 << 32
+
+# Chunks held back waiting for a missing one before it is given up as lost
+REORDER_DEPTH = 4
+
+
+class ChunkSequencer:
+    """Reorder numbered chunks and skip the ones that never arrive.
+
+    Chunks are released in sequence order. One that arrives ahead of a gap
+    is held until the gap fills; once more than ``depth`` chunks are held the
+    missing ones are counted as lost and delivery resumes past them. Chunks
+    behind the delivered position are late or duplicated and are dropped.
+    On an ordered transport nothing is ever held, so this adds no latency.
+
+    ``acked`` is the cumulative acknowledgement: every chunk up to and
+    including it has been delivered or given up.
+    """
+
+    def __init__(
+        self, depth: int = REORDER_DEPTH, modulo: int = SEQUENCE_MODULO
+    ) -> None:
+        """Initialize a sequencer that starts at the first chunk it sees.
+
+        ``modulo`` is where sequence numbers wrap, e.g. 65536 for RTP.
+        """
+        self.depth = depth
+        self.modulo = modulo
+        self.lost = 0
+        self.late = 0
+        self._started = False
+        self._expected = 0
+        self._held: dict[int, bytes] = {}
+
+    @property
+    def acked(self) -> int | None:
+        """Return the last chunk number delivered or skipped, if any."""
+        if not self._started:
+            return None
+        return (self._expected - 1) % self.modulo
+
+    @property
+    def held(self) -> int:
+        """Return the number of chunks waiting for a missing one."""
+        return len(self._held)
+
+    def distance(self, seq: int) -> int | None:
+        """Return how far ``seq`` is ahead of the next expected chunk.
+
+        Negative for chunks already delivered or skipped; None before the
+        first chunk.
+        """
+        if not self._started:
+            return None
+        # Sequence numbers wrap; compare them as a signed distance
+        half = self.modulo // 2
+        return (seq - self._expected + half) % self.modulo - half
+
+    def push(self, seq: int, payload: bytes) -> list[bytes]:
+        """Accept chunk ``seq`` and return the chunks now deliverable in order."""
+        if not self._started:
+            self._started = True
+            self._expected = seq
+        distance = self.distance(seq)
+        if distance is None or distance < 0 or seq in self._held:
+            self.late += 1
+            return []
+
+        self._held[seq] = payload
+        ready = self._release()
+        if len(self._held) > self.depth:
+            ready.extend(self.skip_gap())
+        return ready
+
+    def skip_gap(self) -> list[bytes]:
+        """Give up on the gap before the oldest held chunk and release past it."""
+        if not self._held:
+            return []
+        expected = self._expected
+        oldest = min(self._held, key=lambda held: (held - expected) % self.modulo)
+        self.lost += (oldest - expected) % self.modulo
+        self._expected = oldest
+        return self._release()
+
+    def _release(self) -> list[bytes]:
+        """Pop the run of held chunks starting at the expected number."""
+        ready = []
+        while self._expected in self._held:
+            ready.append(self._held.pop(self._expected))
+            self._expected = (self._expected + 1) % self.modulo
+        return ready
@@ -0,0 +1,164 @@
+"""Text-to-speech audio for the talkback speak service."""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import AsyncIterator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+# Seconds of PCM handed to the encoder per chunk
+SPEAK_CHUNK_DURATION = 0.1
+
+# Seconds of speech queued ahead of real time; more would only sit in the
+# session buffer, less risks gaps when synthesis stalls
+SPEAK_LEAD = 0.5
+
+# Sample rate requested from TTS engines when the camera's is not yet known
+SPEAK_SAMPLE_RATE = 24000
+
+RIFF_HEADER = struct.Struct("<4sI4s")
+WAV_CHUNK_HEADER = struct.Struct("<4sI")
+# Audio format, channels, sample rate, byte rate, block align, bits per sample
+WAV_FMT = struct.Struct("<HHIIHH")
+WAV_FORMAT_PCM = 1
+
+
+class WavStreamParser:
+    """Split a WAV file into PCM S16LE mono chunks as its bytes arrive.
+
+    Streamed WAV files often carry a placeholder data size, so everything
+    after the ``data`` chunk header is treated as samples.
+    """
+
+    def __init__(self, chunk_duration: float = SPEAK_CHUNK_DURATION) -> None:
+        """Initialize the parser before the header has been seen."""
+        self._chunk_duration = chunk_duration
+        self._buffer = bytearray()
+        self._in_data = False
+        self.sample_rate: int | None = None
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Consume bytes and return the complete PCM chunks now available."""
+        self._buffer += data
+        if not self._in_data and not self._parse_header():
+            return []
+
+        assert self.sample_rate is not None
+        chunk_size = 2 * max(1, round(self.sample_rate * self._chunk_duration))
+        chunks = [
+            bytes(self._buffer[start : start + chunk_size])
+            for start in range(0, len(self._buffer) - chunk_size + 1, chunk_size)
+        ]
+        del self._buffer[: len(chunks) * chunk_size]
+        return chunks
+
+    def flush(self) -> bytes:
+        """Return the remaining whole samples at the end of the stream."""
+        if not self._in_data:
+            raise ValueError("Incomplete WAV header")
+        tail = bytes(self._buffer[: len(self._buffer) - len(self._buffer) % 2])
+        self._buffer.clear()
+        return tail
+
+    def _parse_header(self) -> bool:
+        """Strip the RIFF header once complete; return True when samples follow."""
+        if len(self._buffer) < RIFF_HEADER.size:
+            return False
+        riff, _, wave = RIFF_HEADER.unpack_from(self._buffer)
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError("Not a WAV file")
+
+        offset = RIFF_HEADER.size
+        while offset + WAV_CHUNK_HEADER.size <= len(self._buffer):
+            chunk_id, size = WAV_CHUNK_HEADER.unpack_from(self._buffer, offset)
+            offset += WAV_CHUNK_HEADER.size
+            if chunk_id == b"data":
+                if self.sample_rate is None:
+                    raise ValueError("WAV data before format chunk")
+                del self._buffer[:offset]
+                self._in_data = True
+                return True
+            if offset + size > len(self._buffer):
+                return False
+            if chunk_id == b"fmt ":
+                audio_format, channels, rate, _, _, bits = WAV_FMT.unpack_from(
+                    self._buffer, offset
+                )
+                if (audio_format, channels, bits) != (WAV_FORMAT_PCM, 1, 16):
+                    raise ValueError(
+                        f"Unsupported WAV format {audio_format}, "
+                        f"{channels} channels, {bits} bits"
+                    )
+                self.sample_rate = rate
+            offset += size + size % 2
+        return False
+
+
+async def async_stream_tts(
+    hass: HomeAssistant,
+    message: str,
+    engine: str | None,
+    language: str | None,
+    options: dict | None,
+    sample_rate: int,
+) -> AsyncIterator[bytes]:
+    """Yield WAV bytes for a message, mono S16LE at ``sample_rate``.
+
+    Engines that stream are consumed as they synthesize; on Home Assistant
+    releases without TTS streaming the finished file is yielded at once.
+    """
+    # TTS is an optional integration; import it only when speech is requested
+    from homeassistant.components import tts
+
+    if (resolved := tts.async_resolve_engine(hass, engine)) is None:
+        raise HomeAssistantError(f"Unknown TTS engine: {engine}")
+    engine = resolved
+
+    options = {
+        **(options or {}),
+        tts.ATTR_PREFERRED_FORMAT: "wav",
+        tts.ATTR_PREFERRED_SAMPLE_RATE: sample_rate,
+        tts.ATTR_PREFERRED_SAMPLE_CHANNELS: 1,
+        tts.ATTR_PREFERRED_SAMPLE_BYTES: 2,
+    }
+    create_stream = getattr(tts, "async_create_stream", None)
+    if create_stream is not None:
+        stream = create_stream(hass, engine, language, options)
+        stream.async_set_message(message)
+        async for data in stream.async_stream_result():
+            yield data
+        return
+
+    media_source_id = tts.generate_media_source_id(
+        hass, message, engine, language, options
+    )
+    _, data = await tts.async_get_media_source_audio(hass, media_source_id)
+    yield data
+
+
+async def async_speech_pcm(
+    hass: HomeAssistant,
+    message: str,
+    engine: str | None,
+    language: str | None,
+    options: dict | None,
+    sample_rate: int,
+) -> AsyncIterator[tuple[bytes, int]]:
+    """Yield (PCM S16LE mono chunk, sample rate) pairs for a TTS message."""
+    parser = WavStreamParser()
+
+    def parsed_rate() -> int:
+        # Chunks only follow a complete header, which carries the rate
+        if parser.sample_rate is None:
+            raise ValueError("Incomplete WAV header")
+        return parser.sample_rate
+
+    async for data in async_stream_tts(
+        hass, message, engine, language, options, sample_rate
+    ):
+        for chunk in parser.feed(data):
+            yield chunk, parsed_rate()
+    if tail := parser.flush():
+        yield tail, parsed_rate()
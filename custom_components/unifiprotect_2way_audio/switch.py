@@ -4,24 +4,91 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import io
+import contextlib
 import logging
-from typing import Any
+import time
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Any
 
 import av
+import numpy as np
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import (
     AddEntitiesCallback,
     async_get_current_platform,
 )
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 from uiprotect.data.devices import Camera as UPCamera
 from uiprotect.stream import TalkbackSession
 
-from .const import DOMAIN
+from .aec import EchoCanceller, frame_to_mono, mono_to_frame
+from .arbitration import (
+    ARBITRATION_EXCLUSIVE,
+    ARBITRATION_MIX,
+    PRIORITY_ANNOUNCEMENT,
+    PRIORITY_USER,
+    SessionArbiter,
+)
+from .audio_format import (
+    MIN_WEBM_SIZE,
+    OPUS_PACKETS_FORMAT,
+    PCM_FORMAT,
+    WEBM_EBML_HEADER,
+    detect_audio_format,
+    opus_timestamp_gap,
+    parse_opus_packets,
+    repair_prefix,
+)
+from .audio_log import AudioPipelineLogger
+from .clock import SessionClock
+from .const import (
+    ATTR_CHANNELS,
+    ATTR_CODEC,
+    ATTR_SAMPLE_RATE,
+    DEFAULT_CHANNELS,
+    DEFAULT_ECHO_CANCELLATION,
+    DEFAULT_EXPECTED_PACKET_LOSS,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_LOSS_RESILIENCE,
+    DEFAULT_MAX_BIT_RATE,
+    DEFAULT_MAX_QUEUED_CHUNKS,
+    DEFAULT_MIN_BIT_RATE,
+    DEFAULT_RTP_TRANSPORT,
+    DEFAULT_VOICE_GATE,
+    DOMAIN,
+    LOSS_RESILIENCE_MODES,
+    RESILIENCE_REDUNDANCY,
+    TRANSPORT_NATIVE,
+    TRANSPORT_PYAV,
+)
+from .downlink import DOWNLINK_SAMPLE_RATE
+from .encoding import (
+    OutputResampler,
+    clocked_frames,
+    decode_frames,
+    pcm_frame,
+    stamp_opus_packet,
+    webm_init_segment,
+)
+from .mixer import PcmMixer
+from .ratecontrol import OpusRateController, resilience_settings
+from .recorder import SessionRecording
+from .ringbuffer import ByteRing
+from .rtcp import ReceptionReport, RtcpSession
+from .rtp import OPUS_RTP_CLOCK_RATE, RtpOpusStream, RtpSender
+from .rtp_ingest import RtpIngest
+from .scheduler import EncodeScheduler, ScheduledSession
+from .speech import SPEAK_LEAD, SPEAK_SAMPLE_RATE, async_speech_pcm
+from .vad import VoiceActivityDetector
+
+if TYPE_CHECKING:
+    from .manager import StreamConfigManager
+    from .transcoder import WorkerSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,19 +99,28 @@ STATE_ACTIVE = "active"
 STATE_STOPPING = "stopping"
 STATE_ERROR = "error"
 
+# Reasons recorded when a session ends
+STOP_REASON_USER = "user"
+STOP_REASON_IDLE = "idle_timeout"
+STOP_REASON_ERROR = "error"
+STOP_REASON_STREAM_CLOSED = "stream_closed"
+
+# Upper bound on how long the session loop sleeps between idle checks
+QUEUE_POLL_INTERVAL = 5.0
+
 # Audio processing constants
-# WebM container structure: EBML Header (typically 40-50 bytes) + Segment
-# Header (~20-30 bytes)
-# Setting minimum to 50 bytes ensures we have at least the EBML header before
-# attempting to parse
-# This prevents PyAV from failing on partial/incomplete MediaRecorder chunks
-MIN_WEBM_SIZE = 50  # Minimum bytes for valid WebM container with EBML header
-WEBM_EBML_HEADER = b"\x1a\x45\xdf\xa3"
-WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
-WEBM_EBML_HEADER_TRUNC = b"\x45\xdf\xa3"
-WEBM_CLUSTER_ID_TRUNC = b"\x43\xb6\x75"
-OGG_CAPTURE_PATTERN = b"OggS"
-PCM_FORMAT = "pcm_s16le"
+MIX_FRAME_DURATION = 0.02  # Seconds of audio per mixed frame
+AUDIO_RING_SIZE = 1 << 19  # Bytes of pending audio buffered per session
+OPUS_BIT_RATE = 24000  # 24 kbps
+
+# Producer key for audio that arrives without an owner (e.g. send_audio)
+SERVICE_PRODUCER = "service"
+
+# Producer key prefix for messages spoken by the speak service
+SPEAK_PRODUCER = "speak"
+
+# Producer key for audio received by the RTP ingest listener
+RTP_INGEST_PRODUCER = "rtp_ingest"
 
 
 async def async_setup_entry(
@@ -67,55 +143,46 @@ async def async_setup_entry(
 
         # Register send_audio service
         platform = async_get_current_platform()
-
-        async def handle_send_audio(call: ServiceCall) -> None:
-            """Handle send_audio service call."""
-            entity_ids_data = call.data.get("entity_id", [])
-            if isinstance(entity_ids_data, str):
-                entity_ids = [entity_ids_data]
-            else:
-                entity_ids = entity_ids_data
-            audio_data_b64 = call.data.get("audio_data", "")
-            audio_format = call.data.get("audio_format")
-            sample_rate = call.data.get("sample_rate")
-
-            if not audio_data_b64:
-                _LOGGER.warning("No audio data provided to send_audio service")
-                return
-
-            # Find target entities
-            for entity in entities:
-                if entity.entity_id in entity_ids:
-                    try:
-                        # Decode base64 audio data
-                        audio_bytes = base64.b64decode(audio_data_b64)
-                        await entity.send_audio_data(
-                            audio_bytes,
-                            audio_format=audio_format,
-                            sample_rate=sample_rate,
-                        )
-                    except Exception as err:
-                        _LOGGER.error(
-                            "Failed to send audio to %s: %s",
-                            entity.entity_id,
-                            err,
-                        )
-
         platform.async_register_entity_service(
             "send_audio",
             {
                 "audio_data": str,
                 "audio_format": str,
                 "sample_rate": int,
+                "priority": int,
             },
-            handle_send_audio,
+            "async_send_audio",
         )
         _LOGGER.info("Registered send_audio service")
+
+        platform.async_register_entity_service(
+            "speak",
+            {
+                "message": str,
+                "engine": str,
+                "language": str,
+                "options": dict,
+                "priority": int,
+            },
+            "async_speak",
+        )
+
+        platform.async_register_entity_service(
+            "set_loss_resilience",
+            {"mode": str, "expected_packet_loss": int},
+            "async_set_loss_resilience",
+        )
+
+        platform.async_register_entity_service(
+            "set_rtp_ingest",
+            {"port": int, "source": str, "opus_payload_type": int},
+            "async_set_rtp_ingest",
+        )
     else:
         _LOGGER.warning("No UniFi Protect switch entities found")
 
 
-class TalkbackSwitch(SwitchEntity):
+class TalkbackSwitch(SwitchEntity, RestoreEntity):
     """Representation of a UniFi Protect 2-Way Audio talkback control switch.
 
     This entity represents the audio backchannel transmit state for a
@@ -130,9 +197,11 @@ class TalkbackSwitch(SwitchEntity):
         camera_unique_id: str,
         device_info: DeviceInfo,
         media_player_id: str | None,
+        manager: StreamConfigManager | None = None,
     ) -> None:
         """Initialize the talkback switch entity."""
         self.hass = hass
+        self._manager = manager
         self._camera_entity_id = camera_entity_id
         self._camera_unique_id = camera_unique_id
         self._media_player_id = media_player_id
@@ -149,13 +218,60 @@ class TalkbackSwitch(SwitchEntity):
         self._is_on = False
         self._session_state = STATE_IDLE
         self._last_error = ""
-        self._transport = "pyav"  # Use PyAV for audio processing
+        self._transport = self._rtp_transport
 
         # Backchannel session management
         self._backchannel_task: asyncio.Task | None = None
         self._talkback_session: TalkbackSession | None = None
-        self._audio_queue: asyncio.Queue = asyncio.Queue()
+        # Audio format the camera negotiated, fixed for the session's lifetime
+        self._capabilities: dict[str, Any] | None = None
+        # Single hand-off between producers and the encoder; the buffer is
+        # only allocated while a session has audio pending
+        self._audio_ring = ByteRing(AUDIO_RING_SIZE, self._max_queued_chunks)
+        self._audio_ready = asyncio.Event()
+        # Set whenever the encoder takes a chunk, for producers that wait
+        self._audio_consumed = asyncio.Event()
+        self._producer_slots: dict[Hashable, int] = {}
+        self._slot_producers: list[Hashable] = []
         self._protect_camera: UPCamera | None = None
+        self._resampler: OutputResampler | None = None
+        self._last_audio_time: float | None = None
+        self._stop_reason: str | None = None
+        self._dropped_chunks = 0
+        self._arbiter = SessionArbiter(
+            self._arbitration_policy, self._forget_producer_audio
+        )
+        self._mixer: PcmMixer | None = None
+        self._mix_resamplers: dict[Hashable, av.AudioResampler] = {}
+        self._clock: SessionClock | None = None
+        # This session's turn at encoding, shared fairly with other cameras
+        self._encode_session: ScheduledSession | None = None
+        # Per producer of client-encoded Opus: where its timeline has reached,
+        # and a decoder for sessions that cannot forward the packets as is
+        self._opus_timestamps: dict[Hashable, int] = {}
+        self._opus_decoders: dict[Hashable, av.CodecContext] = {}
+        # Skips encoding while nobody speaks; None when the gate is disabled
+        self._vad: VoiceActivityDetector | None = None
+        # Removes camera audio that listeners' microphones pick up again; the
+        # tap is only set while cancellation is enabled for a session
+        self._echo_canceller: EchoCanceller | None = None
+        self._echo_reference_unsub: Callable[[], None] | None = None
+        self._audio_log = AudioPipelineLogger(_LOGGER, camera_entity_id)
+        # Outlives sessions so SSRC, sequence and timestamp stay continuous
+        self._rtp_sender = RtpSender()
+        self._worker_session: WorkerSession | None = None
+        # Native transport only: RTCP feedback drives the Opus encoder
+        self._rtcp: RtcpSession | None = None
+        self._opus_stream: RtpOpusStream | None = None
+        self._rate_controller: OpusRateController | None = None
+        # Per-camera (mode, expected loss %) overriding the integration default
+        self._loss_resilience_override: tuple[str, int] | None = None
+        # Audit recording of the encoded session audio, when enabled
+        self._recording: SessionRecording | None = None
+        # UDP listener for RTP from a SIP/VoIP gateway, while configured
+        self._rtp_ingest: RtpIngest | None = None
+        # Milliseconds from the last speak call to its first queued audio
+        self._time_to_first_audio: int | None = None
 
         # Audio transmission statistics for debugging
         self._audio_bytes_sent = 0
@@ -171,6 +287,84 @@ class TalkbackSwitch(SwitchEntity):
         """Return True if the backchannel is active."""
         return self._is_on
 
+    @property
+    def audio_log(self) -> AudioPipelineLogger:
+        """Return the rate-limited logger for this camera's audio pipeline."""
+        return self._audio_log
+
+    @property
+    def manager(self) -> StreamConfigManager | None:
+        """Return the manager shared by the config entry's entities."""
+        return self._manager
+
+    @property
+    def capabilities(self) -> dict[str, Any] | None:
+        """Return the active session's codec, sample rate and channel count."""
+        return self._capabilities
+
+    @property
+    def camera_entity_id(self) -> str:
+        """Return the camera entity this switch talks through."""
+        return self._camera_entity_id
+
+    @property
+    def _idle_timeout(self) -> int:
+        """Seconds without audio before the session is stopped (0 disables)."""
+        if self._manager is None:
+            return DEFAULT_IDLE_TIMEOUT
+        return self._manager.idle_timeout
+
+    @property
+    def _arbitration_policy(self) -> str:
+        """Policy used when several producers feed this camera."""
+        if self._manager is None:
+            return ARBITRATION_EXCLUSIVE
+        return self._manager.arbitration_policy
+
+    @property
+    def _rtp_transport(self) -> str:
+        """Transport used to send encoded audio to the camera."""
+        if self._manager is None:
+            return DEFAULT_RTP_TRANSPORT
+        return self._manager.rtp_transport
+
+    @property
+    def _bit_rate_range(self) -> tuple[int, int]:
+        """Bounds (bit/s) for the adaptive Opus bitrate."""
+        if self._manager is None:
+            return DEFAULT_MIN_BIT_RATE * 1000, DEFAULT_MAX_BIT_RATE * 1000
+        return self._manager.bit_rate_range
+
+    @property
+    def _loss_resilience(self) -> tuple[str, int]:
+        """Opus loss-resilience mode and expected loss percentage in effect."""
+        if self._loss_resilience_override is not None:
+            return self._loss_resilience_override
+        if self._manager is None:
+            return DEFAULT_LOSS_RESILIENCE, DEFAULT_EXPECTED_PACKET_LOSS
+        return self._manager.loss_resilience
+
+    @property
+    def _voice_gate(self) -> bool:
+        """Whether audio without voice is skipped instead of encoded."""
+        if self._manager is None:
+            return DEFAULT_VOICE_GATE
+        return self._manager.voice_gate
+
+    @property
+    def _echo_cancellation(self) -> bool:
+        """Whether camera audio played to listeners is cancelled in the uplink."""
+        if self._manager is None:
+            return DEFAULT_ECHO_CANCELLATION
+        return self._manager.echo_cancellation
+
+    @property
+    def _max_queued_chunks(self) -> int:
+        """Maximum number of pending audio chunks for this camera."""
+        if self._manager is None:
+            return DEFAULT_MAX_QUEUED_CHUNKS
+        return self._manager.max_queued_chunks
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes for diagnostics."""
@@ -202,8 +396,82 @@ class TalkbackSwitch(SwitchEntity):
             "audio_bytes_sent": self._audio_bytes_sent,
             "audio_packets_sent": self._audio_packets_sent,
             "transmission_errors": self._transmission_errors,
+            "dropped_chunks": self._dropped_chunks,
+            "arbitration_policy": self._arbiter.policy,
+            "audio_producers": len(self._arbiter.producers),
+            "rejected_chunks": self._arbiter.rejected_chunks,
+            "voice_frames": self._vad.voice_frames if self._vad else None,
+            "gated_frames": self._vad.gated_frames if self._vad else None,
+            "deadline_misses": (
+                self._encode_session.deadline_misses if self._encode_session else None
+            ),
+            "clock_drift_ppm": (
+                round(self._clock.drift.drift_ppm, 1) if self._clock else None
+            ),
+            "echo_return_loss_enhancement": (
+                round(self._echo_canceller.erle, 1) if self._echo_canceller else None
+            ),
+            "echo_delay_ms": (
+                round(self._echo_canceller.delay * 1000)
+                if self._echo_canceller and self._echo_canceller.delay is not None
+                else None
+            ),
             "last_transmission_time": self._last_transmission_time,
             "session_duration": session_duration,
+            "stop_reason": self._stop_reason,
+            "time_to_first_audio_ms": self._time_to_first_audio,
+            "recording": (
+                self._recording.path.name
+                if self._recording and self._recording.path
+                else None
+            ),
+            "recording_dropped_packets": (
+                self._recording.dropped_packets if self._recording else None
+            ),
+            "transcode_worker": (
+                self._worker_session.worker if self._worker_session else None
+            ),
+            "loss_resilience": self._loss_resilience[0],
+            "expected_packet_loss": self._loss_resilience[1],
+            "loss_resilience_override": (
+                self._loss_resilience_override[0]
+                if self._loss_resilience_override
+                else None
+            ),
+            **self._rtcp_attributes(),
+            **self._rtp_ingest_attributes(),
+        }
+
+    def _rtp_ingest_attributes(self) -> dict[str, Any]:
+        """Return the RTP ingest listener's settings and counters."""
+        ingest = self._rtp_ingest
+        if ingest is None:
+            return {"rtp_ingest_port": None}
+        return {
+            "rtp_ingest_port": ingest.port,
+            "rtp_ingest_source": ingest.source,
+            "rtp_ingest_opus_payload_type": ingest.opus_payload_type,
+            "rtp_ingest_packets": ingest.packets_received,
+            "rtp_ingest_lost_packets": ingest.lost_packets,
+            "rtp_ingest_rejected_packets": ingest.rejected_packets,
+        }
+
+    def _rtcp_attributes(self) -> dict[str, Any]:
+        """Return adaptive encoder settings and the latest receiver report."""
+        settings = self._rate_controller.settings if self._rate_controller else None
+        report = self._rtcp.last_report if self._rtcp else None
+        round_trip = self._rtcp.round_trip if self._rtcp else None
+        return {
+            "opus_bit_rate": settings.bit_rate if settings else None,
+            "opus_frame_duration": settings.frame_duration if settings else None,
+            "opus_fec": settings.fec if settings else None,
+            "rtcp_fraction_lost": report.fraction_lost if report else None,
+            "rtcp_jitter_ms": (
+                round(report.jitter * 1000 / OPUS_RTP_CLOCK_RATE, 1) if report else None
+            ),
+            "rtcp_round_trip_ms": (
+                round(round_trip * 1000, 1) if round_trip is not None else None
+            ),
         }
 
     async def async_turn_on(self, **kwargs: Any) -> None:
@@ -219,18 +487,34 @@ class TalkbackSwitch(SwitchEntity):
             _LOGGER.warning("Backchannel already active for %s", self._camera_entity_id)
             return
 
+        if self._manager and not self._manager.try_acquire_session(
+            self._camera_unique_id
+        ):
+            raise HomeAssistantError(
+                f"Maximum of {self._manager.max_active_sessions} concurrent "
+                "talkback sessions reached"
+            )
+
         try:
             self._session_state = STATE_STARTING
             self._last_error = ""
+            self._stop_reason = None
 
             # Reset statistics for new session
             self._audio_bytes_sent = 0
             self._audio_packets_sent = 0
             self._transmission_errors = 0
+            self._dropped_chunks = 0
+            self._arbiter = SessionArbiter(
+                self._arbitration_policy, self._forget_producer_audio
+            )
+            self._mixer = None
+            self._vad = VoiceActivityDetector() if self._voice_gate else None
             self._last_transmission_time = None
             self._session_start_time = dt_util.utcnow()
             self._webm_init_segment = None
             self._input_audio_format = None
+            self._audio_log.reset()
 
             self.async_write_ha_state()
 
@@ -242,6 +526,12 @@ class TalkbackSwitch(SwitchEntity):
             # Start the backchannel session
             await self._start_backchannel()
 
+            self._echo_canceller = None
+            if self._echo_cancellation and self._manager is not None:
+                self._echo_reference_unsub = self._manager.downlink.tap(
+                    self._camera_entity_id, self._on_echo_reference
+                )
+
             self._is_on = True
             self._session_state = STATE_ACTIVE
             self._last_error = ""
@@ -266,11 +556,16 @@ class TalkbackSwitch(SwitchEntity):
             self._is_on = False
             self._session_state = STATE_ERROR
             self._last_error = str(err)
+            self._release_session_slot()
             self.async_write_ha_state()
             raise
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch (stop backchannel session)."""
+        await self._async_stop_session(STOP_REASON_USER)
+
+    async def _async_stop_session(self, reason: str) -> None:
+        """Stop the backchannel session and record why it ended."""
         _LOGGER.info("Stopping backchannel for %s", self._camera_entity_id)
         _LOGGER.debug(
             "Backchannel stop requested - bytes_sent: %d, packets_sent: %d, errors: %d",
@@ -293,6 +588,7 @@ class TalkbackSwitch(SwitchEntity):
             self._is_on = False
             self._session_state = STATE_IDLE
             self._last_error = ""
+            self._stop_reason = reason
 
             # Log final statistics
             session_duration = None
@@ -304,8 +600,9 @@ class TalkbackSwitch(SwitchEntity):
             self.async_write_ha_state()
 
             _LOGGER.info(
-                "Backchannel stopped successfully for %s - session stats: "
+                "Backchannel stopped (%s) for %s - session stats: "
                 "duration: %.1fs, bytes_sent: %d, packets_sent: %d, errors: %d",
+                reason,
                 self._camera_entity_id,
                 session_duration or 0,
                 self._audio_bytes_sent,
@@ -354,6 +651,13 @@ class TalkbackSwitch(SwitchEntity):
 
             if not self._talkback_session:
                 raise RuntimeError("Failed to create talkback session with camera")
+            self._capabilities = {
+                ATTR_CODEC: getattr(self._talkback_session, "codec", "opus"),
+                ATTR_SAMPLE_RATE: getattr(
+                    self._talkback_session, "sampling_rate", 24000
+                ),
+                ATTR_CHANNELS: DEFAULT_CHANNELS,
+            }
 
             _LOGGER.info(
                 "Talkback session created for %s - RTP URL: %s, codec: %s",
@@ -509,14 +813,42 @@ class TalkbackSwitch(SwitchEntity):
             except Exception as err:
                 _LOGGER.warning("Error closing talkback session: %s", err)
 
-        # Clear session data
+        # Clear session data and per-session buffers so an idle switch holds
+        # no decoder state, queued audio or cached container headers
         self._talkback_session = None
+        self._capabilities = None
+        self._audio_ring.clear()
+        self._audio_consumed.set()
+        self._producer_slots.clear()
+        self._slot_producers.clear()
+        self._webm_init_segment = None
+        self._input_audio_format = None
+        self._resampler = None
+        self._mixer = None
+        self._mix_resamplers.clear()
+        self._opus_timestamps.clear()
+        self._opus_decoders.clear()
+        if self._echo_reference_unsub is not None:
+            self._echo_reference_unsub()
+            self._echo_reference_unsub = None
+        self._echo_canceller = None
+        self._last_audio_time = None
+        self._release_session_slot()
+        self._arbiter.stop_all()
+        self._audio_log.flush(self._pipeline_stats())
+        self._clock = None
+        self._encode_session = None
 
         _LOGGER.debug(
             "Backchannel resources released for %s",
             self._camera_entity_id,
         )
 
+    def _release_session_slot(self) -> None:
+        """Return this camera's slot to the global session limiter."""
+        if self._manager:
+            self._manager.release_session(self._camera_unique_id)
+
     async def _run_backchannel_session(self) -> None:
         """Run the backchannel streaming session.
 
@@ -551,55 +883,84 @@ class TalkbackSwitch(SwitchEntity):
                 self._transport,
             )
 
-            # Set up PyAV output container for RTP streaming
-            output_container = av.open(
-                rtp_url,
-                mode="w",
-                format="rtp",
-                options={"payload_type": "96"},
+            output_container, output_stream = await self._open_rtp_output(
+                rtp_url, codec_name, sample_rate
             )
-
-            # Create audio output stream with camera's expected format
-            output_stream = output_container.add_stream(
-                codec_name,
-                rate=sample_rate,
+            self._recording = self._open_recording(
+                output_stream, codec_name, sample_rate
             )
-            output_stream.codec_context.bit_rate = 24000  # 24 kbps
+
+            if self._arbiter.policy == ARBITRATION_MIX:
+                self._mixer = PcmMixer(int(sample_rate * MIX_FRAME_DURATION))
 
             _LOGGER.info(
                 "RTP stream opened to %s - streaming audio to camera",
                 rtp_url,
             )
             no_audio_warning_logged = False
+            idle_timeout = self._idle_timeout
+            poll_interval = (
+                min(QUEUE_POLL_INTERVAL, idle_timeout)
+                if idle_timeout
+                else QUEUE_POLL_INTERVAL
+            )
+            self._last_audio_time = time.monotonic()
+            self._encode_session = encode_session = (
+                self._manager.scheduler if self._manager else EncodeScheduler()
+            ).open_session()
 
-            # Process audio chunks from queue and stream to camera
+            # Process audio chunks from the ring and stream to camera
             while True:
                 try:
-                    # Wait for audio data with timeout
-                    queue_item = await asyncio.wait_for(
-                        self._audio_queue.get(),
-                        timeout=5.0,
-                    )
-
-                    if queue_item is None:
-                        # Sentinel value to stop streaming
-                        _LOGGER.debug("Received stop signal in audio queue")
-                        break
-
-                    audio_data, audio_format, input_sample_rate = queue_item
+                    if not self._audio_ring:
+                        # Wait for audio data with timeout
+                        self._audio_ready.clear()
+                        await asyncio.wait_for(
+                            self._audio_ready.wait(), timeout=poll_interval
+                        )
+                        continue
 
-                    # Process and stream the audio chunk
-                    await self._process_and_stream_audio(
-                        audio_data,
-                        output_container,
-                        output_stream,
-                        sample_rate,
-                        audio_format=audio_format,
-                        input_sample_rate=input_sample_rate,
-                    )
+                    # Due when the audio already sent to the camera runs out
+                    deadline = self._clock.deadline if self._clock else None
+                    async with encode_session.slot(deadline):
+                        # The chunk is a view into the ring: it must be fully
+                        # consumed before the next await lets producers write
+                        record = self._read_audio()
+                        if record is None:
+                            continue
+                        self._last_audio_time = time.monotonic()
+                        audio_data, input_sample_rate, producer, audio_format = record
+
+                        if self._worker_session is not None:
+                            self._submit_to_worker(
+                                audio_data, audio_format, input_sample_rate
+                            )
+                            continue
+
+                        # Process and stream the audio chunk
+                        await self._process_and_stream_audio(
+                            audio_data,
+                            output_container,
+                            output_stream,
+                            sample_rate,
+                            audio_format=audio_format,
+                            input_sample_rate=input_sample_rate,
+                            producer=producer,
+                        )
 
                 except TimeoutError:
-                    # No audio data received, send silence to keep stream alive
+                    idle_for = time.monotonic() - self._last_audio_time
+                    if idle_timeout and idle_for >= idle_timeout:
+                        _LOGGER.info(
+                            "No audio for %s in %.0fs - stopping idle talkback session",
+                            self._camera_entity_id,
+                            idle_for,
+                        )
+                        # Stopping awaits this task, so hand it to a new one
+                        self.hass.async_create_task(
+                            self._async_stop_session(STOP_REASON_IDLE)
+                        )
+                        break
                     if not no_audio_warning_logged and self._audio_packets_sent == 0:
                         no_audio_warning_logged = True
                         _LOGGER.warning(
@@ -607,7 +968,7 @@ class TalkbackSwitch(SwitchEntity):
                             "Talkback is active but no microphone data is being transmitted.",
                             self._camera_entity_id,
                         )
-                    _LOGGER.debug("No audio data for 5s, sending keepalive")
+                    _LOGGER.debug("No audio data for %.0fs, waiting for more", idle_for)
                     continue
                 except Exception as err:
                     _LOGGER.error(
@@ -632,46 +993,274 @@ class TalkbackSwitch(SwitchEntity):
             )
             self._session_state = STATE_ERROR
             self._last_error = str(err)
+            self._stop_reason = STOP_REASON_ERROR
             self._is_on = False
             self._transmission_errors += 1
             self.async_write_ha_state()
+            # Stopping awaits this task, so hand the teardown to a new one;
+            # the slot is only released once the camera session is closed
+            self.hass.async_create_task(self._stop_backchannel())
             raise
         finally:
-            # Clean up streaming resources
-            if output_container:
-                try:
-                    output_container.close()
-                    _LOGGER.debug("RTP output container closed")
-                except Exception as err:
-                    _LOGGER.warning("Error closing output container: %s", err)
+            if self._encode_session is not None:
+                self._encode_session.close()
+            self._close_rtp_output(output_container)
+
+    async def _open_rtp_output(
+        self, rtp_url: str, codec_name: str, sample_rate: int
+    ) -> tuple[Any, Any]:
+        """Open the RTP output and encoder for the configured transport.
+
+        Returns a (container, stream) pair; the native transport returns the
+        paced RTP sender and a standalone Opus encoder with the same shape.
+        When a transcoder pool is configured the session runs in a worker
+        process instead and (None, None) is returned, unless it needs a
+        feature only the in-process pipeline provides.
+        """
+        transcoder = self._manager.transcoder if self._manager else None
+        if transcoder is not None and (
+            unsupported := self._worker_unsupported_features(codec_name)
+        ):
+            _LOGGER.warning(
+                "Transcoding %s in-process - transcoder workers do not support %s",
+                self._camera_entity_id,
+                ", ".join(unsupported),
+            )
+            transcoder = None
+        if transcoder is not None:
+            self._transport = TRANSPORT_PYAV
+            self._worker_session = await transcoder.async_open_session(
+                self._camera_unique_id,
+                rtp_url,
+                codec_name,
+                sample_rate,
+                OPUS_BIT_RATE,
+                on_stats=self._on_worker_stats,
+                on_lost=self._on_worker_lost,
+                voice_gate=self._vad is not None,
+                codec_options=(
+                    resilience_settings(
+                        OPUS_BIT_RATE, *self._loss_resilience
+                    ).codec_options()
+                    if codec_name == "opus"
+                    else None
+                ),
+            )
+            _LOGGER.debug(
+                "Transcoding %s in worker %d",
+                self._camera_entity_id,
+                self._worker_session.worker,
+            )
+            return None, None
+
+        self._transport = self._rtp_transport
+        if self._transport == TRANSPORT_NATIVE and codec_name != "opus":
+            _LOGGER.warning(
+                "Native RTP transport only supports Opus, camera %s uses %s;"
+                " falling back to PyAV",
+                self._camera_entity_id,
+                codec_name,
+            )
+            self._transport = TRANSPORT_PYAV
+
+        if self._transport == TRANSPORT_NATIVE:
+            # Encode with a standalone Opus encoder and packetize ourselves;
+            # the camera's receiver reports adapt the encoder to the link
+            self._rate_controller = OpusRateController(
+                *self._bit_rate_range, OPUS_BIT_RATE, *self._loss_resilience
+            )
+            self._opus_stream = RtpOpusStream(
+                sample_rate, self._rate_controller.settings
+            )
+            self._rtp_sender.redundancy = (
+                self._loss_resilience[0] == RESILIENCE_REDUNDANCY
+            )
+            await self._rtp_sender.async_connect(rtp_url)
+            self._rtcp = RtcpSession(self._rtp_sender, self._on_receiver_report)
+            await self._rtcp.async_start(rtp_url)
+            return self._rtp_sender, self._opus_stream
+
+        # Set up PyAV output container for RTP streaming
+        output_container = av.open(
+            rtp_url,
+            mode="w",
+            format="rtp",
+            options={"payload_type": "96"},
+        )
+
+        # Create audio output stream with camera's expected format
+        output_stream = output_container.add_stream(
+            codec_name,
+            rate=sample_rate,
+        )
+        output_stream.codec_context.bit_rate = OPUS_BIT_RATE
+        if codec_name == "opus":
+            # Redundant packets need the native sender; FEC works everywhere
+            output_stream.codec_context.options = resilience_settings(
+                OPUS_BIT_RATE, *self._loss_resilience
+            ).codec_options()
+        return output_container, output_stream
+
+    def _worker_unsupported_features(self, codec_name: str) -> list[str]:
+        """Return the enabled features a transcoder worker cannot provide.
+
+        Workers share the decode, voice gate, drift and encode stages, but
+        not the state that lives in Home Assistant: other producers' audio,
+        the listeners' echo reference, the recording writer and the RTCP
+        feedback of the native transport.
+        """
+        features = []
+        if self._arbiter.policy == ARBITRATION_MIX:
+            features.append("mixing")
+        if self._echo_cancellation:
+            features.append("echo cancellation")
+        if self._manager is not None and self._manager.record_sessions:
+            features.append("session recording")
+        if self._rtp_transport == TRANSPORT_NATIVE and codec_name == "opus":
+            features.append("the native RTP transport")
+        return features
+
+    def _open_recording(
+        self, output_stream: Any, codec_name: str, sample_rate: int
+    ) -> SessionRecording | None:
+        """Start recording the encoded session audio if enabled.
+
+        Packets from the in-process Opus encoder are recorded as they are
+        sent; sessions to be recorded are never handed to a worker.
+        """
+        if self._manager is None or not self._manager.record_sessions:
+            return None
+        if output_stream is None or codec_name != "opus":
+            _LOGGER.warning(
+                "Not recording %s - recording needs in-process Opus encoding",
+                self._camera_entity_id,
+            )
+            return None
+        return self._manager.recorder.open_session(
+            self._camera_entity_id,
+            sample_rate,
+            len(output_stream.codec_context.layout.channels) or 1,
+        )
+
+    def _close_rtp_output(self, output_container: Any) -> None:
+        """Close the in-process RTP output or the worker session."""
+        if self._recording is not None:
+            self._recording.close()
+            self._recording = None
+        if self._rtcp is not None:
+            self._rtcp.close()
+            self._rtcp = None
+        self._opus_stream = None
+        self._rate_controller = None
+
+        if self._worker_session is not None:
+            if self._manager and self._manager.transcoder:
+                self._manager.transcoder.close_session(
+                    self._camera_unique_id, self._worker_session
+                )
+            self._worker_session = None
+
+        if output_container:
+            try:
+                output_container.close()
+                _LOGGER.debug("RTP output closed")
+            except Exception as err:
+                _LOGGER.warning("Error closing output container: %s", err)
+
+    def _submit_to_worker(
+        self,
+        audio_data: bytes | memoryview,
+        audio_format: str | None,
+        sample_rate: int | None,
+    ) -> None:
+        """Hand a chunk to the transcoder worker, dropping it if the ring is full."""
+        assert self._manager and self._manager.transcoder and self._worker_session
+        if not self._manager.transcoder.submit(
+            self._worker_session, audio_data, audio_format, sample_rate
+        ):
+            self._dropped_chunks += 1
+
+    @callback
+    def _on_receiver_report(self, report: ReceptionReport) -> None:
+        """Adapt the Opus encoder to the loss and jitter the camera reports."""
+        if self._rate_controller is None or self._opus_stream is None:
+            return
+        jitter = report.jitter / OPUS_RTP_CLOCK_RATE
+        if self._rate_controller.update(report.fraction_lost, jitter):
+            settings = self._rate_controller.settings
+            self._opus_stream.configure(settings)
+            _LOGGER.debug(
+                "Adapting Opus encoder for %s - loss: %.1f%%, jitter: %.0f ms, "
+                "bit_rate: %d, frame: %d ms, fec: %s",
+                self._camera_entity_id,
+                report.fraction_lost * 100,
+                jitter * 1000,
+                settings.bit_rate,
+                settings.frame_duration,
+                settings.fec,
+            )
+        self.async_write_ha_state()
+
+    @callback
+    def _on_worker_stats(
+        self, chunks: int, octets: int, errors: int, voiced: int, gated: int
+    ) -> None:
+        """Fold statistics reported by the transcoder worker into the session."""
+        self._audio_packets_sent += chunks
+        self._audio_bytes_sent += octets
+        self._transmission_errors += errors
+        if self._vad is not None:
+            self._vad.voice_frames += voiced
+            self._vad.gated_frames += gated
+        if chunks:
+            self._last_transmission_time = dt_util.utcnow().isoformat()
+        self.async_write_ha_state()
+
+    @callback
+    def _on_worker_lost(self, reason: str) -> None:
+        """Stop the session when its transcoder worker fails."""
+        _LOGGER.error(
+            "Transcoder worker failed for %s: %s", self._camera_entity_id, reason
+        )
+        self._worker_session = None
+        self._last_error = reason
+        self._transmission_errors += 1
+        self.hass.async_create_task(self._async_stop_session(STOP_REASON_ERROR))
 
     async def _process_and_stream_audio(
         self,
-        audio_data: bytes,
+        audio_data: bytes | memoryview,
         output_container: av.container.OutputContainer,
         output_stream: av.audio.stream.AudioStream,
         target_sample_rate: int,
         audio_format: str | None = None,
         input_sample_rate: int | None = None,
+        producer: Hashable = SERVICE_PRODUCER,
     ) -> None:
         """Process incoming audio data and stream to camera.
 
         Args:
-            audio_data: Raw audio bytes (WebM/Opus from frontend)
+            audio_data: Raw audio bytes (WebM/Opus from frontend), usually a
+                view into the session's audio ring
             output_container: PyAV output container for RTP stream
             output_stream: Audio stream in the container
             target_sample_rate: Target sample rate for output
+            producer: Source of the chunk, used to keep mixed streams apart
         """
         # Validate audio data before processing
         if not audio_data:
-            _LOGGER.debug(
-                "Skipping empty audio chunk for %s",
-                self._camera_entity_id,
-            )
+            if self._audio_log.sample("empty_chunk"):
+                _LOGGER.debug(
+                    "Skipping empty audio chunk for %s",
+                    self._camera_entity_id,
+                )
             return
 
-        normalized_audio_data = self._normalize_audio_chunk(audio_data, audio_format)
-        chunk_format = audio_format or self._detect_audio_format(normalized_audio_data)
+        view = memoryview(audio_data)
+        prefix = repair_prefix(bytes(view[:4]), audio_format)
+        head = prefix + bytes(view[:8])
+        chunk_size = len(prefix) + len(view)
+        chunk_format = audio_format or self._detect_audio_format(head)
         if chunk_format and chunk_format != self._input_audio_format:
             self._input_audio_format = chunk_format
             _LOGGER.info(
@@ -681,18 +1270,17 @@ class TalkbackSwitch(SwitchEntity):
             )
 
         # WebM-specific minimum-size warning.
-        if (self._input_audio_format in (None, "webm")) and len(
-            normalized_audio_data
-        ) < MIN_WEBM_SIZE:
-            _LOGGER.warning(
+        if self._input_audio_format in (None, "webm") and chunk_size < MIN_WEBM_SIZE:
+            self._audio_log.warning(
+                "undersized_chunk",
                 "Attempting to process undersized audio chunk for %s - size:"
                 " %d bytes (expected minimum: %d)",
                 self._camera_entity_id,
-                len(normalized_audio_data),
+                chunk_size,
                 MIN_WEBM_SIZE,
             )
 
-        candidate_chunks = self._prepare_candidate_chunks(normalized_audio_data)
+        candidate_chunks = self._prepare_candidate_chunks((prefix, view), head)
 
         last_error: Exception | None = None
 
@@ -700,33 +1288,47 @@ class TalkbackSwitch(SwitchEntity):
             try:
                 if self._input_audio_format == PCM_FORMAT:
                     self._process_pcm_and_stream_audio(
-                        audio_data=chunk,
+                        audio_data=view,
                         output_container=output_container,
                         output_stream=output_stream,
                         target_sample_rate=target_sample_rate,
                         input_sample_rate=input_sample_rate,
+                        producer=producer,
                     )
-                    self._record_successful_chunk(len(normalized_audio_data))
+                    self._record_successful_chunk(chunk_size)
+                    return
+
+                if self._input_audio_format == OPUS_PACKETS_FORMAT:
+                    self._process_opus_packets(
+                        view,
+                        output_container,
+                        output_stream,
+                        target_sample_rate,
+                        producer,
+                    )
+                    self._record_successful_chunk(chunk_size)
                     return
 
                 self._decode_and_stream_chunk(
-                    chunk=chunk,
+                    chunk,
                     output_container=output_container,
                     output_stream=output_stream,
                     target_sample_rate=target_sample_rate,
+                    producer=producer,
                 )
-                self._record_successful_chunk(len(normalized_audio_data))
+                self._record_successful_chunk(chunk_size)
                 return
 
             except (av.error.InvalidDataError, av.error.EOFError) as err:
                 last_error = err
                 if idx == 0 and len(candidate_chunks) > 1:
-                    _LOGGER.debug(
-                        "Primary chunk decode failed for %s, retrying with"
-                        " cached WebM init segment: %s",
-                        self._camera_entity_id,
-                        err,
-                    )
+                    if self._audio_log.sample("init_segment_retry"):
+                        _LOGGER.debug(
+                            "Primary chunk decode failed for %s, retrying with"
+                            " cached WebM init segment: %s",
+                            self._camera_entity_id,
+                            err,
+                        )
                     continue
                 break
             except Exception as err:
@@ -739,115 +1341,223 @@ class TalkbackSwitch(SwitchEntity):
                 raise
 
         if last_error is not None:
-            self._handle_invalid_audio_chunk(normalized_audio_data, last_error)
+            self._handle_invalid_audio_chunk(head, chunk_size, last_error)
+
+    def _prepare_candidate_chunks(
+        self, segments: tuple[bytes | memoryview, ...], head: bytes
+    ) -> list[tuple[bytes | memoryview, ...]]:
+        """Build decode candidates and cache WebM init segment when available.
 
-    def _prepare_candidate_chunks(self, audio_data: bytes) -> list[bytes]:
-        """Build decode candidates and cache WebM init segment when available."""
-        if self._input_audio_format in ("ogg", PCM_FORMAT):
-            return [audio_data]
+        Each candidate is a tuple of buffers read back to back, so prepending
+        the cached init segment does not copy the chunk.
+        """
+        if self._input_audio_format in ("ogg", PCM_FORMAT, OPUS_PACKETS_FORMAT):
+            return [segments]
 
         # MediaRecorder often emits one initialization segment and then cluster-only
         # chunks. Cache the init segment and prepend it for cluster-only payloads.
-        candidate_chunks: list[bytes] = [audio_data]
-        if not audio_data.startswith(WEBM_EBML_HEADER) and self._webm_init_segment:
-            candidate_chunks.insert(0, self._webm_init_segment + audio_data)
+        candidate_chunks = [segments]
+        if not head.startswith(WEBM_EBML_HEADER) and self._webm_init_segment:
+            candidate_chunks.insert(0, (self._webm_init_segment, *segments))
 
-        if audio_data.startswith(WEBM_EBML_HEADER):
-            cluster_pos = audio_data.find(WEBM_CLUSTER_ID)
-            if cluster_pos > 0:
-                self._webm_init_segment = audio_data[:cluster_pos]
+        # Init segments arrive once per recording, so copying here is rare
+        if head.startswith(WEBM_EBML_HEADER) and (
+            init_segment := webm_init_segment(b"".join(segments))
+        ):
+            self._webm_init_segment = init_segment
 
         return candidate_chunks
 
     def _detect_audio_format(self, chunk: bytes) -> str | None:
         """Detect input container from magic bytes."""
-        if chunk.startswith(WEBM_EBML_HEADER):
-            return "webm"
-        if chunk.startswith(WEBM_EBML_HEADER_TRUNC):
-            return "webm"
-        if chunk.startswith(OGG_CAPTURE_PATTERN):
-            return "ogg"
-        return None
-
-    def _normalize_audio_chunk(
-        self, chunk: bytes, declared_format: str | None
-    ) -> bytes:
-        """Repair known malformed chunk prefixes from frontend transport quirks."""
-        if declared_format not in (None, "webm"):
-            return chunk
-
-        if chunk.startswith(WEBM_EBML_HEADER_TRUNC):
-            return b"\x1a" + chunk
-        if chunk.startswith(WEBM_CLUSTER_ID_TRUNC):
-            return b"\x1f" + chunk
-        return chunk
+        return detect_audio_format(chunk)
 
     def _process_pcm_and_stream_audio(
         self,
-        audio_data: bytes,
+        audio_data: bytes | memoryview,
         output_container: av.container.OutputContainer,
         output_stream: av.audio.stream.AudioStream,
         target_sample_rate: int,
         input_sample_rate: int | None,
+        producer: Hashable = SERVICE_PRODUCER,
     ) -> None:
         """Convert PCM S16LE mono samples into AudioFrames and stream."""
-        if len(audio_data) < 2:
-            raise av.error.InvalidDataError(-1, "PCM chunk too small")
-
-        # Ensure 16-bit sample alignment.
-        valid_size = len(audio_data) - (len(audio_data) % 2)
-        pcm_data = audio_data[:valid_size]
-        num_samples = len(pcm_data) // 2
-        if num_samples == 0:
-            raise av.error.InvalidDataError(-1, "PCM chunk has no complete samples")
+        frame = pcm_frame(audio_data, input_sample_rate or target_sample_rate)
+        self._emit_frame(
+            frame, producer, output_container, output_stream, target_sample_rate
+        )
 
-        frame = av.AudioFrame(format="s16", layout="mono", samples=num_samples)
-        frame.sample_rate = input_sample_rate or target_sample_rate
-        frame.planes[0].update(pcm_data)
+    def _process_opus_packets(
+        self,
+        audio_data: bytes | memoryview,
+        output_container: av.container.OutputContainer,
+        output_stream: av.audio.stream.AudioStream,
+        target_sample_rate: int,
+        producer: Hashable = SERVICE_PRODUCER,
+    ) -> None:
+        """Send Opus packets encoded by the client.
 
-        if frame.sample_rate != target_sample_rate:
-            resampler = av.AudioResampler(
-                format=output_stream.codec_context.format,
-                layout=output_stream.codec_context.layout,
-                rate=target_sample_rate,
-            )
-            frame = resampler.resample(frame)[0]
+        Packets go to RTP as they are, stamped by the session clock, which
+        also drops or spaces out a packet now and then to offset clock drift.
+        Mixing, echo cancellation and non-Opus cameras need PCM, so for them
+        the packets are decoded into the usual encode path instead.
+        """
+        try:
+            packets = parse_opus_packets(audio_data)
+        except ValueError as err:
+            raise av.error.InvalidDataError(-1, str(err)) from err
+
+        forward = (
+            self._mixer is None
+            and self._echo_reference_unsub is None
+            and output_stream.codec_context.name == "libopus"
+        )
+        clock = self._session_clock(target_sample_rate)
+        for timestamp, payload, samples in packets:
+            gap = opus_timestamp_gap(self._opus_timestamps.get(producer), timestamp)
+            if gap is None:
+                continue
+            self._opus_timestamps[producer] = (timestamp + samples) & 0xFFFFFFFF
+
+            if not forward:
+                decoder = self._opus_decoders.get(producer)
+                if decoder is None:
+                    decoder = av.CodecContext.create("opus", "r")
+                    self._opus_decoders[producer] = decoder
+                for frame in decoder.decode(av.Packet(bytes(payload))):
+                    self._emit_frame(
+                        frame,
+                        producer,
+                        output_container,
+                        output_stream,
+                        target_sample_rate,
+                    )
+                continue
 
-        for output_packet in output_stream.encode(frame):
-            output_container.mux(output_packet)
+            packet = stamp_opus_packet(clock, payload, samples, gap)
+            if packet is None:
+                continue
+            if self._transport == TRANSPORT_PYAV:
+                packet.stream = output_stream
+            if self._recording is not None:
+                self._recording.add(packet)
+            output_container.mux(packet)
 
     def _decode_and_stream_chunk(
         self,
-        chunk: bytes,
+        chunk: bytes | tuple[bytes | memoryview, ...],
         output_container: av.container.OutputContainer,
         output_stream: av.audio.stream.AudioStream,
         target_sample_rate: int,
+        producer: Hashable = SERVICE_PRODUCER,
     ) -> None:
-        """Decode one chunk and mux it to the RTP output stream."""
-        input_format = self._detect_audio_format(chunk) or self._input_audio_format
-        open_kwargs: dict[str, Any] = {"mode": "r"}
-        if input_format in ("webm", "ogg"):
-            open_kwargs["format"] = input_format
+        """Decode one chunk and mux it to the RTP output stream.
 
-        input_container = av.open(io.BytesIO(chunk), **open_kwargs)
-        try:
-            for packet in input_container.demux():
-                for frame in packet.decode():
-                    if not isinstance(frame, av.AudioFrame):
-                        continue
+        ``chunk`` may be a tuple of buffers that are demuxed back to back.
+        """
+        segments = chunk if isinstance(chunk, tuple) else (chunk,)
+        head = b"".join(bytes(segment[:4]) for segment in segments)
+        input_format = self._detect_audio_format(head) or self._input_audio_format
+        for frame in decode_frames(segments, input_format):
+            self._emit_frame(
+                frame, producer, output_container, output_stream, target_sample_rate
+            )
 
-                    if frame.sample_rate != target_sample_rate:
-                        resampler = av.AudioResampler(
-                            format=output_stream.codec_context.format,
-                            layout=output_stream.codec_context.layout,
-                            rate=target_sample_rate,
-                        )
-                        frame = resampler.resample(frame)[0]
+    def _emit_frame(
+        self,
+        frame: av.AudioFrame,
+        producer: Hashable,
+        output_container: av.container.OutputContainer,
+        output_stream: av.audio.stream.AudioStream,
+        target_sample_rate: int,
+    ) -> None:
+        """Encode a decoded frame, mixing it with other producers if enabled."""
+        if self._mixer is None:
+            self._encode_frame(
+                frame, output_container, output_stream, target_sample_rate
+            )
+            return
 
-                    for output_packet in output_stream.encode(frame):
-                        output_container.mux(output_packet)
-        finally:
-            input_container.close()
+        self._mixer.add(producer, self._to_mix_samples(frame, producer))
+        for mixed in self._mixer.pull():
+            mixed_frame = av.AudioFrame.from_ndarray(
+                mixed.reshape(1, -1), format="s16", layout="mono"
+            )
+            mixed_frame.sample_rate = target_sample_rate
+            self._encode_frame(
+                mixed_frame, output_container, output_stream, target_sample_rate
+            )
+
+    def _encode_frame(
+        self,
+        frame: av.AudioFrame,
+        output_container: av.container.OutputContainer,
+        output_stream: av.audio.stream.AudioStream,
+        target_sample_rate: int,
+    ) -> None:
+        """Resample a frame to the encoder format, encode it and mux packets.
+
+        Frames are stamped by the session clock, which also fills short
+        arrival gaps with silence and skips the timestamps over pauses.
+        Frames are stretched or squeezed by the few samples the clock's
+        drift compensation asks for, so the producer's clock cannot slowly
+        grow or drain the camera's buffer. Frames the voice gate closes on
+        only advance the clock, so silence costs neither resampling nor
+        encoding and sends nothing. Echo is cancelled before the gate, so
+        echoed camera audio does not hold it open.
+        """
+        if self._echo_reference_unsub is not None:
+            cancelled = self._cancel_echo(frame)
+            if cancelled is None:
+                return
+            frame = cancelled
+        clock = self._session_clock(target_sample_rate)
+        if self._resampler is None:
+            self._resampler = OutputResampler(
+                output_stream.codec_context, target_sample_rate
+            )
+        for out_frame in clocked_frames(clock, frame, self._resampler, self._vad):
+            for output_packet in output_stream.encode(out_frame):
+                if self._recording is not None:
+                    self._recording.add(output_packet)
+                output_container.mux(output_packet)
+
+    def _session_clock(self, sample_rate: int) -> SessionClock:
+        """Return the session clock, starting it at the output rate."""
+        if self._clock is None or self._clock.sample_rate != sample_rate:
+            self._clock = SessionClock(sample_rate)
+        return self._clock
+
+    @callback
+    def _on_echo_reference(self, pcm: bytes) -> None:
+        """Keep camera audio played to listeners as the echo reference."""
+        if self._echo_canceller is not None:
+            self._echo_canceller.add_reference(pcm, DOWNLINK_SAMPLE_RATE)
+
+    def _cancel_echo(self, frame: av.AudioFrame) -> av.AudioFrame | None:
+        """Return a mono frame with the echo removed, or None until a block fills."""
+        if (
+            self._echo_canceller is None
+            or self._echo_canceller.sample_rate != frame.sample_rate
+        ):
+            self._echo_canceller = EchoCanceller(frame.sample_rate)
+        samples = self._echo_canceller.process(frame_to_mono(frame))
+        if not samples.size:
+            return None
+        return mono_to_frame(samples, frame.sample_rate)
+
+    def _to_mix_samples(self, frame: av.AudioFrame, producer: Hashable) -> np.ndarray:
+        """Convert a producer's frame to mono int16 samples at the mixer rate."""
+        assert self._mixer is not None
+        target_rate = int(self._mixer.frame_samples / MIX_FRAME_DURATION)
+        resampler = self._mix_resamplers.get(producer)
+        if resampler is None:
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=target_rate)
+            self._mix_resamplers[producer] = resampler
+        frames = resampler.resample(frame)
+        if not frames:
+            return np.zeros(0, dtype=np.int16)
+        return np.concatenate([f.to_ndarray().reshape(-1) for f in frames])
 
     def _record_successful_chunk(self, data_size: int) -> None:
         """Update per-session metrics after a successful transmit."""
@@ -855,48 +1565,198 @@ class TalkbackSwitch(SwitchEntity):
         self._audio_packets_sent += 1
         self._last_transmission_time = dt_util.utcnow().isoformat()
 
-        _LOGGER.debug(
-            "Streamed audio chunk to %s - size: %d bytes, "
-            "total_packets: %d, total_bytes: %d",
-            self._camera_entity_id,
-            data_size,
-            self._audio_packets_sent,
-            self._audio_bytes_sent,
-        )
-
-        if self._audio_packets_sent % 100 == 0:
-            _LOGGER.info(
-                "Audio transmission stats for %s - "
-                "packets: %d, bytes: %d KB, errors: %d",
+        if self._audio_log.sample("streamed"):
+            _LOGGER.debug(
+                "Streamed audio chunk to %s - size: %d bytes, "
+                "total_packets: %d, total_bytes: %d",
                 self._camera_entity_id,
+                data_size,
                 self._audio_packets_sent,
-                self._audio_bytes_sent // 1024,
-                self._transmission_errors,
+                self._audio_bytes_sent,
             )
+        self._audio_log.maybe_summarize(self._pipeline_stats)
 
         self.async_write_ha_state()
 
-    def _handle_invalid_audio_chunk(self, audio_data: bytes, error: Exception) -> None:
+    def _pipeline_stats(self) -> dict[str, int]:
+        """Return the session counters reported in pipeline summaries."""
+        return {
+            "packets": self._audio_packets_sent,
+            "bytes": self._audio_bytes_sent,
+            "errors": self._transmission_errors,
+            "dropped": self._dropped_chunks,
+            "rejected": self._arbiter.rejected_chunks,
+            "gaps_filled": self._clock.gaps_filled if self._clock else 0,
+            "gaps_skipped": self._clock.gaps_skipped if self._clock else 0,
+            "gated_frames": self._vad.gated_frames if self._vad else 0,
+            "drift_samples": self._clock.drift.adjusted if self._clock else 0,
+            "deadline_misses": (
+                self._encode_session.deadline_misses if self._encode_session else 0
+            ),
+        }
+
+    def _handle_invalid_audio_chunk(
+        self, head: bytes, size: int, error: Exception
+    ) -> None:
         """Track and log invalid/incomplete audio chunks that cannot be decoded."""
-        prefix_hex = audio_data[:8].hex()
-        _LOGGER.warning(
+        self._transmission_errors += 1
+        self._audio_log.warning(
+            "invalid_chunk",
             "Failed to process audio chunk for %s - size: %d bytes,"
             " prefix: %s, error: %s. "
             "This chunk will be skipped. Possible causes: incomplete"
             " transmission, codec issues, or invalid audio format.",
             self._camera_entity_id,
-            len(audio_data),
-            prefix_hex,
-            str(error),
+            size,
+            head[:8].hex(),
+            error,
         )
-        self._transmission_errors += 1
-        return
+
+    async def async_send_audio(
+        self,
+        audio_data: str,
+        audio_format: str | None = None,
+        sample_rate: int | None = None,
+        priority: int = PRIORITY_USER,
+    ) -> None:
+        """Handle the send_audio service with base64-encoded audio."""
+        if not audio_data:
+            _LOGGER.warning("No audio data provided to send_audio service")
+            return
+        try:
+            await self.send_audio_data(
+                base64.b64decode(audio_data),
+                audio_format=audio_format,
+                sample_rate=sample_rate,
+                priority=priority,
+            )
+        except Exception as err:
+            _LOGGER.error(
+                "Failed to send audio to %s: %s",
+                self.entity_id,
+                err,
+            )
+
+    async def async_speak(
+        self,
+        message: str,
+        engine: str | None = None,
+        language: str | None = None,
+        options: dict | None = None,
+        priority: int = PRIORITY_ANNOUNCEMENT,
+    ) -> None:
+        """Speak a TTS message through the camera while it is synthesized.
+
+        An inactive backchannel is started alongside synthesis and stopped
+        again once the message has played out. Audio is queued at most
+        ``SPEAK_LEAD`` seconds ahead of real time.
+        """
+        requested = time.monotonic()
+        owner = (SPEAK_PRODUCER, requested)
+        started = not self._is_on
+        starting = (
+            self.hass.async_create_task(self.async_turn_on()) if started else None
+        )
+        sample_rate = (
+            getattr(self._talkback_session, "sampling_rate", None) or SPEAK_SAMPLE_RATE
+        )
+        session_ended = asyncio.Event()
+        played_from: float | None = None
+        queued = 0.0  # Seconds of speech queued so far
+
+        try:
+            async for chunk, rate in async_speech_pcm(
+                self.hass, message, engine, language, options, sample_rate
+            ):
+                if played_from is None:
+                    if starting is not None:
+                        task, starting = starting, None
+                        await task
+                    if not self._arbiter.claim(owner, priority, session_ended.set):
+                        raise HomeAssistantError(
+                            f"{self.entity_id} is busy with another audio producer"
+                        )
+                    played_from = time.monotonic()
+                    self._time_to_first_audio = round((played_from - requested) * 1000)
+                    _LOGGER.debug(
+                        "First speech audio for %s after %d ms",
+                        self._camera_entity_id,
+                        self._time_to_first_audio,
+                    )
+                elif session_ended.is_set():
+                    return
+                elif (ahead := queued - (time.monotonic() - played_from)) > SPEAK_LEAD:
+                    await asyncio.sleep(ahead - SPEAK_LEAD)
+                self.enqueue_audio(chunk, PCM_FORMAT, rate, owner, priority)
+                queued += len(chunk) / 2 / rate
+
+            if starting is not None:
+                # Nothing was synthesized: still report a failed start
+                task, starting = starting, None
+                await task
+            if started and played_from is not None:
+                # Let the message play out before the session is stopped
+                await asyncio.sleep(max(0.0, queued - (time.monotonic() - played_from)))
+        finally:
+            if starting is not None:
+                # Synthesis failed first and its error propagates; only log
+                # the start failure so the task's exception is retrieved
+                await asyncio.wait([starting])
+                if not starting.cancelled() and (err := starting.exception()):
+                    _LOGGER.error(
+                        "Failed to start talkback for %s: %s",
+                        self._camera_entity_id,
+                        err,
+                    )
+            self._release_producer(owner)
+            if started and self._is_on and not self._arbiter.has_claims():
+                await self._async_stop_session(STOP_REASON_STREAM_CLOSED)
+
+    async def async_set_loss_resilience(
+        self, mode: str, expected_packet_loss: int | None = None
+    ) -> None:
+        """Handle the set_loss_resilience service for this camera.
+
+        ``default`` clears the override so the integration options apply.
+        Changes reach a running native session at once and other transports
+        from their next session.
+        """
+        if mode == "default":
+            self._loss_resilience_override = None
+        elif mode in LOSS_RESILIENCE_MODES:
+            if expected_packet_loss is None:
+                expected_packet_loss = self._loss_resilience[1]
+            if not 0 <= expected_packet_loss <= 100:
+                raise HomeAssistantError(
+                    f"Expected packet loss must be 0-100%, got {expected_packet_loss}"
+                )
+            self._loss_resilience_override = (mode, expected_packet_loss)
+        else:
+            raise HomeAssistantError(f"Unknown loss resilience mode: {mode}")
+
+        mode, expected_loss = self._loss_resilience
+        _LOGGER.info(
+            "Loss resilience for %s set to %s (expected loss %d%%)",
+            self._camera_entity_id,
+            mode,
+            expected_loss,
+        )
+        self._rtp_sender.redundancy = mode == RESILIENCE_REDUNDANCY
+        if (
+            self._rate_controller is not None
+            and self._opus_stream is not None
+            and self._rate_controller.set_resilience(mode, expected_loss)
+        ):
+            self._opus_stream.configure(self._rate_controller.settings)
+        self.async_write_ha_state()
 
     async def send_audio_data(
         self,
         audio_data: bytes,
         audio_format: str | None = None,
         sample_rate: int | None = None,
+        producer: Hashable = SERVICE_PRODUCER,
+        priority: int = PRIORITY_USER,
     ) -> None:
         """Send audio data to the camera.
 
@@ -906,24 +1766,68 @@ class TalkbackSwitch(SwitchEntity):
 
         Args:
             audio_data: Raw audio bytes to transmit (WebM/Opus from frontend)
+            producer: Source of the audio, used for arbitration and mixing
+            priority: Producer priority under the priority policy
+        """
+        self.enqueue_audio(audio_data, audio_format, sample_rate, producer, priority)
+
+    @callback
+    def enqueue_audio(
+        self,
+        audio_data: bytes | memoryview,
+        audio_format: str | None = None,
+        sample_rate: int | None = None,
+        producer: Hashable = SERVICE_PRODUCER,
+        priority: int = PRIORITY_USER,
+    ) -> bool:
+        """Queue an audio chunk for the streaming task without awaiting.
+
+        Returns False when the backchannel is inactive, the producer is not
+        allowed to talk right now, or the chunk could not be queued.
         """
         if not self._is_on:
-            _LOGGER.warning(
+            self._audio_log.warning(
+                "inactive_send",
                 "Attempted to send audio data while backchannel inactive for %s",
                 self._camera_entity_id,
             )
-            return
+            return False
+
+        if not self._arbiter.accepts(producer, priority):
+            return False
 
         try:
-            # Queue audio data for the streaming task to process
-            await self._audio_queue.put((audio_data, audio_format, sample_rate))
+            # Copy the chunk into the session ring for the streaming task.
+            # When the encoder falls behind, the ring drops the oldest chunks
+            # rather than letting latency and memory grow without bound.
+            slot = self._producer_slots.get(producer)
+            if slot is None:
+                slot = self._producer_slots[producer] = len(self._slot_producers)
+                self._slot_producers.append(producer)
+            dropped = self._audio_ring.dropped
+            queued = self._audio_ring.write(audio_data, sample_rate, slot, audio_format)
+            self._dropped_chunks += self._audio_ring.dropped - dropped
+            if not queued:
+                self._dropped_chunks += 1
+                self._audio_log.warning(
+                    "oversized_chunk",
+                    "Dropping %d byte audio chunk for %s - larger than the"
+                    " %d byte session buffer",
+                    len(audio_data),
+                    self._camera_entity_id,
+                    self._audio_ring.capacity,
+                )
+                return False
+            self._audio_ready.set()
 
-            _LOGGER.debug(
-                "Queued audio chunk for %s - size: %d bytes, queue_size: %d",
-                self._camera_entity_id,
-                len(audio_data),
-                self._audio_queue.qsize(),
-            )
+            if self._audio_log.sample("queued"):
+                _LOGGER.debug(
+                    "Queued audio chunk for %s - size: %d bytes, queue_size: %d",
+                    self._camera_entity_id,
+                    len(audio_data),
+                    len(self._audio_ring),
+                )
+            return True
 
         except Exception as err:
             self._transmission_errors += 1
@@ -934,6 +1838,149 @@ class TalkbackSwitch(SwitchEntity):
                 self._transmission_errors,
             )
             self.async_write_ha_state()
+            return False
+
+    def _read_audio(
+        self,
+    ) -> tuple[memoryview, int | None, Hashable, str | None] | None:
+        """Pop the oldest queued chunk as (view, sample rate, producer, format)."""
+        record = self._audio_ring.read()
+        if record is None:
+            return None
+        self._audio_consumed.set()
+        audio_data, sample_rate, slot, audio_format = record
+        return audio_data, sample_rate, self._slot_producers[slot], audio_format
+
+    async def async_wait_for_room(self, max_queued: int) -> None:
+        """Wait until at most ``max_queued`` chunks are waiting to be encoded.
+
+        A producer that can pause, such as an HTTP upload, calls this between
+        chunks so it is held back instead of having its audio dropped.
+        """
+        while self._is_on and len(self._audio_ring) > max_queued:
+            self._audio_consumed.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._audio_consumed.wait(), timeout=QUEUE_POLL_INTERVAL
+                )
+
+    @callback
+    def claim_stream(
+        self,
+        owner: Hashable,
+        on_stop: Callable[[], None],
+        priority: int = PRIORITY_USER,
+    ) -> bool:
+        """Claim this switch for a streaming client.
+
+        ``on_stop`` is called when the session ends for any other reason (turned
+        off, idle timeout, error) so the client can drop its stream. Returns
+        False if the arbitration policy refuses the new producer.
+        """
+        return self._arbiter.claim(owner, priority, on_stop)
+
+    async def async_release_stream(
+        self, owner: Hashable, stop_session: bool = True
+    ) -> None:
+        """Release a streaming claim and stop the session once nobody streams.
+
+        With ``stop_session`` false the session stays up, so a client whose
+        stream never got going can claim it again another way.
+        """
+        if not self._release_producer(owner):
+            return
+        if stop_session and not self._arbiter.has_claims():
+            await self._async_stop_session(STOP_REASON_STREAM_CLOSED)
+
+    def _release_producer(self, owner: Hashable) -> bool:
+        """Forget a producer and its mixing state; return True if it was known."""
+        if not self._arbiter.release(owner):
+            return False
+        self._forget_producer_audio(owner)
+        return True
+
+    def _forget_producer_audio(self, owner: Hashable) -> None:
+        """Drop a departed producer's mixer buffer and resampler."""
+        if self._mixer is not None:
+            self._mixer.remove(owner)
+        self._mix_resamplers.pop(owner, None)
+
+    async def async_set_rtp_ingest(
+        self,
+        port: int,
+        source: str | None = None,
+        opus_payload_type: int | None = None,
+    ) -> None:
+        """Handle the set_rtp_ingest service for this camera.
+
+        Listens for RTP on ``port`` (0 stops listening), optionally only from
+        the ``source`` address. Received audio goes to the talkback session
+        while the switch is on.
+        """
+        if port and not 1024 <= port <= 65535:
+            raise HomeAssistantError(f"RTP ingest port must be 1024-65535, got {port}")
+        if self._rtp_ingest is not None:
+            self._rtp_ingest.close()
+            self._rtp_ingest = None
+        if port:
+            try:
+                await self._async_start_rtp_ingest(port, source, opus_payload_type)
+            except OSError as err:
+                self.async_write_ha_state()
+                raise HomeAssistantError(
+                    f"Cannot listen for RTP on port {port}: {err}"
+                ) from err
+            _LOGGER.info(
+                "RTP ingest for %s listening on port %d (source %s)",
+                self._camera_entity_id,
+                port,
+                source or "any",
+            )
+        self.async_write_ha_state()
+
+    async def _async_start_rtp_ingest(
+        self, port: int, source: str | None, opus_payload_type: int | None
+    ) -> None:
+        """Open the RTP ingest listener."""
+        ingest = RtpIngest(self._on_ingest_audio, source or None, opus_payload_type)
+        await ingest.async_start(port)
+        self._rtp_ingest = ingest
+
+    @callback
+    def _on_ingest_audio(
+        self, audio_data: bytes, audio_format: str, sample_rate: int | None
+    ) -> None:
+        """Queue audio from the RTP ingest listener while talkback is on."""
+        if self._is_on:
+            self.enqueue_audio(
+                audio_data, audio_format, sample_rate, RTP_INGEST_PRODUCER
+            )
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the per-camera loss-resilience and RTP ingest settings."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is None:
+            return
+        mode = last_state.attributes.get("loss_resilience_override")
+        if mode in LOSS_RESILIENCE_MODES:
+            self._loss_resilience_override = (
+                mode,
+                int(last_state.attributes.get("expected_packet_loss", 0)),
+            )
+        if port := last_state.attributes.get("rtp_ingest_port"):
+            try:
+                await self._async_start_rtp_ingest(
+                    int(port),
+                    last_state.attributes.get("rtp_ingest_source"),
+                    last_state.attributes.get("rtp_ingest_opus_payload_type"),
+                )
+            except OSError as err:
+                _LOGGER.warning(
+                    "Cannot restore RTP ingest for %s on port %s: %s",
+                    self._camera_entity_id,
+                    port,
+                    err,
+                )
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up when entity is removed."""
@@ -941,5 +1988,8 @@ class TalkbackSwitch(SwitchEntity):
             "Cleaning up talkback switch entity for %s",
             self._camera_entity_id,
         )
+        if self._rtp_ingest is not None:
+            self._rtp_ingest.close()
+            self._rtp_ingest = None
         if self._is_on:
             await self._stop_backchannel()
@@ -0,0 +1,549 @@
+"""Multi-process transcoding backend for talkback audio.
+
+Each worker process owns the decode/resample/encode/RTP state for a shard
+of cameras, running the same stages as the in-process pipeline. Audio
+reaches a worker through a single-producer/single-consumer ring buffer in
+shared memory, so chunks are copied once and never pickled; only session
+control and periodic statistics travel over a pipe.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import av
+
+from .audio_format import (
+    AUDIO_FORMAT_CODES,
+    OPUS_PACKETS_FORMAT,
+    PCM_FORMAT,
+    detect_audio_format,
+    normalize_audio_chunk,
+    opus_timestamp_gap,
+    parse_opus_packets,
+)
+from .clock import SessionClock
+from .encoding import (
+    OutputResampler,
+    clocked_frames,
+    decode_frames,
+    pcm_frame,
+    stamp_opus_packet,
+    webm_init_segment,
+)
+from .vad import VoiceActivityDetector
+
+_LOGGER = logging.getLogger(__name__)
+
+# Shared-memory ring per worker
+DEFAULT_RING_SIZE = 1 << 20  # 1 MiB, several seconds of WebM/Opus or PCM
+RING_INDEX = struct.Struct("=QQ")  # write position, read position
+RECORD_HEADER = struct.Struct("=IIIB")  # length, session id, sample rate, format
+
+# Worker loop timing
+WORKER_POLL_INTERVAL = 0.05  # Seconds between control checks when idle
+STATS_INTERVAL = 1.0  # Seconds between statistics reports per session
+WORKER_STOP_TIMEOUT = 5.0
+
+
+class SharedRing:
+    """Single-producer/single-consumer ring of length-prefixed records.
+
+    The first 16 bytes hold the absolute write and read positions; each side
+    only ever writes its own position. Records wrap around the end of the
+    data region, so a record never needs contiguous free space.
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool) -> None:
+        """Wrap an existing shared memory block."""
+        self._shm = shm
+        self._owner = owner
+        buf = shm.buf
+        assert buf is not None  # Only None once the block is closed
+        self._index = buf[: RING_INDEX.size]
+        self._data = buf[RING_INDEX.size :]
+        self.capacity = len(self._data)
+
+    @classmethod
+    def create(cls, size: int = DEFAULT_RING_SIZE) -> SharedRing:
+        """Allocate a new ring, owned (and unlinked) by the caller."""
+        ring = cls(SharedMemory(create=True, size=RING_INDEX.size + size), owner=True)
+        RING_INDEX.pack_into(ring._index, 0, 0, 0)
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> SharedRing:
+        """Attach to a ring created by another process."""
+        return cls(SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Return the shared memory name used to attach from a worker."""
+        return self._shm.name
+
+    def write(self, header: bytes, payload: bytes | memoryview) -> bool:
+        """Append one record. Returns False if the ring is full."""
+        write_pos, read_pos = RING_INDEX.unpack_from(self._index)
+        size = len(header) + len(payload)
+        if size > self.capacity - (write_pos - read_pos):
+            return False
+
+        pos = self._copy_in(write_pos, header)
+        self._copy_in(pos, payload)
+        struct.pack_into("=Q", self._index, 0, write_pos + size)
+        return True
+
+    def read(self) -> tuple[tuple[int, int, int, int], bytearray] | None:
+        """Pop the oldest record as (header fields, payload)."""
+        write_pos, read_pos = RING_INDEX.unpack_from(self._index)
+        if write_pos == read_pos:
+            return None
+
+        header = RECORD_HEADER.unpack(self._copy_out(read_pos, RECORD_HEADER.size))
+        payload = self._copy_out(read_pos + RECORD_HEADER.size, header[0])
+        struct.pack_into(
+            "=Q", self._index, 8, read_pos + RECORD_HEADER.size + header[0]
+        )
+        return header, payload
+
+    def _copy_in(self, pos: int, data: bytes | memoryview) -> int:
+        """Copy ``data`` into the ring at absolute position ``pos``."""
+        start = pos % self.capacity
+        first = min(len(data), self.capacity - start)
+        self._data[start : start + first] = data[:first]
+        if first < len(data):
+            self._data[: len(data) - first] = data[first:]
+        return pos + len(data)
+
+    def _copy_out(self, pos: int, length: int) -> bytearray:
+        """Copy ``length`` bytes out of the ring from absolute position ``pos``."""
+        start = pos % self.capacity
+        first = min(length, self.capacity - start)
+        out = bytearray(self._data[start : start + first])
+        if first < length:
+            out += self._data[: length - first]
+        return out
+
+    def close(self) -> None:
+        """Release the mapping, unlinking it if this side created it."""
+        self._index.release()
+        self._data.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class _WorkerSession:
+    """Decode, resample, encode and send audio for one camera in a worker."""
+
+    def __init__(
+        self,
+        rtp_url: str,
+        codec_name: str,
+        sample_rate: int,
+        bit_rate: int,
+        codec_options: dict[str, str] | None = None,
+        voice_gate: bool = False,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.container = av.open(
+            rtp_url, mode="w", format="rtp", options={"payload_type": "96"}
+        )
+        self.stream = self.container.add_stream(codec_name, rate=sample_rate)
+        self.stream.codec_context.bit_rate = bit_rate
+        if codec_options:
+            self.stream.codec_context.options = codec_options
+        self.clock = SessionClock(sample_rate)
+        self.vad = VoiceActivityDetector() if voice_gate else None
+        self._resampler = OutputResampler(self.stream.codec_context, sample_rate)
+        self._init_segment: bytes | None = None
+        self._input_format: str | None = None
+        self._opus_timestamp: int | None = None
+        self._opus_decoder: av.CodecContext | None = None
+        self.chunks = 0
+        self.octets = 0
+        self.errors = 0
+        self.reported = (0, 0, 0, 0, 0)
+
+    def process(
+        self, payload: bytearray, audio_format: str | None, input_rate: int
+    ) -> None:
+        """Transcode one chunk, counting failures instead of raising.
+
+        One bad chunk must not stop the worker, which serves other cameras.
+        """
+        try:
+            if audio_format == PCM_FORMAT:
+                self._encode(pcm_frame(payload, input_rate or self.sample_rate))
+            elif audio_format == OPUS_PACKETS_FORMAT:
+                self._process_opus_packets(payload)
+            else:
+                self._process_container(bytes(payload), audio_format)
+        except (av.error.FFmpegError, ValueError) as err:
+            self.errors += 1
+            _LOGGER.debug("Worker failed to transcode chunk: %s", err)
+            return
+        except Exception:
+            self.errors += 1
+            _LOGGER.exception("Worker failed to transcode chunk")
+            return
+        self.chunks += 1
+        self.octets += len(payload)
+
+    def _process_opus_packets(self, payload: bytearray) -> None:
+        # Opus packets go out as they are; other camera codecs need PCM
+        forward = self.stream.codec_context.name == "libopus"
+        for timestamp, data, samples in parse_opus_packets(payload):
+            gap = opus_timestamp_gap(self._opus_timestamp, timestamp)
+            if gap is None:
+                continue
+            self._opus_timestamp = (timestamp + samples) & 0xFFFFFFFF
+            if not forward:
+                if self._opus_decoder is None:
+                    self._opus_decoder = av.CodecContext.create("opus", "r")
+                for frame in self._opus_decoder.decode(av.Packet(bytes(data))):
+                    self._encode(frame)
+                continue
+            if (packet := stamp_opus_packet(self.clock, data, samples, gap)) is None:
+                continue
+            packet.stream = self.stream
+            self.container.mux(packet)
+
+    def _process_container(self, chunk: bytes, audio_format: str | None) -> None:
+        chunk = normalize_audio_chunk(chunk, audio_format)
+        self._input_format = (
+            audio_format or detect_audio_format(chunk) or self._input_format
+        )
+
+        segments: tuple[bytes, ...] = (chunk,)
+        if init_segment := webm_init_segment(chunk):
+            self._init_segment = init_segment
+        elif self._input_format == "webm" and self._init_segment:
+            segments = (self._init_segment, chunk)
+        for frame in decode_frames(segments, self._input_format):
+            self._encode(frame)
+
+    def _encode(self, frame: av.AudioFrame) -> None:
+        for out_frame in clocked_frames(self.clock, frame, self._resampler, self.vad):
+            for packet in self.stream.encode(out_frame):
+                self.container.mux(packet)
+
+    def pop_stats(self) -> tuple[int, int, int, int, int] | None:
+        """Return counter deltas since the last report, if any changed."""
+        counters = (
+            self.chunks,
+            self.octets,
+            self.errors,
+            self.vad.voice_frames if self.vad else 0,
+            self.vad.gated_frames if self.vad else 0,
+        )
+        if counters == self.reported:
+            return None
+        chunks, octets, errors, voiced, gated = self.reported
+        self.reported = counters
+        return (
+            counters[0] - chunks,
+            counters[1] - octets,
+            counters[2] - errors,
+            counters[3] - voiced,
+            counters[4] - gated,
+        )
+
+    def close(self) -> None:
+        self.container.close()
+
+
+class _WorkerLoop:
+    """Event loop of one worker process."""
+
+    def __init__(self, conn: Connection, ring: SharedRing, doorbell: Any) -> None:
+        self._conn = conn
+        self._ring = ring
+        self._doorbell = doorbell
+        self._sessions: dict[int, _WorkerSession] = {}
+        self._running = True
+
+    def run(self) -> None:
+        next_report = time.monotonic() + STATS_INTERVAL
+        try:
+            while self._handle_control():
+                # One doorbell token is released per record written
+                if self._doorbell.acquire(timeout=WORKER_POLL_INTERVAL):
+                    self._process_record()
+                if time.monotonic() >= next_report:
+                    next_report = time.monotonic() + STATS_INTERVAL
+                    for session_id, session in self._sessions.items():
+                        self._report(session_id, session)
+        except (EOFError, KeyboardInterrupt):
+            pass
+        finally:
+            for session in self._sessions.values():
+                session.close()
+            self._ring.close()
+
+    def _process_record(self) -> None:
+        if (record := self._ring.read()) is None:
+            return
+        (_, session_id, rate, fmt), payload = record
+        # The session may have been opened after the last control check
+        self._handle_control()
+        if session := self._sessions.get(session_id):
+            session.process(payload, AUDIO_FORMAT_CODES[fmt], rate)
+
+    def _handle_control(self) -> bool:
+        """Apply pending control messages. Returns False once told to stop."""
+        while self._running and self._conn.poll():
+            command, *args = self._conn.recv()
+            if command == "open":
+                session_id, *session_args = args
+                try:
+                    self._sessions[session_id] = _WorkerSession(*session_args)
+                except Exception as err:
+                    self._conn.send(("failed", session_id, str(err)))
+            elif command == "close":
+                if session := self._sessions.pop(args[0], None):
+                    self._report(args[0], session)
+                    session.close()
+            elif command == "stop":
+                self._running = False
+        return self._running
+
+    def _report(self, session_id: int, session: _WorkerSession) -> None:
+        if (delta := session.pop_stats()) is not None:
+            self._conn.send(("stats", session_id, *delta))
+
+
+def _worker_main(conn: Connection, ring_name: str, doorbell: Any) -> None:
+    """Worker process entry point."""
+    _WorkerLoop(conn, SharedRing.attach(ring_name), doorbell).run()
+
+
+@dataclass
+class WorkerSession:
+    """Main-process handle for a session running in a worker."""
+
+    session_id: int
+    worker: int
+    # Deltas of (chunks, octets, errors, voiced frames, gated frames)
+    on_stats: Callable[[int, int, int, int, int], None]
+    on_lost: Callable[[str], None]
+
+
+class _Worker:
+    """Main-process side of one worker process."""
+
+    def __init__(self, index: int, ring_size: int) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self.index = index
+        self.ring = SharedRing.create(ring_size)
+        self.doorbell = ctx.Semaphore(0)
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.ring.name, self.doorbell),
+            name=f"up2wa-transcoder-{index}",
+            daemon=True,
+        )
+        self._child_conn = child_conn
+        self.cameras: set[str] = set()
+
+    def start(self) -> None:
+        self.process.start()
+        self._child_conn.close()
+
+    def stop(self) -> None:
+        with contextlib.suppress(OSError):
+            self.conn.send(("stop",))
+        self.process.join(WORKER_STOP_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+        self.ring.close()
+
+
+class TranscoderPool:
+    """Pool of transcoding worker processes shared by every camera.
+
+    A camera is pinned to the least-loaded worker the first time it talks
+    and stays there, so per-camera decoder and RTP state live in one process
+    and cameras spread evenly across cores.
+    """
+
+    def __init__(self, workers: int, ring_size: int = DEFAULT_RING_SIZE) -> None:
+        """Initialize the pool; processes start on first use."""
+        self._size = workers
+        self._ring_size = ring_size
+        self._workers: list[_Worker | None] = [None] * workers
+        self._camera_worker: dict[str, int] = {}
+        self._sessions: dict[int, WorkerSession] = {}
+        self._next_session_id = 1
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def size(self) -> int:
+        """Return the number of worker processes."""
+        return self._size
+
+    def worker_for(self, camera_id: str) -> int:
+        """Return the worker a camera is pinned to, assigning one if needed."""
+        if (index := self._camera_worker.get(camera_id)) is None:
+            load = [len(worker.cameras) if worker else 0 for worker in self._workers]
+            index = load.index(min(load))
+            self._camera_worker[camera_id] = index
+        return index
+
+    async def async_open_session(
+        self,
+        camera_id: str,
+        rtp_url: str,
+        codec_name: str,
+        sample_rate: int,
+        bit_rate: int,
+        on_stats: Callable[[int, int, int, int, int], None],
+        on_lost: Callable[[str], None],
+        codec_options: dict[str, str] | None = None,
+        voice_gate: bool = False,
+    ) -> WorkerSession:
+        """Start a talkback session for a camera on its worker.
+
+        ``codec_options`` are private encoder options such as Opus FEC;
+        ``voice_gate`` skips audio without voice as the in-process pipeline
+        does.
+        """
+        self._loop = asyncio.get_running_loop()
+        index = self.worker_for(camera_id)
+        worker = self._workers[index]
+        if worker is None or not worker.process.is_alive():
+            if worker is not None:
+                self._loop.remove_reader(worker.conn.fileno())
+            worker = await self._loop.run_in_executor(None, self._start_worker, index)
+
+        session = WorkerSession(self._next_session_id, index, on_stats, on_lost)
+        self._next_session_id += 1
+        self._sessions[session.session_id] = session
+        worker.cameras.add(camera_id)
+        worker.conn.send(
+            (
+                "open",
+                session.session_id,
+                rtp_url,
+                codec_name,
+                sample_rate,
+                bit_rate,
+                codec_options,
+                voice_gate,
+            )
+        )
+        return session
+
+    def submit(
+        self,
+        session: WorkerSession,
+        audio_data: bytes | memoryview,
+        audio_format: str | None,
+        sample_rate: int | None,
+    ) -> bool:
+        """Hand a chunk to the session's worker. Returns False if its ring is full."""
+        worker = self._workers[session.worker]
+        if worker is None:
+            return False
+        header = RECORD_HEADER.pack(
+            len(audio_data),
+            session.session_id,
+            sample_rate or 0,
+            AUDIO_FORMAT_CODES.index(audio_format)
+            if audio_format in AUDIO_FORMAT_CODES
+            else 0,
+        )
+        if not worker.ring.write(header, audio_data):
+            return False
+        worker.doorbell.release()
+        return True
+
+    def close_session(self, camera_id: str, session: WorkerSession) -> None:
+        """Stop a session; the worker sends its final statistics."""
+        self._sessions.pop(session.session_id, None)
+        worker = self._workers[session.worker]
+        if worker is None:
+            return
+        worker.cameras.discard(camera_id)
+        try:
+            worker.conn.send(("close", session.session_id))
+        except OSError as err:
+            _LOGGER.debug("Transcoder worker %d unreachable: %s", worker.index, err)
+
+    async def async_shutdown(self) -> None:
+        """Stop every worker process and release shared memory."""
+        workers = [worker for worker in self._workers if worker is not None]
+        self._workers = [None] * self._size
+        for worker in workers:
+            if self._loop is not None:
+                self._loop.remove_reader(worker.conn.fileno())
+        for session in list(self._sessions.values()):
+            session.on_lost("transcoder stopped")
+        self._sessions.clear()
+        if workers:
+
+            def stop_workers() -> None:
+                for worker in workers:
+                    worker.stop()
+
+            await asyncio.get_running_loop().run_in_executor(None, stop_workers)
+
+    def _start_worker(self, index: int) -> _Worker:
+        """Spawn (or respawn) a worker process. Runs in an executor."""
+        if (old := self._workers[index]) is not None:
+            old.stop()
+        worker = _Worker(index, self._ring_size)
+        worker.start()
+        self._workers[index] = worker
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(
+            self._loop.add_reader,
+            worker.conn.fileno(),
+            self._on_worker_message,
+            worker,
+        )
+        _LOGGER.debug(
+            "Started transcoder worker %d (pid %s)", index, worker.process.pid
+        )
+        return worker
+
+    def _on_worker_message(self, worker: _Worker) -> None:
+        """Dispatch statistics and failures reported by a worker."""
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            self._on_worker_lost(worker)
+            return
+
+        kind, session_id, *args = message
+        if (session := self._sessions.get(session_id)) is None:
+            return
+        if kind == "stats":
+            session.on_stats(*args)
+        elif kind == "failed":
+            self._sessions.pop(session_id, None)
+            session.on_lost(args[0])
+
+    def _on_worker_lost(self, worker: _Worker) -> None:
+        """Fail every session of a worker that exited unexpectedly."""
+        _LOGGER.warning("Transcoder worker %d exited unexpectedly", worker.index)
+        assert self._loop is not None
+        self._loop.remove_reader(worker.conn.fileno())
+        worker.cameras.clear()
+        for session_id, session in list(self._sessions.items()):
+            if session.worker == worker.index:
+                del self._sessions[session_id]
+                session.on_lost("transcoder worker exited")
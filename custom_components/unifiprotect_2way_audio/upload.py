@@ -0,0 +1,215 @@
+"""HTTP upload of live audio streams from non-browser producers."""
+
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .arbitration import PRIORITY_USER
+from .audio_format import (
+    OPUS_PACKET_HEADER,
+    OPUS_PACKETS_FORMAT,
+    PCM_FORMAT,
+    WEBM_CLUSTER_ID,
+    OggOpusReader,
+    detect_audio_format,
+)
+from .const import DOMAIN
+from .websocket_api import async_get_switch
+
+_LOGGER = logging.getLogger(__name__)
+
+UPLOAD_URL = f"/api/{DOMAIN}/stream"
+UPLOAD_FORMATS = [PCM_FORMAT, "ogg", "webm"]
+
+# Largest chunk handed to the switch; bigger PCM reads are split
+UPLOAD_CHUNK_SIZE = 4096
+# WebM is cut at cluster boundaries, so a cluster may not exceed this
+UPLOAD_MAX_CLUSTER = 1 << 16
+# Chunks waiting to be encoded before the upload stops reading the body
+UPLOAD_MAX_QUEUED = 4
+
+
+class _PcmFramer:
+    """Cut raw PCM into sample-aligned chunks."""
+
+    audio_format = PCM_FORMAT
+
+    def __init__(self) -> None:
+        """Initialize with no pending byte."""
+        self._pending = b""
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Return the whole samples received so far in bounded chunks."""
+        if self._pending:
+            data = self._pending + data
+        usable = len(data) - len(data) % 2
+        self._pending = data[usable:]
+        return [
+            data[start : min(start + UPLOAD_CHUNK_SIZE, usable)]
+            for start in range(0, usable, UPLOAD_CHUNK_SIZE)
+        ]
+
+
+class _OggFramer:
+    """Unwrap Ogg/Opus pages into opus_packets chunks, so nothing is decoded."""
+
+    audio_format = OPUS_PACKETS_FORMAT
+
+    def __init__(self) -> None:
+        """Initialize the page reader."""
+        self._reader = OggOpusReader()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Return one chunk holding the packets ``data`` completed."""
+        packets = self._reader.feed(data)
+        if not packets:
+            return []
+        return [
+            b"".join(
+                OPUS_PACKET_HEADER.pack(timestamp, len(packet)) + packet
+                for timestamp, packet, _samples in packets
+            )
+        ]
+
+
+class _WebmFramer:
+    """Cut a WebM stream before each cluster.
+
+    The first chunk holds the EBML header and the first cluster, which the
+    switch caches as the init segment for the cluster-only chunks after it,
+    as it does for MediaRecorder output.
+    """
+
+    audio_format = "webm"
+
+    def __init__(self) -> None:
+        """Initialize with an empty buffer."""
+        self._buffer = bytearray()
+        self._header_sent = False
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Return the clusters ``data`` completed."""
+        self._buffer += data
+        chunks = []
+        # The header alone is not a chunk; it goes out with the first cluster
+        start = 0 if self._header_sent else self._buffer.find(WEBM_CLUSTER_ID)
+        while start >= 0 and (end := self._buffer.find(WEBM_CLUSTER_ID, start + 1)) > 0:
+            chunks.append(bytes(self._buffer[:end]))
+            del self._buffer[:end]
+            self._header_sent = True
+            start = 0
+        if len(self._buffer) > UPLOAD_MAX_CLUSTER:
+            raise ValueError(
+                f"WebM cluster larger than {UPLOAD_MAX_CLUSTER} bytes; "
+                "limit the cluster duration"
+            )
+        return chunks
+
+
+_FRAMERS: dict[str | None, type[_PcmFramer | _OggFramer | _WebmFramer]] = {
+    PCM_FORMAT: _PcmFramer,
+    "ogg": _OggFramer,
+    "webm": _WebmFramer,
+}
+
+
+class AudioUploadView(HomeAssistantView):
+    """Stream a chunked HTTP request body into a talkback session."""
+
+    url = UPLOAD_URL + "/{entity_id}"
+    name = f"api:{DOMAIN}:stream"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the upload view."""
+        self.hass = hass
+
+    async def post(self, request: web.Request, entity_id: str) -> web.Response:
+        """Feed the request body to the switch as it arrives.
+
+        The switch must be on. The upload claims it like a websocket stream,
+        and the session stops when the body ends. The body is only read while
+        the encoder keeps up, so a fast sender is held back by TCP flow
+        control instead of losing audio.
+        """
+        audio_format = request.query.get("format")
+        if audio_format is not None and audio_format not in UPLOAD_FORMATS:
+            return self.json_message(
+                f"Unsupported format {audio_format}", HTTPStatus.BAD_REQUEST
+            )
+        try:
+            sample_rate = (
+                int(request.query["sample_rate"])
+                if "sample_rate" in request.query
+                else None
+            )
+            priority = int(request.query.get("priority", PRIORITY_USER))
+        except ValueError:
+            return self.json_message("Invalid number", HTTPStatus.BAD_REQUEST)
+
+        switch_entity = async_get_switch(self.hass, entity_id)
+        if switch_entity is None:
+            return self.json_message(
+                f"Could not find switch entity for {entity_id}", HTTPStatus.NOT_FOUND
+            )
+        if not switch_entity.is_on:
+            return self.json_message(
+                "Talkback must be active to stream audio", HTTPStatus.CONFLICT
+            )
+
+        # The producer key is this upload; requests themselves are unhashable
+        owner = object()
+        stopped = False
+
+        def _on_stop() -> None:
+            nonlocal stopped
+            stopped = True
+
+        if not switch_entity.claim_stream(owner, _on_stop, priority):
+            return self.json_message(
+                f"{entity_id} is already streaming audio from another client",
+                HTTPStatus.CONFLICT,
+            )
+
+        received = 0
+        head = b""
+        try:
+            framer: _PcmFramer | _OggFramer | _WebmFramer | None = (
+                _FRAMERS[audio_format]() if audio_format else None
+            )
+            async for data in request.content.iter_any():
+                if stopped:
+                    break
+                received += len(data)
+                if framer is None:
+                    # Only containers announce themselves; PCM must be declared
+                    head += data
+                    if len(head) < len(WEBM_CLUSTER_ID):
+                        continue
+                    framer_type = _FRAMERS.get(detect_audio_format(head[:4]))
+                    if framer_type is None:
+                        return self.json_message(
+                            "Could not detect the audio format; pass ?format=",
+                            HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                        )
+                    framer = framer_type()
+                    data = head
+                for chunk in framer.feed(data):
+                    switch_entity.enqueue_audio(
+                        chunk, framer.audio_format, sample_rate, owner, priority
+                    )
+                await switch_entity.async_wait_for_room(UPLOAD_MAX_QUEUED)
+        except ValueError as err:
+            return self.json_message(str(err), HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+        finally:
+            await switch_entity.async_release_stream(owner)
+
+        _LOGGER.debug("Audio upload for %s ended after %d bytes", entity_id, received)
+        return self.json({"bytes_received": received, "stopped": stopped})
+
+    # curl -T uploads a body with PUT
+    put = post
@@ -0,0 +1,90 @@
+"""Energy-based voice activity detection for the talkback pipeline."""
+
+from __future__ import annotations
+
+import av
+import numpy as np
+
+# Seconds of audio per analysis window
+WINDOW_DURATION = 0.01
+
+# Windows this many dB above the tracked noise floor count as voice
+SNR_MARGIN_DB = 10.0
+
+# Level (dBFS) below which audio never counts as voice
+MIN_VOICE_DB = -50.0
+
+# Initial noise floor (dBFS) and how fast (dB/s) it follows rising background
+# noise; it drops immediately to any quieter window
+INITIAL_NOISE_FLOOR_DB = -60.0
+NOISE_FLOOR_RISE = 2.0
+
+# Seconds the gate stays open after the last voiced window, so word endings
+# and the short pauses between words are still sent
+HANGOVER = 0.3
+
+
+def frame_levels(frame: av.AudioFrame) -> np.ndarray:
+    """Return the level (dBFS) of each analysis window of a frame."""
+    samples = frame.to_ndarray()
+    if np.issubdtype(samples.dtype, np.integer):
+        scale = float(np.iinfo(samples.dtype).max)
+        samples = samples.astype(np.float32) / scale
+    # Planar frames are (channels, samples); packed ones interleave channels
+    power = np.square(samples, dtype=np.float32).mean(axis=0)
+    width = max(1, round(WINDOW_DURATION * frame.sample_rate))
+    if not frame.format.is_planar:
+        width *= len(frame.layout.channels)
+    windows = max(1, power.size // width)
+    if power.size >= width:
+        power = power[: windows * width].reshape(windows, width).mean(axis=1)
+    else:
+        power = power.mean(keepdims=True)
+    return 10 * np.log10(power + 1e-10)
+
+
+class VoiceActivityDetector:
+    """Open or close the talkback gate for each decoded frame.
+
+    A window is voiced when it is louder than both an absolute threshold and
+    the adaptive noise floor plus a margin. The gate stays open for a
+    hangover after the last voiced window.
+    """
+
+    def __init__(
+        self,
+        hangover: float = HANGOVER,
+        snr_margin: float = SNR_MARGIN_DB,
+        min_voice_level: float = MIN_VOICE_DB,
+    ) -> None:
+        """Initialize the detector with the gate closed."""
+        self._hangover = hangover
+        self._snr_margin = snr_margin
+        self._min_voice_level = min_voice_level
+        self.noise_floor = INITIAL_NOISE_FLOOR_DB
+        self._open_for = 0.0  # Seconds of hangover left
+        self.voice_frames = 0
+        self.gated_frames = 0
+
+    def is_voice(self, frame: av.AudioFrame) -> bool:
+        """Return True if a frame should be encoded and sent."""
+        levels = frame_levels(frame)
+        duration = frame.samples / frame.sample_rate
+        quietest = float(levels.min())
+        if quietest < self.noise_floor:
+            self.noise_floor = quietest
+        else:
+            self.noise_floor = min(
+                quietest, self.noise_floor + NOISE_FLOOR_RISE * duration
+            )
+
+        threshold = max(self.noise_floor + self._snr_margin, self._min_voice_level)
+        if levels.max() >= threshold:
+            self._open_for = self._hangover
+        elif self._open_for > 0:
+            self._open_for -= duration
+        else:
+            self.gated_frames += 1
+            return False
+        self.voice_frames += 1
+        return True
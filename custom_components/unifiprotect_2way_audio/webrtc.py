@@ -0,0 +1,147 @@
+"""WebRTC ingress of browser talkback audio."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING
+
+from .audio_format import OPUS_PACKETS_FORMAT
+from .rtp import RTP_HEADER
+from .rtp_ingest import RtpIngest
+
+try:
+    from aiortc import (
+        RTCConfiguration,
+        RTCIceServer,
+        RTCPeerConnection,
+        RTCRtpReceiver,
+        RTCSessionDescription,
+    )
+    from aiortc.exceptions import OperationError
+except ImportError:  # aiortc is optional; clients fall back to the websocket
+    RTCPeerConnection = None
+
+if TYPE_CHECKING:
+    from aiortc.rtp import RtpPacket
+    from webrtc_models import RTCIceServer as HassIceServer
+
+_LOGGER = logging.getLogger(__name__)
+
+WEBRTC_AVAILABLE = RTCPeerConnection is not None
+OPUS_MIME_TYPE = "audio/opus"
+
+# (opus_packets chunk) handed to the talkback switch
+PeerAudioCallback = Callable[[bytes], None]
+
+
+class TalkbackPeer:
+    """Answer a browser's WebRTC offer and pass on the Opus it sends.
+
+    The browser's own WebRTC stack carries the microphone over SRTP/UDP with
+    its congestion control, so a lost packet never holds up the ones behind
+    it as it does on the websocket. Only Opus is accepted. The RTP packets
+    are taken from aiortc's receiver before it would decode them and go
+    through the ``RtpIngest`` jitter buffer, so they reach the switch as
+    ``opus_packets`` chunks and are sent to the camera without re-encoding.
+
+    ICE uses the servers configured for Home Assistant under ``webrtc:``;
+    with none, only host candidates are offered, which suffices on a LAN.
+    """
+
+    def __init__(
+        self,
+        on_audio: PeerAudioCallback,
+        on_failed: Callable[[], None],
+        ice_servers: Iterable[HassIceServer] = (),
+    ) -> None:
+        """Initialize a peer that reports audio to ``on_audio``.
+
+        ``on_failed`` is called when the connection fails, including ICE
+        finding no route before it ever connected.
+        """
+        self._on_audio = on_audio
+        self._on_failed = on_failed
+        self._ice_servers = [
+            RTCIceServer(server.urls, server.username, server.credential)
+            for server in ice_servers
+        ]
+        self._ingest = RtpIngest(self._on_ingest_audio)
+        self._pc: RTCPeerConnection | None = None
+        self.connected = False
+
+    @property
+    def lost_packets(self) -> int:
+        """Return packets the jitter buffer skipped as lost."""
+        return self._ingest.lost_packets
+
+    async def async_answer(self, offer_sdp: str) -> str:
+        """Accept an SDP offer and return the answer.
+
+        ICE candidates are gathered before this returns, so the answer is
+        complete and no trickle signaling is needed. Raises ValueError for
+        an offer without an Opus audio track.
+        """
+        self._pc = pc = RTCPeerConnection(
+            RTCConfiguration(iceServers=self._ice_servers)
+        )
+
+        @pc.on("connectionstatechange")
+        def _on_state() -> None:
+            _LOGGER.debug("WebRTC talkback connection %s", pc.connectionState)
+            if pc.connectionState == "connected":
+                self.connected = True
+            elif pc.connectionState == "failed":
+                self._on_failed()
+
+        # Codec preferences only apply to transceivers that exist before the
+        # offer is applied, so the offer's audio track is bound to this one
+        transceiver = pc.addTransceiver("audio", direction="recvonly")
+        transceiver.setCodecPreferences(
+            [
+                codec
+                for codec in RTCRtpReceiver.getCapabilities("audio").codecs
+                if codec.mimeType.lower() == OPUS_MIME_TYPE
+            ]
+        )
+        # aiortc offers no encoded-frame API; the DTLS transport hands every
+        # routed packet to this method, which here replaces decoding
+        transceiver.receiver._handle_rtp_packet = self._handle_rtp_packet
+
+        try:
+            await pc.setRemoteDescription(RTCSessionDescription(offer_sdp, "offer"))
+        except OperationError as err:
+            raise ValueError("Offer has no Opus audio track") from err
+        if transceiver.mid is None:
+            raise ValueError("Offer has no audio track")
+
+        await pc.setLocalDescription(await pc.createAnswer())
+        return pc.localDescription.sdp
+
+    async def _handle_rtp_packet(self, packet: RtpPacket, arrival_time_ms: int) -> None:
+        """Queue one decrypted RTP packet in the jitter buffer."""
+        if not packet.payload:
+            # Padding-only bandwidth probes
+            return
+        header = RTP_HEADER.pack(
+            0x80,
+            packet.payload_type,
+            packet.sequence_number,
+            packet.timestamp,
+            packet.ssrc,
+        )
+        self._ingest.datagram_received(header + packet.payload, ("", 0))
+
+    def _on_ingest_audio(
+        self, chunk: bytes, audio_format: str, _rate: int | None
+    ) -> None:
+        """Pass an in-order Opus chunk on to the switch."""
+        if audio_format == OPUS_PACKETS_FORMAT:
+            self._on_audio(chunk)
+
+    async def async_close(self) -> None:
+        """Close the connection and drop buffered packets."""
+        self._ingest.close()
+        pc, self._pc = self._pc, None
+        if pc is not None:
+            await pc.close()
@@ -4,22 +4,38 @@ from __future__ import annotations
 
 import base64
 import logging
-from typing import Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from homeassistant.components import websocket_api
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry as er
 
+from .arbitration import PRIORITY_USER
+from .audio_format import OPUS_PACKETS_FORMAT
 from .const import DOMAIN
+from .downlink import DOWNLINK_FORMAT, DOWNLINK_SAMPLE_RATE
+from .sequencer import SEQUENCE_HEADER, ChunkSequencer
+from .webrtc import WEBRTC_AVAILABLE, TalkbackPeer
+
+if TYPE_CHECKING:
+    from .switch import TalkbackSwitch
 
 _LOGGER = logging.getLogger(__name__)
 
+AUDIO_FORMATS = ["webm", "ogg", "pcm_s16le", "opus_packets"]
+
 
 @callback
 def async_register_websocket_handlers(hass: HomeAssistant) -> None:
     """Register websocket handlers."""
     websocket_api.async_register_command(hass, handle_stream_audio)
+    websocket_api.async_register_command(hass, handle_start_stream)
+    websocket_api.async_register_command(hass, handle_start_webrtc)
+    websocket_api.async_register_command(hass, handle_listen)
+    websocket_api.async_register_command(hass, handle_capabilities)
     _LOGGER.info("Registered UniFi Protect 2-Way Audio websocket handlers")
 
 
@@ -28,7 +44,7 @@ def async_register_websocket_handlers(hass: HomeAssistant) -> None:
         vol.Required("type"): "unifiprotect_2way_audio/stream_audio",
         vol.Required("entity_id"): str,
         vol.Required("audio_data"): str,
-        vol.Optional("audio_format"): vol.In(["webm", "ogg", "pcm_s16le"]),
+        vol.Optional("audio_format"): vol.In(AUDIO_FORMATS),
         vol.Optional("sample_rate"): int,
     }
 )
@@ -72,17 +88,7 @@ async def handle_stream_audio(
             return
 
         # Find the switch entity instance
-        switch_entity = None
-        for _entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
-            if isinstance(entry_data, dict) and "manager" in entry_data:
-                manager = entry_data["manager"]
-                for device in manager.get_devices():
-                    if device.switch and device.switch.entity_id == entity_id:
-                        switch_entity = device.switch
-                        break
-                if switch_entity:
-                    break
-
+        switch_entity = async_get_switch(hass, entity_id)
         if not switch_entity:
             connection.send_error(
                 msg["id"],
@@ -107,13 +113,15 @@ async def handle_stream_audio(
                 audio_bytes,
                 audio_format=audio_format,
                 sample_rate=sample_rate,
+                producer=connection,
             )
 
-            _LOGGER.debug(
-                "Received audio via websocket for %s - size: %d bytes",
-                entity_id,
-                len(audio_bytes),
-            )
+            if switch_entity.audio_log.sample("websocket_received"):
+                _LOGGER.debug(
+                    "Received audio via websocket for %s - size: %d bytes",
+                    entity_id,
+                    len(audio_bytes),
+                )
 
             # Send success response
             connection.send_result(msg["id"], {"success": True})
@@ -141,3 +149,349 @@ async def handle_stream_audio(
             "unknown_error",
             str(err),
         )
+
+
+@callback
+def async_get_switch(hass: HomeAssistant, entity_id: str) -> TalkbackSwitch | None:
+    """Find the talkback switch entity instance for an entity_id."""
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        if isinstance(entry_data, dict) and "manager" in entry_data:
+            for device in entry_data["manager"].get_devices():
+                if device.switch and device.switch.entity_id == entity_id:
+                    return device.switch
+    return None
+
+
+@callback
+def _async_deliver_sequenced(
+    connection: websocket_api.ActiveConnection,
+    msg_id: int,
+    sequencer: ChunkSequencer,
+    payload: bytes,
+    queue: Callable[[bytes], None],
+) -> None:
+    """Queue the chunks a numbered frame releases and acknowledge them."""
+    if len(payload) <= SEQUENCE_HEADER.size:
+        return
+    acked = sequencer.acked
+    (seq,) = SEQUENCE_HEADER.unpack_from(payload)
+    for chunk in sequencer.push(seq, payload[SEQUENCE_HEADER.size :]):
+        queue(chunk)
+    if sequencer.acked != acked:
+        connection.send_event(msg_id, {"type": "ack", "seq": sequencer.acked})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "unifiprotect_2way_audio/start_stream",
+        vol.Required("entity_id"): str,
+        vol.Optional("audio_format", default="pcm_s16le"): vol.In(AUDIO_FORMATS),
+        vol.Optional("sample_rate"): int,
+        vol.Optional("priority", default=PRIORITY_USER): int,
+        vol.Optional("sequenced", default=False): bool,
+    }
+)
+@callback
+def handle_start_stream(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Claim a talkback switch and stream binary audio over this connection.
+
+    The switch and its talkback state are validated once. The client then
+    sends raw audio as binary websocket messages prefixed with the returned
+    ``handler_id`` byte. The backchannel is stopped when the subscription
+    ends or the connection closes, so a vanished client cannot leave an
+    orphaned session behind.
+
+    With ``sequenced`` set, each binary message also carries a 32-bit chunk
+    number after the handler byte. Chunks are delivered in order through a
+    small reorder buffer, and ``ack`` events report the last chunk delivered
+    so the client can bound the audio it has in flight.
+    """
+    entity_id = msg["entity_id"]
+    audio_format = msg["audio_format"]
+    sample_rate = msg.get("sample_rate")
+    msg_id = msg["id"]
+
+    switch_entity = async_get_switch(hass, entity_id)
+    if not switch_entity:
+        connection.send_error(
+            msg_id,
+            "entity_not_found",
+            f"Could not find switch entity for {entity_id}",
+        )
+        return
+
+    if not switch_entity.is_on:
+        connection.send_error(
+            msg_id,
+            "talkback_inactive",
+            "Talkback must be active to stream audio",
+        )
+        return
+
+    unregister_handler: Callable[[], None] | None = None
+
+    @callback
+    def _on_session_stopped() -> None:
+        """Close the subscription when the switch stops on its own."""
+        if unregister_handler:
+            unregister_handler()
+        if connection.subscriptions.pop(msg_id, None) is not None:
+            connection.send_event(msg_id, {"type": "stopped"})
+
+    if not switch_entity.claim_stream(connection, _on_session_stopped, msg["priority"]):
+        connection.send_error(
+            msg_id,
+            "stream_in_use",
+            f"{entity_id} is already streaming audio from another client",
+        )
+        return
+
+    sequencer = ChunkSequencer() if msg["sequenced"] else None
+
+    @callback
+    def _on_audio(
+        _hass: HomeAssistant,
+        _connection: websocket_api.ActiveConnection,
+        payload: bytes,
+    ) -> None:
+        """Queue one binary audio chunk for the talkback session."""
+        if sequencer is not None:
+            _async_deliver_sequenced(connection, msg_id, sequencer, payload, _queue)
+        elif payload:
+            _queue(payload)
+
+    @callback
+    def _queue(chunk: bytes) -> None:
+        """Hand one audio chunk to the talkback session."""
+        switch_entity.enqueue_audio(
+            chunk, audio_format, sample_rate, connection, msg["priority"]
+        )
+
+    handler_id, unregister_handler = connection.async_register_binary_handler(_on_audio)
+
+    @callback
+    def _unsubscribe() -> None:
+        """Release the switch when the client unsubscribes or disconnects."""
+        if unregister_handler:
+            unregister_handler()
+        if sequencer and (sequencer.lost or sequencer.late):
+            _LOGGER.debug(
+                "Audio stream for %s lost %d chunks, dropped %d late",
+                entity_id,
+                sequencer.lost,
+                sequencer.late,
+            )
+        hass.async_create_task(switch_entity.async_release_stream(connection))
+
+    connection.subscriptions[msg_id] = _unsubscribe
+    connection.send_result(msg_id)
+    connection.send_event(msg_id, {"type": "ready", "handler_id": handler_id})
+    _LOGGER.debug(
+        "Started binary audio stream for %s (handler %d, format %s)",
+        entity_id,
+        handler_id,
+        audio_format,
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "unifiprotect_2way_audio/start_webrtc",
+        vol.Required("entity_id"): str,
+        vol.Required("offer"): str,
+        vol.Optional("priority", default=PRIORITY_USER): int,
+    }
+)
+@websocket_api.async_response
+async def handle_start_webrtc(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Claim a talkback switch for Opus audio sent over WebRTC.
+
+    The client sends an SDP offer with its microphone track and receives the
+    answer in an ``answer`` event. Audio then flows over the peer connection
+    instead of this websocket, and the session ends like a binary stream.
+    If the peer connection fails, a ``failed`` event closes the
+    subscription; when it never connected, the session is left running so
+    the client can fall back to ``start_stream``.
+    """
+    entity_id = msg["entity_id"]
+    msg_id = msg["id"]
+
+    if not WEBRTC_AVAILABLE:
+        connection.send_error(
+            msg_id,
+            "webrtc_unavailable",
+            "Install aiortc to stream audio over WebRTC",
+        )
+        return
+
+    switch_entity = async_get_switch(hass, entity_id)
+    if not switch_entity:
+        connection.send_error(
+            msg_id,
+            "entity_not_found",
+            f"Could not find switch entity for {entity_id}",
+        )
+        return
+
+    if not switch_entity.is_on:
+        connection.send_error(
+            msg_id,
+            "talkback_inactive",
+            "Talkback must be active to stream audio",
+        )
+        return
+
+    @callback
+    def _queue(chunk: bytes) -> None:
+        """Hand one Opus chunk to the talkback session."""
+        switch_entity.enqueue_audio(
+            chunk, OPUS_PACKETS_FORMAT, None, peer, msg["priority"]
+        )
+
+    @callback
+    def _close() -> None:
+        """Close the peer and release the switch."""
+        if peer.lost_packets:
+            _LOGGER.debug(
+                "WebRTC audio for %s lost %d packets", entity_id, peer.lost_packets
+            )
+        hass.async_create_task(peer.async_close())
+        # A peer that never connected leaves the session to the fallback
+        hass.async_create_task(
+            switch_entity.async_release_stream(peer, stop_session=peer.connected)
+        )
+
+    @callback
+    def _end(event_type: str) -> None:
+        """Close the subscription with a final event."""
+        if connection.subscriptions.pop(msg_id, None) is not None:
+            _close()
+            connection.send_event(msg_id, {"type": event_type})
+
+    peer = TalkbackPeer(_queue, lambda: _end("failed"), hass.config.webrtc.ice_servers)
+    if not switch_entity.claim_stream(peer, lambda: _end("stopped"), msg["priority"]):
+        connection.send_error(
+            msg_id,
+            "stream_in_use",
+            f"{entity_id} is already streaming audio from another client",
+        )
+        return
+
+    try:
+        answer = await peer.async_answer(msg["offer"])
+    except ValueError as err:
+        await peer.async_close()
+        await switch_entity.async_release_stream(peer, stop_session=False)
+        connection.send_error(msg_id, "invalid_offer", str(err))
+        return
+
+    connection.subscriptions[msg_id] = _close
+    connection.send_result(msg_id)
+    connection.send_event(msg_id, {"type": "answer", "sdp": answer})
+    _LOGGER.debug("Started WebRTC audio stream for %s", entity_id)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "unifiprotect_2way_audio/capabilities",
+        vol.Required("entity_id"): str,
+    }
+)
+@callback
+def handle_capabilities(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the audio format negotiated for a switch's talkback session.
+
+    Clients capture and send audio at this sample rate and channel count so
+    the server encodes it without resampling.
+    """
+    entity_id = msg["entity_id"]
+    msg_id = msg["id"]
+
+    switch_entity = async_get_switch(hass, entity_id)
+    if not switch_entity:
+        connection.send_error(
+            msg_id,
+            "entity_not_found",
+            f"Could not find switch entity for {entity_id}",
+        )
+        return
+
+    if switch_entity.capabilities is None:
+        connection.send_error(
+            msg_id,
+            "talkback_inactive",
+            "Talkback must be active to negotiate an audio format",
+        )
+        return
+
+    connection.send_result(msg_id, switch_entity.capabilities)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "unifiprotect_2way_audio/listen",
+        vol.Required("entity_id"): str,
+    }
+)
+@websocket_api.async_response
+async def handle_listen(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the camera's audio behind a talkback switch.
+
+    After a ``ready`` event describing the format, the client receives
+    ``audio`` events carrying base64 PCM. Every listener of a camera shares
+    one upstream connection, which closes when the last one unsubscribes.
+    """
+    entity_id = msg["entity_id"]
+    msg_id = msg["id"]
+
+    switch_entity = async_get_switch(hass, entity_id)
+    if not switch_entity or switch_entity.manager is None:
+        connection.send_error(
+            msg_id,
+            "entity_not_found",
+            f"Could not find switch entity for {entity_id}",
+        )
+        return
+
+    # Each audio event body is serialized once per camera and shared
+    prefix = b'{"id":%d,"type":"event","event":' % msg_id
+
+    @callback
+    def _on_audio(event: bytes) -> None:
+        connection.send_message(prefix + event + b"}")
+
+    try:
+        unsubscribe = await switch_entity.manager.downlink.async_subscribe(
+            switch_entity.camera_entity_id, _on_audio
+        )
+    except HomeAssistantError as err:
+        connection.send_error(msg_id, "stream_unavailable", str(err))
+        return
+
+    connection.subscriptions[msg_id] = unsubscribe
+    connection.send_result(msg_id)
+    connection.send_event(
+        msg_id,
+        {
+            "type": "ready",
+            "format": DOWNLINK_FORMAT,
+            "sample_rate": DOWNLINK_SAMPLE_RATE,
+        },
+    )
+    _LOGGER.debug("Started audio downlink listener for %s", entity_id)
@@ -5,6 +5,107 @@
  * for UniFi Protect cameras with microphone and speaker capabilities.
  */
 
+// Microphone capture processor, served by the integration
+const RECORDER_WORKLET_URL = '/unifiprotect_2way_audio/up2wa-recorder-worklet.js';
+// Samples per PCM chunk posted by the capture worklet at the context rate;
+// chunks keep this duration when the worklet downsamples
+const RECORDER_CHUNK_SIZE = 2048;
+
+// Browser-side Opus encoding (WebCodecs), sent as length-prefixed packets
+// with a big-endian 32-bit timestamp on the 48 kHz Opus clock
+const PCM_FORMAT = 'pcm_s16le';
+const OPUS_PACKETS_FORMAT = 'opus_packets';
+const OPUS_BIT_RATE = 24000;
+const OPUS_CLOCK_RATE = 48000;
+const OPUS_PACKET_HEADER_SIZE = 6;
+
+// One microphone capture shared by every card on the page: a single
+// getUserMedia stream, AudioContext and source node, with the worklet module
+// loaded once. Each talking card connects its own worklet node to the source,
+// since cameras may take different sample rates.
+const sharedCapture = {
+  users: 0,
+  ready: null,
+};
+
+async function openMicrophone() {
+  console.log('[UniFi 2-Way Audio] Requesting microphone access...');
+  const mediaStream = await navigator.mediaDevices.getUserMedia({
+    audio: {
+      echoCancellation: true,
+      noiseSuppression: true,
+      autoGainControl: true,
+    }
+  });
+  console.log('[UniFi 2-Way Audio] Microphone access granted');
+
+  // Match Home Assistant Assist approach: capture PCM via AudioWorklet.
+  // This avoids MediaRecorder container header/chunking issues.
+  const AudioContextCtor = window.AudioContext || window.webkitAudioContext;
+  if (!AudioContextCtor) {
+    mediaStream.getTracks().forEach((track) => track.stop());
+    throw new Error('AudioContext is not available in this browser');
+  }
+  const audioContext = new AudioContextCtor();
+  try {
+    // Served by the integration next to this card, without long-lived cache
+    // headers so an upgrade never pairs the card with a stale worklet
+    await audioContext.audioWorklet.addModule(RECORDER_WORKLET_URL);
+  } catch (error) {
+    mediaStream.getTracks().forEach((track) => track.stop());
+    await audioContext.close();
+    throw error;
+  }
+  const sourceNode = audioContext.createMediaStreamSource(mediaStream);
+  return { mediaStream, audioContext, sourceNode };
+}
+
+async function acquireMicrophone() {
+  sharedCapture.users++;
+  if (!sharedCapture.ready) {
+    const ready = openMicrophone();
+    sharedCapture.ready = ready;
+    ready.catch(() => {
+      if (sharedCapture.ready === ready) {
+        sharedCapture.ready = null;
+      }
+    });
+  }
+  try {
+    return await sharedCapture.ready;
+  } catch (error) {
+    sharedCapture.users--;
+    throw error;
+  }
+}
+
+async function releaseMicrophone() {
+  sharedCapture.users--;
+  if (sharedCapture.users > 0 || !sharedCapture.ready) {
+    return;
+  }
+  const ready = sharedCapture.ready;
+  sharedCapture.ready = null;
+  const capture = await ready;
+  capture.sourceNode.disconnect();
+  await capture.audioContext.close();
+  capture.mediaStream.getTracks().forEach((track) => track.stop());
+  console.log('[UniFi 2-Way Audio] Microphone released');
+}
+
+// Sequenced binary frames: a handler-id byte, a big-endian 32-bit chunk
+// number, then the audio. At most SEND_WINDOW chunks are sent ahead of the
+// server's cumulative ack; chunks waiting longer than STALE_CHUNK_MS for
+// room in the window are dropped rather than sent late.
+const STREAM_FRAME_HEADER_SIZE = 5;
+const SEND_WINDOW = 8;
+const STALE_CHUNK_MS = 300;
+
+// Optional WebRTC mode (`webrtc: true`): the browser's own stack sends the
+// microphone as Opus over UDP. The offer carries every ICE candidate, so the
+// card waits for gathering, bounded by this timeout, before sending it.
+const WEBRTC_GATHER_TIMEOUT_MS = 2000;
+
 class Unifi2WayAudio extends HTMLElement {
   constructor() {
     super();
@@ -16,13 +117,71 @@ class Unifi2WayAudio extends HTMLElement {
     this._lastCameraId = null;
     this._rendered = false;
     this._stream = null;
-    
-    // Audio capture for talkback
-    this._mediaStream = null;
-    this._audioContext = null;
-    this._audioSourceNode = null;
+    this._lastStates = null;
+    // The camera stream only runs while the card is on screen
+    this._visibilityObserver = null;
+    this._visible = false;
+
+    // Audio capture for talkback (a lease on the shared microphone)
+    this._capture = null;
     this._audioWorkletNode = null;
     this._audioSampleRate = null;
+    this._audioFormat = PCM_FORMAT;
+    this._audioEncoder = null;
+    this._captureTimestamp = 0;
+
+    // Binary audio stream (unifiprotect_2way_audio/start_stream subscription)
+    this._streamUnsub = null;
+    this._streamHandlerId = null;
+    this._sendQueue = [];
+    this._sendSeq = 0;
+    this._ackedSeq = 0xffffffff;
+    this._pendingMessages = 0;
+    this._staleChunks = 0;
+
+    // WebRTC audio (unifiprotect_2way_audio/start_webrtc subscription)
+    this._peer = null;
+    this._peerConnected = false;
+    this._webrtcUnsub = null;
+
+    // Camera audio downlink (unifiprotect_2way_audio/listen subscription)
+    this._listenUnsub = null;
+    this._listenContext = null;
+    this._listenSampleRate = null;
+    this._listenPlayhead = 0;
+  }
+
+  connectedCallback() {
+    if (typeof IntersectionObserver === 'undefined') {
+      this._setVisible(true);
+      return;
+    }
+    if (!this._visibilityObserver) {
+      this._visibilityObserver = new IntersectionObserver((entries) => {
+        this._setVisible(entries[entries.length - 1].isIntersecting);
+      });
+    }
+    this._visibilityObserver.observe(this);
+  }
+
+  disconnectedCallback() {
+    if (this._visibilityObserver) {
+      this._visibilityObserver.disconnect();
+    }
+    this._setVisible(false);
+    void this.stopListening();
+  }
+
+  _setVisible(visible) {
+    if (visible === this._visible) {
+      return;
+    }
+    this._visible = visible;
+    if (visible) {
+      void this.updateCameraFeed();
+    } else {
+      this._stopCameraFeed();
+    }
   }
 
   setConfig(config) {
@@ -30,15 +189,35 @@ class Unifi2WayAudio extends HTMLElement {
       throw new Error('You need to define an entity');
     }
     this._config = config;
+    this._lastStates = null;
     this.render();
   }
 
   set hass(hass) {
+    // A new hass object arrives on every state change in the instance, but
+    // an entity's state object is only replaced when that entity changes
     this._hass = hass;
+    if (!this._config) {
+      return;
+    }
+    const states = this._watchedStates();
+    const previous = this._lastStates;
+    if (previous && states.every((state, index) => state === previous[index])) {
+      return;
+    }
+    this._lastStates = states;
     this.updateState();
     void this.updateCameraFeed();
   }
 
+  _watchedStates() {
+    return [
+      this.getSwitchEntityId(),
+      this.getCameraEntityId(),
+      this.getMediaPlayerEntityId(),
+    ].map((entityId) => (entityId ? this._hass.states[entityId] : undefined));
+  }
+
   getCardSize() {
     return 3;
   }
@@ -159,6 +338,11 @@ class Unifi2WayAudio extends HTMLElement {
         <div class="camera-container">
           <div id="camera-stream"></div>
           <div class="controls-overlay">
+            <button class="control-button" id="listen-button" title="Listen">
+              <svg class="icon" viewBox="0 0 24 24">
+                <path d="M12,1C7,1 3,5 3,10V17A3,3 0 0,0 6,20H9V12H5V10A7,7 0 0,1 12,3A7,7 0 0,1 19,10V12H15V20H18A3,3 0 0,0 21,17V10C21,5 16.97,1 12,1Z"/>
+              </svg>
+            </button>
             <button class="control-button" id="mute-button" title="Toggle Mute">
               <svg class="icon" viewBox="0 0 24 24">
                 <path id="mute-icon-path" d="M14,3.23V5.29C16.89,6.15 19,8.83 19,12C19,15.17 16.89,17.85 14,18.71V20.77C18,19.86 21,16.28 21,12C21,7.72 18,4.14 14,3.23M16.5,12C16.5,10.23 15.5,8.71 14,7.97V16C15.5,15.29 16.5,13.76 16.5,12M3,9V15H7L12,20V4L7,9H3Z"/>
@@ -181,6 +365,7 @@ class Unifi2WayAudio extends HTMLElement {
       </ha-card>
     `;
 
+    this._listenButton = this.shadowRoot.getElementById('listen-button');
     this._muteButton = this.shadowRoot.getElementById('mute-button');
     this._talkbackButton = this.shadowRoot.getElementById('talkback-button');
     this._cameraStream = this.shadowRoot.getElementById('camera-stream');
@@ -189,6 +374,7 @@ class Unifi2WayAudio extends HTMLElement {
     this._statusLabel = this.shadowRoot.getElementById('status-label');
     this._muteIconPath = this.shadowRoot.getElementById('mute-icon-path');
 
+    this._listenButton.addEventListener('click', () => this.toggleListen());
     this._muteButton.addEventListener('click', () => this.toggleMute());
     this._talkbackButton.addEventListener('click', () => this.toggleTalkback());
 
@@ -212,7 +398,7 @@ class Unifi2WayAudio extends HTMLElement {
   }
 
   async updateCameraFeed() {
-    if (!this._hass || !this._config) return;
+    if (!this._hass || !this._config || !this._visible) return;
 
     const cameraEntityId = this.getCameraEntityId();
     if (!cameraEntityId) return;
@@ -236,6 +422,7 @@ class Unifi2WayAudio extends HTMLElement {
     if (!container) return;
 
     await this._ensureStream(cameraEntityId);
+    if (!this._visible) return;
 
     // Now it is safe to replace
     container.innerHTML = "";
@@ -251,6 +438,15 @@ class Unifi2WayAudio extends HTMLElement {
     this._lastCameraId = cameraEntityId;
   }
 
+  _stopCameraFeed() {
+    // Dropping the element ends its HLS/WebRTC session
+    if (this._stream) {
+      this._stream.remove();
+      this._stream = null;
+    }
+    this._lastCameraId = null;
+  }
+
   getCameraEntity() {
     return this._hass.states[this.getCameraEntityId()];
   }
@@ -361,8 +557,6 @@ class Unifi2WayAudio extends HTMLElement {
       this._statusDot.className = 'status-dot inactive';
       this._statusLabel.textContent = 'Idle';
     }
-
-    void this.updateCameraFeed();
   }
 
   async toggleMute() {
@@ -445,172 +639,499 @@ class Unifi2WayAudio extends HTMLElement {
     }
   }
 
+  async toggleListen() {
+    if (this._listenUnsub) {
+      await this.stopListening();
+    } else {
+      await this.startListening();
+    }
+  }
+
+  async startListening() {
+    // Audio-only downlink: the server pulls the camera's audio once and
+    // shares it between every listening card, without the video pipeline.
+    if (!this._hass || this._listenUnsub) return;
+    this._listenContext = new AudioContext();
+    this._listenPlayhead = 0;
+    try {
+      this._listenUnsub = await this._hass.connection.subscribeMessage(
+        (event) => this._handleListenEvent(event),
+        {
+          type: 'unifiprotect_2way_audio/listen',
+          entity_id: this.getSwitchEntityId(),
+        },
+      );
+      this._listenButton.classList.add('active');
+    } catch (error) {
+      console.error('[UniFi 2-Way Audio] Failed to listen to camera:', error);
+      this._statusText.textContent = 'Camera audio unavailable';
+      await this.stopListening();
+    }
+  }
+
+  async stopListening() {
+    const unsub = this._listenUnsub;
+    this._listenUnsub = null;
+    if (this._listenButton) {
+      this._listenButton.classList.remove('active');
+    }
+    if (unsub) {
+      try {
+        await unsub();
+      } catch (error) {
+        console.debug('[UniFi 2-Way Audio] Listen subscription already closed:', error);
+      }
+    }
+    if (this._listenContext) {
+      await this._listenContext.close();
+      this._listenContext = null;
+    }
+  }
+
+  _handleListenEvent(event) {
+    if (event.type === 'ready') {
+      this._listenSampleRate = event.sample_rate;
+    } else if (event.type === 'audio' && this._listenContext) {
+      this._playDownlinkFrame(event.data);
+    }
+  }
+
+  _playDownlinkFrame(data) {
+    const context = this._listenContext;
+    const bytes = Uint8Array.from(atob(data), (c) => c.charCodeAt(0));
+    const samples = new Int16Array(bytes.buffer, 0, bytes.length >> 1);
+    const buffer = context.createBuffer(1, samples.length, this._listenSampleRate);
+    const channel = buffer.getChannelData(0);
+    for (let i = 0; i < samples.length; i++) {
+      channel[i] = samples[i] / 32768;
+    }
+
+    // Keep a small jitter buffer; when frames pile up (tab in background,
+    // network stall) drop them rather than letting the delay grow.
+    const now = context.currentTime;
+    if (this._listenPlayhead < now) {
+      this._listenPlayhead = now + 0.08;
+    } else if (this._listenPlayhead - now > 0.5) {
+      return;
+    }
+    const source = context.createBufferSource();
+    source.buffer = buffer;
+    source.connect(context.destination);
+    source.start(this._listenPlayhead);
+    this._listenPlayhead += buffer.duration;
+  }
+
   async startAudioCapture() {
     try {
-      console.log('[UniFi 2-Way Audio] Requesting microphone access...');
-      
-      // Request microphone access
-      this._mediaStream = await navigator.mediaDevices.getUserMedia({
-        audio: {
-          echoCancellation: true,
-          noiseSuppression: true,
-          autoGainControl: true,
-        }
-      });
-      
-      console.log('[UniFi 2-Way Audio] Microphone access granted');
+      this._capture = await acquireMicrophone();
+      if (!(await this._startWebRtc())) {
+        await this._startWorkletCapture();
+      }
+    } catch (error) {
+      console.error('[UniFi 2-Way Audio] Failed to start audio capture:', error);
+      this._statusText.textContent = 'Microphone access denied';
+      throw error;
+    }
+  }
+
+  async _startWorkletCapture() {
+    const audioContext = this._capture.audioContext;
+    const contextRate = audioContext.sampleRate;
+
+    // Downsample to the camera's rate in the worklet, so less audio is sent
+    // and the server encodes it as is. The context keeps its default rate
+    // because some browsers refuse microphone sources at other rates.
+    const capabilities = await this._fetchCapabilities();
+    const cameraRate = capabilities ? capabilities.sample_rate : null;
+    this._audioSampleRate = cameraRate && cameraRate < contextRate ? cameraRate : contextRate;
+
+    // Where WebCodecs can, encode Opus here: a 20 ms packet is under 100
+    // bytes against 640-1920 bytes of PCM. Opus takes the context rate.
+    this._audioEncoder = await this._createOpusEncoder(contextRate);
+    if (this._audioEncoder) {
+      this._audioFormat = OPUS_PACKETS_FORMAT;
+      this._audioSampleRate = contextRate;
+    } else {
+      this._audioFormat = PCM_FORMAT;
+    }
 
-      // Match Home Assistant Assist approach: capture PCM via AudioWorklet.
-      // This avoids MediaRecorder container header/chunking issues.
-      const AudioContextCtor = window.AudioContext || window.webkitAudioContext;
-      if (!AudioContextCtor) {
-        throw new Error('AudioContext is not available in this browser');
+    this._audioWorkletNode = new AudioWorkletNode(audioContext, 'up2wa-recorder-worklet', {
+      processorOptions: {
+        chunkSize: Math.round((RECORDER_CHUNK_SIZE * this._audioSampleRate) / contextRate),
+        targetRate: this._audioSampleRate,
+      },
+    });
+    const workletPort = this._audioWorkletNode.port;
+    workletPort.onmessage = (event) => {
+      const buffer = event.data;
+      if (!(buffer instanceof ArrayBuffer) || buffer.byteLength === 0) {
+        return;
       }
+      // Both paths copy the samples before they yield, so the buffer can
+      // go straight back to the worklet's pool
+      if (this._audioEncoder) {
+        this._encodeOpus(new Int16Array(buffer));
+      } else {
+        this.sendAudioChunk(new Int16Array(buffer), this._audioSampleRate);
+      }
+      workletPort.postMessage(buffer, [buffer]);
+    };
+
+    await this._openAudioStream(this._audioSampleRate);
 
-      this._audioContext = new AudioContextCtor();
-      this._audioSampleRate = this._audioContext.sampleRate;
-      await this._ensureRecorderWorklet(this._audioContext);
+    this._capture.sourceNode.connect(this._audioWorkletNode);
+    await audioContext.resume();
 
-      this._audioSourceNode = this._audioContext.createMediaStreamSource(this._mediaStream);
-      this._audioWorkletNode = new AudioWorkletNode(this._audioContext, 'up2wa-recorder-worklet');
-      this._audioWorkletNode.port.onmessage = (event) => {
-        if (!event.data || !event.data.buffer) {
+    console.log(
+      `[UniFi 2-Way Audio] Audio capture started (format=${this._audioFormat}, sampleRate=${this._audioSampleRate})`,
+    );
+  }
+
+  async _startWebRtc() {
+    if (!this._config.webrtc || typeof RTCPeerConnection === 'undefined') {
+      return false;
+    }
+    // No ICE servers here: host candidates suffice on a LAN, and the answer
+    // carries candidates from the STUN/TURN servers configured on the server
+    const peer = new RTCPeerConnection();
+    try {
+      // The shared microphone track: closing the peer leaves it running
+      const [track] = this._capture.mediaStream.getAudioTracks();
+      peer.addTransceiver(track, { direction: 'sendonly' });
+      await peer.setLocalDescription(await peer.createOffer());
+      await this._iceGatheringComplete(peer);
+
+      this._peer = peer;
+      this._peerConnected = false;
+      peer.onconnectionstatechange = () => {
+        if (this._peer !== peer) {
           return;
         }
-        const pcmChunk = new Int16Array(event.data.buffer);
-        if (pcmChunk.length > 0) {
-          void this.sendAudioChunk(pcmChunk, this._audioSampleRate);
+        if (peer.connectionState === 'connected') {
+          this._peerConnected = true;
+          console.log('[UniFi 2-Way Audio] WebRTC audio connected');
+        } else if (peer.connectionState === 'failed') {
+          void this._handleWebRtcFailure();
         }
       };
+      this._webrtcUnsub = await this._hass.connection.subscribeMessage(
+        (event) => this._handleWebRtcEvent(peer, event),
+        {
+          type: 'unifiprotect_2way_audio/start_webrtc',
+          entity_id: this.getSwitchEntityId(),
+          offer: peer.localDescription.sdp,
+        },
+      );
+      console.log('[UniFi 2-Way Audio] Audio capture started (WebRTC)');
+      return true;
+    } catch (error) {
+      console.warn('[UniFi 2-Way Audio] WebRTC unavailable, streaming over the websocket:', error);
+      this._peer = null;
+      peer.close();
+      return false;
+    }
+  }
 
-      this._audioSourceNode.connect(this._audioWorkletNode);
-      await this._audioContext.resume();
+  _iceGatheringComplete(peer) {
+    return new Promise((resolve) => {
+      if (peer.iceGatheringState === 'complete') {
+        resolve();
+        return;
+      }
+      const timer = setTimeout(resolve, WEBRTC_GATHER_TIMEOUT_MS);
+      peer.addEventListener('icegatheringstatechange', () => {
+        if (peer.iceGatheringState === 'complete') {
+          clearTimeout(timer);
+          resolve();
+        }
+      });
+    });
+  }
 
-      console.log(`[UniFi 2-Way Audio] PCM audio capture started (sampleRate=${this._audioSampleRate})`);
-      
+  _handleWebRtcEvent(peer, event) {
+    if (this._peer !== peer) {
+      return;
+    }
+    if (event.type === 'answer') {
+      peer
+        .setRemoteDescription({ type: 'answer', sdp: event.sdp })
+        .catch(() => this._handleWebRtcFailure());
+    } else if (event.type === 'failed') {
+      this._webrtcUnsub = null;
+      void this._handleWebRtcFailure();
+    } else if (event.type === 'stopped') {
+      this._webrtcUnsub = null;
+      void this.stopAudioCapture();
+    }
+  }
+
+  async _handleWebRtcFailure() {
+    // Before audio ever flowed the server keeps the session, so the card
+    // carries on over the websocket; a drop mid-call ends the session
+    const connected = this._peerConnected;
+    await this._closeWebRtc();
+    if (connected || !this._capture) {
+      await this.stopAudioCapture();
+      return;
+    }
+    console.warn('[UniFi 2-Way Audio] WebRTC could not connect, streaming over the websocket');
+    try {
+      await this._startWorkletCapture();
     } catch (error) {
-      console.error('[UniFi 2-Way Audio] Failed to start audio capture:', error);
-      this._statusText.textContent = 'Microphone access denied';
-      throw error;
+      console.error('[UniFi 2-Way Audio] Websocket fallback failed:', error);
+      await this.stopAudioCapture();
+    }
+  }
+
+  async _closeWebRtc() {
+    const peer = this._peer;
+    const unsub = this._webrtcUnsub;
+    this._peer = null;
+    this._peerConnected = false;
+    this._webrtcUnsub = null;
+    if (peer) {
+      peer.close();
+    }
+    if (unsub) {
+      try {
+        await unsub();
+      } catch (error) {
+        console.debug('[UniFi 2-Way Audio] WebRTC stream already closed:', error);
+      }
+    }
+  }
+
+  async _createOpusEncoder(sampleRate) {
+    if (this._config.encode_opus === false || typeof AudioEncoder === 'undefined') {
+      return null;
+    }
+    const config = { codec: 'opus', sampleRate, numberOfChannels: 1, bitrate: OPUS_BIT_RATE };
+    try {
+      const { supported } = await AudioEncoder.isConfigSupported(config);
+      if (!supported) {
+        return null;
+      }
+      const encoder = new AudioEncoder({
+        output: (chunk) => this._sendOpusPacket(chunk),
+        error: (error) => {
+          console.error('[UniFi 2-Way Audio] Opus encoder failed:', error);
+          this._statusText.textContent = 'Audio encoder failed';
+          void this.stopAudioCapture();
+        },
+      });
+      encoder.configure(config);
+      this._captureTimestamp = 0;
+      return encoder;
+    } catch (error) {
+      console.warn('[UniFi 2-Way Audio] Opus encoding unavailable, sending PCM:', error);
+      return null;
+    }
+  }
+
+  _encodeOpus(samples) {
+    // AudioData copies the samples; timestamps are in microseconds
+    const data = new AudioData({
+      format: 's16',
+      sampleRate: this._audioSampleRate,
+      numberOfFrames: samples.length,
+      numberOfChannels: 1,
+      timestamp: Math.round(this._captureTimestamp),
+      data: samples,
+    });
+    this._captureTimestamp += (samples.length * 1e6) / this._audioSampleRate;
+    this._audioEncoder.encode(data);
+    data.close();
+  }
+
+  _sendOpusPacket(chunk) {
+    const packet = new Uint8Array(OPUS_PACKET_HEADER_SIZE + chunk.byteLength);
+    const header = new DataView(packet.buffer);
+    header.setUint32(0, Math.round((chunk.timestamp * OPUS_CLOCK_RATE) / 1e6) >>> 0);
+    header.setUint16(4, chunk.byteLength);
+    chunk.copyTo(packet.subarray(OPUS_PACKET_HEADER_SIZE));
+    this.sendAudioChunk(packet, this._audioSampleRate, OPUS_PACKETS_FORMAT);
+  }
+
+  async _fetchCapabilities() {
+    // The negotiated codec, sample rate and channel count of the session
+    try {
+      return await this._hass.connection.sendMessagePromise({
+        type: 'unifiprotect_2way_audio/capabilities',
+        entity_id: this.getSwitchEntityId(),
+      });
+    } catch (error) {
+      console.warn('[UniFi 2-Way Audio] Camera audio format unavailable, sending at the context rate:', error);
+      return null;
+    }
+  }
+
+  async _openAudioStream(sampleRate) {
+    // Claim the switch for this connection once; chunks are then sent as
+    // binary frames without per-chunk validation. The server stops the
+    // backchannel if this connection goes away.
+    this._streamHandlerId = null;
+    this._resetSendWindow();
+    try {
+      this._streamUnsub = await this._hass.connection.subscribeMessage(
+        (event) => this._handleStreamEvent(event),
+        {
+          type: 'unifiprotect_2way_audio/start_stream',
+          entity_id: this.getSwitchEntityId(),
+          audio_format: this._audioFormat,
+          sample_rate: sampleRate,
+          sequenced: true,
+        },
+      );
+    } catch (error) {
+      console.warn('[UniFi 2-Way Audio] Binary stream unavailable, sending per-chunk messages:', error);
+      this._streamUnsub = null;
+    }
+  }
+
+  _handleStreamEvent(event) {
+    if (event.type === 'ready') {
+      this._streamHandlerId = event.handler_id;
+      console.log(`[UniFi 2-Way Audio] Binary audio stream ready (handler ${event.handler_id})`);
+    } else if (event.type === 'ack') {
+      this._ackedSeq = event.seq;
+      this._drainSendQueue();
+    } else if (event.type === 'stopped') {
+      // Session ended server-side (turned off, idle timeout or error)
+      this._streamHandlerId = null;
+      this._streamUnsub = null;
+      void this.stopAudioCapture();
+    }
+  }
+
+  async _closeAudioStream() {
+    const unsub = this._streamUnsub;
+    this._streamUnsub = null;
+    this._streamHandlerId = null;
+    if (this._staleChunks) {
+      console.log(`[UniFi 2-Way Audio] Dropped ${this._staleChunks} stale audio chunks`);
+    }
+    this._resetSendWindow();
+    if (unsub) {
+      try {
+        await unsub();
+      } catch (error) {
+        console.debug('[UniFi 2-Way Audio] Audio stream already closed:', error);
+      }
     }
   }
 
   async stopAudioCapture() {
     console.log('[UniFi 2-Way Audio] Stopping audio capture...');
 
+    if (this._audioEncoder) {
+      if (this._audioEncoder.state !== 'closed') {
+        this._audioEncoder.close();
+      }
+      this._audioEncoder = null;
+    }
+    await this._closeWebRtc();
+    await this._closeAudioStream();
+
+    const capture = this._capture;
+    this._capture = null;
     if (this._audioWorkletNode) {
       this._audioWorkletNode.port.onmessage = null;
-      this._audioWorkletNode.disconnect();
+      if (capture) {
+        capture.sourceNode.disconnect(this._audioWorkletNode);
+      }
       this._audioWorkletNode = null;
     }
-    if (this._audioSourceNode) {
-      this._audioSourceNode.disconnect();
-      this._audioSourceNode = null;
-    }
-    if (this._audioContext) {
-      await this._audioContext.close();
-      this._audioContext = null;
-    }
     this._audioSampleRate = null;
-    
-    // Stop all tracks in the media stream
-    if (this._mediaStream) {
-      this._mediaStream.getTracks().forEach(track => {
-        track.stop();
-        console.log('[UniFi 2-Way Audio] Audio track stopped');
-      });
-      this._mediaStream = null;
+
+    // The microphone itself stops once no card is talking
+    if (capture) {
+      await releaseMicrophone();
     }
-    
+
     console.log('[UniFi 2-Way Audio] Audio capture stopped');
   }
 
-  async sendAudioChunk(audioChunk, sampleRate) {
-    const switchEntityId = this.getSwitchEntityId();
-    let base64Audio = "";
-    
-    try {
-      // Convert PCM Int16 chunk to base64.
-      const uint8Array = new Uint8Array(
-        audioChunk.buffer,
-        audioChunk.byteOffset,
-        audioChunk.byteLength
-      );
-      base64Audio = this._uint8ToBase64(uint8Array);
-      
-      // Send audio chunk via websocket (compatible with assist pipeline)
-      await this._hass.connection.sendMessagePromise({
+  sendAudioChunk(audioChunk, sampleRate, audioFormat = PCM_FORMAT) {
+    // Chunks are copied into their frame or message here, so the caller's
+    // buffer can be reused at once; sending happens as the window allows
+    const bytes = new Uint8Array(audioChunk.buffer, audioChunk.byteOffset, audioChunk.byteLength);
+    const queued = { time: performance.now(), frame: null, message: null };
+    if (this._streamHandlerId !== null) {
+      queued.frame = new Uint8Array(STREAM_FRAME_HEADER_SIZE + bytes.byteLength);
+      queued.frame[0] = this._streamHandlerId;
+      queued.frame.set(bytes, STREAM_FRAME_HEADER_SIZE);
+    } else {
+      // Per-chunk messages until the binary stream is ready, or without it
+      queued.message = {
         type: 'unifiprotect_2way_audio/stream_audio',
-        entity_id: switchEntityId,
-        audio_data: base64Audio,
-        audio_format: 'pcm_s16le',
+        entity_id: this.getSwitchEntityId(),
+        audio_data: this._uint8ToBase64(bytes),
+        audio_format: audioFormat,
         sample_rate: sampleRate,
-      });
-      
-      console.log(`[UniFi 2-Way Audio] PCM chunk sent via websocket: ${audioChunk.byteLength} bytes`);
-      
-    } catch (error) {
-      console.error('[UniFi 2-Way Audio] Failed to send audio chunk:', error);
-      
-      // Fallback to service call if websocket fails
-      try {
-        await this._hass.callService('switch', 'send_audio', {
-          entity_id: switchEntityId,
-          audio_data: base64Audio,
-          audio_format: 'pcm_s16le',
-          sample_rate: sampleRate,
-        });
-        console.log('[UniFi 2-Way Audio] Audio sent via service fallback');
-      } catch (fallbackError) {
-        console.error('[UniFi 2-Way Audio] Service fallback also failed:', fallbackError);
-      }
+      };
     }
+    this._sendQueue.push(queued);
+    this._drainSendQueue();
   }
 
-  async _ensureRecorderWorklet(audioContext) {
-    const processorSource = `
-      class UP2WARecorderWorklet extends AudioWorkletProcessor {
-        constructor() {
-          super();
-          this._buffer = [];
-          this._chunkSize = 2048;
-        }
+  _resetSendWindow() {
+    this._sendQueue = [];
+    this._sendSeq = 0;
+    this._ackedSeq = 0xffffffff;
+    this._staleChunks = 0;
+  }
 
-        process(inputs) {
-          const input = inputs[0];
-          if (!input || !input[0]) {
-            return true;
-          }
-
-          const channelData = input[0];
-          for (let i = 0; i < channelData.length; i++) {
-            const sample = Math.max(-1, Math.min(1, channelData[i]));
-            this._buffer.push(sample < 0 ? sample * 0x8000 : sample * 0x7fff);
-          }
-
-          while (this._buffer.length >= this._chunkSize) {
-            const chunk = this._buffer.splice(0, this._chunkSize);
-            const int16 = new Int16Array(chunk.length);
-            for (let i = 0; i < chunk.length; i++) {
-              int16[i] = chunk[i];
-            }
-            this.port.postMessage({ buffer: int16.buffer }, [int16.buffer]);
-          }
-
-          return true;
-        }
-      }
+  _inFlight() {
+    // Binary frames not yet covered by the server's cumulative ack, plus
+    // per-chunk messages still awaiting their result
+    return ((this._sendSeq - this._ackedSeq - 1) >>> 0) + this._pendingMessages;
+  }
 
-      registerProcessor('up2wa-recorder-worklet', UP2WARecorderWorklet);
-    `;
+  _drainSendQueue() {
+    const now = performance.now();
+    while (this._sendQueue.length > 0) {
+      const queued = this._sendQueue[0];
+      if (now - queued.time > STALE_CHUNK_MS) {
+        // Real-time audio that missed its slot is worth less than the
+        // bandwidth it would take; the server's clock covers the gap
+        this._sendQueue.shift();
+        this._staleChunks++;
+        continue;
+      }
+      if (this._inFlight() >= SEND_WINDOW) {
+        return;
+      }
+      this._sendQueue.shift();
+      if (queued.frame) {
+        this._sendFrame(queued.frame);
+      } else {
+        this._sendMessage(queued.message);
+      }
+    }
+  }
 
-    const blob = new Blob([processorSource], { type: 'application/javascript' });
-    const url = URL.createObjectURL(blob);
-    try {
-      await audioContext.audioWorklet.addModule(url);
-    } finally {
-      URL.revokeObjectURL(url);
+  _sendFrame(frame) {
+    const socket = this._hass.connection.socket;
+    if (!socket || socket.readyState !== WebSocket.OPEN) {
+      this._staleChunks++;
+      return;
     }
+    new DataView(frame.buffer).setUint32(1, this._sendSeq);
+    this._sendSeq = (this._sendSeq + 1) >>> 0;
+    socket.send(frame);
+  }
+
+  _sendMessage(message) {
+    // A failed chunk is dropped, not retried: by the time a retry could
+    // land it would be stale, and it would add load to a struggling link
+    this._pendingMessages++;
+    this._hass.connection
+      .sendMessagePromise(message)
+      .catch((error) => console.warn('[UniFi 2-Way Audio] Audio chunk dropped:', error))
+      .finally(() => {
+        this._pendingMessages--;
+        this._drainSendQueue();
+      });
   }
 
   _uint8ToBase64(bytes) {
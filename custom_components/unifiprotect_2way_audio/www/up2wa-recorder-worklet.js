@@ -0,0 +1,187 @@
+/**
+ * UniFi Protect 2-Way Audio microphone capture worklet
+ *
+ * Runs on the real-time audio thread, so the render path never allocates:
+ * each 128-sample quantum is copied into a preallocated Float32Array ring,
+ * full chunks are converted to Int16 in one pass into a pooled buffer, and
+ * the buffer is transferred to the card, which sends it back for reuse.
+ *
+ * Given a target rate below the context rate, samples are low-pass filtered
+ * and area-averaged down to it before they enter the ring, so the server
+ * receives audio at the camera's rate and never resamples it.
+ */
+
+const DEFAULT_CHUNK_SIZE = 2048;
+// Ring capacity in chunks; audio older than this is dropped if the thread
+// falls behind
+const RING_CHUNKS = 4;
+// Output buffers kept for reuse; the card returns each one after sending
+const POOL_SIZE = 4;
+// Anti-aliasing cutoff as a fraction of the target rate
+const CUTOFF_RATIO = 0.45;
+
+/**
+ * Convert float samples in [-1, 1] to clamped Int16, one contiguous run.
+ */
+function floatToInt16(source, sourceStart, target, targetStart, count) {
+  for (let i = 0; i < count; i++) {
+    const sample = source[sourceStart + i] * 0x8000;
+    target[targetStart + i] = sample > 0x7fff ? 0x7fff : sample < -0x8000 ? -0x8000 : sample;
+  }
+}
+
+class UP2WARecorderWorklet extends AudioWorkletProcessor {
+  constructor(options) {
+    super();
+    const processorOptions = (options && options.processorOptions) || {};
+    this._chunkSize = processorOptions.chunkSize || DEFAULT_CHUNK_SIZE;
+    this._ring = new Float32Array(this._chunkSize * RING_CHUNKS);
+    this._readIndex = 0;
+    this._available = 0;
+    this._pool = [];
+    for (let i = 0; i < POOL_SIZE; i++) {
+      this._pool.push(new Int16Array(this._chunkSize));
+    }
+    this.droppedSamples = 0;
+    this.port.onmessage = (event) => this._recycle(event.data);
+
+    // sampleRate is the context rate, a global of the worklet scope
+    const targetRate = processorOptions.targetRate;
+    this._step = targetRate && targetRate < sampleRate ? sampleRate / targetRate : 1;
+    this._sum = 0;
+    this._filled = 0;
+    if (this._step > 1) {
+      this._initLowPass((CUTOFF_RATIO * targetRate) / sampleRate);
+    }
+  }
+
+  /**
+   * Set up a Butterworth biquad low-pass at a normalized cutoff frequency.
+   */
+  _initLowPass(cutoff) {
+    const omega = 2 * Math.PI * cutoff;
+    const alpha = Math.sin(omega) / Math.SQRT2;
+    const cos = Math.cos(omega);
+    const a0 = 1 + alpha;
+    this._b0 = (1 - cos) / 2 / a0;
+    this._b1 = (1 - cos) / a0;
+    this._a1 = (-2 * cos) / a0;
+    this._a2 = (1 - alpha) / a0;
+    this._x1 = this._x2 = this._y1 = this._y2 = 0;
+  }
+
+  _recycle(buffer) {
+    if (
+      buffer instanceof ArrayBuffer &&
+      buffer.byteLength === this._chunkSize * 2 &&
+      this._pool.length < POOL_SIZE
+    ) {
+      this._pool.push(new Int16Array(buffer));
+    }
+  }
+
+  process(inputs) {
+    const channel = inputs[0] && inputs[0][0];
+    if (!channel) {
+      return true;
+    }
+
+    if (this._step > 1) {
+      this._downsample(channel);
+    } else {
+      this._write(channel);
+    }
+    while (this._available >= this._chunkSize) {
+      this._emit();
+    }
+    return true;
+  }
+
+  _write(samples) {
+    const ring = this._ring;
+    const capacity = ring.length;
+    const count = Math.min(samples.length, capacity);
+    const overflow = this._available + count - capacity;
+    if (overflow > 0) {
+      this._readIndex = (this._readIndex + overflow) % capacity;
+      this._available -= overflow;
+      this.droppedSamples += overflow;
+    }
+
+    const writeIndex = (this._readIndex + this._available) % capacity;
+    const offset = samples.length - count;
+    if (offset === 0 && writeIndex + count <= capacity) {
+      // The ring holds whole quanta, so this bulk copy is the usual path
+      ring.set(samples, writeIndex);
+    } else {
+      for (let i = 0; i < count; i++) {
+        ring[(writeIndex + i) % capacity] = samples[offset + i];
+      }
+    }
+    this._available += count;
+  }
+
+  _downsample(samples) {
+    // Each output sample is the mean of the filtered input it spans, with
+    // input samples that straddle two outputs split between them
+    const step = this._step;
+    const b0 = this._b0;
+    const b1 = this._b1;
+    const a1 = this._a1;
+    const a2 = this._a2;
+    let x1 = this._x1;
+    let x2 = this._x2;
+    let y1 = this._y1;
+    let y2 = this._y2;
+    let sum = this._sum;
+    let filled = this._filled;
+    for (let i = 0; i < samples.length; i++) {
+      const x = samples[i];
+      const y = b0 * (x + x2) + b1 * x1 - a1 * y1 - a2 * y2;
+      x2 = x1;
+      x1 = x;
+      y2 = y1;
+      y1 = y;
+
+      const room = step - filled;
+      if (room > 1) {
+        sum += y;
+        filled += 1;
+        continue;
+      }
+      this._push((sum + y * room) / step);
+      filled = 1 - room;
+      sum = y * filled;
+    }
+    this._x1 = x1;
+    this._x2 = x2;
+    this._y1 = y1;
+    this._y2 = y2;
+    this._sum = sum;
+    this._filled = filled;
+  }
+
+  _push(sample) {
+    const capacity = this._ring.length;
+    if (this._available === capacity) {
+      this._readIndex = (this._readIndex + 1) % capacity;
+      this._available--;
+      this.droppedSamples++;
+    }
+    this._ring[(this._readIndex + this._available) % capacity] = sample;
+    this._available++;
+  }
+
+  _emit() {
+    const chunk = this._pool.pop() || new Int16Array(this._chunkSize);
+    const capacity = this._ring.length;
+    const first = Math.min(this._chunkSize, capacity - this._readIndex);
+    floatToInt16(this._ring, this._readIndex, chunk, 0, first);
+    floatToInt16(this._ring, 0, chunk, first, this._chunkSize - first);
+    this._readIndex = (this._readIndex + this._chunkSize) % capacity;
+    this._available -= this._chunkSize;
+    this.port.postMessage(chunk.buffer, [chunk.buffer]);
+  }
+}
+
+registerProcessor('up2wa-recorder-worklet', UP2WARecorderWorklet);
@@ -0,0 +1,68 @@
+"""Tests for acoustic echo cancellation."""
+
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.aec import EchoCanceller
+
+RATE = 16000
+
+
+def _far_end(seconds: float) -> np.ndarray:
+    """Return speech-like noise with a syllable-rate envelope."""
+    rng = np.random.default_rng(3)
+    samples = int(seconds * RATE)
+    envelope = np.repeat(np.abs(rng.normal(0, 1, samples // 1600 + 1)), 1600)
+    return rng.normal(0, 0.2, samples) * envelope[:samples]
+
+
+def _run(canceller: EchoCanceller, far: np.ndarray, near: np.ndarray) -> np.ndarray:
+    """Feed 40 ms reference frames and 20 ms uplink frames in real time order."""
+    out = []
+    for start in range(0, near.size, 320):
+        if start % 640 == 0:
+            pcm = np.clip(far[start : start + 640] * 32767, -32768, 32767)
+            canceller.add_reference(pcm.astype("<i2").tobytes(), RATE)
+        out.append(canceller.process(near[start : start + 320].astype(np.float32)))
+    return np.concatenate(out)
+
+
+def _state_sizes(canceller: EchoCanceller) -> dict[str, int]:
+    """Return the size of each buffer, except the partial input block."""
+    return {
+        name: value.nbytes
+        for name, value in vars(canceller).items()
+        if isinstance(value, np.ndarray) and name != "_pending"
+    }
+
+
+def test_cancels_delayed_echo() -> None:
+    """Test that the bulk delay is found and the echo path is learned."""
+    far = _far_end(5)
+    rng = np.random.default_rng(5)
+    path = rng.normal(0, 0.1, 480) * np.exp(-np.arange(480) / 100)
+    delay = int(0.3 * RATE)
+    echo = np.concatenate((np.zeros(delay), np.convolve(far, path)[: far.size - delay]))
+    canceller = EchoCanceller(RATE)
+
+    out = _run(canceller, far, echo)
+
+    # Delays count from the newest reference, which arrives in 40 ms frames
+    assert 0.3 <= canceller.delay < 0.35
+    residual = np.mean(np.square(out[-RATE:]))
+    before = np.mean(np.square(echo[-RATE - canceller.block : -canceller.block]))
+    assert 10 * np.log10(before / residual) > 20
+    assert canceller.erle > 20
+
+
+def test_near_end_passes_without_reference() -> None:
+    """Test that the uplink is only delayed by a block when nothing plays."""
+    near = _far_end(2)
+    canceller = EchoCanceller(RATE)
+    sizes = _state_sizes(canceller)
+
+    out = _run(canceller, np.zeros_like(near), near)
+
+    np.testing.assert_allclose(out, near[: out.size], atol=1e-6)
+    assert canceller.adapted_blocks == 0
+    assert canceller.delay is None
+    assert _state_sizes(canceller) == sizes
@@ -0,0 +1,110 @@
+"""Test producer arbitration for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.unifiprotect_2way_audio.arbitration import (
+    ARBITRATION_EXCLUSIVE,
+    ARBITRATION_MIX,
+    ARBITRATION_PRIORITY,
+    PRIORITY_ANNOUNCEMENT,
+    PRIORITY_USER,
+    SessionArbiter,
+)
+
+
+def test_exclusive_refuses_second_producer() -> None:
+    """Test that the exclusive policy keeps the first producer."""
+    arbiter = SessionArbiter(ARBITRATION_EXCLUSIVE)
+
+    assert arbiter.claim("tablet", PRIORITY_USER, MagicMock())
+    assert not arbiter.claim("phone", PRIORITY_USER, MagicMock())
+    assert not arbiter.accepts("service", PRIORITY_ANNOUNCEMENT)
+    assert arbiter.accepts("tablet")
+    assert arbiter.rejected_chunks == 1
+
+
+def test_priority_preempts_lower_producer() -> None:
+    """Test that a higher priority producer silences lower ones until it leaves."""
+    arbiter = SessionArbiter(ARBITRATION_PRIORITY)
+
+    assert arbiter.claim("tablet", PRIORITY_USER, MagicMock())
+    assert not arbiter.claim("phone", PRIORITY_USER, MagicMock())
+    assert arbiter.claim("automation", PRIORITY_ANNOUNCEMENT, MagicMock())
+
+    assert arbiter.accepts("automation", PRIORITY_ANNOUNCEMENT)
+    assert not arbiter.accepts("tablet")
+
+    arbiter.release("automation")
+    assert arbiter.accepts("tablet")
+
+
+def test_mix_accepts_everyone() -> None:
+    """Test that the mix policy admits every producer."""
+    arbiter = SessionArbiter(ARBITRATION_MIX)
+
+    assert arbiter.claim("tablet", PRIORITY_USER, MagicMock())
+    assert arbiter.claim("phone", PRIORITY_USER, MagicMock())
+    assert arbiter.accepts("service")
+    assert len(arbiter.producers) == 3
+
+
+def test_implicit_producer_expires() -> None:
+    """Test that producers without a claim lose their place when they go quiet."""
+    arbiter = SessionArbiter(ARBITRATION_EXCLUSIVE)
+
+    with patch(
+        "custom_components.unifiprotect_2way_audio.arbitration.time.monotonic",
+        side_effect=[0.0, 0.0, 10.0],
+    ):
+        assert arbiter.accepts("service")
+        assert arbiter.claim("tablet", PRIORITY_USER, MagicMock())
+
+    assert [p.owner for p in arbiter.producers] == ["tablet"]
+
+
+def test_expired_producer_reported() -> None:
+    """Test that dropping a quiet implicit producer notifies the session."""
+    on_expire = MagicMock()
+    arbiter = SessionArbiter(ARBITRATION_MIX, on_expire)
+
+    with patch(
+        "custom_components.unifiprotect_2way_audio.arbitration.time.monotonic",
+        side_effect=[0.0, 0.0, 0.0, 10.0, 10.0],
+    ):
+        assert arbiter.accepts("service")
+        assert arbiter.claim("tablet", PRIORITY_USER, MagicMock())
+        assert arbiter.accepts("phone")
+
+    on_expire.assert_called_once_with("service")
+
+
+def test_lower_producer_resumes_after_implicit_one_expires() -> None:
+    """Test that a quiet implicit announcement stops preempting the user."""
+    arbiter = SessionArbiter(ARBITRATION_PRIORITY)
+
+    with patch(
+        "custom_components.unifiprotect_2way_audio.arbitration.time.monotonic",
+        side_effect=[0.0, 0.0, 0.0, 1.0, 10.0],
+    ):
+        assert arbiter.claim("tablet", PRIORITY_USER, MagicMock())
+        assert arbiter.accepts("service", PRIORITY_ANNOUNCEMENT)
+        assert not arbiter.accepts("tablet")
+        assert arbiter.accepts("tablet")
+
+    assert [p.owner for p in arbiter.producers] == ["tablet"]
+    assert arbiter.rejected_chunks == 1
+
+
+def test_stop_all_notifies_claimed_producers() -> None:
+    """Test that ending the session notifies every explicit producer."""
+    arbiter = SessionArbiter(ARBITRATION_MIX)
+    on_stop = MagicMock()
+    arbiter.claim("tablet", PRIORITY_USER, on_stop)
+    arbiter.accepts("service")
+
+    arbiter.stop_all()
+
+    on_stop.assert_called_once()
+    assert not arbiter.producers
@@ -0,0 +1,87 @@
+"""Test the audio pipeline logger for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.unifiprotect_2way_audio.audio_log import AudioPipelineLogger
+
+LOGGER_NAME = "custom_components.unifiprotect_2way_audio.test"
+MONOTONIC = "custom_components.unifiprotect_2way_audio.audio_log.time.monotonic"
+
+
+def test_sample_passes_every_nth_event(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that debug sampling passes the first and every Nth event."""
+    audio_log = AudioPipelineLogger(logging.getLogger(LOGGER_NAME), "cam", 10)
+
+    with caplog.at_level(logging.DEBUG, logger=LOGGER_NAME):
+        passed = [audio_log.sample("queued") for _ in range(25)]
+
+    assert [i for i, ok in enumerate(passed) if ok] == [0, 10, 20]
+
+
+def test_sample_disabled_without_debug(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that sampling never passes when DEBUG is disabled."""
+    audio_log = AudioPipelineLogger(logging.getLogger(LOGGER_NAME), "cam", 1)
+
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        assert not any(audio_log.sample("queued") for _ in range(5))
+
+
+def test_warning_suppression_reports_count(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that repeated warnings collapse into one line with a count."""
+    audio_log = AudioPipelineLogger(
+        logging.getLogger(LOGGER_NAME), "cam", warning_interval=10.0
+    )
+
+    with (
+        caplog.at_level(logging.WARNING, logger=LOGGER_NAME),
+        patch(MONOTONIC, side_effect=[0.0, 1.0, 2.0, 3.0, 11.0]),
+    ):
+        for _ in range(5):
+            audio_log.warning("invalid_chunk", "Bad chunk for %s", "cam")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages == [
+        "Bad chunk for cam",
+        "Bad chunk for cam (3 similar warnings suppressed)",
+    ]
+
+
+def test_summary_is_periodic(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that summaries are emitted once per interval with deltas."""
+    with patch(MONOTONIC, return_value=0.0):
+        audio_log = AudioPipelineLogger(
+            logging.getLogger(LOGGER_NAME), "cam", summary_interval=60.0
+        )
+
+    with (
+        caplog.at_level(logging.INFO, logger=LOGGER_NAME),
+        patch(MONOTONIC, side_effect=[30.0, 61.0, 62.0]),
+    ):
+        audio_log.maybe_summarize(lambda: {"packets": 10})
+        audio_log.maybe_summarize(lambda: {"packets": 20})
+        audio_log.maybe_summarize(lambda: {"packets": 30})
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Audio pipeline stats for cam - packets: 20 (+20)"
+    ]
+
+
+def test_flush_reports_pending_suppressed(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that ending a session reports warnings that were still suppressed."""
+    audio_log = AudioPipelineLogger(logging.getLogger(LOGGER_NAME), "cam")
+
+    with caplog.at_level(logging.INFO, logger=LOGGER_NAME):
+        for _ in range(4):
+            audio_log.warning("invalid_chunk", "Bad chunk")
+        audio_log.flush({"packets": 5, "errors": 4})
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[1:] == [
+        "3 invalid_chunk warnings suppressed for cam",
+        "Audio session totals for cam - packets: 5 (+5), errors: 4 (+4)",
+    ]
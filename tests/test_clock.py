@@ -0,0 +1,113 @@
+"""Test the session clock for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+from fractions import Fraction
+
+import av
+
+from custom_components.unifiprotect_2way_audio.clock import SessionClock
+
+
+class _FakeTime:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _frame(samples: int, rate: int = 16000) -> av.AudioFrame:
+    frame = av.AudioFrame(format="s16", layout="mono", samples=samples)
+    frame.sample_rate = rate
+    return frame
+
+
+def test_stamps_contiguous_pts_and_ignores_jitter() -> None:
+    """Test that frames get sample-accurate PTS despite small arrival jitter."""
+    fake_time = _FakeTime()
+    clock = SessionClock(16000, time_func=fake_time)
+
+    pts = []
+    audio_end = fake_time.now
+    for samples, jitter in ((320, 0.0), (160, 0.04), (480, 0.01)):
+        # Arrive up to 40 ms after the previous audio would have finished
+        fake_time.now = audio_end + jitter
+        assert clock.catch_up() == 0
+        frame = clock.stamp(_frame(samples))
+        pts.append(frame.pts)
+        assert frame.time_base == Fraction(1, 16000)
+        audio_end += samples / 16000
+
+    assert pts == [0, 320, 480]
+    assert clock.gaps_filled == clock.gaps_skipped == 0
+
+
+def test_short_gap_is_filled_with_silence() -> None:
+    """Test that a dropout shorter than the fill limit becomes silence."""
+    fake_time = _FakeTime()
+    clock = SessionClock(16000, time_func=fake_time)
+    clock.catch_up()
+    clock.stamp(_frame(320))
+
+    fake_time.now += 0.02 + 0.2
+    silence = clock.catch_up()
+    assert silence == 3200
+
+    frame = clock.silence(silence, "s16", "mono")
+    assert (frame.pts, frame.samples) == (320, 3200)
+    assert not frame.to_ndarray().any()
+    assert clock.stamp(_frame(320)).pts == 3520
+    assert clock.gaps_filled == 1
+
+
+def test_long_gap_advances_pts() -> None:
+    """Test that a pause advances timestamps without sending silence."""
+    fake_time = _FakeTime()
+    clock = SessionClock(16000, time_func=fake_time)
+    clock.catch_up()
+    clock.stamp(_frame(320))
+
+    fake_time.now += 0.02 + 3.0
+    assert clock.catch_up() == 0
+    assert clock.stamp(_frame(320)).pts == 320 + 48000
+    assert clock.gaps_skipped == 1
+
+
+def test_skip_advances_pts_without_frames() -> None:
+    """Test that gated audio moves the timestamps on like encoded audio."""
+    fake_time = _FakeTime()
+    clock = SessionClock(16000, time_func=fake_time)
+    clock.catch_up()
+    clock.stamp(_frame(320))
+
+    fake_time.now += 0.02
+    clock.skip(320)
+    fake_time.now += 0.02 + 1.0
+    clock.skip(320)
+    assert clock.catch_up() == 0
+    assert clock.stamp(_frame(320)).pts == 960 + 16000
+    assert clock.gaps_filled == clock.gaps_skipped == 0
+
+
+def test_stamp_packet_takes_the_longer_gap() -> None:
+    """Test that encoded packets skip declared and arrival gaps, not both."""
+    fake_time = _FakeTime()
+    clock = SessionClock(16000, time_func=fake_time)
+    packet = clock.stamp_packet(av.Packet(b"\xf8"), 320)
+    assert (packet.pts, packet.duration, packet.time_base) == (
+        0,
+        320,
+        Fraction(1, 16000),
+    )
+
+    # The producer skipped 40 ms and its next packet arrives on time for that
+    fake_time.now += 0.06
+    assert clock.stamp_packet(av.Packet(b"\xf8"), 320, gap=640).pts == 960
+
+    # A pause the producer did not declare is taken from the wall clock
+    fake_time.now += 0.02 + 1.0
+    assert clock.stamp_packet(av.Packet(b"\xf8"), 320, gap=320).pts == 1280 + 16000
+    assert clock.gaps_skipped == 1
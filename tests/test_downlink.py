@@ -0,0 +1,91 @@
+"""Tests for the shared camera audio downlink."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+from unittest.mock import MagicMock
+
+import av
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.downlink import (
+    DOWNLINK_FRAME_DURATION,
+    DOWNLINK_SAMPLE_RATE,
+    AudioDownlinkHub,
+    CameraAudioDownlink,
+)
+
+
+def _write_tone(path, seconds: float = 1.0, rate: int = 48000) -> None:
+    with av.open(str(path), mode="w") as container:
+        stream = container.add_stream("pcm_s16le", rate=rate, layout="stereo")
+        tone = (np.sin(np.arange(int(seconds * rate)) / 8) * 8000).astype(np.int16)
+        frame = av.AudioFrame.from_ndarray(
+            np.repeat(tone, 2).reshape(1, -1), format="s16", layout="stereo"
+        )
+        frame.sample_rate = rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+async def test_downlink_fans_out_one_pull(tmp_path) -> None:
+    """Test that listeners share identical frames from a single upstream."""
+    path = tmp_path / "camera.wav"
+    _write_tone(path)
+    hass = MagicMock()
+    hass.loop = asyncio.get_running_loop()
+    downlink = CameraAudioDownlink(
+        hass, "camera.front_door", str(path), reconnect_delay=60
+    )
+
+    first: list[bytes] = []
+    second: list[bytes] = []
+    unsubscribe_first = downlink.subscribe(first.append)
+    unsubscribe_second = downlink.subscribe(second.append)
+    frame_samples = round(DOWNLINK_SAMPLE_RATE * DOWNLINK_FRAME_DURATION)
+    # The resampler holds back the final partial frame of the one-second tone
+    expected_frames = DOWNLINK_SAMPLE_RATE // frame_samples - 1
+    for _ in range(100):
+        if len(first) >= expected_frames:
+            break
+        await asyncio.sleep(0.02)
+
+    unsubscribe_first()
+    assert not downlink.stopped
+    unsubscribe_second()
+    assert downlink.stopped
+    downlink._thread.join(timeout=5)
+    assert not downlink._thread.is_alive()
+
+    assert first == second
+    events = [json.loads(event) for event in first]
+    assert [event["seq"] for event in events] == list(range(1, len(events) + 1))
+    assert len(events) == expected_frames
+    pcm = np.frombuffer(base64.b64decode(events[0]["data"]), dtype=np.int16)
+    assert pcm.size == frame_samples
+    assert np.abs(pcm).max() > 4000
+
+
+def test_hub_taps_receive_pcm_only_while_listened() -> None:
+    """Test that taps get raw PCM from a downlink without keeping it alive."""
+    hass = MagicMock()
+    hub = AudioDownlinkHub(hass)
+    tapped: list[bytes] = []
+    untap = hub.tap("camera.front_door", tapped.append)
+    downlink = CameraAudioDownlink(
+        hass, "camera.front_door", "unused", taps=hub._taps["camera.front_door"]
+    )
+
+    downlink._listeners.add(MagicMock())
+    downlink._publish(b"\x01\x00")
+    downlink._listeners.clear()
+    downlink._publish(b"\x02\x00")
+    untap()
+    downlink._listeners.add(MagicMock())
+    downlink._publish(b"\x03\x00")
+
+    assert tapped == [b"\x01\x00"]
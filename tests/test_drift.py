@@ -0,0 +1,104 @@
+"""Test clock-drift compensation."""
+
+from __future__ import annotations
+
+import random
+
+import av
+import numpy as np
+import pytest
+
+from custom_components.unifiprotect_2way_audio.clock import SessionClock
+from custom_components.unifiprotect_2way_audio.drift import (
+    DriftCompensator,
+    stretch_frame,
+)
+
+FRAME_SAMPLES = 960
+SAMPLE_RATE = 48000
+
+
+class _FakeTime:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run_session(drift: float, seconds: float) -> tuple[SessionClock, list[float]]:
+    """Feed 20 ms frames from a producer whose clock runs ``drift`` fast.
+
+    Frames arrive with up to 15 ms of jitter and are shortened or lengthened
+    as the switch does. Returns the clock and the lead after each minute.
+    """
+    rng = random.Random(1)
+    fake_time = _FakeTime()
+    clock = SessionClock(SAMPLE_RATE, time_func=fake_time)
+    start = fake_time.now
+    leads = []
+    frame = av.AudioFrame(format="s16", layout="mono", samples=FRAME_SAMPLES)
+    frame.sample_rate = SAMPLE_RATE
+    for index in range(int(seconds * 50)):
+        captured = start + (index + 1) * 0.02 / (1 + drift)
+        fake_time.now = captured + rng.uniform(0, 0.015)
+        assert clock.catch_up() == 0
+        removed = clock.drift.adjust(FRAME_SAMPLES)
+        clock.stamp(stretch_frame(frame, FRAME_SAMPLES - removed) if removed else frame)
+        if index % 3000 == 0:
+            leads.append(clock.pts / SAMPLE_RATE - (fake_time.now - start))
+    return clock, leads
+
+
+@pytest.mark.parametrize("drift", [2e-4, -2e-4])
+def test_lead_stays_constant_over_long_session(drift: float) -> None:
+    """Test that a drifting producer neither grows nor drains the buffer."""
+    clock, leads = _run_session(drift, 3600)
+
+    # Uncompensated, an hour at 200 ppm is 720 ms of latency change
+    assert max(leads[5:]) - min(leads[5:]) < 0.03
+    assert clock.drift.drift_ppm == pytest.approx(drift * 1e6, abs=20)
+    assert clock.gaps_filled == clock.gaps_skipped == 0
+
+
+def test_adjust_carries_fractions_and_whole_steps() -> None:
+    """Test that corrections add up exactly and respect the step size."""
+    compensator = DriftCompensator()
+    compensator.ratio = 2**-10
+
+    assert sum(compensator.adjust(960) for _ in range(1024)) == 960
+    packets = [compensator.adjust(960, 960) for _ in range(1024)]
+    assert set(packets) == {0, 960}
+    assert packets.count(960) == 1
+    assert compensator.adjusted == 2 * 960
+
+    compensator.ratio = -(2**-10)
+    assert sum(compensator.adjust(960, 960) for _ in range(1024)) == -960
+
+
+def test_stretch_frame_keeps_format_and_shape() -> None:
+    """Test interpolation of packed and planar frames by a few samples."""
+    ramp = np.arange(0, 9600, 10, dtype=np.int16).reshape(1, -1)
+    packed = av.AudioFrame.from_ndarray(ramp, format="s16", layout="mono")
+    packed.sample_rate = SAMPLE_RATE
+
+    shorter = stretch_frame(packed, 958)
+    assert (shorter.samples, shorter.format.name, shorter.sample_rate) == (
+        958,
+        "s16",
+        SAMPLE_RATE,
+    )
+    samples = shorter.to_ndarray()[0]
+    assert (samples[0], samples[-1]) == (0, 9590)
+    assert np.all(np.diff(samples) > 0)
+
+    stereo = np.stack([np.linspace(0, 1, 960), np.linspace(1, 0, 960)])
+    planar = av.AudioFrame.from_ndarray(
+        stereo.astype(np.float32), format="fltp", layout="stereo"
+    )
+    planar.sample_rate = SAMPLE_RATE
+    longer = stretch_frame(planar, 961).to_ndarray()
+    assert longer.shape == (2, 961)
+    assert longer[0, -1] == pytest.approx(1) and longer[1, -1] == pytest.approx(0)
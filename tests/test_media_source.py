@@ -0,0 +1,72 @@
+"""Tests for the talkback recordings media source."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.components.media_player import BrowseError
+from homeassistant.components.media_source.error import Unresolvable
+from homeassistant.components.media_source.models import MediaSourceItem
+
+from custom_components.unifiprotect_2way_audio.const import DOMAIN
+from custom_components.unifiprotect_2way_audio.media_source import (
+    RecordingMediaSource,
+)
+
+
+@pytest.fixture
+def recordings_hass(tmp_path) -> MagicMock:
+    """Return a hass mock whose config directory is ``tmp_path``."""
+    hass = MagicMock()
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+    folder = tmp_path / DOMAIN / "recordings" / "front_door"
+    folder.mkdir(parents=True)
+    for index, name in enumerate(("20261019-101500.ogg", "20261019-101500-1.ogg")):
+        (folder / name).write_bytes(b"OggS")
+        os.utime(folder / name, (1000 + index, 1000 + index))
+    return hass
+
+
+async def test_browse_lists_cameras_and_newest_recordings_first(
+    recordings_hass,
+) -> None:
+    """Test browsing the camera folders and one camera's recordings."""
+    source = RecordingMediaSource(recordings_hass)
+
+    root = await source.async_browse_media(
+        MediaSourceItem(recordings_hass, DOMAIN, "", None)
+    )
+    camera = await source.async_browse_media(
+        MediaSourceItem(recordings_hass, DOMAIN, "front_door", None)
+    )
+
+    assert [child.identifier for child in root.children] == ["front_door"]
+    assert [child.title for child in camera.children] == [
+        "20261019-101500-1",
+        "20261019-101500",
+    ]
+    assert all(child.can_play for child in camera.children)
+
+
+async def test_resolve_rejects_paths_outside_recordings(recordings_hass) -> None:
+    """Test that recordings resolve to the view and traversal is refused."""
+    source = RecordingMediaSource(recordings_hass)
+
+    media = await source.async_resolve_media(
+        MediaSourceItem(recordings_hass, DOMAIN, "front_door/20261019-101500.ogg", None)
+    )
+
+    assert media.url == f"/api/{DOMAIN}/recordings/front_door/20261019-101500.ogg"
+    assert media.mime_type == "audio/ogg"
+    for identifier in ("../secrets.yaml", "front_door/../../secrets.ogg", "a/b/c"):
+        with pytest.raises(Unresolvable):
+            await source.async_resolve_media(
+                MediaSourceItem(recordings_hass, DOMAIN, identifier, None)
+            )
+    with pytest.raises(BrowseError):
+        await source.async_browse_media(
+            MediaSourceItem(recordings_hass, DOMAIN, "..", None)
+        )
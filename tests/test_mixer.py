@@ -0,0 +1,43 @@
+"""Test the PCM mixer for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.mixer import MAX_LAG_FRAMES, PcmMixer
+
+
+def test_mix_sums_aligned_frames() -> None:
+    """Test that aligned frames from two producers are summed."""
+    mixer = PcmMixer(4)
+    mixer.add("a", np.array([1, 2, 3, 4, 5], dtype=np.int16))
+    mixer.add("b", np.array([10, 20], dtype=np.int16))
+    assert len(mixer.pull()) == 0
+
+    mixer.add("b", np.array([30, 40], dtype=np.int16))
+    mixer.add("c", np.array([0, 0, 0, 0], dtype=np.int16))
+    frames = mixer.pull()
+
+    assert len(frames) == 1
+    assert frames[0].tolist() == [11, 22, 33, 44]
+
+
+def test_mix_clips_to_int16() -> None:
+    """Test that summed samples saturate instead of wrapping."""
+    mixer = PcmMixer(2)
+    mixer.add("a", np.array([30000, -30000], dtype=np.int16))
+    mixer.add("b", np.array([30000, -30000], dtype=np.int16))
+
+    assert mixer.pull()[0].tolist() == [32767, -32768]
+
+
+def test_stalled_producer_does_not_block_mix() -> None:
+    """Test that a producer without audio is treated as silent after a lag."""
+    mixer = PcmMixer(2)
+    mixer.add("quiet", np.array([], dtype=np.int16))
+    mixer.add("talker", np.ones(2 * MAX_LAG_FRAMES, dtype=np.int16))
+
+    frames = mixer.pull()
+
+    assert len(frames) == 1
+    assert frames[0].tolist() == [1, 1]
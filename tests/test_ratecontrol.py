@@ -0,0 +1,74 @@
+"""Test the adaptive Opus rate controller for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+from custom_components.unifiprotect_2way_audio.ratecontrol import (
+    OpusRateController,
+    OpusSettings,
+)
+
+
+def test_heavy_loss_cuts_bitrate_and_enables_fec() -> None:
+    """Test that heavy loss lowers the bitrate, lengthens frames and adds FEC."""
+    controller = OpusRateController(12000, 32000, 24000)
+
+    assert controller.update(0.2, 0.0)
+    assert controller.settings == OpusSettings(
+        bit_rate=18000, frame_duration=40, fec=True, packet_loss=20
+    )
+
+    for _ in range(5):
+        controller.update(0.5, 0.0)
+    assert controller.settings.bit_rate == 12000
+    assert controller.settings.codec_options() == {
+        "frame_duration": "40",
+        "fec": "1",
+        "packet_loss": "50",
+    }
+
+
+def test_moderate_loss_holds_bitrate() -> None:
+    """Test that moderate loss adds FEC without touching the bitrate."""
+    controller = OpusRateController(12000, 32000, 24000)
+
+    assert controller.update(0.05, 0.0)
+    assert controller.settings == OpusSettings(24000, fec=True, packet_loss=5)
+    assert not controller.update(0.05, 0.0)
+
+
+def test_clean_reports_recover_up_to_ceiling() -> None:
+    """Test that clean reports raise the bitrate and drop FEC within bounds."""
+    controller = OpusRateController(12000, 28000, 40000)
+    assert controller.settings.bit_rate == 28000
+
+    controller.update(0.2, 0.05)
+    assert controller.settings.bit_rate == 21000
+
+    # One clean report shortens frames again; FEC stays until the second
+    controller.update(0.0, 0.0)
+    assert controller.settings == OpusSettings(21000, fec=True, packet_loss=20)
+    controller.update(0.0, 0.0)
+    assert controller.settings == OpusSettings(25000)
+
+    for _ in range(5):
+        controller.update(0.0, 0.0)
+    assert controller.settings.bit_rate == 28000
+
+    # High jitter alone switches to longer frames
+    controller.update(0.0, 0.05)
+    assert controller.settings.frame_duration == 40
+
+
+def test_resilience_modes() -> None:
+    """Test that the resilience mode disables FEC or sets a loss floor."""
+    controller = OpusRateController(12000, 32000, 24000, mode="off")
+    controller.update(0.05, 0.0)
+    assert controller.settings == OpusSettings(24000)
+
+    controller = OpusRateController(12000, 32000, 24000, "fec", expected_loss=10)
+    assert controller.settings == OpusSettings(24000, fec=True, packet_loss=10)
+    controller.update(0.3, 0.0)
+    assert controller.settings.packet_loss == 30
+
+    assert controller.set_resilience("off", 10)
+    assert not controller.settings.fec
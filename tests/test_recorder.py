@@ -0,0 +1,111 @@
+"""Tests for the session audit recorder."""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import time
+from fractions import Fraction
+
+import av
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.recorder import (
+    RecordingWriter,
+    SessionRecording,
+    ogg_crc,
+    remove_expired_recordings,
+)
+
+
+def _opus_packets(seconds: float, rate: int = 24000) -> list[av.Packet]:
+    """Encode a tone with libopus the way the live pipeline does."""
+    codec_context = av.CodecContext.create("opus", "w")
+    codec_context.sample_rate = rate
+    codec_context.format = "s16"
+    codec_context.layout = "mono"
+    codec_context.bit_rate = 24000
+    codec_context.time_base = Fraction(1, rate)
+    tone = (np.sin(np.arange(int(seconds * rate)) / 6) * 8000).astype(np.int16)
+    packets = []
+    for start in range(0, tone.size, rate // 50):
+        frame = av.AudioFrame.from_ndarray(
+            tone[start : start + rate // 50].reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = rate
+        frame.pts = start
+        packets.extend(codec_context.encode(frame))
+    return packets
+
+
+def test_ogg_crc_matches_libavformat() -> None:
+    """Test the page checksum against a page written by libavformat."""
+    output = io.BytesIO()
+    with av.open(output, "w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=48000, layout="mono")
+        frame = av.AudioFrame.from_ndarray(
+            np.zeros((1, 960), dtype=np.int16), format="s16", layout="mono"
+        )
+        frame.sample_rate = 48000
+        for packet in [*stream.encode(frame), *stream.encode(None)]:
+            container.mux(packet)
+    data = output.getvalue()
+    size = 27 + data[26] + sum(data[27 : 27 + data[26]])
+    page = bytearray(data[:size])
+    (expected,) = struct.unpack_from("<I", page, 22)
+    struct.pack_into("<I", page, 22, 0)
+
+    assert ogg_crc(bytes(page)) == expected
+
+
+def test_recording_rotates_into_playable_files(tmp_path) -> None:
+    """Test that packets are written unchanged and split by size."""
+    packets = _opus_packets(4)
+    writer = RecordingWriter(tmp_path, max_bytes=5000)
+    recording = writer.open_session("camera.front_door", 24000, 1)
+    for packet in packets:
+        recording.add(packet)
+    recording.close()
+    writer.stop()
+
+    files = sorted(tmp_path.glob("front_door/*.ogg"), key=os.path.getmtime)
+    assert len(files) > 1
+    payloads = []
+    for path in files:
+        with av.open(str(path)) as container:
+            stream = container.streams.audio[0]
+            assert stream.codec_context.name == "opus"
+            assert stream.metadata["CAMERA"] == "camera.front_door"
+            payloads.extend(
+                bytes(packet) for packet in container.demux(stream) if packet.size
+            )
+    assert payloads == [bytes(packet) for packet in packets]
+    assert (recording.packets, recording.dropped_packets) == (len(packets), 0)
+
+
+def test_live_path_drops_when_writer_falls_behind(tmp_path) -> None:
+    """Test that batches beyond the pending budget are dropped, not queued."""
+    writer = RecordingWriter(tmp_path, max_pending_bytes=1)
+    recording = SessionRecording(writer, "camera.front_door", 24000, 1)
+    for packet in _opus_packets(2.5):
+        recording.add(packet)
+
+    assert recording.packets == 0
+    assert recording.dropped_packets == 100
+
+
+def test_remove_expired_recordings(tmp_path) -> None:
+    """Test that only recordings past the retention period are deleted."""
+    folder = tmp_path / "front_door"
+    folder.mkdir()
+    old, new = folder / "old.ogg", folder / "new.ogg"
+    old.write_bytes(b"")
+    new.write_bytes(b"")
+    week_ago = time.time() - 7 * 86400
+    os.utime(old, (week_ago, week_ago))
+
+    assert remove_expired_recordings(tmp_path, 0) == 0
+    assert remove_expired_recordings(tmp_path, 5) == 1
+    assert not old.exists()
+    assert new.exists()
@@ -0,0 +1,86 @@
+"""Tests for the audio hand-off ring buffer."""
+
+import io
+
+import av
+
+from custom_components.unifiprotect_2way_audio.ringbuffer import (
+    RECORD_HEADER,
+    ByteRing,
+    SegmentReader,
+)
+
+
+def test_ring_wraps_and_preserves_record_metadata() -> None:
+    """Test that records survive wrapping around the end of the buffer."""
+    ring = ByteRing(3 * (RECORD_HEADER.size + 10), max_records=10)
+
+    for index in range(20):
+        payload = bytes([index]) * 10
+        assert ring.write(payload, 16000, index % 3, "pcm_s16le")
+        audio_data, sample_rate, producer, audio_format = ring.read()
+        assert bytes(audio_data) == payload
+        assert (sample_rate, producer, audio_format) == (16000, index % 3, "pcm_s16le")
+
+    assert ring.read() is None
+    assert ring.dropped == 0
+
+
+def test_ring_drops_oldest_by_count_and_space() -> None:
+    """Test that a full ring drops its oldest records to admit new ones."""
+    ring = ByteRing(1024, max_records=2)
+    for chunk in (b"one", b"two", b"three"):
+        ring.write(chunk, None, 0, None)
+
+    assert len(ring) == 2
+    assert ring.dropped == 1
+    assert bytes(ring.read()[0]) == b"two"
+
+    ring = ByteRing(2 * (RECORD_HEADER.size + 100), max_records=10)
+    for fill in b"abc":
+        ring.write(bytes([fill]) * 100, None, 0, "webm")
+
+    assert ring.dropped == 1
+    assert [bytes(ring.read()[0][:1]) for _ in range(len(ring))] == [b"b", b"c"]
+
+
+def test_ring_rejects_oversized_payload_and_clear_frees_buffer() -> None:
+    """Test that oversized payloads are refused and clear() releases memory."""
+    ring = ByteRing(64, max_records=4)
+
+    assert not ring.write(b"x" * 64, None, 0, None)
+    assert ring._buf is None
+
+    assert ring.write(b"ok", 8000, 1, "ogg")
+    ring.clear()
+    assert ring._buf is None
+    assert len(ring) == 0
+    assert ring.read() is None
+
+
+def test_segment_reader_demuxes_split_container() -> None:
+    """Test that PyAV can demux a container split across several buffers."""
+    output = io.BytesIO()
+    with av.open(output, mode="w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=48000)
+        stream.layout = "mono"
+        frame = av.AudioFrame(format="s16", layout="mono", samples=960)
+        frame.sample_rate = 48000
+        frame.planes[0].update(bytes(1920))
+        for _ in range(5):
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    data = output.getvalue()
+    split = len(data) // 3
+
+    reader = SegmentReader(data[:split], memoryview(data)[split:])
+    assert reader.read() == data
+    reader.seek(-4, io.SEEK_END)
+    assert reader.read(10) == data[-4:]
+
+    with av.open(
+        SegmentReader(data[:split], memoryview(data)[split:]), format="ogg"
+    ) as container:
+        assert sum(1 for _ in container.decode(audio=0)) > 0
@@ -0,0 +1,89 @@
+"""Test RTCP reports for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+
+from custom_components.unifiprotect_2way_audio.rtcp import (
+    RTCP_SR,
+    RtcpSession,
+    build_sender_report,
+    parse_rtcp,
+)
+from custom_components.unifiprotect_2way_audio.rtp import RtpSender
+
+
+class _Camera(asyncio.DatagramProtocol):
+    """Queue datagrams arriving at the camera's RTCP port."""
+
+    def __init__(self) -> None:
+        self.received: asyncio.Queue = asyncio.Queue()
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.received.put_nowait((data, addr))
+
+
+def _receiver_report(ssrc: int, fraction: int, lost: int, lsr: int = 0) -> bytes:
+    """Build a receiver report with one block about ``ssrc``."""
+    return struct.pack(
+        "!BBHIIIIIII",
+        0x81,
+        201,
+        7,
+        0x1234,
+        ssrc,
+        (fraction << 24) | (lost & 0xFFFFFF),
+        1000,
+        480,
+        lsr,
+        0,
+    )
+
+
+def test_parse_compound_packet() -> None:
+    """Test parsing a sender report followed by a receiver report."""
+    sender_report = build_sender_report(0xAABBCCDD, 1.0e9, 1234, 10, 1000)
+    reports = parse_rtcp(sender_report + _receiver_report(0xAABBCCDD, 64, -1))
+
+    assert struct.unpack_from("!BB", sender_report) == (0x80, RTCP_SR)
+    assert len(reports) == 1
+    report = reports[0]
+    assert report.ssrc == 0xAABBCCDD
+    assert report.fraction_lost == 0.25
+    assert report.packets_lost == -1
+    assert (report.highest_sequence, report.jitter) == (1000, 480)
+    assert parse_rtcp(b"\x00" * 3) == []
+
+
+async def test_session_exchanges_reports(socket_enabled) -> None:
+    """Test that the session sends a sender report and hands back our blocks."""
+    loop = asyncio.get_running_loop()
+    camera_rtcp, camera = await loop.create_datagram_endpoint(
+        _Camera, local_addr=("127.0.0.1", 0)
+    )
+    rtcp_port = camera_rtcp.get_extra_info("sockname")[1]
+    url = f"rtp://127.0.0.1:{rtcp_port - 1}"
+
+    sender = RtpSender()
+    reports = []
+    session = RtcpSession(sender, reports.append)
+    try:
+        await sender.async_connect(url)
+        await session.async_start(url)
+        data, addr = await asyncio.wait_for(camera.received.get(), 1)
+        assert struct.unpack_from("!BBHI", data)[1:] == (RTCP_SR, 6, sender.ssrc)
+
+        # Echo the sender report's compact NTP time as LSR
+        lsr = struct.unpack_from("!I", data, 10)[0]
+        camera_rtcp.sendto(_receiver_report(sender.ssrc ^ 1, 10, 1), addr)
+        camera_rtcp.sendto(_receiver_report(sender.ssrc, 26, 3, lsr), addr)
+        await asyncio.sleep(0.05)
+    finally:
+        session.close()
+        sender.close()
+        camera_rtcp.close()
+
+    assert [report.packets_lost for report in reports] == [3]
+    assert session.last_report is reports[0]
+    assert session.round_trip is not None
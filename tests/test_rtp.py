@@ -0,0 +1,181 @@
+"""Test the native RTP sender for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from fractions import Fraction
+from itertools import pairwise
+
+import av
+import numpy as np
+import pytest
+
+from custom_components.unifiprotect_2way_audio.ratecontrol import OpusSettings
+from custom_components.unifiprotect_2way_audio.rtp import (
+    RtpOpusStream,
+    RtpSender,
+    parse_rtp_url,
+)
+
+
+class _Receiver(asyncio.DatagramProtocol):
+    """Collect datagrams with their arrival time."""
+
+    def __init__(self) -> None:
+        self.packets: list[tuple[float, bytes]] = []
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.packets.append((asyncio.get_running_loop().time(), data))
+
+
+async def _receiver() -> tuple[asyncio.DatagramTransport, _Receiver, str]:
+    """Start a UDP receiver on a free loopback port and return its RTP URL."""
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        _Receiver, local_addr=("127.0.0.1", 0)
+    )
+    port = transport.get_extra_info("sockname")[1]
+    return transport, protocol, f"rtp://127.0.0.1:{port}"
+
+
+def _header(datagram: bytes) -> tuple[int, int, int, int, int]:
+    """Return version, marker, payload type, sequence and timestamp."""
+    first, second, seq, ts, _ = struct.unpack("!BBHII", datagram[:12])
+    return first >> 6, second >> 7, second & 0x7F, seq, ts
+
+
+def test_parse_rtp_url() -> None:
+    """Test parsing the talkback URL handed out by the camera."""
+    assert parse_rtp_url("rtp://192.168.1.10:7004?localrtpport=7005") == (
+        ("192.168.1.10", 7004),
+        ("0.0.0.0", 7005),
+    )
+    with pytest.raises(ValueError):
+        parse_rtp_url("http://192.168.1.10")
+
+
+async def test_sender_packetizes_and_paces_opus(socket_enabled) -> None:
+    """Test that encoded Opus reaches a local receiver as paced RTP."""
+    transport, receiver, url = await _receiver()
+    sender = RtpSender()
+    stream = RtpOpusStream(16000, OpusSettings(24000))
+    tone = (np.sin(np.arange(1600) / 8) * 8000).astype(np.int16)
+
+    try:
+        await sender.async_connect(url)
+        frame = av.AudioFrame.from_ndarray(
+            tone.reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = 16000
+        for packet in stream.encode(frame):
+            sender.mux(packet)
+        await asyncio.sleep(0.15)
+    finally:
+        sender.close()
+        transport.close()
+
+    headers = [_header(data) for _, data in receiver.packets]
+    assert len(headers) == 5
+    assert {h[0] for h in headers} == {2}
+    assert {h[2] for h in headers} == {96}
+    assert [h[1] for h in headers] == [1, 0, 0, 0, 0]
+    # 20 ms Opus frames advance the 48 kHz RTP clock by 960
+    assert [(b[3] - a[3]) & 0xFFFF for a, b in pairwise(headers)] == [1] * 4
+    assert [b[4] - a[4] for a, b in pairwise(headers)] == [960] * 4
+    # Packets are spread over wall-clock time rather than sent in one burst
+    arrival = [at for at, _ in receiver.packets]
+    assert arrival[-1] - arrival[0] >= 0.06
+
+
+async def test_sequence_continues_across_reconnect(socket_enabled) -> None:
+    """Test that a renewed session keeps SSRC and sequence continuity."""
+    transport, receiver, url = await _receiver()
+    sender = RtpSender()
+
+    try:
+        await sender.async_connect(url)
+        sender.send(b"\xf8\xff\xfe", 960)
+        sender.close()
+        await asyncio.sleep(0.3)
+
+        await sender.async_connect(url)
+        sender.send(b"\xf8\xff\xfe", 960)
+        await asyncio.sleep(0.01)
+    finally:
+        sender.close()
+        transport.close()
+
+    first, second = (data for _, data in receiver.packets)
+    assert first[8:12] == second[8:12]
+    _, _, _, seq1, ts1 = _header(first)
+    _, marker, _, seq2, ts2 = _header(second)
+    assert marker == 1
+    assert seq2 == (seq1 + 1) & 0xFFFF
+    # The timestamp jumps by the wall-clock gap, not just one frame
+    assert ts2 - ts1 >= 960 + 0.25 * 48000
+
+
+async def test_pts_jump_advances_timestamp(socket_enabled) -> None:
+    """Test that a pause skipped by the session clock shows in RTP time."""
+    transport, receiver, url = await _receiver()
+    sender = RtpSender()
+
+    try:
+        await sender.async_connect(url)
+        for pts in (0, 480, 12480):
+            if pts == 12480:
+                # The clock skipped a 0.48 s pause that has just elapsed
+                await asyncio.sleep(0.48)
+            packet = av.Packet(b"\xf8\xff\xfe")
+            packet.pts = pts
+            packet.duration = 480
+            packet.time_base = Fraction(1, 24000)
+            sender.mux(packet)
+        await asyncio.sleep(0.05)
+    finally:
+        sender.close()
+        transport.close()
+
+    headers = [_header(data) for _, data in receiver.packets]
+    assert [h[1] for h in headers] == [1, 0, 1]
+    # 480 samples at 24 kHz are 960 ticks of the 48 kHz RTP clock, and the
+    # 11520-sample pause adds 23040 more
+    assert [b[4] - a[4] for a, b in pairwise(headers)] == [960, 24000]
+
+
+def test_opus_stream_reconfigures_between_frames() -> None:
+    """Test that new encoder settings apply from the next frame."""
+    stream = RtpOpusStream(24000, OpusSettings(24000))
+    frame = av.AudioFrame(format="s16", layout="mono", samples=960)
+    frame.sample_rate = 24000
+    frame.planes[0].update(bytes(1920))
+
+    assert {packet.duration for packet in stream.encode(frame)} == {480}
+    stream.configure(OpusSettings(16000, frame_duration=40, fec=True, packet_loss=10))
+    frame.pts = None
+    packets = stream.encode(frame) + stream.encode(frame)
+
+    assert stream.codec_context.bit_rate == 16000
+    assert stream.codec_context.frame_size == 960
+    assert packets[-1].duration == 960
+
+
+async def test_redundancy_resends_each_packet(socket_enabled) -> None:
+    """Test that redundant copies trail the originals with the same sequence."""
+    transport, receiver, url = await _receiver()
+    sender = RtpSender()
+    sender.redundancy = True
+
+    try:
+        await sender.async_connect(url)
+        for _ in range(3):
+            sender.send(b"\xf8\xff\xfe", 960)
+        await asyncio.sleep(0.15)
+    finally:
+        sender.close()
+        transport.close()
+
+    sequences = [_header(data)[3] for _, data in receiver.packets]
+    # Each copy goes out 30 ms after its original, between later packets
+    assert [(seq - sequences[0]) & 0xFFFF for seq in sequences] == [0, 1, 0, 2, 1, 2]
@@ -0,0 +1,100 @@
+"""Test the RTP ingest listener."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+
+from custom_components.unifiprotect_2way_audio.audio_format import (
+    OPUS_PACKETS_FORMAT,
+    PCM_FORMAT,
+    parse_opus_packets,
+)
+from custom_components.unifiprotect_2way_audio.rtp import RTP_HEADER
+from custom_components.unifiprotect_2way_audio.rtp_ingest import (
+    G711_TABLES,
+    JITTER_DELAY,
+    PAYLOAD_PCMA,
+    PAYLOAD_PCMU,
+    RtpIngest,
+    parse_rtp,
+)
+
+# A 20 ms CELT-only Opus packet (TOC config 31, one frame)
+OPUS_PAYLOAD = bytes([0xF8]) + b"\x00" * 20
+
+
+def _rtp(sequence: int, payload: bytes, payload_type: int = 111, ssrc: int = 7):
+    """Build an RTP packet with a 20 ms timestamp step per sequence number."""
+    return RTP_HEADER.pack(0x80, payload_type, sequence, sequence * 960, ssrc) + payload
+
+
+def test_g711_tables() -> None:
+    """Test reference points of the mu-law and A-law expansions."""
+    ulaw = G711_TABLES[PAYLOAD_PCMU]
+    alaw = G711_TABLES[PAYLOAD_PCMA]
+
+    assert (ulaw[0xFF], ulaw[0x7F], ulaw[0x80], ulaw[0x00]) == (0, 0, 32124, -32124)
+    assert (alaw[0xD5], alaw[0x55], alaw[0xAA], alaw[0x2A]) == (8, -8, 32256, -32256)
+
+
+def test_parse_rtp_skips_csrcs_extension_and_padding() -> None:
+    """Test that the payload is found behind optional header parts."""
+    datagram = (
+        RTP_HEADER.pack(0xB1, 0x80 | 8, 5, 800, 9)
+        + b"\x00\x00\x00\x01"  # one CSRC
+        + b"\xbe\xde\x00\x01\x11\x22\x33\x44"  # one-word extension
+        + b"\xd5\xd5"
+        + b"\x00\x02"  # two padding bytes
+    )
+
+    payload_type, sequence, timestamp, ssrc, payload = parse_rtp(datagram)
+
+    assert (payload_type, sequence, timestamp, ssrc) == (PAYLOAD_PCMA, 5, 800, 9)
+    assert bytes(payload) == b"\xd5\xd5"
+
+
+async def test_ingest_reorders_and_skips_lost_packets(socket_enabled) -> None:
+    """Test RTP from a local sender reaching the switch callback in order."""
+    received = []
+    ingest = RtpIngest(
+        lambda chunk, audio_format, rate: received.append((chunk, audio_format, rate)),
+        source="127.0.0.1",
+    )
+    await ingest.async_start(0, "127.0.0.1")
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        # Packet 2 arrives late, packet 4 never arrives
+        for sequence in (0, 1, 3, 2, 5):
+            sender.sendto(_rtp(sequence, OPUS_PAYLOAD), ("127.0.0.1", ingest.port))
+        sender.sendto(
+            _rtp(6, b"\x00\x00", payload_type=101), ("127.0.0.1", ingest.port)
+        )
+        await asyncio.sleep(JITTER_DELAY * 3)
+    finally:
+        sender.close()
+        ingest.close()
+
+    opus = [chunk for chunk, audio_format, _ in received]
+    assert {audio_format for _, audio_format, _ in received} == {OPUS_PACKETS_FORMAT}
+    timestamps = [parse_opus_packets(chunk)[0][0] for chunk in opus]
+    assert timestamps == [0, 960, 1920, 2880, 4800]
+    assert ingest.lost_packets == 1
+    # The telephone-event packet is not taken for Opus
+    assert ingest.rejected_packets == 1
+
+
+async def test_ingest_expands_g711_and_filters_source() -> None:
+    """Test that G.711 becomes 8 kHz PCM and other senders are ignored."""
+    received = []
+    ingest = RtpIngest(
+        lambda chunk, audio_format, rate: received.append((chunk, audio_format, rate)),
+        source="192.0.2.1",
+    )
+
+    ingest.datagram_received(_rtp(0, b"\xff\x80", PAYLOAD_PCMU), ("192.0.2.1", 4000))
+    ingest.datagram_received(_rtp(1, b"\xff\x80", PAYLOAD_PCMU), ("192.0.2.2", 4000))
+
+    assert received == [(b"\x00\x00\x7c\x7d", PCM_FORMAT, 8000)]
+    assert ingest.rejected_packets == 1
@@ -0,0 +1,142 @@
+"""Test the encode scheduler shared by talkback sessions."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.unifiprotect_2way_audio.scheduler import EncodeScheduler
+
+
+class _FakeTime:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _encode(session, deadline, order: list[str], name: str, cost=0.0):
+    async with session.slot(deadline):
+        order.append(name)
+        session._scheduler._time.now += cost
+
+
+async def test_slots_go_to_earliest_deadline() -> None:
+    """Test that waiting chunks are encoded in deadline order."""
+    fake_time = _FakeTime()
+    scheduler = EncodeScheduler(time_func=fake_time)
+    sessions = [scheduler.open_session() for _ in range(3)]
+    order: list[str] = []
+
+    async with sessions[0].slot():
+        tasks = [
+            asyncio.create_task(_encode(sessions[1], 105, order, "late")),
+            asyncio.create_task(_encode(sessions[2], 101, order, "early")),
+            asyncio.create_task(_encode(sessions[0], 103, order, "middle")),
+        ]
+        await asyncio.sleep(0)
+        assert order == []
+    await asyncio.gather(*tasks)
+
+    assert order == ["early", "middle", "late"]
+    assert scheduler.deadline_misses == 0
+
+
+async def test_session_over_quota_waits_for_others() -> None:
+    """Test that a session past its share yields even with earlier deadlines."""
+    fake_time = _FakeTime()
+    scheduler = EncodeScheduler(time_func=fake_time)
+    flooder, other = scheduler.open_session(), scheduler.open_session()
+    order: list[str] = []
+
+    # Over half a second of encoding uses up the flooder's half of the window
+    await _encode(flooder, None, order, "burst", cost=0.6)
+    async with other.slot():
+        tasks = [
+            asyncio.create_task(_encode(flooder, 100.7, order, "flooder")),
+            asyncio.create_task(_encode(other, 101.0, order, "other")),
+        ]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ["burst", "other", "flooder"]
+
+    # Once the window has passed, deadlines decide again
+    fake_time.now += 2
+    order.clear()
+    async with other.slot():
+        tasks = [
+            asyncio.create_task(_encode(other, 103.0, order, "other")),
+            asyncio.create_task(_encode(flooder, 102.8, order, "flooder")),
+        ]
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ["flooder", "other"]
+
+    # A session alone is never held back by its quota
+    other.close()
+    assert scheduler.quota == 1.0
+
+
+async def test_deadline_misses_counted_per_session() -> None:
+    """Test that only deadlines passed while waiting or encoding are misses."""
+    fake_time = _FakeTime()
+    scheduler = EncodeScheduler(time_func=fake_time)
+    session = scheduler.open_session()
+    order: list[str] = []
+
+    await _encode(session, 100.01, order, "slow", cost=0.02)
+    await _encode(session, 100.5, order, "fast", cost=0.02)
+    # Already late when requested: a gap the scheduler did not cause
+    await _encode(session, 90.0, order, "stale", cost=0.02)
+
+    assert session.deadline_misses == scheduler.deadline_misses == 1
+    assert session.encode_time() == pytest.approx(0.06)
+
+
+async def test_cancelled_waiter_does_not_hold_the_slot() -> None:
+    """Test that a waiter cancelled before or after its grant frees the slot."""
+    scheduler = EncodeScheduler(time_func=_FakeTime())
+    first, second = scheduler.open_session(), scheduler.open_session()
+    order: list[str] = []
+
+    async with first.slot():
+        waiting = asyncio.create_task(_encode(second, None, order, "cancelled"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+    granted = asyncio.create_task(_encode(second, None, order, "granted"))
+    await asyncio.sleep(0)
+    async with first.slot():
+        pass
+    assert order == ["granted"]
+
+    async with first.slot():
+        pending = asyncio.create_task(_encode(second, None, order, "dropped"))
+        await asyncio.sleep(0)
+    # Granted on release, then cancelled before it resumed
+    pending.cancel()
+    await asyncio.gather(waiting, granted, pending, return_exceptions=True)
+    await asyncio.wait_for(_encode(first, None, order, "after"), 1)
+    assert order == ["granted", "after"]
+
+
+async def test_busy_session_yields_between_chunks() -> None:
+    """Test that a session with a backlog lets others encode in between."""
+    scheduler = EncodeScheduler(time_func=_FakeTime())
+    busy, paced = scheduler.open_session(), scheduler.open_session()
+    order: list[str] = []
+
+    async def drain() -> None:
+        for index in range(5):
+            await _encode(busy, 200.0 + index, order, "busy")
+
+    task = asyncio.create_task(drain())
+    await asyncio.sleep(0)
+    await _encode(paced, 150.0, order, "paced")
+    await task
+
+    assert order.index("paced") <= 2
+    assert len(order) == 6
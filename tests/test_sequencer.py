@@ -0,0 +1,54 @@
+"""Test the audio chunk sequencer."""
+
+from __future__ import annotations
+
+from custom_components.unifiprotect_2way_audio.sequencer import ChunkSequencer
+
+
+def test_in_order_chunks_pass_straight_through() -> None:
+    """Test that an ordered stream is delivered without holding chunks."""
+    sequencer = ChunkSequencer()
+    assert sequencer.acked is None
+
+    for seq in range(10, 13):
+        assert sequencer.push(seq, bytes([seq])) == [bytes([seq])]
+
+    assert sequencer.acked == 12
+    assert (sequencer.lost, sequencer.late) == (0, 0)
+
+
+def test_out_of_order_chunks_are_reordered() -> None:
+    """Test that a chunk ahead of a gap waits for the missing one."""
+    sequencer = ChunkSequencer()
+    sequencer.push(0, b"a")
+
+    assert sequencer.push(2, b"c") == []
+    assert sequencer.acked == 0
+    assert sequencer.push(1, b"b") == [b"b", b"c"]
+    assert sequencer.acked == 2
+
+
+def test_gap_is_skipped_once_the_buffer_fills() -> None:
+    """Test that a chunk that never arrives is given up as lost."""
+    sequencer = ChunkSequencer(depth=2)
+    sequencer.push(0, b"a")
+
+    assert sequencer.push(3, b"d") == []
+    assert sequencer.push(4, b"e") == []
+    assert sequencer.push(5, b"f") == [b"d", b"e", b"f"]
+    assert sequencer.lost == 2
+    assert sequencer.acked == 5
+
+    # The skipped chunks are late if they turn up after all
+    assert sequencer.push(1, b"b") == []
+    assert sequencer.late == 1
+
+
+def test_sequence_numbers_wrap() -> None:
+    """Test that delivery continues across the 32-bit wrap."""
+    sequencer = ChunkSequencer()
+    sequencer.push(0xFFFFFFFF, b"a")
+
+    assert sequencer.push(1, b"c") == []
+    assert sequencer.push(0, b"b") == [b"b", b"c"]
+    assert sequencer.acked == 1
@@ -0,0 +1,44 @@
+"""Tests for text-to-speech audio handling."""
+
+import struct
+
+import pytest
+
+from custom_components.unifiprotect_2way_audio.speech import WavStreamParser
+
+
+def _wav(samples: bytes, rate: int = 16000, channels: int = 1) -> bytes:
+    fmt = struct.pack("<HHIIHH", 1, channels, rate, rate * 2 * channels, 2, 16)
+    chunks = b"".join(
+        (
+            b"fmt " + struct.pack("<I", len(fmt)) + fmt,
+            b"LIST" + struct.pack("<I", 3) + b"abc\x00",
+            # Streamed WAV files leave the data size unknown
+            b"data" + struct.pack("<I", 0xFFFFFFFF) + samples,
+        )
+    )
+    return b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE" + chunks
+
+
+def test_wav_stream_is_split_into_chunks() -> None:
+    """Test that a WAV stream fed in odd pieces yields aligned PCM chunks."""
+    samples = bytes(range(256)) * 30 + b"\x01\x02\x03"
+    data = _wav(samples)
+    parser = WavStreamParser(chunk_duration=0.1)
+
+    chunks = []
+    for start in range(0, len(data), 777):
+        chunks.extend(parser.feed(data[start : start + 777]))
+    tail = parser.flush()
+
+    assert parser.sample_rate == 16000
+    assert [len(chunk) for chunk in chunks] == [3200, 3200]
+    assert b"".join(chunks) + tail == samples[:-1]
+
+
+def test_wav_stream_rejects_unsupported_audio() -> None:
+    """Test that non-WAV data and multichannel WAV files are refused."""
+    with pytest.raises(ValueError):
+        WavStreamParser().feed(b"ID3\x04" + bytes(64))
+    with pytest.raises(ValueError):
+        WavStreamParser().feed(_wav(bytes(64), channels=2))
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 
 async def test_switch_module_import() -> None:
@@ -192,3 +194,690 @@ async def test_process_audio_invalid_webm() -> None:
         # Verify transmission errors incremented (invalid data now counts as error)
         assert switch._transmission_errors == 1
         assert switch._audio_packets_sent == 0
+
+
+async def test_send_audio_drops_oldest_when_queue_full() -> None:
+    """Test that a full per-camera queue drops the oldest chunk."""
+    with patch("custom_components.unifiprotect_2way_audio.switch.av"):
+        from custom_components.unifiprotect_2way_audio.manager import (
+            StreamConfigManager,
+        )
+        from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+        manager = StreamConfigManager(MagicMock(), {"max_queued_chunks": 2})
+        mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+        switch = TalkbackSwitch(
+            MagicMock(),
+            "camera.test_camera",
+            "test_camera_id",
+            mock_device_info,
+            None,
+            manager=manager,
+        )
+        switch._is_on = True
+
+        for chunk in (b"one", b"two", b"three"):
+            await switch.send_audio_data(chunk)
+
+        assert len(switch._audio_ring) == 2
+        assert switch._dropped_chunks == 1
+        assert bytes(switch._read_audio()[0]) == b"two"
+
+
+async def test_turn_on_refused_when_session_cap_reached() -> None:
+    """Test that the global session cap rejects additional talkback sessions."""
+    import pytest
+    from homeassistant.exceptions import HomeAssistantError
+
+    with patch("custom_components.unifiprotect_2way_audio.switch.av"):
+        from custom_components.unifiprotect_2way_audio.manager import (
+            StreamConfigManager,
+        )
+        from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+        manager = StreamConfigManager(MagicMock(), {"max_active_sessions": 1})
+        assert manager.try_acquire_session("other_camera_id")
+
+        mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+        switch = TalkbackSwitch(
+            MagicMock(),
+            "camera.test_camera",
+            "test_camera_id",
+            mock_device_info,
+            None,
+            manager=manager,
+        )
+
+        with pytest.raises(HomeAssistantError):
+            await switch.async_turn_on()
+        assert switch.is_on is False
+
+        manager.release_session("other_camera_id")
+        assert manager.try_acquire_session("test_camera_id")
+
+
+async def test_idle_session_stops_itself() -> None:
+    """Test that a session without audio is torn down after the idle timeout."""
+    import asyncio
+    from unittest.mock import PropertyMock
+
+    from custom_components.unifiprotect_2way_audio.manager import StreamConfigManager
+
+    with (
+        patch("custom_components.unifiprotect_2way_audio.switch.av"),
+        patch.object(
+            StreamConfigManager,
+            "idle_timeout",
+            new_callable=PropertyMock,
+            return_value=0.05,
+        ),
+    ):
+        from custom_components.unifiprotect_2way_audio.switch import (
+            STOP_REASON_IDLE,
+            TalkbackSwitch,
+        )
+
+        hass = MagicMock()
+        hass.async_create_task = asyncio.ensure_future
+        manager = StreamConfigManager(MagicMock())
+        mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+        switch = TalkbackSwitch(
+            hass,
+            "camera.test_camera",
+            "test_camera_id",
+            mock_device_info,
+            None,
+            manager=manager,
+        )
+        switch.async_write_ha_state = MagicMock()
+        switch._talkback_session = MagicMock(url="rtp://127.0.0.1:7004")
+        switch._is_on = True
+        switch._webm_init_segment = b"init"
+        manager.try_acquire_session("test_camera_id")
+
+        switch._backchannel_task = asyncio.ensure_future(
+            switch._run_backchannel_session()
+        )
+        await asyncio.wait_for(switch._backchannel_task, timeout=1)
+        await asyncio.sleep(0.01)
+
+        assert switch.is_on is False
+        assert switch._stop_reason == STOP_REASON_IDLE
+        assert switch._webm_init_segment is None
+        assert switch._talkback_session is None
+        assert manager.try_acquire_session("another_camera_id")
+
+
+async def test_failed_session_is_torn_down() -> None:
+    """Test that a session failing mid-stream closes the camera session."""
+    import asyncio
+
+    from custom_components.unifiprotect_2way_audio.manager import StreamConfigManager
+
+    with patch("custom_components.unifiprotect_2way_audio.switch.av"):
+        from custom_components.unifiprotect_2way_audio.switch import (
+            STATE_ERROR,
+            STOP_REASON_ERROR,
+            TalkbackSwitch,
+        )
+
+        hass = MagicMock()
+        hass.async_create_task = asyncio.ensure_future
+        manager = StreamConfigManager(MagicMock(), {"max_active_sessions": 1})
+        mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+        switch = TalkbackSwitch(
+            hass,
+            "camera.test_camera",
+            "test_camera_id",
+            mock_device_info,
+            None,
+            manager=manager,
+        )
+        switch.async_write_ha_state = MagicMock()
+        protect_camera = MagicMock(close_talkback_stream=AsyncMock())
+        switch._protect_camera = protect_camera
+        # No RTP URL: the session fails before streaming
+        switch._talkback_session = MagicMock(url=None)
+        switch._is_on = True
+        switch._webm_init_segment = b"init"
+        manager.try_acquire_session("test_camera_id")
+
+        switch._backchannel_task = asyncio.ensure_future(
+            switch._run_backchannel_session()
+        )
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(switch._backchannel_task, timeout=1)
+        await asyncio.sleep(0.01)
+
+        assert switch.is_on is False
+        assert switch._session_state == STATE_ERROR
+        assert switch._stop_reason == STOP_REASON_ERROR
+        protect_camera.close_talkback_stream.assert_awaited_once()
+        assert switch._talkback_session is None
+        assert switch._webm_init_segment is None
+        assert manager.try_acquire_session("another_camera_id")
+
+
+async def test_mix_policy_encodes_concurrent_producers() -> None:
+    """Test that PCM from two producers is mixed into one encoded stream."""
+    import io
+
+    import av
+    import numpy as np
+
+    from custom_components.unifiprotect_2way_audio.manager import StreamConfigManager
+    from custom_components.unifiprotect_2way_audio.mixer import PcmMixer
+    from custom_components.unifiprotect_2way_audio.switch import (
+        PCM_FORMAT,
+        TalkbackSwitch,
+    )
+
+    manager = StreamConfigManager(MagicMock(), {"arbitration_policy": "mix"})
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(),
+        "camera.test_camera",
+        "test_camera_id",
+        mock_device_info,
+        None,
+        manager=manager,
+    )
+    switch.async_write_ha_state = MagicMock()
+    switch._mixer = PcmMixer(320)
+
+    output_container = av.open(io.BytesIO(), mode="w", format="ogg")
+    output_stream = output_container.add_stream("opus", rate=16000)
+    tone = (np.sin(np.arange(1600) / 8) * 8000).astype("<i2").tobytes()
+
+    try:
+        for producer in ("tablet", "phone"):
+            await switch._process_and_stream_audio(
+                tone,
+                output_container,
+                output_stream,
+                16000,
+                audio_format=PCM_FORMAT,
+                input_sample_rate=16000,
+                producer=producer,
+            )
+    finally:
+        output_container.close()
+
+    assert switch._transmission_errors == 0
+    assert switch._audio_packets_sent == 2
+    assert set(switch._mix_resamplers) == {"tablet", "phone"}
+
+    # The phone goes quiet: once it expires, the mix no longer waits for it
+    with patch(
+        "custom_components.unifiprotect_2way_audio.arbitration.time.monotonic",
+        side_effect=[0.0, 0.0, 10.0, 10.0],
+    ):
+        assert switch._arbiter.accepts("phone")
+        assert switch._arbiter.accepts("tablet")
+    assert set(switch._mix_resamplers) == {"tablet"}
+    assert set(switch._mixer._buffers) == {"tablet"}
+
+
+async def test_invalid_chunks_warn_once(caplog) -> None:
+    """Test that a burst of undecodable chunks logs a single warning."""
+    import logging
+
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+
+    with caplog.at_level(logging.WARNING):
+        for _ in range(20):
+            switch._handle_invalid_audio_chunk(b"\x00" * 8, 64, ValueError("bad"))
+
+    assert switch._transmission_errors == 20
+    assert len(caplog.records) == 1
+
+
+async def test_worker_falls_back_for_unsupported_features(caplog) -> None:
+    """Test that a session a worker cannot serve is transcoded in-process."""
+    import logging
+
+    from custom_components.unifiprotect_2way_audio.manager import StreamConfigManager
+
+    with patch("custom_components.unifiprotect_2way_audio.switch.av"):
+        from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+        manager = StreamConfigManager(
+            MagicMock(), {"transcode_workers": 1, "record_sessions": True}
+        )
+        mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+        switch = TalkbackSwitch(
+            MagicMock(),
+            "camera.test_camera",
+            "test_camera_id",
+            mock_device_info,
+            None,
+            manager=manager,
+        )
+
+        with caplog.at_level(logging.WARNING):
+            output_container, output_stream = await switch._open_rtp_output(
+                "rtp://127.0.0.1:7004", "opus", 16000
+            )
+
+    assert output_container is not None
+    assert output_stream is not None
+    assert switch._worker_session is None
+    assert "session recording" in caplog.text
+
+
+async def test_set_loss_resilience_overrides_options() -> None:
+    """Test the per-camera loss-resilience override and its reset."""
+    with patch("custom_components.unifiprotect_2way_audio.switch.av"):
+        from homeassistant.exceptions import HomeAssistantError
+
+        from custom_components.unifiprotect_2way_audio.manager import (
+            StreamConfigManager,
+        )
+        from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+        manager = StreamConfigManager(
+            MagicMock(), {"loss_resilience": "off", "expected_packet_loss": 5}
+        )
+        mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+        switch = TalkbackSwitch(
+            MagicMock(),
+            "camera.test_camera",
+            "test_camera_id",
+            mock_device_info,
+            None,
+            manager=manager,
+        )
+        switch.async_write_ha_state = MagicMock()
+
+        await switch.async_set_loss_resilience("redundancy", 15)
+        attrs = switch.extra_state_attributes
+        assert attrs["loss_resilience"] == "redundancy"
+        assert attrs["expected_packet_loss"] == 15
+        assert attrs["loss_resilience_override"] == "redundancy"
+        assert switch._rtp_sender.redundancy
+
+        with pytest.raises(HomeAssistantError):
+            await switch.async_set_loss_resilience("fec", 150)
+
+        await switch.async_set_loss_resilience("default")
+        attrs = switch.extra_state_attributes
+        assert (attrs["loss_resilience"], attrs["expected_packet_loss"]) == ("off", 5)
+        assert attrs["loss_resilience_override"] is None
+        assert not switch._rtp_sender.redundancy
+
+
+async def test_voice_gate_skips_silence() -> None:
+    """Test that gated silence is neither encoded nor sent."""
+    import av
+    import numpy as np
+
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+    from custom_components.unifiprotect_2way_audio.vad import VoiceActivityDetector
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch._vad = VoiceActivityDetector(hangover=0)
+    output_container = MagicMock()
+    output_stream = MagicMock()
+    output_stream.encode.return_value = [MagicMock()]
+
+    for samples in (np.sin(np.arange(1600) / 8) * 8000, np.zeros(1600)):
+        frame = av.AudioFrame.from_ndarray(
+            samples.astype(np.int16).reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = 16000
+        switch._encode_frame(frame, output_container, output_stream, 16000)
+
+    assert output_stream.encode.call_count == 1
+    assert output_container.mux.call_count == 1
+    assert switch._clock.pts == 3200
+    attrs = switch.extra_state_attributes
+    assert (attrs["voice_frames"], attrs["gated_frames"]) == (1, 1)
+
+
+async def test_capabilities_cached_for_session() -> None:
+    """Test that the negotiated format is kept for one session."""
+    import av
+
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch._protect_camera = MagicMock()
+    session = MagicMock(codec="opus", sampling_rate=16000)
+
+    with (
+        patch.object(switch, "_get_protect_camera", AsyncMock()),
+        patch.object(
+            switch, "_create_talkback_session", AsyncMock(return_value=session)
+        ),
+        patch.object(switch, "_run_backchannel_session", AsyncMock()),
+    ):
+        await switch._start_backchannel()
+
+    assert switch.capabilities == {"codec": "opus", "sample_rate": 16000, "channels": 1}
+
+    # Audio sent at the negotiated rate is encoded without resampling
+    output_stream = MagicMock()
+    output_stream.encode.return_value = []
+    switch._process_pcm_and_stream_audio(
+        b"\x00\x00" * 320, MagicMock(), output_stream, 16000, 16000
+    )
+    assert isinstance(output_stream.encode.call_args.args[0], av.AudioFrame)
+    assert switch._resampler is not None
+    assert switch._resampler._resampler is None
+
+    await switch._stop_backchannel()
+    assert switch.capabilities is None
+
+
+async def test_wait_for_room_holds_producer_until_encoded() -> None:
+    """Test that a pausable producer waits for the encoder to catch up."""
+    import asyncio
+
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch._is_on = True
+    for _ in range(3):
+        switch.enqueue_audio(b"\x00\x00", "pcm_s16le")
+
+    waiter = asyncio.ensure_future(switch.async_wait_for_room(1))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    switch._read_audio()
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    switch._read_audio()
+    await asyncio.wait_for(waiter, 1)
+
+
+async def test_rtp_ingest_feeds_active_session(socket_enabled) -> None:
+    """Test that the RTP ingest listener queues audio only while talkback is on."""
+    from custom_components.unifiprotect_2way_audio.switch import (
+        RTP_INGEST_PRODUCER,
+        TalkbackSwitch,
+    )
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch.async_write_ha_state = MagicMock()
+
+    with patch(
+        "custom_components.unifiprotect_2way_audio.rtp_ingest.RtpIngest.async_start",
+        AsyncMock(),
+    ):
+        await switch.async_set_rtp_ingest(40000, "192.0.2.1")
+    ingest = switch._rtp_ingest
+    assert ingest is not None
+    assert ingest.source == "192.0.2.1"
+
+    # PCMU packet with two samples
+    packet = b"\x80\x00\x00\x01\x00\x00\x00\xa0\x00\x00\x00\x07\xff\xff"
+    ingest.datagram_received(packet, ("192.0.2.1", 5004))
+    assert switch._read_audio() is None
+
+    switch._is_on = True
+    ingest.datagram_received(packet[:2] + b"\x00\x02" + packet[4:], ("192.0.2.1", 5004))
+    audio_data, sample_rate, producer, audio_format = switch._read_audio()
+    assert bytes(audio_data) == b"\x00\x00\x00\x00"
+    assert (sample_rate, producer, audio_format) == (
+        8000,
+        RTP_INGEST_PRODUCER,
+        "pcm_s16le",
+    )
+
+    await switch.async_set_rtp_ingest(0)
+    assert switch._rtp_ingest is None
+
+
+def _opus_packets(count: int) -> list[bytes]:
+    """Encode ``count`` 20 ms Opus packets of a tone at 48 kHz."""
+    from fractions import Fraction
+
+    import av
+    import numpy as np
+
+    encoder = av.CodecContext.create("opus", "w")
+    encoder.sample_rate = 48000
+    encoder.format = "s16"
+    encoder.layout = "mono"
+    encoder.time_base = Fraction(1, 48000)
+    packets = []
+    for index in range(count + 1):
+        tone = np.sin(np.arange(index * 960, (index + 1) * 960) / 8) * 8000
+        frame = av.AudioFrame.from_ndarray(
+            tone.astype(np.int16).reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = 48000
+        frame.pts = index * 960
+        packets.extend(bytes(packet) for packet in encoder.encode(frame))
+    return packets[:count]
+
+
+def _opus_chunk(*records: tuple[int, bytes]) -> bytes:
+    """Build an opus_packets chunk from (timestamp, packet) records."""
+    import struct
+
+    return b"".join(
+        struct.pack(">IH", timestamp, len(packet)) + packet
+        for timestamp, packet in records
+    )
+
+
+async def test_opus_packets_forwarded_without_decoding() -> None:
+    """Test that client-encoded Opus reaches RTP untouched and in time."""
+    from custom_components.unifiprotect_2way_audio.const import TRANSPORT_NATIVE
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch._transport = TRANSPORT_NATIVE
+    switch.async_write_ha_state = MagicMock()
+    output_container = MagicMock()
+    output_stream = MagicMock()
+    output_stream.codec_context.name = "libopus"
+    first, second, third = _opus_packets(3)
+
+    # The repeated first packet is dropped; the third follows a 20 ms pause
+    chunk = _opus_chunk((0, first), (960, second), (960, second), (2880, third))
+    await switch._process_and_stream_audio(
+        chunk, output_container, output_stream, 16000, audio_format="opus_packets"
+    )
+    await switch._process_and_stream_audio(
+        chunk[:-1], output_container, output_stream, 16000, audio_format="opus_packets"
+    )
+
+    sent = [call.args[0] for call in output_container.mux.call_args_list]
+    assert [bytes(packet) for packet in sent] == [first, second, third]
+    assert [(packet.pts, packet.duration) for packet in sent] == [
+        (0, 320),
+        (320, 320),
+        (960, 320),
+    ]
+    output_stream.encode.assert_not_called()
+    # The truncated copy is rejected whole, so nothing in it is sent twice
+    assert switch._transmission_errors == 1
+
+
+async def test_opus_packets_decoded_for_other_codecs() -> None:
+    """Test that packets are decoded into the encode path when not forwardable."""
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    output_container = MagicMock()
+    output_stream = MagicMock()
+    output_stream.codec_context.name = "aac"
+    packets = _opus_packets(2)
+
+    with patch.object(switch, "_emit_frame") as emit:
+        switch._process_opus_packets(
+            _opus_chunk((0, packets[0]), (960, packets[1])),
+            output_container,
+            output_stream,
+            16000,
+        )
+
+    frames = [call.args[0] for call in emit.call_args_list]
+    assert [(frame.samples, frame.sample_rate) for frame in frames] == [
+        (960, 48000),
+        (960, 48000),
+    ]
+    output_container.mux.assert_not_called()
+
+
+async def test_echo_cancellation_runs_before_encoding() -> None:
+    """Test that uplink frames pass the echo canceller in whole blocks."""
+    import av
+    import numpy as np
+
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch._echo_reference_unsub = MagicMock()
+    output_container = MagicMock()
+    output_stream = MagicMock()
+    output_stream.encode.return_value = [MagicMock()]
+
+    for samples in (100, 200):
+        frame = av.AudioFrame.from_ndarray(
+            np.full((2, samples), 1000, dtype=np.int16), format="s16p", layout="stereo"
+        )
+        frame.sample_rate = 16000
+        switch._encode_frame(frame, output_container, output_stream, 16000)
+        switch._on_echo_reference(b"\x00\x00" * 640)
+
+    encoded = output_stream.encode.call_args.args[0]
+    assert output_stream.encode.call_count == 1
+    assert (encoded.samples, encoded.layout.name) == (256, "mono")
+    assert switch._echo_canceller.sample_rate == 16000
+    assert switch.extra_state_attributes["echo_return_loss_enhancement"] == 0
+
+
+async def test_recording_tees_encoded_packets() -> None:
+    """Test that encoded packets are recorded before they are sent."""
+    import av
+    import numpy as np
+
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    switch = TalkbackSwitch(
+        MagicMock(), "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    recording = switch._recording = MagicMock()
+    packet = MagicMock()
+    output_container = MagicMock()
+    output_stream = MagicMock()
+    output_stream.encode.return_value = [packet]
+    frame = av.AudioFrame.from_ndarray(
+        np.zeros((1, 320), dtype=np.int16), format="s16", layout="mono"
+    )
+    frame.sample_rate = 16000
+
+    switch._encode_frame(frame, output_container, output_stream, 16000)
+    switch._close_rtp_output(None)
+
+    recording.add.assert_called_once_with(packet)
+    output_container.mux.assert_called_once_with(packet)
+    recording.close.assert_called_once()
+    assert switch._recording is None
+
+
+async def test_speak_starts_streams_and_stops_session() -> None:
+    """Test that speak starts talkback, queues speech and stops afterwards."""
+    import asyncio
+
+    from custom_components.unifiprotect_2way_audio.switch import (
+        PCM_FORMAT,
+        TalkbackSwitch,
+    )
+
+    async def _speech(*args):
+        for _ in range(3):
+            yield b"\x00\x01" * 160, 16000
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    hass = MagicMock()
+    hass.async_create_task = asyncio.get_running_loop().create_task
+    switch = TalkbackSwitch(
+        hass, "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch.async_write_ha_state = MagicMock()
+
+    async def _turn_on() -> None:
+        switch._is_on = True
+
+    switch.async_turn_on = _turn_on
+    switch._async_stop_session = AsyncMock()
+
+    with patch(
+        "custom_components.unifiprotect_2way_audio.switch.async_speech_pcm", _speech
+    ):
+        await switch.async_speak("Hello", engine="tts.test")
+
+    records = []
+    while (record := switch._read_audio()) is not None:
+        records.append((bytes(record[0]), record[1], record[3]))
+    assert records == [(b"\x00\x01" * 160, 16000, PCM_FORMAT)] * 3
+    assert switch.extra_state_attributes["time_to_first_audio_ms"] is not None
+    assert not switch._arbiter.producers
+    switch._async_stop_session.assert_awaited_once()
+
+
+async def test_speak_reports_failed_start() -> None:
+    """Test that speak raises when the backchannel fails to start."""
+    import asyncio
+
+    from homeassistant.exceptions import HomeAssistantError
+
+    from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+    async def _speech(*args):
+        return
+        yield
+
+    mock_device_info = {"identifiers": {("unifiprotect", "test_camera_id")}}
+    hass = MagicMock()
+    hass.async_create_task = asyncio.get_running_loop().create_task
+    switch = TalkbackSwitch(
+        hass, "camera.test_camera", "test_camera_id", mock_device_info, None
+    )
+    switch.async_write_ha_state = MagicMock()
+    switch.async_turn_on = AsyncMock(side_effect=HomeAssistantError("no camera"))
+    switch._async_stop_session = AsyncMock()
+
+    with (
+        patch(
+            "custom_components.unifiprotect_2way_audio.switch.async_speech_pcm",
+            _speech,
+        ),
+        pytest.raises(HomeAssistantError, match="no camera"),
+    ):
+        await switch.async_speak("Hello", engine="tts.test")
+
+    assert not switch._arbiter.producers
+    switch._async_stop_session.assert_not_awaited()
@@ -0,0 +1,202 @@
+"""Test the process-pool transcoder for UniFi Protect 2-Way Audio."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.audio_format import (
+    AUDIO_FORMAT_CODES,
+    OPUS_PACKETS_FORMAT,
+    PCM_FORMAT,
+)
+from custom_components.unifiprotect_2way_audio.transcoder import (
+    RECORD_HEADER,
+    SharedRing,
+    TranscoderPool,
+    _WorkerLoop,
+    _WorkerSession,
+)
+
+
+def _header(length: int, session_id: int = 1) -> bytes:
+    return RECORD_HEADER.pack(length, session_id, 16000, 1)
+
+
+def test_shared_ring_wraps_and_refuses_when_full() -> None:
+    """Test that records survive wrap-around and a full ring refuses writes."""
+    ring = SharedRing.create(64)
+    try:
+        for round_ in range(5):
+            payload = bytes([round_]) * 30
+            assert ring.write(_header(len(payload)), payload)
+            header, data = ring.read()
+            assert header == (30, 1, 16000, 1)
+            assert data == payload
+
+        assert ring.write(_header(30), b"x" * 30)
+        assert not ring.write(_header(30), b"y" * 30)
+        assert ring.read() is not None
+        assert ring.read() is None
+    finally:
+        ring.close()
+
+
+def test_cameras_are_pinned_to_least_loaded_worker() -> None:
+    """Test that cameras spread across workers and keep their assignment."""
+    pool = TranscoderPool(2)
+    first = pool.worker_for("camera_a")
+    pool._workers[first] = MagicMock(cameras={"camera_a"})
+
+    second = pool.worker_for("camera_b")
+
+    assert second != first
+    assert pool.worker_for("camera_a") == first
+
+
+async def test_worker_transcodes_pcm_to_rtp(socket_enabled) -> None:
+    """Test that a worker process encodes submitted PCM and sends RTP."""
+    loop = asyncio.get_running_loop()
+    received: list[bytes] = []
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: type(
+            "Receiver",
+            (asyncio.DatagramProtocol,),
+            {"datagram_received": lambda self, data, addr: received.append(data)},
+        )(),
+        local_addr=("127.0.0.1", 0),
+    )
+    port = transport.get_extra_info("sockname")[1]
+    pool = TranscoderPool(1, ring_size=1 << 16)
+    stats: list[tuple[int, ...]] = []
+    tone = (np.sin(np.arange(3200) / 8) * 8000).astype("<i2").tobytes()
+
+    try:
+        session = await pool.async_open_session(
+            "camera_a",
+            f"rtp://127.0.0.1:{port}",
+            "opus",
+            16000,
+            24000,
+            on_stats=lambda *delta: stats.append(delta),
+            on_lost=MagicMock(),
+        )
+        for _ in range(5):
+            assert pool.submit(session, tone, PCM_FORMAT, 16000)
+
+        for _ in range(100):
+            if stats and received:
+                break
+            await asyncio.sleep(0.1)
+        pool.close_session("camera_a", session)
+    finally:
+        await pool.async_shutdown()
+        transport.close()
+
+    assert sum(chunks for chunks, *_ in stats) == 5
+    assert sum(errors for _, _, errors, *_ in stats) == 0
+    assert received
+
+
+def test_worker_forwards_opus_packets(socket_enabled) -> None:
+    """Test that a worker sends client-encoded Opus packets as RTP payloads."""
+    import socket
+    import struct
+
+    import av
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(5)
+    port = receiver.getsockname()[1]
+    encoder = av.CodecContext.create("opus", "w")
+    encoder.sample_rate = 48000
+    encoder.format = "s16"
+    encoder.layout = "mono"
+    tone = (np.sin(np.arange(960 * 4) / 8) * 8000).astype(np.int16).reshape(1, -1)
+    frame = av.AudioFrame.from_ndarray(tone, format="s16", layout="mono")
+    frame.sample_rate = 48000
+    packets = [bytes(packet) for packet in encoder.encode(frame)][:3]
+    chunk = b"".join(
+        struct.pack(">IH", index * 960, len(packet)) + packet
+        for index, packet in enumerate(packets)
+    )
+
+    session = _WorkerSession(f"rtp://127.0.0.1:{port}", "opus", 16000, 24000)
+    try:
+        session.process(bytearray(chunk), OPUS_PACKETS_FORMAT, 48000)
+        payloads = [receiver.recv(2048)[12:] for _ in packets]
+    finally:
+        session.close()
+        receiver.close()
+
+    assert (session.chunks, session.errors) == (1, 0)
+    assert payloads == packets
+
+
+def test_worker_gates_silence(socket_enabled) -> None:
+    """Test that a worker with the voice gate skips silence but sends voice."""
+    import socket
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(5)
+    port = receiver.getsockname()[1]
+    tone = (np.sin(np.arange(1600) / 8) * 8000).astype("<i2").tobytes()
+
+    session = _WorkerSession(
+        f"rtp://127.0.0.1:{port}", "opus", 16000, 24000, voice_gate=True
+    )
+    try:
+        session.process(bytearray(3200), PCM_FORMAT, 16000)
+        assert session.clock.pts == 1600
+        assert session.pop_stats() == (1, 3200, 0, 0, 1)
+
+        session.process(bytearray(tone), PCM_FORMAT, 16000)
+        assert receiver.recv(2048)
+    finally:
+        session.close()
+        receiver.close()
+
+    assert session.pop_stats() == (1, 3200, 0, 1, 0)
+
+
+def test_worker_survives_unexpected_chunk_errors(socket_enabled) -> None:
+    """Test that a chunk failing unexpectedly only counts as a session error."""
+    import socket
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(5)
+    url = f"rtp://127.0.0.1:{receiver.getsockname()[1]}"
+    tone = (np.sin(np.arange(1600) / 8) * 8000).astype("<i2").tobytes()
+    ring = SharedRing.create(1 << 16)
+    conn = MagicMock()
+    conn.poll.return_value = False
+    worker = _WorkerLoop(conn, ring, MagicMock())
+    broken = _WorkerSession(url, "opus", 16000, 24000)
+    healthy = _WorkerSession(url, "opus", 16000, 24000)
+    worker._sessions = {1: broken, 2: healthy}
+
+    try:
+        with patch.object(broken, "_encode", side_effect=IndexError("bad chunk")):
+            for session_id in (1, 2):
+                header = RECORD_HEADER.pack(
+                    len(tone),
+                    session_id,
+                    16000,
+                    AUDIO_FORMAT_CODES.index(PCM_FORMAT),
+                )
+                assert ring.write(header, tone)
+                worker._process_record()
+        assert receiver.recv(2048)
+    finally:
+        broken.close()
+        healthy.close()
+        ring.close()
+        receiver.close()
+
+    assert (broken.chunks, broken.errors) == (0, 1)
+    assert (healthy.chunks, healthy.errors) == (1, 0)
@@ -0,0 +1,143 @@
+"""Test the HTTP audio upload view."""
+
+from __future__ import annotations
+
+import io
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import av
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.audio_format import (
+    WEBM_CLUSTER_ID,
+    WEBM_EBML_HEADER,
+    parse_opus_packets,
+)
+from custom_components.unifiprotect_2way_audio.upload import (
+    AudioUploadView,
+    _OggFramer,
+    _PcmFramer,
+    _WebmFramer,
+)
+
+
+def _ogg_opus(frames: int) -> tuple[bytes, list[bytes]]:
+    """Encode a tone as Ogg/Opus; return the file and its audio packets."""
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=48000)
+        stream.layout = "mono"
+        tone = np.sin(np.arange(960 * frames) / 10) * 8000
+        frame = av.AudioFrame.from_ndarray(
+            tone.astype(np.int16).reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = 48000
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+    buffer.seek(0)
+    with av.open(buffer, "r", format="ogg") as container:
+        packets = [bytes(packet) for packet in container.demux() if packet.size]
+    return buffer.getvalue(), packets
+
+
+def _feed(framer, data: bytes, piece: int) -> list[bytes]:
+    """Feed ``data`` to a framer in fixed-size pieces."""
+    chunks = []
+    for start in range(0, len(data), piece):
+        chunks.extend(framer.feed(data[start : start + piece]))
+    return chunks
+
+
+def test_ogg_upload_becomes_opus_packets() -> None:
+    """Test that Ogg pages are unwrapped into timestamped Opus packets."""
+    data, expected = _ogg_opus(10)
+    chunks = _feed(_OggFramer(), data, 7)
+
+    records = [record for chunk in chunks for record in parse_opus_packets(chunk)]
+    assert [bytes(packet) for _, packet, _ in records] == expected
+    assert [timestamp for timestamp, _, _ in records] == [
+        960 * index for index in range(len(expected))
+    ]
+
+
+def test_pcm_framer_keeps_samples_whole() -> None:
+    """Test that PCM chunks stay sample-aligned across odd reads."""
+    framer = _PcmFramer()
+
+    assert framer.feed(b"\x01\x02\x03") == [b"\x01\x02"]
+    assert framer.feed(b"\x04") == [b"\x03\x04"]
+    assert [len(chunk) for chunk in framer.feed(bytes(5000))] == [4096, 904]
+
+
+def test_webm_framer_cuts_before_clusters() -> None:
+    """Test that the header travels with the first cluster."""
+    header = WEBM_EBML_HEADER + b"head"
+    first = WEBM_CLUSTER_ID + b"one"
+    second = WEBM_CLUSTER_ID + b"two"
+
+    chunks = _feed(_WebmFramer(), header + first + second + WEBM_CLUSTER_ID, 3)
+
+    assert chunks == [header + first, second]
+
+
+async def test_upload_streams_body_into_switch() -> None:
+    """Test that an upload claims the switch, queues audio and releases it."""
+    switch = MagicMock()
+    switch.is_on = True
+    switch.claim_stream.return_value = True
+    switch.async_wait_for_room = AsyncMock()
+    switch.async_release_stream = AsyncMock()
+
+    async def _body():
+        yield b"\x01\x00\x02"
+        yield b"\x00"
+
+    request = MagicMock()
+    request.query = {"format": "pcm_s16le", "sample_rate": "16000"}
+    request.content.iter_any = _body
+
+    view = AudioUploadView(MagicMock())
+    with patch(
+        "custom_components.unifiprotect_2way_audio.upload.async_get_switch",
+        return_value=switch,
+    ):
+        response = await view.post(request, "switch.test_camera_talkback")
+
+    assert json.loads(response.body) == {"bytes_received": 4, "stopped": False}
+    owner = switch.claim_stream.call_args[0][0]
+    queued = [call.args for call in switch.enqueue_audio.call_args_list]
+    assert queued == [
+        (b"\x01\x00", "pcm_s16le", 16000, owner, 0),
+        (b"\x02\x00", "pcm_s16le", 16000, owner, 0),
+    ]
+    switch.async_release_stream.assert_awaited_once_with(owner)
+
+
+async def test_upload_requires_declared_pcm() -> None:
+    """Test that an undeclared headerless body is refused."""
+    switch = MagicMock()
+    switch.is_on = True
+    switch.claim_stream.return_value = True
+    switch.async_release_stream = AsyncMock()
+
+    async def _body():
+        yield b"\x00\x01\x02\x03"
+
+    request = MagicMock()
+    request.query = {}
+    request.content.iter_any = _body
+
+    view = AudioUploadView(MagicMock())
+    with patch(
+        "custom_components.unifiprotect_2way_audio.upload.async_get_switch",
+        return_value=switch,
+    ):
+        response = await view.post(request, "switch.test_camera_talkback")
+
+    assert response.status == 415
+    switch.enqueue_audio.assert_not_called()
+    switch.async_release_stream.assert_awaited_once()
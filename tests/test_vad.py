@@ -0,0 +1,63 @@
+"""Tests for voice activity detection."""
+
+import av
+import numpy as np
+
+from custom_components.unifiprotect_2way_audio.vad import (
+    HANGOVER,
+    VoiceActivityDetector,
+    frame_levels,
+)
+
+
+def _frame(samples: np.ndarray) -> av.AudioFrame:
+    frame = av.AudioFrame.from_ndarray(
+        samples.astype(np.int16).reshape(1, -1), format="s16", layout="mono"
+    )
+    frame.sample_rate = 16000
+    return frame
+
+
+def _tone(amplitude: float, samples: int = 320) -> np.ndarray:
+    return np.sin(np.arange(samples) / 4) * amplitude
+
+
+def test_gate_closes_after_hangover() -> None:
+    """Test that silence passes during the hangover and is gated after it."""
+    vad = VoiceActivityDetector()
+    assert vad.is_voice(_frame(_tone(8000)))
+
+    silence = _frame(np.zeros(320))
+    hangover_frames = round(HANGOVER / 0.02)
+    results = [vad.is_voice(silence) for _ in range(hangover_frames + 5)]
+
+    assert all(results[:hangover_frames])
+    assert not any(results[hangover_frames + 1 :])
+    assert vad.is_voice(_frame(_tone(8000)))
+    assert vad.gated_frames == results.count(False)
+    assert vad.voice_frames == 2 + results.count(True)
+
+
+def test_noise_floor_follows_background() -> None:
+    """Test that steady background noise is gated once the floor adapts."""
+    rng = np.random.default_rng(1)
+    vad = VoiceActivityDetector(hangover=0)
+    noise = [_frame(rng.normal(0, 300, 320)) for _ in range(500)]
+
+    assert vad.is_voice(noise[0])
+    for frame in noise[1:]:
+        vad.is_voice(frame)
+
+    assert not vad.is_voice(noise[-1])
+    assert vad.noise_floor > -45
+    assert vad.is_voice(_frame(rng.normal(0, 300, 320) + _tone(6000)))
+
+
+def test_frame_levels_per_window() -> None:
+    """Test that levels are reported per 10 ms window in dBFS."""
+    samples = np.concatenate([np.zeros(160), np.full(160, 32767)])
+    levels = frame_levels(_frame(samples))
+
+    assert levels.shape == (2,)
+    assert levels[0] < -90
+    assert abs(levels[1]) < 0.01
@@ -0,0 +1,93 @@
+"""Test WebRTC ingress of browser talkback audio."""
+
+from __future__ import annotations
+
+import asyncio
+import fractions
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+aiortc = pytest.importorskip("aiortc")
+
+from custom_components.unifiprotect_2way_audio.audio_format import (  # noqa: E402
+    parse_opus_packets,
+)
+from custom_components.unifiprotect_2way_audio.webrtc import TalkbackPeer  # noqa: E402
+
+
+@pytest.fixture
+def loopback_ice(socket_enabled):
+    """Gather ICE candidates on loopback; the harness fakes the interfaces."""
+    with patch("aioice.ice.get_host_addresses", return_value=["127.0.0.1"]):
+        yield
+
+
+class _ToneTrack(aiortc.MediaStreamTrack):
+    """A 20 ms-per-frame tone standing in for a browser microphone."""
+
+    kind = "audio"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._pts = 0
+
+    async def recv(self):
+        import av
+
+        await asyncio.sleep(0.02)
+        tone = np.sin((np.arange(960) + self._pts) / 10) * 8000
+        frame = av.AudioFrame.from_ndarray(
+            tone.astype(np.int16).reshape(1, -1), format="s16", layout="mono"
+        )
+        frame.sample_rate = 48000
+        frame.pts = self._pts
+        frame.time_base = fractions.Fraction(1, 48000)
+        self._pts += 960
+        return frame
+
+
+async def test_peer_forwards_browser_opus_unchanged(loopback_ice) -> None:
+    """Test a localhost peer connection delivering timestamped Opus packets."""
+    chunks: list[bytes] = []
+    failed: list[bool] = []
+    peer = TalkbackPeer(chunks.append, lambda: failed.append(True))
+    client = aiortc.RTCPeerConnection(aiortc.RTCConfiguration(iceServers=[]))
+    client.addTransceiver(_ToneTrack(), direction="sendonly")
+    try:
+        await client.setLocalDescription(await client.createOffer())
+        answer = await peer.async_answer(client.localDescription.sdp)
+        assert "opus/48000" in answer
+        assert "PCMU" not in answer
+        await client.setRemoteDescription(
+            aiortc.RTCSessionDescription(answer, "answer")
+        )
+        for _ in range(100):
+            if len(chunks) >= 10:
+                break
+            await asyncio.sleep(0.05)
+        assert peer.connected
+    finally:
+        await client.close()
+        await peer.async_close()
+
+    records = [record for chunk in chunks for record in parse_opus_packets(chunk)]
+    assert len(records) >= 10
+    timestamps = [timestamp for timestamp, _, _ in records]
+    assert np.all(np.diff(timestamps) == 960)
+    assert not failed
+
+
+async def test_peer_rejects_offer_without_audio(loopback_ice) -> None:
+    """Test that an offer carrying no audio track is refused."""
+    peer = TalkbackPeer(lambda chunk: None, lambda: None)
+    client = aiortc.RTCPeerConnection(aiortc.RTCConfiguration(iceServers=[]))
+    client.createDataChannel("chat")
+    try:
+        await client.setLocalDescription(await client.createOffer())
+        with pytest.raises(ValueError):
+            await peer.async_answer(client.localDescription.sdp)
+    finally:
+        await client.close()
+        await peer.async_close()
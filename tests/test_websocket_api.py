@@ -0,0 +1,281 @@
+"""Test the UniFi Protect 2-Way Audio websocket API."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from custom_components.unifiprotect_2way_audio.const import DOMAIN
+
+
+def _setup_switch(hass: MagicMock, is_on: bool = True):
+    """Register a talkback switch with a manager in hass.data."""
+    with patch("custom_components.unifiprotect_2way_audio.switch.av"):
+        from custom_components.unifiprotect_2way_audio.manager import (
+            StreamConfigManager,
+            Unifi2WayAudioDevice,
+        )
+        from custom_components.unifiprotect_2way_audio.switch import TalkbackSwitch
+
+        manager = StreamConfigManager(MagicMock())
+        switch = TalkbackSwitch(
+            hass,
+            "camera.test_camera",
+            "test_camera_id",
+            {"identifiers": {("unifiprotect", "test_camera_id")}},
+            None,
+            manager=manager,
+        )
+        switch.entity_id = "switch.test_camera_talkback"
+        switch._is_on = is_on
+        manager._devices["test_camera_id"] = Unifi2WayAudioDevice(
+            switch, "camera.test_camera", None
+        )
+        hass.data = {DOMAIN: {"entry_id": {"manager": manager}}}
+        return switch
+
+
+def _start_stream_msg(msg_id: int, **kwargs) -> dict:
+    """Build a start_stream message validated against the command schema."""
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_start_stream,
+    )
+
+    return handle_start_stream._ws_schema(
+        {
+            "id": msg_id,
+            "type": "unifiprotect_2way_audio/start_stream",
+            "entity_id": "switch.test_camera_talkback",
+            **kwargs,
+        }
+    )
+
+
+def _connection() -> MagicMock:
+    """Return a mock websocket connection with binary handler support."""
+    connection = MagicMock()
+    connection.subscriptions = {}
+    connection.async_register_binary_handler.return_value = (1, MagicMock())
+    return connection
+
+
+async def test_start_stream_queues_binary_audio() -> None:
+    """Test that binary frames on a claimed stream reach the audio queue."""
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_start_stream,
+    )
+
+    hass = MagicMock()
+    switch = _setup_switch(hass)
+    connection = _connection()
+
+    handle_start_stream(hass, connection, _start_stream_msg(5, sample_rate=16000))
+
+    connection.send_result.assert_called_once_with(5)
+    connection.send_event.assert_called_once_with(5, {"type": "ready", "handler_id": 1})
+    handler = connection.async_register_binary_handler.call_args[0][0]
+    handler(hass, connection, b"\x01\x00\x02\x00")
+
+    audio_data, sample_rate, producer, audio_format = switch._read_audio()
+    assert bytes(audio_data) == b"\x01\x00\x02\x00"
+    assert (sample_rate, producer, audio_format) == (16000, connection, "pcm_s16le")
+
+
+async def test_sequenced_stream_reorders_and_acks() -> None:
+    """Test that numbered frames are delivered in order and acknowledged."""
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_start_stream,
+    )
+
+    hass = MagicMock()
+    switch = _setup_switch(hass)
+    connection = _connection()
+    handle_start_stream(hass, connection, _start_stream_msg(3, sequenced=True))
+    handler = connection.async_register_binary_handler.call_args[0][0]
+    connection.send_event.reset_mock()
+
+    handler(hass, connection, b"\x00\x00\x00\x00\x01\x00")
+    handler(hass, connection, b"\x00\x00\x00\x02\x03\x00")
+    handler(hass, connection, b"\x00\x00\x00\x01\x02\x00")
+    handler(hass, connection, b"\x00\x00\x00\x01\x02\x00")
+
+    chunks = []
+    while (record := switch._read_audio()) is not None:
+        chunks.append(bytes(record[0]))
+    assert chunks == [b"\x01\x00", b"\x02\x00", b"\x03\x00"]
+    assert connection.send_event.call_args_list == [
+        call(3, {"type": "ack", "seq": 0}),
+        call(3, {"type": "ack", "seq": 2}),
+    ]
+
+
+async def test_start_stream_rejects_second_client() -> None:
+    """Test that a claimed switch refuses a stream from another connection."""
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_start_stream,
+    )
+
+    hass = MagicMock()
+    _setup_switch(hass)
+    msg = _start_stream_msg(1)
+
+    handle_start_stream(hass, _connection(), msg)
+    second = _connection()
+    handle_start_stream(hass, second, msg)
+
+    second.send_error.assert_called_once()
+    assert second.send_error.call_args[0][1] == "stream_in_use"
+
+
+async def test_connection_close_stops_backchannel() -> None:
+    """Test that closing the subscription stops the talkback session."""
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_start_stream,
+    )
+
+    hass = MagicMock()
+    switch = _setup_switch(hass)
+    connection = _connection()
+    handle_start_stream(hass, connection, _start_stream_msg(7))
+
+    with patch.object(switch, "_async_stop_session", AsyncMock()) as stop:
+        connection.subscriptions.pop(7)()
+        await hass.async_create_task.call_args[0][0]
+
+    stop.assert_awaited_once()
+    assert not switch._arbiter.producers
+
+
+async def test_start_stream_requires_active_talkback() -> None:
+    """Test that streaming is refused while talkback is off."""
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_start_stream,
+    )
+
+    hass = MagicMock()
+    _setup_switch(hass, is_on=False)
+    connection = _connection()
+    handle_start_stream(hass, connection, _start_stream_msg(2))
+
+    assert connection.send_error.call_args[0][1] == "talkback_inactive"
+    connection.async_register_binary_handler.assert_not_called()
+
+
+async def test_capabilities_reports_negotiated_format() -> None:
+    """Test that the session's format is returned only while it is active."""
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_capabilities,
+    )
+
+    hass = MagicMock()
+    switch = _setup_switch(hass)
+    msg = handle_capabilities._ws_schema(
+        {
+            "id": 3,
+            "type": "unifiprotect_2way_audio/capabilities",
+            "entity_id": "switch.test_camera_talkback",
+        }
+    )
+
+    connection = _connection()
+    handle_capabilities(hass, connection, msg)
+    assert connection.send_error.call_args[0][1] == "talkback_inactive"
+
+    switch._capabilities = {"codec": "opus", "sample_rate": 16000, "channels": 1}
+    connection = _connection()
+    handle_capabilities(hass, connection, msg)
+    connection.send_result.assert_called_once_with(
+        3, {"codec": "opus", "sample_rate": 16000, "channels": 1}
+    )
+
+
+async def test_listen_forwards_shared_audio_events() -> None:
+    """Test that downlink events are wrapped for the listening subscription."""
+    import json
+
+    from custom_components.unifiprotect_2way_audio.websocket_api import handle_listen
+
+    hass = MagicMock()
+    switch = _setup_switch(hass, is_on=False)
+    connection = _connection()
+    unsubscribe = MagicMock()
+    subscribe = AsyncMock(return_value=unsubscribe)
+    msg = handle_listen._ws_schema(
+        {
+            "id": 9,
+            "type": "unifiprotect_2way_audio/listen",
+            "entity_id": "switch.test_camera_talkback",
+        }
+    )
+
+    with patch.object(switch.manager.downlink, "async_subscribe", subscribe):
+        await handle_listen.__wrapped__(hass, connection, msg)
+
+    camera_entity_id, listener = subscribe.call_args[0]
+    assert camera_entity_id == "camera.test_camera"
+    connection.send_result.assert_called_once_with(9)
+    assert connection.send_event.call_args[0][1]["type"] == "ready"
+
+    listener(b'{"type":"audio","seq":1,"data":"AAA="}')
+    message = json.loads(connection.send_message.call_args[0][0])
+    assert message == {
+        "id": 9,
+        "type": "event",
+        "event": {"type": "audio", "seq": 1, "data": "AAA="},
+    }
+    connection.subscriptions.pop(9)()
+    unsubscribe.assert_called_once()
+
+
+async def test_start_webrtc_answers_and_queues_opus() -> None:
+    """Test that a WebRTC offer claims the switch and its audio is queued."""
+    from custom_components.unifiprotect_2way_audio import websocket_api
+    from custom_components.unifiprotect_2way_audio.websocket_api import (
+        handle_start_webrtc,
+    )
+
+    hass = MagicMock()
+    switch = _setup_switch(hass)
+    connection = _connection()
+    msg = handle_start_webrtc._ws_schema(
+        {
+            "id": 4,
+            "type": "unifiprotect_2way_audio/start_webrtc",
+            "entity_id": "switch.test_camera_talkback",
+            "offer": "v=0",
+        }
+    )
+    peer = MagicMock(lost_packets=0, connected=False)
+    peer.async_answer = AsyncMock(return_value="answer-sdp")
+    peer.async_close = AsyncMock()
+
+    with (
+        patch.object(websocket_api, "WEBRTC_AVAILABLE", True),
+        patch.object(websocket_api, "TalkbackPeer", return_value=peer) as peer_type,
+    ):
+        await handle_start_webrtc.__wrapped__(hass, connection, msg)
+
+    peer.async_answer.assert_awaited_once_with("v=0")
+    connection.send_result.assert_called_once_with(4)
+    connection.send_event.assert_called_once_with(
+        4, {"type": "answer", "sdp": "answer-sdp"}
+    )
+    on_audio, on_failed, _ice_servers = peer_type.call_args[0]
+    on_audio(b"opus")
+    audio_data, _rate, producer, audio_format = switch._read_audio()
+    assert (bytes(audio_data), producer, audio_format) == (
+        b"opus",
+        peer,
+        "opus_packets",
+    )
+
+    # A peer that never connected fails without ending the session
+    with patch.object(switch, "_async_stop_session", AsyncMock()) as stop:
+        on_failed()
+        for task in hass.async_create_task.call_args_list:
+            await task.args[0]
+
+    assert 4 not in connection.subscriptions
+    connection.send_event.assert_called_with(4, {"type": "failed"})
+    peer.async_close.assert_awaited_once()
+    stop.assert_not_awaited()
+    assert not switch._arbiter.producers